@@ -0,0 +1,179 @@
+"""
+Decoding benchmark.
+
+This script measures the throughput, in lines per second, of the tax
+calculation loop using different decoding strategies:
+
+- `uncached`: building the pydantic adapters on every line.
+- `cached`: reusing the module-level pydantic adapters.
+- `fast`: decoding operations into lightweight records.
+- `pipeline`: the line processor, validating operations with pydantic.
+- `pipeline-fast`: the line processor with the fast decoder, which also
+  calculates taxes in cents and formats them without result models.
+
+Example: python benchmarks/decode.py --lines 20000
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from capital_gains.calculators import TaxCalculator
+from capital_gains.decoders import decode_operations
+from capital_gains.models import (
+    OPERATIONS_ADAPTER,
+    RESULTS_ADAPTER,
+    OperationModel,
+    ResultModel,
+)
+from capital_gains.pipeline import LineProcessor
+from capital_gains.states import PortfolioState
+
+
+def generate_lines(count: int, operations_per_line: int, seed: int) -> List[str]:
+    """
+    Generate deterministic JSON lines of short operation batches.
+
+    Parameters:
+        count (int): The number of lines to generate.
+        operations_per_line (int): The number of operations in each line.
+        seed (int): The random seed.
+
+    Returns:
+        List[str]: The generated lines.
+    """
+
+    generator = random.Random(seed)
+    lines = []
+
+    for _ in range(count):
+        operations = []
+        shares = 0
+
+        for index in range(operations_per_line):
+            unit_cost = round(generator.uniform(5, 50), 2)
+
+            # Alternate buys and sells, never selling more than the held shares.
+            if index % 2 == 0:
+                operation = "buy"
+                quantity = generator.randint(1, 10) * 1000
+                shares += quantity
+            else:
+                operation = "sell"
+                quantity = generator.randint(1, shares)
+                shares -= quantity
+
+            operations.append(
+                f'{{"operation": "{operation}", "unit-cost": {unit_cost}, '
+                f'"quantity": {quantity}}}'
+            )
+
+        lines.append(f"[{', '.join(operations)}]\n")
+
+    return lines
+
+
+def process_uncached(line: str) -> bytes:
+    """
+    Process a line building the adapters on every call.
+
+    Parameters:
+        line (str): The JSON encoded batch of operations.
+
+    Returns:
+        bytes: The JSON encoded results.
+    """
+
+    calculator = TaxCalculator(PortfolioState())
+    operations = TypeAdapter(List[OperationModel]).validate_json(line)
+    results = list(calculator.process(operations))
+
+    return TypeAdapter(List[ResultModel]).dump_json(results)
+
+
+def process_cached(line: str) -> bytes:
+    """
+    Process a line reusing the module-level adapters.
+
+    Parameters:
+        line (str): The JSON encoded batch of operations.
+
+    Returns:
+        bytes: The JSON encoded results.
+    """
+
+    calculator = TaxCalculator(PortfolioState())
+    operations = OPERATIONS_ADAPTER.validate_json(line)
+    results = list(calculator.process(operations))
+
+    return RESULTS_ADAPTER.dump_json(results)
+
+
+def process_fast(line: str) -> bytes:
+    """
+    Process a line using the fast decoder.
+
+    Parameters:
+        line (str): The JSON encoded batch of operations.
+
+    Returns:
+        bytes: The JSON encoded results.
+    """
+
+    calculator = TaxCalculator(PortfolioState())
+    operations = decode_operations(line)
+    results = list(calculator.process(operations))
+
+    return RESULTS_ADAPTER.dump_json(results)
+
+
+def measure(process: Callable[[str], bytes], lines: List[str]) -> float:
+    """
+    Measure the throughput of a processing strategy.
+
+    Parameters:
+        process (Callable[[str], bytes]): The processing strategy.
+        lines (List[str]): The lines to process.
+
+    Returns:
+        float: The throughput in lines per second.
+    """
+
+    start = time.perf_counter()
+
+    for line in lines:
+        process(line)
+
+    return len(lines) / (time.perf_counter() - start)
+
+
+def main():
+    """
+    Run the decoding benchmark.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--operations-per-line", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lines = generate_lines(args.lines, args.operations_per_line, args.seed)
+    strategies = {
+        "uncached": process_uncached,
+        "cached": process_cached,
+        "fast": process_fast,
+        "pipeline": LineProcessor().process,
+        "pipeline-fast": LineProcessor(fast_decode=True).process,
+    }
+
+    for name, process in strategies.items():
+        assert process(lines[0]) == process_uncached(lines[0])
+        print(f"{name:>13}: {measure(process, lines):12.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
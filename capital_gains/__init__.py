@@ -2,15 +2,66 @@
 Package main module.
 
 This module serves as the entry point for the package.
-It attempts to retrieve the current version of the package using the
-package metadata. If the package is not installed, it handles
-the exception gracefully, allowing the application to continue without
+It retrieves the current version of the package using the package
+metadata when `__version__` is first accessed, since querying the
+metadata is slow. If the package is not installed, it handles the
+exception gracefully, allowing the application to continue without
 version information.
+
+The library entry points, `process_lines` and `calculate_taxes`, and
+their `Engine` and `Backend` options, are also imported on first access,
+so that importing the package stays fast for the command-line interface.
 """
 
-from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Dict
+
+#: The modules of the library entry points, indexed by their name.
+_EXPORTS: Dict[str, str] = {
+    "process_lines": "api",
+    "calculate_taxes": "api",
+    "Engine": "options",
+    "Backend": "options",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Retrieve the version of the package or a library entry point on first access.
+
+    Parameters:
+        name (str): The name of the attribute.
+
+    Returns:
+        Any: The value of the attribute.
+
+    Raises:
+        AttributeError: The attribute does not exist, or the package is not
+            installed.
+    """
+
+    if name in _EXPORTS:
+        from importlib import import_module  # pylint: disable=import-outside-toplevel
+
+        value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+
+        return value
+
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib.metadata import (  # pylint: disable=import-outside-toplevel
+        PackageNotFoundError,
+        version,
+    )
+
+    try:
+        __version__ = version("capital-gains")
+    except PackageNotFoundError as error:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from error
+
+    globals()["__version__"] = __version__
 
-try:
-    __version__ = version("capital-gains")
-except PackageNotFoundError:
-    pass
+    return __version__
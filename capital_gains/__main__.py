@@ -0,0 +1,41 @@
+"""
+Entry point module.
+
+This module provides the entry point of the command-line application.
+Invocations without arguments, the most common case, process standard
+input with the default options directly, without loading the
+command-line interface framework. Any other invocation is handled by the
+command-line interface.
+"""
+
+import sys
+
+
+def main():
+    """
+    Run the command-line application.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    if len(sys.argv) > 1:
+        from .cli import app
+
+        app()
+        return
+
+    from .buffers import OutputBuffer, read_lines
+    from .pipeline import LineProcessor
+
+    processor = LineProcessor()
+
+    try:
+        # Write the results preceding an invalid line before the error is raised.
+        with OutputBuffer(sys.stdout.buffer) as output:
+            for json_result in processor.process_lines(read_lines(sys.stdin.buffer)):
+                output.write_line(json_result)
+    finally:
+        sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    main()
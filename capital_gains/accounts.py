@@ -0,0 +1,362 @@
+"""
+Accounts module.
+
+This module implements the stateful processing of accounts. Each line of
+input is an object with an account identifier and a batch of operations,
+which are applied to the portfolio state persisted for the account
+instead of an empty portfolio, so that new operations are processed
+without replaying the history of the account.
+
+The `AccountStore` class persists the portfolio states in an SQLite
+database, keeping the most recently used states in memory and writing
+updated states back in batched transactions. The `AccountProcessor`
+class processes lines of input against a store.
+"""
+
+import sqlite3
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+from .decoders import decode_account_batch
+from .models import ACCOUNT_BATCH_ADAPTER, Operation
+from .options import Engine
+from .pipeline import LineProcessor
+
+#: The values of a persisted portfolio state: total shares, average cost and total loss.
+AccountState = Tuple[int, Decimal, Decimal]
+
+
+class AccountStore:  # pylint: disable=too-many-instance-attributes
+    """
+    Portfolio states of accounts, stored in an SQLite database.
+
+    Updated states are kept in memory and committed in batched
+    transactions, so states updated after the last commit are lost if the
+    process is interrupted. The least recently used states beyond the
+    maximum number of cached states are dropped from memory once committed.
+    """
+
+    #: The path of the database.
+    path: str
+
+    #: The number of updated states committed at a time.
+    commit_interval: int
+
+    #: The maximum number of states kept in memory.
+    max_cached: int
+
+    #: The number of states found in memory.
+    hits: int
+
+    #: The number of states read from the database, or not found.
+    misses: int
+
+    #: The number of states committed.
+    writes: int
+
+    def __init__(self, path: str, commit_interval: int = 1024, max_cached: int = 65536):
+        """
+        Open the account store, creating the database if needed.
+
+        Parameters:
+            path (str): The path of the database.
+            commit_interval (int): The number of updated states committed at
+                a time. Defaults to 1024.
+            max_cached (int): The maximum number of states kept in memory.
+                Defaults to 65536.
+        """
+
+        self.path = path
+        self.commit_interval = commit_interval
+        self.max_cached = max_cached
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        self._connection = sqlite3.connect(path, timeout=30.0)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS accounts ("
+            "account TEXT PRIMARY KEY, total_shares INTEGER NOT NULL, "
+            "average_cost TEXT NOT NULL, total_loss TEXT NOT NULL)"
+        )
+        self._connection.commit()
+
+        self._states: "OrderedDict[str, AccountState]" = OrderedDict()
+        self._updates: Dict[str, AccountState] = {}
+
+    def load(self, account: str) -> Optional[AccountState]:
+        """
+        Look up the portfolio state of an account.
+
+        Parameters:
+            account (str): The identifier of the account.
+
+        Returns:
+            Optional[AccountState]: The state of the account, or `None` if
+                the account has no state.
+        """
+
+        state = self._states.get(account)
+
+        if state is not None:
+            self._states.move_to_end(account)
+            self.hits += 1
+
+            return state
+
+        self.misses += 1
+        row = self._connection.execute(
+            "SELECT total_shares, average_cost, total_loss FROM accounts "
+            "WHERE account = ?",
+            (account,),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        state = (row[0], Decimal(row[1]), Decimal(row[2]))
+        self._cache(account, state)
+
+        return state
+
+    def save(self, account: str, state: AccountState):
+        """
+        Update the portfolio state of an account.
+
+        Parameters:
+            account (str): The identifier of the account.
+            state (AccountState): The state of the account.
+        """
+
+        self._cache(account, state)
+        self._updates[account] = state
+
+        if len(self._updates) >= self.commit_interval:
+            self.flush()
+
+    def _cache(self, account: str, state: AccountState):
+        """
+        Keep the state of an account in memory, dropping the least recently used.
+
+        Parameters:
+            account (str): The identifier of the account.
+            state (AccountState): The state of the account.
+        """
+
+        states = self._states
+        states[account] = state
+        states.move_to_end(account)
+
+        while len(states) > self.max_cached:
+            evicted, _ = states.popitem(last=False)
+
+            # Updated states are looked up in memory until committed.
+            if evicted in self._updates:
+                self.flush()
+
+    def flush(self):
+        """
+        Commit the updated states in a single transaction.
+        """
+
+        if not self._updates:
+            return
+
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO accounts VALUES (?, ?, ?, ?)",
+                [
+                    (account, total_shares, str(average_cost), str(total_loss))
+                    for account, (
+                        total_shares,
+                        average_cost,
+                        total_loss,
+                    ) in self._updates.items()
+                ],
+            )
+
+        self.writes += len(self._updates)
+        self._updates.clear()
+
+    def close(self):
+        """
+        Commit the updated states and close the database.
+        """
+
+        self.flush()
+        self._connection.close()
+
+    def report(self) -> str:
+        """
+        Format the lookup and write statistics of the store.
+
+        Returns:
+            str: The statistics report.
+        """
+
+        lookups = self.hits + self.misses
+        hit_ratio = self.hits / lookups if lookups else 0.0
+
+        return "\n".join(
+            [
+                f"Account lookups: {lookups}",
+                f"  memory hits: {self.hits}",
+                f"  misses: {self.misses}",
+                f"  hit ratio: {hit_ratio:.1%}",
+                f"  memory states: {len(self._states)} of {self.max_cached}",
+                f"  committed states: {self.writes}",
+            ]
+        )
+
+
+class AccountProcessor:
+    """
+    Processor of JSON encoded batches of operations of accounts.
+
+    Each line is an object with an `account` identifier and the
+    `operations` applied to its persisted portfolio state, in order.
+    Results are encoded as for batches of operations.
+    """
+
+    #: The line processor, providing the decoding options, backend and hooks.
+    processor: LineProcessor
+
+    #: The account store.
+    store: AccountStore
+
+    def __init__(self, processor: LineProcessor, store: AccountStore):
+        """
+        Initialize the account processor.
+
+        Parameters:
+            processor (LineProcessor): The line processor, providing the
+                decoding options, numeric backend and hooks. Only line events
+                are reported to the hooks.
+            store (AccountStore): The account store.
+
+        Raises:
+            ValueError: The line processor does not use the decimal engine.
+        """
+
+        if processor.engine != Engine.DECIMAL or processor.prefix_index is not None:
+            raise ValueError(
+                "Accounts are only supported by the decimal engine "
+                "without a prefix index."
+            )
+
+        self.processor = processor
+        self.store = store
+
+        self._calculator = processor.create_calculator()
+
+    def decode(self, json_batch: Union[str, bytes]) -> Tuple[str, Sequence[Operation]]:
+        """
+        Decode a JSON encoded batch of operations of an account.
+
+        Parameters:
+            json_batch (Union[str, bytes]): The JSON encoded batch of operations
+                of an account.
+
+        Returns:
+            Tuple[str, Sequence[Operation]]: The account and its operations.
+
+        Raises:
+            ValidationError: The batch of operations is invalid.
+        """
+
+        if self.processor.fast_decode:
+            return decode_account_batch(json_batch, self.processor.json_codec)
+
+        batch = ACCOUNT_BATCH_ADAPTER.validate_json(json_batch)
+
+        return batch.account, batch.operations
+
+    def process(self, json_batch: Union[str, bytes]) -> bytes:
+        """
+        Process a JSON encoded batch of operations of an account.
+
+        The state of the account is updated only if the whole batch is
+        processed.
+
+        Parameters:
+            json_batch (Union[str, bytes]): The JSON encoded batch of operations
+                of an account.
+
+        Returns:
+            bytes: The JSON encoded results, without a trailing line break.
+
+        Raises:
+            ValidationError: The batch of operations is invalid.
+        """
+
+        hooks = self.processor.hooks
+        start = time.perf_counter()
+
+        try:
+            account, operations = self.decode(json_batch)
+        except ValueError as error:
+            if hooks is not None:
+                hooks.error(error)
+
+            raise
+
+        calculator = self._calculator
+        state = calculator.state
+        backend = state.backend
+        account_state = self.store.load(account)
+
+        if account_state is None:
+            state.reset()
+        else:
+            total_shares, average_cost, total_loss = account_state
+            state.restore(
+                (
+                    total_shares,
+                    backend.from_decimal(average_cost),
+                    backend.from_decimal(total_loss),
+                )
+            )
+
+        json_results = self.processor.json_codec.encode_results(
+            calculator.calculate(operations)
+        )
+
+        self.store.save(
+            account,
+            (
+                state.total_shares,
+                backend.to_decimal(state.average_cost),
+                backend.to_decimal(state.total_loss),
+            ),
+        )
+
+        if hooks is not None:
+            hooks.line(
+                len(operations),
+                len(json_batch),
+                len(json_results),
+                time.perf_counter() - start,
+            )
+
+        return json_results
+
+    def process_lines(self, lines: Iterable[Union[str, bytes]]) -> Iterator[bytes]:
+        """
+        Process multiple JSON encoded batches of operations of accounts.
+
+        Parameters:
+            lines (Iterable[Union[str, bytes]]): The JSON encoded batches of
+                operations of accounts.
+
+        Returns:
+            Iterator[bytes]: The JSON encoded results for each line, in order.
+
+        Raises:
+            ValidationError: A batch of operations is invalid.
+        """
+
+        return map(self.process, lines)
@@ -0,0 +1,132 @@
+"""
+API module.
+
+This module provides the library entry points for embedding the tax
+calculation in Python applications without the command-line interface.
+Input is consumed lazily, and results are produced in order as each
+batch is calculated, in-process, by a single line processor whose
+calculators are reused for all batches.
+"""
+
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List, Sequence, Union
+
+from .decoders import decode_values
+from .models import OPERATIONS_ADAPTER, Operation, OperationModel, OperationRecord
+from .options import Backend, Engine
+from .pipeline import LineProcessor
+
+#: Any batch of operations accepted by `calculate_taxes`: a JSON encoded
+#: line, or an iterable of operations or of their parsed JSON objects.
+Batch = Union[str, bytes, Iterable[Any]]
+
+
+def process_lines(
+    lines: Iterable[Union[str, bytes]],
+    *,
+    engine: Engine = Engine.DECIMAL,
+    backend: Backend = Backend.DECIMAL,
+    fast_decode: bool = False,
+    batch_size: int = 256,
+) -> Iterator[bytes]:
+    """
+    Calculate the taxes of JSON encoded batches of operations.
+
+    Each line is calculated independently, starting from an empty
+    portfolio state, exactly as by the command-line interface.
+
+    Parameters:
+        lines (Iterable[Union[str, bytes]]): The JSON encoded batches of
+            operations, without trailing line breaks.
+        engine (Engine): The tax calculation engine. Defaults to decimal.
+        backend (Backend): The numeric backend of the decimal engine.
+            Defaults to decimal.
+        fast_decode (bool): Whether to decode operations into lightweight
+            records, bypassing the validation models. Defaults to false.
+        batch_size (int): The number of lines processed at a time by the
+            columnar engine. Defaults to 256.
+
+    Returns:
+        Iterator[bytes]: The JSON encoded results for each line, in order.
+
+    Raises:
+        ImportError: The engine dependencies are not installed.
+        ValidationError: A batch of operations is invalid.
+    """
+
+    processor = LineProcessor(fast_decode, engine, batch_size, backend)
+
+    return processor.process_lines(lines)
+
+
+def _decode_batch(processor: LineProcessor, batch: Batch) -> Sequence[Operation]:
+    """
+    Decode a JSON encoded or parsed batch of operations.
+
+    Parameters:
+        processor (LineProcessor): The line processor decoding JSON encoded batches.
+        batch (Batch): The batch of operations.
+
+    Returns:
+        Sequence[Operation]: The decoded operations.
+
+    Raises:
+        ValidationError: The batch of operations is invalid.
+    """
+
+    if isinstance(batch, (str, bytes)):
+        return processor.decode(batch)
+
+    values = list(batch)
+
+    # Operations decoded by the caller are calculated as they are.
+    if all(isinstance(value, (OperationModel, OperationRecord)) for value in values):
+        return values
+
+    if processor.fast_decode:
+        return decode_values(values)
+
+    return OPERATIONS_ADAPTER.validate_python(values)
+
+
+def calculate_taxes(
+    batches: Iterable[Batch],
+    *,
+    engine: Engine = Engine.DECIMAL,
+    backend: Backend = Backend.DECIMAL,
+    fast_decode: bool = False,
+    batch_size: int = 256,
+) -> Iterator[List[Decimal]]:
+    """
+    Calculate the taxes of batches of operations as decimal values.
+
+    Each batch is calculated independently, starting from an empty
+    portfolio state. Batches may be JSON encoded lines, iterables of
+    decoded operations, calculated as they are, or iterables of parsed
+    JSON objects with the `operation`, `unit-cost` and `quantity` keys,
+    which are validated as by `OperationModel` without a JSON round trip.
+
+    Parameters:
+        batches (Iterable[Batch]): The batches of operations.
+        engine (Engine): The tax calculation engine. Defaults to decimal.
+        backend (Backend): The numeric backend of the decimal engine.
+            Defaults to decimal.
+        fast_decode (bool): Whether to decode operations into lightweight
+            records, bypassing the validation models. Defaults to false.
+        batch_size (int): The number of batches calculated at a time by the
+            columnar engine. Defaults to 256.
+
+    Returns:
+        Iterator[List[Decimal]]: The taxes of each operation of each batch,
+            rounded to two decimal places as in `ResultModel`, in order.
+
+    Raises:
+        ImportError: The engine dependencies are not installed.
+        ValidationError: A batch of operations is invalid.
+    """
+
+    processor = LineProcessor(fast_decode, engine, batch_size, backend)
+    operations = (_decode_batch(processor, batch) for batch in batches)
+
+    for taxes in processor.calculate_batches(operations):
+        yield [Decimal(tax).scaleb(-2) for tax in taxes]
@@ -0,0 +1,14 @@
+"""
+Backends module.
+
+This module provides the numeric backends used to represent financial
+values within the portfolio state and the operations. It includes the
+base class `BaseBackend`, which defines the arithmetic interface shared
+by all backends, the `DecimalBackend`, which represents values with
+decimals, and the `FixedPointBackend`, which represents values with
+scaled integers.
+"""
+
+from .base import BaseBackend, Number
+from .decimal import DECIMAL_BACKEND, DecimalBackend
+from .fixed import FixedPointBackend
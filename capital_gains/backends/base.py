@@ -0,0 +1,97 @@
+"""
+Base backend module.
+
+This module defines the abstract base class for numeric backends. A
+backend converts financial values from and to decimals and implements
+the arithmetic that depends on the value representation, namely division
+and scaling. Addition, subtraction, comparison and multiplication by an
+integer quantity use the native operators of the representation.
+"""
+
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Generic, TypeVar, Union
+
+#: Any representation of a financial value supported by the backends.
+Number = Union[Decimal, int]
+
+NumberT = TypeVar("NumberT", Decimal, int)
+
+
+class BaseBackend(ABC, Generic[NumberT]):
+    """
+    Abstract base class for numeric backends.
+
+    This class defines the operations that all numeric backends must
+    implement to represent and calculate financial values.
+    """
+
+    #: The representation of zero.
+    zero: NumberT
+
+    @abstractmethod
+    def from_decimal(self, value: Decimal) -> NumberT:
+        """
+        Convert a decimal value to the backend representation.
+
+        Parameters:
+            value (Decimal): The decimal value.
+
+        Returns:
+            NumberT: The value in the backend representation.
+        """
+
+    @abstractmethod
+    def to_decimal(self, value: NumberT) -> Decimal:
+        """
+        Convert a value in the backend representation to a decimal.
+
+        Parameters:
+            value (NumberT): The value in the backend representation.
+
+        Returns:
+            Decimal: The decimal value.
+        """
+
+    @abstractmethod
+    def to_cents(self, value: NumberT) -> int:
+        """
+        Round a value in the backend representation to an integer of cents.
+
+        Values are rounded with ties away from zero, as in the `ResultModel`.
+
+        Parameters:
+            value (NumberT): The value in the backend representation.
+
+        Returns:
+            int: The value in cents.
+        """
+
+    @abstractmethod
+    def divide(self, value: NumberT, quantity: int) -> NumberT:
+        """
+        Divide a value by an integer quantity.
+
+        Parameters:
+            value (NumberT): The value in the backend representation.
+            quantity (int): The quantity to divide by.
+
+        Returns:
+            NumberT: The quotient in the backend representation.
+
+        Raises:
+            ArithmeticError: The quantity is zero.
+        """
+
+    @abstractmethod
+    def scale(self, value: NumberT, factor: Decimal) -> NumberT:
+        """
+        Multiply a value by a decimal factor.
+
+        Parameters:
+            value (NumberT): The value in the backend representation.
+            factor (Decimal): The factor to multiply by.
+
+        Returns:
+            NumberT: The product in the backend representation.
+        """
@@ -0,0 +1,96 @@
+"""
+Decimal backend module.
+
+This module defines the `DecimalBackend` class, which represents financial
+values with decimals. Calculations follow the rounding rules of the
+current decimal context.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from .base import BaseBackend
+
+#: The smallest financial unit.
+_CENT = Decimal("0.01")
+
+
+class DecimalBackend(BaseBackend[Decimal]):
+    """
+    Numeric backend representing financial values with decimals.
+    """
+
+    zero = Decimal("0")
+
+    def from_decimal(self, value: Decimal) -> Decimal:
+        """
+        Convert a decimal value to the backend representation.
+
+        Parameters:
+            value (Decimal): The decimal value.
+
+        Returns:
+            Decimal: The same decimal value.
+        """
+
+        return value
+
+    def to_decimal(self, value: Decimal) -> Decimal:
+        """
+        Convert a value in the backend representation to a decimal.
+
+        Parameters:
+            value (Decimal): The decimal value.
+
+        Returns:
+            Decimal: The same decimal value.
+        """
+
+        return value
+
+    def to_cents(self, value: Decimal) -> int:
+        """
+        Round a decimal value to an integer of cents.
+
+        Parameters:
+            value (Decimal): The decimal value.
+
+        Returns:
+            int: The value in cents, rounded with ties away from zero.
+        """
+
+        return int(value.quantize(_CENT, rounding=ROUND_HALF_UP).scaleb(2))
+
+    def divide(self, value: Decimal, quantity: int) -> Decimal:
+        """
+        Divide a value by an integer quantity.
+
+        Parameters:
+            value (Decimal): The decimal value.
+            quantity (int): The quantity to divide by.
+
+        Returns:
+            Decimal: The quotient, rounded by the decimal context.
+
+        Raises:
+            ArithmeticError: The quantity is zero.
+        """
+
+        return value / quantity
+
+    def scale(self, value: Decimal, factor: Decimal) -> Decimal:
+        """
+        Multiply a value by a decimal factor.
+
+        Parameters:
+            value (Decimal): The decimal value.
+            factor (Decimal): The factor to multiply by.
+
+        Returns:
+            Decimal: The product, rounded by the decimal context.
+        """
+
+        return value * factor
+
+
+#: Shared instance of the decimal backend.
+DECIMAL_BACKEND = DecimalBackend()
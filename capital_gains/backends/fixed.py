@@ -0,0 +1,186 @@
+"""
+Fixed-point backend module.
+
+This module defines the `FixedPointBackend` class, which represents
+financial values as integers scaled by a fixed power of ten. Additions,
+subtractions, comparisons and multiplications by quantities are exact
+integer operations, and divisions and scalings are rounded to the
+nearest scaled unit, with ties rounded to even, the same rounding policy
+as the default decimal context.
+"""
+
+from decimal import MAX_PREC, Context, Decimal
+from typing import Dict, Tuple
+
+from .base import BaseBackend
+
+#: Decimal context for exact conversions of scaled integers.
+_EXACT_CONTEXT = Context(prec=MAX_PREC)
+
+#: Maximum number of converted decimal values memoized by a backend.
+_CONVERSION_CACHE_SIZE = 4096
+
+
+def _divide_half_even(numerator: int, denominator: int) -> int:
+    """
+    Divide integers, rounding to the nearest integer with ties to even.
+
+    Parameters:
+        numerator (int): The numerator.
+        denominator (int): The positive denominator.
+
+    Returns:
+        int: The rounded quotient.
+    """
+
+    quotient, remainder = divmod(numerator, denominator)
+    doubled_remainder = 2 * remainder
+
+    if doubled_remainder > denominator or (
+        doubled_remainder == denominator and quotient % 2 == 1
+    ):
+        quotient += 1
+
+    return quotient
+
+
+def _divide_half_up(numerator: int, denominator: int) -> int:
+    """
+    Divide integers, rounding to the nearest integer with ties away from zero.
+
+    Parameters:
+        numerator (int): The numerator.
+        denominator (int): The positive denominator.
+
+    Returns:
+        int: The rounded quotient.
+    """
+
+    if numerator < 0:
+        return -((-numerator * 2 + denominator) // (2 * denominator))
+
+    return (numerator * 2 + denominator) // (2 * denominator)
+
+
+class FixedPointBackend(BaseBackend[int]):
+    """
+    Numeric backend representing financial values with scaled integers.
+    """
+
+    zero = 0
+
+    #: The number of decimal places represented by the scaled integers.
+    places: int
+
+    #: The scaling factor of the integers.
+    unit: int
+
+    def __init__(self, places: int = 18):
+        """
+        Initialize the fixed-point backend.
+
+        Parameters:
+            places (int): The number of decimal places represented by the
+                scaled integers. Defaults to 18.
+        """
+
+        self.places = places
+        self.unit = 10**places
+
+        self._conversions: Dict[Decimal, int] = {}
+        self._ratios: Dict[Decimal, Tuple[int, int]] = {}
+
+    def from_decimal(self, value: Decimal) -> int:
+        """
+        Convert a decimal value to a scaled integer.
+
+        Parameters:
+            value (Decimal): The decimal value.
+
+        Returns:
+            int: The scaled integer, rounded with ties to even.
+        """
+
+        scaled_value = self._conversions.get(value)
+
+        if scaled_value is None:
+            numerator, denominator = value.as_integer_ratio()
+            scaled_value = _divide_half_even(numerator * self.unit, denominator)
+
+            # Unit costs and thresholds repeat often across operations.
+            if len(self._conversions) < _CONVERSION_CACHE_SIZE:
+                self._conversions[value] = scaled_value
+
+        return scaled_value
+
+    def to_decimal(self, value: int) -> Decimal:
+        """
+        Convert a scaled integer to a decimal.
+
+        Parameters:
+            value (int): The scaled integer.
+
+        Returns:
+            Decimal: The exact decimal value.
+        """
+
+        return Decimal(value).scaleb(-self.places, context=_EXACT_CONTEXT)
+
+    def to_cents(self, value: int) -> int:
+        """
+        Round a scaled integer to an integer of cents.
+
+        Parameters:
+            value (int): The scaled integer.
+
+        Returns:
+            int: The value in cents, rounded with ties away from zero.
+        """
+
+        if self.places >= 2:
+            return _divide_half_up(value, 10 ** (self.places - 2))
+
+        return value * 10 ** (2 - self.places)
+
+    def divide(self, value: int, quantity: int) -> int:
+        """
+        Divide a scaled integer by an integer quantity.
+
+        Parameters:
+            value (int): The scaled integer.
+            quantity (int): The quantity to divide by.
+
+        Returns:
+            int: The quotient, rounded with ties to even.
+
+        Raises:
+            ArithmeticError: The quantity is zero.
+        """
+
+        if quantity < 0:
+            return _divide_half_even(-value, -quantity)
+
+        return _divide_half_even(value, quantity)
+
+    def scale(self, value: int, factor: Decimal) -> int:
+        """
+        Multiply a scaled integer by a decimal factor.
+
+        The factor is applied as an exact ratio of integers.
+
+        Parameters:
+            value (int): The scaled integer.
+            factor (Decimal): The factor to multiply by.
+
+        Returns:
+            int: The product, rounded with ties to even.
+        """
+
+        ratio = self._ratios.get(factor)
+
+        if ratio is None:
+            ratio = self._ratios[factor] = factor.as_integer_ratio()
+
+        numerator, denominator = ratio
+
+        return _divide_half_even(value * numerator, denominator)
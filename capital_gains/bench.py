@@ -0,0 +1,183 @@
+"""
+Benchmark module.
+
+This module measures the throughput and latency of the processing of
+lines of input. With the decimal engine, each line is timed through the
+parse, compute and serialize stages. With the columnar engine, lines are
+processed in batches and only the overall throughput is measured.
+"""
+
+import sys
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from .pipeline import Engine, LineProcessor
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+
+class BenchmarkResult(NamedTuple):
+    """
+    Measurements of a benchmark run over a workload.
+    """
+
+    #: The name of the workload.
+    workload: str
+
+    #: The number of lines processed.
+    lines: int
+
+    #: The number of operations processed.
+    operations: int
+
+    #: The total processing time, in seconds.
+    seconds: float
+
+    #: The number of lines processed per second.
+    lines_per_second: float
+
+    #: The number of operations processed per second.
+    operations_per_second: float
+
+    #: The time spent decoding operations, in seconds, if measured.
+    parse_seconds: Optional[float]
+
+    #: The time spent calculating taxes, in seconds, if measured.
+    compute_seconds: Optional[float]
+
+    #: The time spent encoding results, in seconds, if measured.
+    serialize_seconds: Optional[float]
+
+    #: The median processing time of a line, in seconds, if measured.
+    latency_p50: Optional[float]
+
+    #: The 99th percentile processing time of a line, in seconds, if measured.
+    latency_p99: Optional[float]
+
+    #: The peak resident set size of the process, in bytes, if available.
+    peak_rss: Optional[int]
+
+
+def _percentile(sorted_values: Sequence[float], percentile: float) -> float:
+    """
+    Select the nearest-rank percentile of sorted values.
+
+    Parameters:
+        sorted_values (Sequence[float]): The values, in ascending order.
+        percentile (float): The percentile, between zero and one hundred.
+
+    Returns:
+        float: The percentile value.
+    """
+
+    index = max(0, -(-len(sorted_values) * percentile // 100) - 1)
+
+    return sorted_values[int(index)]
+
+
+def peak_rss() -> Optional[int]:
+    """
+    Measure the peak resident set size of the current process.
+
+    Returns:
+        Optional[int]: The peak resident set size, in bytes, or `None` if
+            not available on the platform.
+    """
+
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kibibytes and macOS reports bytes.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _run_stages(
+    processor: LineProcessor, lines: Sequence[bytes]
+) -> Tuple[List[float], List[float]]:
+    """
+    Process lines with the decimal engine, timing each stage of each line.
+
+    Parameters:
+        processor (LineProcessor): The line processor.
+        lines (Sequence[bytes]): The JSON encoded batches of operations.
+
+    Returns:
+        Tuple[List[float], List[float]]: The total parse, compute and serialize
+            times, and the processing time of each line, in seconds.
+    """
+
+    stages = [0.0, 0.0, 0.0]
+    latencies = []
+    calculator = processor.create_calculator()
+
+    for line in lines:
+        calculator.state.reset()
+
+        line_start = time.perf_counter()
+        batch = processor.decode(line)
+        parse_end = time.perf_counter()
+        taxes = list(calculator.calculate(batch))
+        compute_end = time.perf_counter()
+        processor.json_codec.encode_results(taxes)
+        line_end = time.perf_counter()
+
+        stages[0] += parse_end - line_start
+        stages[1] += compute_end - parse_end
+        stages[2] += line_end - compute_end
+        latencies.append(line_end - line_start)
+
+    return stages, latencies
+
+
+def run_benchmark(
+    processor: LineProcessor, workload: str, lines: Sequence[bytes]
+) -> BenchmarkResult:
+    """
+    Measure the processing of lines of input.
+
+    Parameters:
+        processor (LineProcessor): The line processor.
+        workload (str): The name of the workload.
+        lines (Sequence[bytes]): The JSON encoded batches of operations.
+
+    Returns:
+        BenchmarkResult: The measurements of the run.
+
+    Raises:
+        ValidationError: A batch of operations is invalid.
+    """
+
+    operations = sum(line.count(b'"operation"') for line in lines)
+    stages: Optional[List[float]] = None
+    latencies: List[float] = []
+
+    start = time.perf_counter()
+
+    if processor.engine == Engine.DECIMAL:
+        stages, latencies = _run_stages(processor, lines)
+    else:
+        for _ in processor.process_lines(lines):
+            pass
+
+    seconds = time.perf_counter() - start
+    latencies.sort()
+
+    return BenchmarkResult(
+        workload=workload,
+        lines=len(lines),
+        operations=operations,
+        seconds=seconds,
+        lines_per_second=len(lines) / seconds if seconds else 0.0,
+        operations_per_second=operations / seconds if seconds else 0.0,
+        parse_seconds=stages[0] if stages else None,
+        compute_seconds=stages[1] if stages else None,
+        serialize_seconds=stages[2] if stages else None,
+        latency_p50=_percentile(latencies, 50) if latencies else None,
+        latency_p99=_percentile(latencies, 99) if latencies else None,
+        peak_rss=peak_rss(),
+    )
@@ -0,0 +1,155 @@
+"""
+Buffered input and output module.
+
+This module provides the bulk binary input and output layer of the
+command-line interface. Input is read in large blocks and split into
+lines of bytes without decoding, and output lines are accumulated in
+memory and written to the stream when a size or time threshold is
+reached, reducing the number of system calls for short lines.
+"""
+
+import time
+from typing import BinaryIO, Iterator, List
+
+
+def read_lines(stream: BinaryIO, block_size: int = 1048576) -> Iterator[bytes]:
+    """
+    Read lines of bytes from a binary stream in large blocks.
+
+    Lines are yielded without the trailing line break. A line may span
+    any number of blocks.
+
+    Parameters:
+        stream (BinaryIO): The binary input stream.
+        block_size (int): The number of bytes read from the stream at a time.
+            Defaults to 1 MiB.
+
+    Returns:
+        Iterator[bytes]: The lines of input, in order.
+    """
+
+    # Return the data available in interactive pipes without waiting for a full block.
+    read = getattr(stream, "read1", stream.read)
+    pending: List[bytes] = []
+
+    while data := read(block_size):
+        lines = data.split(b"\n")
+
+        if len(lines) == 1:
+            pending.append(data)
+            continue
+
+        pending.append(lines[0])
+
+        yield b"".join(pending)
+        yield from lines[1:-1]
+
+        pending = [lines[-1]]
+
+    line = b"".join(pending)
+
+    if line:
+        yield line
+
+
+class OutputBuffer:
+    """
+    Buffer of output lines written to a binary stream in bulk.
+
+    Lines are accumulated in memory and written to the stream at once when
+    the buffered size or the time since the last write reaches a threshold.
+    The time threshold is only checked when a line is written.
+    """
+
+    #: The binary output stream.
+    stream: BinaryIO
+
+    #: The number of buffered bytes that triggers a write.
+    flush_size: int
+
+    #: The number of seconds since the last write that triggers a write.
+    flush_interval: float
+
+    #: Whether to write each line as soon as it is buffered.
+    line_buffered: bool
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        flush_size: int = 1048576,
+        flush_interval: float = 1.0,
+        line_buffered: bool = False,
+    ):
+        """
+        Initialize the output buffer.
+
+        Parameters:
+            stream (BinaryIO): The binary output stream.
+            flush_size (int): The number of buffered bytes that triggers a write.
+                Defaults to 1 MiB.
+            flush_interval (float): The number of seconds since the last write
+                that triggers a write. Defaults to one second.
+            line_buffered (bool): Whether to write each line as soon as it is
+                buffered. Defaults to false.
+        """
+
+        self.stream = stream
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.line_buffered = line_buffered
+
+        self._chunks: List[bytes] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def write_line(self, line: bytes):
+        """
+        Buffer a line of output, writing the buffer if a threshold is reached.
+
+        Parameters:
+            line (bytes): The line of output, without a trailing line break.
+        """
+
+        self._chunks.append(line)
+        self._chunks.append(b"\n")
+        self._size += len(line) + 1
+
+        if (
+            self.line_buffered
+            or self._size >= self.flush_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered lines to the stream and flush it.
+        """
+
+        if self._chunks:
+            self.stream.write(b"".join(self._chunks))
+            self._chunks.clear()
+            self._size = 0
+
+        self.stream.flush()
+        self._last_flush = time.monotonic()
+
+    def __enter__(self) -> "OutputBuffer":
+        """
+        Enter the runtime context of the output buffer.
+
+        Returns:
+            OutputBuffer: The output buffer.
+        """
+
+        return self
+
+    def __exit__(self, *args):
+        """
+        Exit the runtime context, writing the remaining buffered lines.
+
+        Parameters:
+            args: The exception details, if any.
+        """
+
+        self.flush()
@@ -0,0 +1,448 @@
+"""
+Cache module.
+
+This module provides a content-addressed cache of the results of lines of
+input. Lines are keyed by a hash of their raw bytes, so that repeated
+lines skip decoding, validation and calculation. The `ResultCache` class
+keeps the most recently used results in memory, optionally backed by a
+persistent `ResultStore` tier, an SQLite database with size-based
+eviction that can be shared across runs. Invalid lines are never cached.
+"""
+
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict, deque
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+#: The size of the line hashes, in bytes.
+KEY_SIZE = 16
+
+#: The fraction of the maximum size kept when evicting results from the store.
+_EVICTION_RATIO = 0.9
+
+
+def line_key(line: Union[str, bytes], namespace: bytes = b"") -> bytes:
+    """
+    Hash the raw bytes of a line of input.
+
+    Parameters:
+        line (Union[str, bytes]): The line of input.
+        namespace (bytes): A namespace of at most 16 bytes separating the
+            results of incompatible processing options. Defaults to empty.
+
+    Returns:
+        bytes: The key of the line.
+    """
+
+    if isinstance(line, str):
+        line = line.encode()
+
+    return hashlib.blake2b(line, digest_size=KEY_SIZE, person=namespace).digest()
+
+
+class ResultStore:  # pylint: disable=too-many-instance-attributes
+    """
+    Persistent tier of the result cache, stored in an SQLite database.
+
+    Writes and access time updates are buffered and committed in batches.
+    When the stored results exceed the maximum size, the least recently
+    used results are evicted. Several runs may share the same database.
+    """
+
+    #: The path of the database.
+    path: str
+
+    #: The maximum size of the stored keys and results, in bytes.
+    max_bytes: int
+
+    #: The number of buffered writes committed at a time.
+    commit_interval: int
+
+    #: The number of results evicted.
+    evictions: int
+
+    def __init__(
+        self, path: str, max_bytes: int = 268435456, commit_interval: int = 1024
+    ):
+        """
+        Open the result store, creating the database if needed.
+
+        Parameters:
+            path (str): The path of the database.
+            max_bytes (int): The maximum size of the stored keys and results,
+                in bytes. Defaults to 256 MiB.
+            commit_interval (int): The number of buffered writes committed at
+                a time. Defaults to 1024.
+        """
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.commit_interval = commit_interval
+        self.evictions = 0
+
+        self._connection = sqlite3.connect(path, timeout=30.0)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key BLOB PRIMARY KEY, result BLOB NOT NULL, "
+            "size INTEGER NOT NULL, accessed INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+        )
+        self._connection.commit()
+
+        self._size = self._stored_size()
+        self._writes: Dict[bytes, bytes] = {}
+        self._accesses: List[bytes] = []
+
+    def _stored_size(self) -> int:
+        """
+        Measure the size of the stored keys and results.
+
+        Returns:
+            int: The size of the stored keys and results, in bytes.
+        """
+
+        (size,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+
+        return size
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """
+        Look up the result of a line.
+
+        Parameters:
+            key (bytes): The key of the line.
+
+        Returns:
+            Optional[bytes]: The result of the line, or `None` if not stored.
+        """
+
+        result = self._writes.get(key)
+
+        if result is not None:
+            return result
+
+        row = self._connection.execute(
+            "SELECT result FROM results WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        self._accesses.append(key)
+
+        if len(self._accesses) >= self.commit_interval:
+            self.flush()
+
+        return row[0]
+
+    def put(self, key: bytes, result: bytes):
+        """
+        Store the result of a line.
+
+        Parameters:
+            key (bytes): The key of the line.
+            result (bytes): The result of the line.
+        """
+
+        self._writes[key] = result
+
+        if len(self._writes) >= self.commit_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Commit the buffered writes and access times, evicting results if needed.
+        """
+
+        if not self._writes and not self._accesses:
+            return
+
+        accessed = time.time_ns()
+
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                [
+                    (key, result, len(key) + len(result), accessed)
+                    for key, result in self._writes.items()
+                ],
+            )
+            self._connection.executemany(
+                "UPDATE results SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key in self._accesses],
+            )
+
+        self._size += sum(
+            len(key) + len(result) for key, result in self._writes.items()
+        )
+        self._writes.clear()
+        self._accesses.clear()
+
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """
+        Evict the least recently used results until the store fits its size.
+        """
+
+        with self._connection:
+            # Other runs sharing the database may have changed its size.
+            self._size = self._stored_size()
+            excess = self._size - int(self.max_bytes * _EVICTION_RATIO)
+
+            if excess <= 0:
+                return
+
+            keys = []
+
+            for key, size in self._connection.execute(
+                "SELECT key, size FROM results ORDER BY accessed"
+            ):
+                if excess <= 0:
+                    break
+
+                keys.append((key,))
+                excess -= size
+                self._size -= size
+
+            self._connection.executemany("DELETE FROM results WHERE key = ?", keys)
+
+        self.evictions += len(keys)
+
+    def close(self):
+        """
+        Commit the buffered writes and close the database.
+        """
+
+        self.flush()
+        self._connection.close()
+
+
+class ResultCache:  # pylint: disable=too-many-instance-attributes
+    """
+    Bounded least recently used cache of the results of lines of input.
+    """
+
+    #: The maximum number of results kept in memory.
+    max_entries: int
+
+    #: The persistent tier, if any.
+    store: Optional[ResultStore]
+
+    #: The number of results found in memory.
+    hits: int
+
+    #: The number of results found in the persistent tier.
+    store_hits: int
+
+    #: The number of results not found.
+    misses: int
+
+    #: The number of results evicted from memory.
+    evictions: int
+
+    def __init__(self, max_entries: int = 65536, store: Optional[ResultStore] = None):
+        """
+        Initialize an empty result cache.
+
+        Parameters:
+            max_entries (int): The maximum number of results kept in memory.
+                Defaults to 65536.
+            store (Optional[ResultStore]): The persistent tier. Defaults to none.
+        """
+
+        self.max_entries = max_entries
+        self.store = store
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: "OrderedDict[bytes, bytes]" = OrderedDict()
+
+    def _insert(self, key: bytes, result: bytes):
+        """
+        Keep a result in memory, evicting the least recently used result if full.
+
+        Parameters:
+            key (bytes): The key of the line.
+            result (bytes): The result of the line.
+        """
+
+        if self.max_entries <= 0:
+            return
+
+        self._entries[key] = result
+
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """
+        Look up the result of a line, in memory and then in the persistent tier.
+
+        Parameters:
+            key (bytes): The key of the line.
+
+        Returns:
+            Optional[bytes]: The result of the line, or `None` if not cached.
+        """
+
+        result = self._entries.get(key)
+
+        if result is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return result
+
+        if self.store is not None:
+            result = self.store.get(key)
+
+            if result is not None:
+                self._insert(key, result)
+                self.store_hits += 1
+
+                return result
+
+        self.misses += 1
+
+        return None
+
+    def put(self, key: bytes, result: bytes):
+        """
+        Cache the result of a line.
+
+        Parameters:
+            key (bytes): The key of the line.
+            result (bytes): The result of the line.
+        """
+
+        self._insert(key, result)
+
+        if self.store is not None:
+            self.store.put(key, result)
+
+    def close(self):
+        """
+        Commit the persistent tier, if any.
+        """
+
+        if self.store is not None:
+            self.store.close()
+
+    def report(self) -> str:
+        """
+        Format the hit and miss statistics of the cache.
+
+        Returns:
+            str: The statistics report.
+        """
+
+        lookups = self.hits + self.store_hits + self.misses
+        hit_ratio = (self.hits + self.store_hits) / lookups if lookups else 0.0
+        rows = [
+            f"Cache lookups: {lookups}",
+            f"  memory hits: {self.hits}",
+            f"  store hits: {self.store_hits}",
+            f"  misses: {self.misses}",
+            f"  hit ratio: {hit_ratio:.1%}",
+            f"  memory entries: {len(self._entries)} of {self.max_entries}",
+            f"  memory evictions: {self.evictions}",
+        ]
+
+        if self.store is not None:
+            rows.append(f"  store evictions: {self.store.evictions}")
+
+        return "\n".join(rows)
+
+
+def process_cached(
+    process_lines: Callable[[Iterable[bytes]], Iterator[bytes]],
+    lines: Iterable[bytes],
+    cache: ResultCache,
+    namespace: bytes = b"",
+) -> Iterator[bytes]:
+    """
+    Process lines of input, looking up and caching their results.
+
+    Only the lines not cached are passed to the processing function, which
+    may read ahead of the results it yields, such as the columnar engine
+    or a pool of worker processes. Results are yielded in the original
+    input order. If a line fails, the results of all preceding lines are
+    yielded before the error is raised.
+
+    Parameters:
+        process_lines (Callable[[Iterable[bytes]], Iterator[bytes]]): The function
+            processing lines of input, yielding their results in order.
+        lines (Iterable[bytes]): The lines of input.
+        cache (ResultCache): The result cache.
+        namespace (bytes): The namespace of the line keys. Defaults to empty.
+
+    Returns:
+        Iterator[bytes]: The JSON encoded results for each line, in order.
+    """
+
+    # The keys of the lines read, with their cached results, if any.
+    records: Deque[Tuple[bytes, Optional[bytes]]] = deque()
+
+    def misses() -> Iterator[bytes]:
+        for line in lines:
+            key = line_key(line, namespace)
+            result = cache.get(key)
+            records.append((key, result))
+
+            if result is None:
+                yield line
+
+    results = process_lines(misses())
+
+    # Results of the first lines not cached, read while no lines were pending.
+    ready: Deque[bytes] = deque()
+
+    while True:
+        if not records:
+            # Read ahead until the next line not cached, or the end of input.
+            try:
+                ready.append(next(results))
+            except StopIteration:
+                if not records:
+                    return
+            except Exception:  # pylint: disable=broad-exception-caught
+                # Yield the cached results preceding the failing line.
+                while records and records[0][1] is not None:
+                    yield records.popleft()[1]  # type: ignore[misc]
+
+                raise
+
+        key, result = records.popleft()
+
+        if result is None:
+            # Each line read ahead and not cached has a pending result.
+            result = (
+                ready.popleft()
+                if ready
+                else next(results)  # pylint: disable=stop-iteration-return
+            )
+            cache.put(key, result)
+
+        yield result
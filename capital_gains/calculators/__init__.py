@@ -7,8 +7,36 @@ performed within the investment system. It imports the base calculator
 class, `BaseCalculator`, which provides a common interface for
 calculators, and the `TaxCalculator`, which implements the specific
 logic for calculating taxes based on financial operations and
-portfolio state.
+portfolio state. The `ColumnarTaxCalculator` calculates the same taxes
+for whole batches of operations stored as column arrays, and is
+imported on first access, since it loads NumPy.
 """
 
+from typing import Any
+
 from .base import BaseCalculator
 from .tax import TaxCalculator
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import the columnar tax calculator on first access.
+
+    Parameters:
+        name (str): The name of the attribute.
+
+    Returns:
+        Any: The value of the attribute.
+
+    Raises:
+        AttributeError: The attribute does not exist.
+    """
+
+    if name != "ColumnarTaxCalculator":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from .columnar import (  # pylint: disable=import-outside-toplevel
+        ColumnarTaxCalculator,
+    )
+
+    return ColumnarTaxCalculator
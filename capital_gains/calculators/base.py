@@ -9,9 +9,9 @@ and define their own processing logic for different types of operations.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Generator, Generic, List, TypeVar
+from typing import Dict, Generator, Generic, Iterable, TypeVar
 
-from ..models import OperationModel, OperationType, ResultModel
+from ..models import Operation, OperationType, ResultModel
 from ..operations import BaseOperation
 
 StateTypeT = TypeVar("StateTypeT")
@@ -52,7 +52,7 @@ class BaseCalculator(ABC, Generic[StateTypeT]):
 
     @abstractmethod
     def process(
-        self, operations: List[OperationModel]
+        self, operations: Iterable[Operation]
     ) -> Generator[ResultModel, None, None]:
         """
         Process a batch of operations.
@@ -62,7 +62,7 @@ class BaseCalculator(ABC, Generic[StateTypeT]):
         operations and yielding the corresponding results.
 
         Parameters:
-            operations (List[OperationModel]): A batch of operations to process.
+            operations (Iterable[Operation]): A batch of operations to process.
 
         Returns:
             Generator[ResultModel, None, None]:
@@ -0,0 +1,421 @@
+"""
+Columnar tax calculator module.
+
+This module provides the `ColumnarTaxCalculator` class, which calculates
+taxes for whole batches of operations stored as column arrays with NumPy.
+Many batches can be processed in a single call, each batch being a segment
+of the columns that starts from an empty portfolio.
+
+The weighted-average cost and the loss carry-forward are calculated with
+segmented prefix scans in floating point. Rounded taxes are checked
+against a bound on the accumulated floating point error, and segments
+whose results cannot be guaranteed are recalculated with the `Decimal`
+based `TaxCalculator`, so that results are identical to it.
+"""
+
+from decimal import Decimal
+from typing import Callable, List, NamedTuple, Sequence
+
+from ..models import Operation, OperationRecord, OperationType
+from ..operations import SellOperation
+from ..states import PortfolioState
+from .tax import TaxCalculator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+#: Column code of buy operations.
+BUY_CODE = 0
+
+#: Column code of sell operations.
+SELL_CODE = 1
+
+#: Exclusive bound of quantities and unit costs, in cents, handled by the scans.
+_VALUE_BOUND = 2**31
+
+#: Exclusive bound of unit costs exactly converted to cents by the column arrays.
+_UNIT_COST_BOUND = 2.0**40
+
+#: Machine epsilon of double precision floating point numbers.
+_EPSILON = 2.0**-52
+
+
+class OperationColumns(NamedTuple):
+    """
+    Batches of operations stored as column arrays.
+
+    The operations of batch `i` are stored between `offsets[i]` and
+    `offsets[i + 1]`.
+    """
+
+    #: The operation type codes.
+    operation_types: "np.ndarray"
+
+    #: The quantities of shares traded.
+    quantities: "np.ndarray"
+
+    #: The unit costs, in cents.
+    unit_costs: "np.ndarray"
+
+    #: The start offsets of each batch, followed by the total number of operations.
+    offsets: "np.ndarray"
+
+
+def _segmented_scan(
+    index: "np.ndarray",
+    starts: "np.ndarray",
+    max_length: int,
+    combine: Callable[["np.ndarray", "np.ndarray"], None],
+):
+    """
+    Run an inclusive prefix scan within segments using recursive doubling.
+
+    At each step, every element is combined with the element at a doubling
+    distance behind it, as long as both belong to the same segment.
+
+    Parameters:
+        index (np.ndarray): The index of each element.
+        starts (np.ndarray): The start index of the segment of each element.
+        max_length (int): The length of the longest segment.
+        combine (Callable[[np.ndarray, np.ndarray], None]):
+            The function combining the elements at the given source
+            indices into the elements at the given target indices.
+    """
+
+    distance = 1
+
+    while distance < max_length:
+        target = index[distance:]
+        source = target - distance
+        valid = source >= starts[target]
+
+        combine(target[valid], source[valid])
+
+        distance *= 2
+
+
+def _shift(values: "np.ndarray", is_start: "np.ndarray") -> "np.ndarray":
+    """
+    Shift values by one position within segments, starting segments with zero.
+
+    Parameters:
+        values (np.ndarray): The values to shift.
+        is_start (np.ndarray): Whether each element starts a segment.
+
+    Returns:
+        np.ndarray: The shifted values.
+    """
+
+    shifted = np.empty_like(values)
+    shifted[1:] = values[:-1]
+    shifted[is_start] = 0
+
+    return shifted
+
+
+def build_columns(batches: Sequence[Sequence[Operation]]) -> OperationColumns:
+    """
+    Build column arrays from batches of operations.
+
+    Parameters:
+        batches (Sequence[Sequence[Operation]]): The batches of operations.
+
+    Returns:
+        OperationColumns: The column arrays.
+
+    Raises:
+        ImportError: NumPy is not installed.
+        OverflowError: A quantity or unit cost does not fit the column arrays.
+    """
+
+    if np is None:
+        raise ImportError("The columnar engine requires NumPy to be installed.")
+
+    operations = [operation for batch in batches for operation in batch]
+    count = len(operations)
+
+    operation_types = np.fromiter(
+        (operation.operation is OperationType.SELL for operation in operations),
+        dtype=np.int8,
+        count=count,
+    )
+    quantities = np.fromiter(
+        (operation.quantity for operation in operations), dtype=np.int64, count=count
+    )
+    float_unit_costs = np.fromiter(
+        (operation.unit_cost for operation in operations),
+        dtype=np.float64,
+        count=count,
+    )
+
+    # Unit costs have two decimal places, so they are recovered exactly in
+    # cents while the floating point error is below half a cent.
+    if count and np.abs(float_unit_costs).max() >= _UNIT_COST_BOUND:
+        raise OverflowError("Unit cost too large to convert to cents.")
+
+    unit_costs = np.rint(float_unit_costs * 100).astype(np.int64)
+
+    offsets = np.zeros(len(batches) + 1, dtype=np.int64)
+    np.cumsum([len(batch) for batch in batches], out=offsets[1:])
+
+    return OperationColumns(operation_types, quantities, unit_costs, offsets)
+
+
+class ColumnarTaxCalculator:
+    """
+    A calculator for determining tax obligations of column arrays of operations.
+
+    This class produces exactly the same taxes as the `TaxCalculator` for
+    each batch of operations, starting from an empty portfolio.
+    """
+
+    #: The threshold for exempting a sale value from taxation, in cents.
+    exempt_tax_sale_threshold: int
+
+    #: The rate at which tax is applied to profits.
+    tax_percentage: float
+
+    def __init__(self):
+        """
+        Initialize the columnar tax calculator.
+
+        The taxation rules are taken from the `SellOperation`.
+
+        Raises:
+            ImportError: NumPy is not installed.
+        """
+
+        if np is None:
+            raise ImportError("The columnar engine requires NumPy to be installed.")
+
+        self.exempt_tax_sale_threshold = int(
+            SellOperation.exempt_tax_sale_threshold.scaleb(2)
+        )
+
+        # The decimal tax percentage is built from a float, so it is exact.
+        self.tax_percentage = float(SellOperation.tax_percentage)
+
+    def _process_segment(
+        self, columns: OperationColumns, start: int, end: int
+    ) -> "np.ndarray":
+        """
+        Calculate the taxes of a single batch with the `TaxCalculator`.
+
+        Parameters:
+            columns (OperationColumns): The column arrays.
+            start (int): The start index of the batch.
+            end (int): The end index of the batch.
+
+        Returns:
+            np.ndarray: The taxes of each operation, in cents.
+        """
+
+        operations = [
+            OperationRecord(
+                (
+                    OperationType.SELL
+                    if operation_type == SELL_CODE
+                    else OperationType.BUY
+                ),
+                int(quantity),
+                Decimal(int(unit_cost)).scaleb(-2),
+            )
+            for operation_type, quantity, unit_cost in zip(
+                columns.operation_types[start:end].tolist(),
+                columns.quantities[start:end].tolist(),
+                columns.unit_costs[start:end].tolist(),
+            )
+        ]
+
+        calculator = TaxCalculator(PortfolioState())
+
+        return np.array(list(calculator.calculate(operations)), dtype=np.int64)
+
+    def process_columns(self, columns: OperationColumns) -> "np.ndarray":
+        """
+        Calculate the taxes of column arrays of operations.
+
+        Parameters:
+            columns (OperationColumns): The column arrays.
+
+        Returns:
+            np.ndarray: The taxes of each operation, in cents, rounded
+                as in the `ResultModel`.
+        """
+
+        # pylint: disable=too-many-locals,too-many-statements
+
+        operation_types = np.asarray(columns.operation_types)
+        quantities = np.asarray(columns.quantities, dtype=np.int64)
+        unit_costs = np.asarray(columns.unit_costs, dtype=np.int64)
+        offsets = np.asarray(columns.offsets, dtype=np.int64)
+
+        count = len(quantities)
+        taxes = np.zeros(count, dtype=np.int64)
+
+        if count == 0:
+            return taxes
+
+        lengths = np.diff(offsets)
+        segments = np.repeat(np.arange(len(lengths)), lengths)
+        index = np.arange(count)
+        starts = offsets[:-1][segments]
+        is_start = index == starts
+        max_length = int(lengths.max())
+
+        is_sell = operation_types == SELL_CODE
+
+        # Segments outside the range of the scans are calculated with decimals.
+        unsafe = (
+            (quantities <= 0)
+            | (quantities >= _VALUE_BOUND)
+            | (unit_costs < 0)
+            | (unit_costs >= _VALUE_BOUND)
+        )
+        quantities = np.where(unsafe, 1, quantities)
+        unit_costs = np.where(unsafe, 0, unit_costs)
+
+        # Calculate the exact number of shares after each operation.
+        deltas = np.where(is_sell, -quantities, quantities)
+        shares = np.cumsum(deltas)
+        shares -= (shares - deltas)[starts]
+        previous_shares = shares - deltas
+
+        # Selling more shares than held is calculated with decimals.
+        unsafe |= shares < 0
+
+        sale_values = quantities * unit_costs
+        float_sale_values = sale_values.astype(np.float64)
+
+        # Scan the cost basis as a composition of affine maps, where buys add
+        # their cost and sells scale it by the fraction of remaining shares.
+        scales = np.ones(count)
+        np.divide(shares, previous_shares, out=scales, where=is_sell & ~unsafe)
+        cost_bases = np.where(is_sell, 0.0, float_sale_values)
+
+        def combine_affine(target: "np.ndarray", source: "np.ndarray"):
+            cost_bases[target] = (
+                scales[target] * cost_bases[source] + cost_bases[target]
+            )
+            scales[target] = scales[target] * scales[source]
+
+        _segmented_scan(index, starts, max_length, combine_affine)
+
+        # Calculate the profit of each sell using the average cost before it.
+        previous_cost_bases = _shift(cost_bases, is_start)
+        cost_values = np.zeros(count)
+        np.divide(
+            quantities * previous_cost_bases,
+            previous_shares,
+            out=cost_values,
+            where=is_sell & ~unsafe,
+        )
+        profits = np.where(is_sell, float_sale_values - cost_values, 0.0)
+
+        is_loss = is_sell & (profits <= 0)
+        is_taxable = is_sell & ~is_loss & (sale_values > self.exempt_tax_sale_threshold)
+
+        # Scan the loss carry-forward as a running sum clamped at zero, along
+        # with the accumulated magnitudes bounding the floating point error.
+        loss_changes = np.where(is_loss | is_taxable, -profits, 0.0)
+        sums = np.stack(
+            [
+                loss_changes,
+                np.abs(loss_changes),
+                np.where(is_sell, 0.0, float_sale_values),
+                float_sale_values,
+            ]
+        )
+
+        def combine_sum(target: "np.ndarray", source: "np.ndarray"):
+            sums[:, target] = sums[:, target] + sums[:, source]
+
+        _segmented_scan(index, starts, max_length, combine_sum)
+
+        minimums = sums[0].copy()
+
+        def combine_minimum(target: "np.ndarray", source: "np.ndarray"):
+            minimums[target] = np.minimum(minimums[target], minimums[source])
+
+        _segmented_scan(index, starts, max_length, combine_minimum)
+
+        losses = sums[0] - np.minimum(minimums, 0.0)
+        previous_losses = _shift(losses, is_start)
+
+        taxable_profits = np.where(
+            is_taxable, np.maximum(profits - previous_losses, 0.0), 0.0
+        )
+        float_taxes = taxable_profits * self.tax_percentage
+        taxes = np.floor(float_taxes + 0.5).astype(np.int64)
+
+        # The taxes and the carried loss depend continuously on the profits,
+        # so the floating point errors of all preceding operations add up.
+        # Each profit error is bounded by the sale value and the accumulated
+        # buy cost, and segments with taxes within the accumulated error
+        # bound of a rounding tie are recalculated with decimals.
+        passes = max(1, int(max_length - 1).bit_length())
+        tolerances = (
+            (sums[1] + sums[3] + (index - starts + 1) * sums[2])
+            * _EPSILON
+            * (8 * passes + 32)
+        )
+        fractions = float_taxes - np.floor(float_taxes)
+
+        unsafe |= is_taxable & (np.abs(fractions - 0.5) <= tolerances)
+        unsafe |= ~np.isfinite(float_taxes) | ~np.isfinite(tolerances)
+
+        for segment in np.unique(segments[unsafe]).tolist():
+            start, end = int(offsets[segment]), int(offsets[segment + 1])
+            taxes[start:end] = self._process_segment(columns, start, end)
+
+        return taxes
+
+    def process_batches(
+        self, batches: Sequence[Sequence[Operation]]
+    ) -> List[List[int]]:
+        """
+        Calculate the taxes of batches of operations.
+
+        Each batch is processed independently, starting from an empty portfolio.
+
+        Parameters:
+            batches (Sequence[Sequence[Operation]]): The batches of operations.
+
+        Returns:
+            List[List[int]]: The taxes of each operation of each batch, in
+                cents, rounded as in the `ResultModel`.
+        """
+
+        try:
+            columns = build_columns(batches)
+        except OverflowError:
+            # Batches with values that do not fit the column arrays are
+            # calculated with decimals.
+            return [self._process_batch(batch) for batch in batches]
+
+        taxes = self.process_columns(columns).tolist()
+        offsets = columns.offsets.tolist()
+
+        return [taxes[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def _process_batch(self, batch: Sequence[Operation]) -> List[int]:
+        """
+        Calculate the taxes of a single batch of operations.
+
+        Parameters:
+            batch (Sequence[Operation]): The batch of operations.
+
+        Returns:
+            List[int]: The taxes of each operation, in cents.
+        """
+
+        try:
+            columns = build_columns([batch])
+        except OverflowError:
+            calculator = TaxCalculator(PortfolioState())
+
+            return list(calculator.calculate(batch))
+
+        return self.process_columns(columns).tolist()
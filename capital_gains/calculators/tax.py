@@ -7,9 +7,11 @@ It uses specific strategies for each type of operation and maintains the state o
 financial portfolio throughout the calculations.
 """
 
-from typing import Generator, List
+import time
+from typing import Generator, Iterable, Optional
 
-from ..models import OperationModel, OperationType, ResultModel
+from ..hooks import ProcessingHooks
+from ..models import Operation, OperationType, ResultModel
 from ..operations import BuyOperation, SellOperation
 from ..states import PortfolioState
 from .base import BaseCalculator
@@ -23,7 +25,10 @@ class TaxCalculator(BaseCalculator[PortfolioState]):
     It applies defined strategies for processing buy and sell operations.
     """
 
-    def __init__(self, state: PortfolioState):
+    #: The instrumentation hooks observing operation dispatches, if any.
+    hooks: Optional[ProcessingHooks]
+
+    def __init__(self, state: PortfolioState, hooks: Optional[ProcessingHooks] = None):
         """
         Initialize the tax calculator with a specific portfolio state.
 
@@ -34,6 +39,8 @@ class TaxCalculator(BaseCalculator[PortfolioState]):
 
         Parameters:
             state (PortfolioState): The initial state of the portfolio to be used in calculations.
+            hooks (Optional[ProcessingHooks]): The instrumentation hooks observing
+                operation dispatches. Defaults to none.
         """
 
         super().__init__(
@@ -41,20 +48,107 @@ class TaxCalculator(BaseCalculator[PortfolioState]):
             {OperationType.BUY: BuyOperation(), OperationType.SELL: SellOperation()},
         )
 
+        self.hooks = hooks
+
     def process(
-        self, operations: List[OperationModel]
+        self, operations: Iterable[Operation]
     ) -> Generator[ResultModel, None, None]:
         """
         Process a batch of operations and calculate taxes.
 
         Parameters:
-            operations (List[OperationModel]): A batch of operations to process.
+            operations (Iterable[Operation]): A batch of operations to process.
 
         Returns:
             Generator[ResultModel, None, None]:
                 A generator yielding the results of the calculations.
         """
 
+        if self.hooks is not None:
+            yield from self._process_with_hooks(operations, self.hooks)
+            return
+
         for operation in operations:
             operation_handler = self.operation_register[operation.operation]
             yield operation_handler.process(operation, self.state)
+
+    def _process_with_hooks(
+        self, operations: Iterable[Operation], hooks: ProcessingHooks
+    ) -> Generator[ResultModel, None, None]:
+        """
+        Process a batch of operations, reporting each dispatch to the hooks.
+
+        Parameters:
+            operations (Iterable[Operation]): A batch of operations to process.
+            hooks (ProcessingHooks): The instrumentation hooks.
+
+        Returns:
+            Generator[ResultModel, None, None]:
+                A generator yielding the results of the calculations.
+        """
+
+        clock = time.perf_counter
+
+        for operation in operations:
+            operation_handler = self.operation_register[operation.operation]
+
+            start = clock()
+            result = operation_handler.process(operation, self.state)
+            hooks.operation(operation.operation, clock() - start)
+
+            yield result
+
+    def calculate(self, operations: Iterable[Operation]) -> Generator[int, None, None]:
+        """
+        Process a batch of operations and calculate taxes in cents.
+
+        Taxes are rounded once, as in the `ResultModel`, without building
+        result models.
+
+        Parameters:
+            operations (Iterable[Operation]): A batch of operations to process.
+
+        Returns:
+            Generator[int, None, None]:
+                A generator yielding the taxes of each operation, in cents.
+        """
+
+        if self.hooks is not None:
+            yield from self._calculate_with_hooks(operations, self.hooks)
+            return
+
+        state = self.state
+        backend = state.backend
+        operation_register = self.operation_register
+
+        for operation in operations:
+            tax = operation_register[operation.operation].calculate(operation, state)
+            yield 0 if tax == backend.zero else backend.to_cents(tax)
+
+    def _calculate_with_hooks(
+        self, operations: Iterable[Operation], hooks: ProcessingHooks
+    ) -> Generator[int, None, None]:
+        """
+        Calculate taxes in cents, reporting each dispatch to the hooks.
+
+        Parameters:
+            operations (Iterable[Operation]): A batch of operations to process.
+            hooks (ProcessingHooks): The instrumentation hooks.
+
+        Returns:
+            Generator[int, None, None]:
+                A generator yielding the taxes of each operation, in cents.
+        """
+
+        clock = time.perf_counter
+        state = self.state
+        backend = state.backend
+
+        for operation in operations:
+            operation_handler = self.operation_register[operation.operation]
+
+            start = clock()
+            tax = operation_handler.calculate(operation, state)
+            hooks.operation(operation.operation, clock() - start)
+
+            yield 0 if tax == backend.zero else backend.to_cents(tax)
@@ -0,0 +1,243 @@
+"""
+Checkpoints module.
+
+This module provides periodic checkpoints of long runs over an input
+file, so that an interrupted run can be resumed with output identical to
+an uninterrupted run. A checkpoint records the input offset to continue
+reading from and the output offset to truncate the output to. In
+streaming mode, checkpoints may be taken within a line, recording the
+portfolio state after the last processed operation of the line.
+
+Checkpoints are written atomically after the output is synchronized to
+disk, so that the output always holds at least the results recorded by
+the latest checkpoint.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from decimal import Decimal
+from typing import (
+    BinaryIO,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .buffers import OutputBuffer
+from .states import PortfolioState
+
+
+class Checkpoint(NamedTuple):
+    """
+    Progress of a run over an input file.
+    """
+
+    #: The offset of the next input byte to process.
+    input_offset: int = 0
+
+    #: The size of the output written up to the input offset, in bytes.
+    output_offset: int = 0
+
+    #: The total shares, average cost and total loss of the line in progress,
+    #: if the input offset is within a line.
+    state: Optional[Tuple[int, str, str]] = None
+
+    @classmethod
+    def capture(
+        cls, input_offset: int, output_offset: int, state: PortfolioState
+    ) -> "Checkpoint":
+        """
+        Create a checkpoint within a line, capturing its portfolio state.
+
+        Parameters:
+            input_offset (int): The offset of the next input byte to process.
+            output_offset (int): The size of the output written, in bytes.
+            state (PortfolioState): The portfolio state of the line in progress.
+
+        Returns:
+            Checkpoint: The checkpoint.
+        """
+
+        backend = state.backend
+
+        return cls(
+            input_offset,
+            output_offset,
+            (
+                state.total_shares,
+                str(backend.to_decimal(state.average_cost)),
+                str(backend.to_decimal(state.total_loss)),
+            ),
+        )
+
+    def restore(self, state: PortfolioState):
+        """
+        Restore the portfolio state of the line in progress.
+
+        Parameters:
+            state (PortfolioState): The portfolio state to restore.
+        """
+
+        backend = state.backend
+        total_shares, average_cost, total_loss = self.state or (0, "0", "0")
+        state.restore(
+            (
+                total_shares,
+                backend.from_decimal(Decimal(average_cost)),
+                backend.from_decimal(Decimal(total_loss)),
+            )
+        )
+
+
+class Checkpointer:
+    """
+    Writer of periodic checkpoints to a file.
+    """
+
+    #: The path of the checkpoint file.
+    path: str
+
+    #: The minimum number of seconds between checkpoints.
+    interval: float
+
+    #: The number of checkpoints written.
+    saves: int
+
+    def __init__(self, path: str, interval: float = 5.0):
+        """
+        Initialize the checkpointer.
+
+        Parameters:
+            path (str): The path of the checkpoint file.
+            interval (float): The minimum number of seconds between checkpoints.
+                Defaults to five seconds.
+        """
+
+        self.path = path
+        self.interval = interval
+        self.saves = 0
+
+        self._last_save = time.monotonic()
+
+    def load(self) -> Optional[Checkpoint]:
+        """
+        Read the latest checkpoint.
+
+        Returns:
+            Optional[Checkpoint]: The latest checkpoint, or `None` if there is none.
+
+        Raises:
+            ValueError: The checkpoint file is invalid.
+        """
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as checkpoint_file:
+                values = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+
+        try:
+            state = values["state"]
+
+            return Checkpoint(
+                int(values["input_offset"]),
+                int(values["output_offset"]),
+                None if state is None else (int(state[0]), state[1], state[2]),
+            )
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError(f"Invalid checkpoint file: {self.path}") from error
+
+    def due(self) -> bool:
+        """
+        Check whether the checkpoint interval has elapsed since the last checkpoint.
+
+        Returns:
+            bool: Whether a checkpoint is due.
+        """
+
+        return time.monotonic() - self._last_save >= self.interval
+
+    def save(self, checkpoint: Checkpoint, output_stream: BinaryIO):
+        """
+        Synchronize the output to disk and write a checkpoint atomically.
+
+        Parameters:
+            checkpoint (Checkpoint): The checkpoint.
+            output_stream (BinaryIO): The output file stream, holding the
+                output up to the output offset of the checkpoint.
+        """
+
+        output_stream.flush()
+        os.fsync(output_stream.fileno())
+
+        temporary_path = f"{self.path}.tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(checkpoint._asdict(), checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+
+        os.replace(temporary_path, self.path)
+
+        self.saves += 1
+        self._last_save = time.monotonic()
+
+
+def process_checkpointed(
+    process_lines: Callable[[Iterable[bytes]], Iterator[bytes]],
+    lines: Iterable[bytes],
+    output: OutputBuffer,
+    checkpointer: Checkpointer,
+    checkpoint: Checkpoint = Checkpoint(),
+) -> Iterator[bytes]:
+    """
+    Process lines of an input file, checkpointing the results written.
+
+    The results must be written to the output buffer as they are yielded,
+    each result being written before the next one is requested. A
+    checkpoint is written when due between results, and once all results
+    are written.
+
+    Parameters:
+        process_lines (Callable[[Iterable[bytes]], Iterator[bytes]]): The function
+            processing lines of input, yielding their results in order.
+        lines (Iterable[bytes]): The lines of input, starting at the input
+            offset of the checkpoint, without trailing line breaks.
+        output (OutputBuffer): The output buffer of the results.
+        checkpointer (Checkpointer): The checkpointer.
+        checkpoint (Checkpoint): The checkpoint resumed from. Defaults to the
+            start of the input.
+
+    Returns:
+        Iterator[bytes]: The JSON encoded results for each line, in order.
+    """
+
+    # The input offsets after the lines read ahead of their results.
+    line_ends: Deque[int] = deque()
+    input_offset, output_offset, _ = checkpoint
+
+    def track(line_end: int) -> Iterator[bytes]:
+        for line in lines:
+            line_end += len(line) + 1
+            line_ends.append(line_end)
+
+            yield line
+
+    for json_result in process_lines(track(input_offset)):
+        yield json_result
+
+        input_offset = line_ends.popleft()
+        output_offset += len(json_result) + 1
+
+        if checkpointer.due():
+            output.flush()
+            checkpointer.save(Checkpoint(input_offset, output_offset), output.stream)
+
+    output.flush()
+    checkpointer.save(Checkpoint(input_offset, output_offset), output.stream)
@@ -4,24 +4,1032 @@ Command-line interface (CLI) module.
 This module provides the command-line interface for the application,
 allowing users to interact with the calculation system directly
 from the terminal.
+
+Modules are imported by the commands using them, so that short
+invocations such as `--help` and `version` do not pay the import cost
+of the processing pipeline and its dependencies.
 """
 
+# pylint: disable=import-outside-toplevel,too-many-lines
+
 import sys
-from typing import List
+from functools import partial
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import typer
-from pydantic import TypeAdapter
 
-from . import __version__
-from .calculators import TaxCalculator
-from .models import OperationModel, ResultModel
-from .states import PortfolioState
+from .options import (
+    DEFAULT_PORT,
+    WORKLOAD_NAMES,
+    Backend,
+    Codec,
+    Compression,
+    DataFormat,
+    Engine,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import cProfile
+
+    from .accounts import AccountStore
+    from .cache import ResultCache
+    from .checkpoints import Checkpoint, Checkpointer
+    from .hooks import ProcessingHooks
+    from .metrics import MetricsCollector
+    from .pipeline import LineProcessor
+    from .prefixes import PrefixIndex
+    from .profiling import Profiler
+    from .sharding import ByteRange
 
 app = typer.Typer(add_completion=False)
 
 
+def _create_processor(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    fast_decode: bool,
+    engine: Engine,
+    batch_size: int,
+    backend: Backend,
+    hooks: Optional["ProcessingHooks"] = None,
+    prefix_index: Optional["PrefixIndex"] = None,
+    codec: Codec = Codec.AUTO,
+) -> "LineProcessor":
+    """
+    Create the line processor for the processing options.
+
+    Parameters:
+        fast_decode (bool): Whether to decode operations into lightweight records.
+        engine (Engine): The tax calculation engine.
+        batch_size (int): The number of lines processed at a time by the columnar engine.
+        backend (Backend): The numeric backend of the decimal engine.
+        hooks (Optional[ProcessingHooks]): The instrumentation hooks, if any.
+        prefix_index (Optional[PrefixIndex]): The prefix index, if any.
+        codec (Codec): The JSON codec. Defaults to the fastest installed codec.
+
+    Returns:
+        LineProcessor: The line processor.
+
+    Raises:
+        typer.BadParameter: The engine or codec dependencies are not installed.
+    """
+
+    from .codecs import create_codec
+    from .pipeline import LineProcessor
+
+    try:
+        create_codec(codec)
+    except ImportError as error:
+        raise typer.BadParameter(str(error), param_hint="'--codec'") from error
+
+    try:
+        return LineProcessor(
+            fast_decode=fast_decode,
+            engine=engine,
+            batch_size=batch_size,
+            backend=backend,
+            hooks=hooks,
+            prefix_index=prefix_index,
+            codec=codec,
+        )
+    except ImportError as error:
+        raise typer.BadParameter(str(error), param_hint="'--engine'") from error
+
+
+def _create_profiler(
+    profile: bool, single_process: bool, cached: bool
+) -> Optional["Profiler"]:
+    """
+    Create the profiler for the profiling options.
+
+    Parameters:
+        profile (bool): Whether to profile the run.
+        single_process (bool): Whether lines are processed one at a time by
+            the main process.
+        cached (bool): Whether results are cached, skipping the processing
+            of cached lines.
+
+    Returns:
+        Optional[Profiler]: The profiler, if profiling is enabled.
+
+    Raises:
+        typer.BadParameter: Profiling is not supported by the processing mode.
+    """
+
+    from .profiling import Profiler
+
+    if not profile:
+        return None
+
+    if not single_process:
+        raise typer.BadParameter(
+            "Profiling does not support streaming mode or multiple workers.",
+            param_hint="'--profile'",
+        )
+
+    if cached:
+        raise typer.BadParameter(
+            "Profiling does not support result caches.", param_hint="'--profile'"
+        )
+
+    return Profiler()
+
+
+def _create_metrics(
+    metrics_file: Optional[Path],
+    metrics_interval: float,
+    metrics_summary: Optional[Path],
+    single_process: bool,
+    cached: bool,
+) -> Optional["MetricsCollector"]:
+    """
+    Create the metrics collector for the metrics options.
+
+    Parameters:
+        metrics_file (Optional[Path]): The Prometheus text file, if any.
+        metrics_interval (float): The number of seconds between exports.
+        metrics_summary (Optional[Path]): The JSON summary file, if any.
+        single_process (bool): Whether lines are processed one at a time by
+            the main process.
+        cached (bool): Whether results are cached, skipping the processing
+            of cached lines.
+
+    Returns:
+        Optional[MetricsCollector]: The metrics collector, if metrics are enabled.
+
+    Raises:
+        typer.BadParameter: Metrics are not supported by the processing mode.
+    """
+
+    from .metrics import MetricsCollector
+
+    if metrics_file is None and metrics_summary is None:
+        return None
+
+    if not single_process:
+        raise typer.BadParameter(
+            "Metrics do not support streaming mode or multiple workers.",
+            param_hint="'--metrics-file'",
+        )
+
+    if cached:
+        raise typer.BadParameter(
+            "Metrics do not support result caches.", param_hint="'--metrics-file'"
+        )
+
+    return MetricsCollector(
+        None if metrics_file is None else str(metrics_file), metrics_interval
+    )
+
+
+def _create_cache(
+    cache: bool,
+    cache_size: int,
+    cache_path: Optional[Path],
+    cache_max_bytes: int,
+    stream: bool,
+) -> Optional["ResultCache"]:
+    """
+    Create the result cache for the cache options.
+
+    Parameters:
+        cache (bool): Whether to cache results.
+        cache_size (int): The maximum number of results kept in memory.
+        cache_path (Optional[Path]): The persistent tier database, if any.
+        cache_max_bytes (int): The maximum size of the persistent tier, in bytes.
+        stream (bool): Whether streaming mode is enabled.
+
+    Returns:
+        Optional[ResultCache]: The result cache, if caching is enabled.
+
+    Raises:
+        typer.BadParameter: Caching is not supported by the processing mode.
+    """
+
+    from .cache import ResultCache, ResultStore
+
+    if not cache and cache_path is None:
+        return None
+
+    if stream:
+        raise typer.BadParameter(
+            "Streaming mode does not support caching.", param_hint="'--cache'"
+        )
+
+    store = (
+        None if cache_path is None else ResultStore(str(cache_path), cache_max_bytes)
+    )
+
+    return ResultCache(cache_size, store)
+
+
+def _create_prefix_index(
+    prefix_cache: bool,
+    prefix_cache_size: int,
+    prefix_cache_bytes: int,
+    engine: Engine,
+    single_process: bool,
+) -> Optional["PrefixIndex"]:
+    """
+    Create the prefix index for the prefix cache options.
+
+    Parameters:
+        prefix_cache (bool): Whether to resume lines from indexed prefixes.
+        prefix_cache_size (int): The maximum number of snapshots.
+        prefix_cache_bytes (int): The maximum size of the indexed results, in bytes.
+        engine (Engine): The tax calculation engine.
+        single_process (bool): Whether lines are processed one at a time by
+            the main process.
+
+    Returns:
+        Optional[PrefixIndex]: The prefix index, if prefix caching is enabled.
+
+    Raises:
+        typer.BadParameter: Prefix caching is not supported by the processing mode.
+    """
+
+    from .prefixes import PrefixIndex
+
+    if not prefix_cache:
+        return None
+
+    if not single_process or engine != Engine.DECIMAL:
+        raise typer.BadParameter(
+            "Prefix caching only supports the decimal engine in a single process, "
+            "without streaming mode.",
+            param_hint="'--prefix-cache'",
+        )
+
+    return PrefixIndex(prefix_cache_size, prefix_cache_bytes)
+
+
+def _create_account_store(
+    accounts: Optional[Path],
+    engine: Engine,
+    single_process: bool,
+    cached: bool,
+) -> Optional["AccountStore"]:
+    """
+    Open the account store for the accounts options.
+
+    Parameters:
+        accounts (Optional[Path]): The account database, if any.
+        engine (Engine): The tax calculation engine.
+        single_process (bool): Whether lines are processed one at a time by
+            the main process.
+        cached (bool): Whether results or prefixes are cached.
+
+    Returns:
+        Optional[AccountStore]: The account store, if accounts are enabled.
+
+    Raises:
+        typer.BadParameter: Accounts are not supported by the processing mode.
+    """
+
+    from .accounts import AccountStore
+
+    if accounts is None:
+        return None
+
+    if not single_process or engine != Engine.DECIMAL or cached:
+        raise typer.BadParameter(
+            "Accounts only support the decimal engine in a single process, "
+            "without streaming mode or caching.",
+            param_hint="'--accounts'",
+        )
+
+    return AccountStore(str(accounts))
+
+
+def _open_checkpoint(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    checkpoint_path: Optional[Path],
+    checkpoint_interval: float,
+    resume: bool,
+    input_path: Optional[Path],
+    output_path: Optional[Path],
+    stream: bool,
+    unsupported: bool,
+) -> Tuple[Optional["Checkpointer"], "Checkpoint"]:
+    """
+    Create the checkpointer and read the checkpoint resumed from, if any.
+
+    Parameters:
+        checkpoint_path (Optional[Path]): The checkpoint file, if any.
+        checkpoint_interval (float): The minimum number of seconds between checkpoints.
+        resume (bool): Whether to resume from the checkpoint file.
+        input_path (Optional[Path]): The input file option, if any.
+        output_path (Optional[Path]): The output file option, if any.
+        stream (bool): Whether streaming mode is enabled.
+        unsupported (bool): Whether a byte range, accounts or compressed files
+            are selected.
+
+    Returns:
+        Tuple[Optional[Checkpointer], Checkpoint]: The checkpointer, if
+            checkpoints are enabled, and the checkpoint resumed from, or the
+            start of the input.
+
+    Raises:
+        typer.BadParameter: The checkpoint options are invalid or not supported.
+    """
+
+    from .checkpoints import Checkpoint, Checkpointer
+
+    if checkpoint_path is None:
+        if resume:
+            raise typer.BadParameter(
+                "Resuming requires a checkpoint file.", param_hint="'--resume'"
+            )
+
+        return None, Checkpoint()
+
+    if input_path is None or output_path is None:
+        raise typer.BadParameter(
+            "Checkpoints require an input file and an output file.",
+            param_hint="'--checkpoint'",
+        )
+
+    if unsupported:
+        raise typer.BadParameter(
+            "Checkpoints do not support byte ranges, accounts or compressed files.",
+            param_hint="'--checkpoint'",
+        )
+
+    checkpointer = Checkpointer(str(checkpoint_path), checkpoint_interval)
+
+    try:
+        checkpoint = (checkpointer.load() if resume else None) or Checkpoint()
+    except ValueError as error:
+        raise typer.BadParameter(str(error), param_hint="'--checkpoint'") from error
+
+    if checkpoint.state is not None and not stream:
+        raise typer.BadParameter(
+            "The checkpoint was taken within a line in streaming mode.",
+            param_hint="'--resume'",
+        )
+
+    if checkpoint.output_offset and (
+        not output_path.exists()
+        or output_path.stat().st_size < checkpoint.output_offset
+    ):
+        raise typer.BadParameter(
+            "The output file is shorter than the checkpoint.",
+            param_hint="'--resume'",
+        )
+
+    return checkpointer, checkpoint
+
+
+def _check_compression(
+    input_path: Optional[Path], output_path: Optional[Path], byte_range: Optional[str]
+) -> Tuple[Optional[Compression], Optional[Compression]]:
+    """
+    Detect and validate the compression formats of the input and output files.
+
+    Parameters:
+        input_path (Optional[Path]): The input file option, if any.
+        output_path (Optional[Path]): The output file option, if any.
+        byte_range (Optional[str]): The byte range option, if any.
+
+    Returns:
+        Tuple[Optional[Compression], Optional[Compression]]: The compression
+            formats of the input and output files, if compressed.
+
+    Raises:
+        typer.BadParameter: The compression formats are not supported.
+    """
+
+    if input_path is None and output_path is None:
+        return None, None
+
+    from .compression import detect_compression, output_compression, require_compression
+
+    input_compression = None if input_path is None else detect_compression(input_path)
+    output_format = None if output_path is None else output_compression(output_path)
+
+    for compression, param_hint in [
+        (input_compression, "'--input'"),
+        (output_format, "'--output'"),
+    ]:
+        if compression is None:
+            continue
+
+        try:
+            require_compression(compression)
+        except ImportError as error:
+            raise typer.BadParameter(str(error), param_hint=param_hint) from error
+
+    if input_compression is not None and byte_range is not None:
+        raise typer.BadParameter(
+            "Byte ranges do not support compressed input files.",
+            param_hint="'--byte-range'",
+        )
+
+    return input_compression, output_format
+
+
+def _open_input(input_path: Path, compression: Optional[Compression]) -> BinaryIO:
+    """
+    Open an input file, decompressing it if compressed.
+
+    Parameters:
+        input_path (Path): The input file.
+        compression (Optional[Compression]): The compression format of the
+            input file, if compressed.
+
+    Returns:
+        BinaryIO: The input stream.
+    """
+
+    if compression is None:
+        # pylint: disable-next=consider-using-with
+        return open(input_path, "rb")
+
+    from .compression import open_decompressed
+
+    return open_decompressed(input_path, compression)
+
+
+def _read_compressed_lines(
+    input_path: Path, compression: Compression
+) -> Iterator[bytes]:
+    """
+    Read the lines of a compressed input file.
+
+    Parameters:
+        input_path (Path): The input file.
+        compression (Compression): The compression format of the input file.
+
+    Returns:
+        Iterator[bytes]: The lines of input, in order.
+    """
+
+    from .buffers import read_lines
+
+    with _open_input(input_path, compression) as input_stream:
+        yield from read_lines(input_stream)
+
+
+def _open_output(
+    output_path: Optional[Path],
+    output_offset: int,
+    compression: Optional[Compression] = None,
+) -> BinaryIO:
+    """
+    Open the output stream, truncating the output file to an offset.
+
+    Parameters:
+        output_path (Optional[Path]): The output file, or `None` for standard output.
+        output_offset (int): The size of the output to keep, in bytes.
+        compression (Optional[Compression]): The compression format of the
+            output file, if compressed. Compressed files are always truncated.
+
+    Returns:
+        BinaryIO: The output stream, positioned at the output offset.
+    """
+
+    if output_path is None:
+        return sys.stdout.buffer
+
+    if compression is not None:
+        from .compression import open_compressed
+
+        return open_compressed(output_path, compression)
+
+    # pylint: disable-next=consider-using-with
+    output_file = open(output_path, "r+b" if output_offset else "wb")
+    output_file.truncate(output_offset)
+    output_file.seek(output_offset)
+
+    return output_file
+
+
+def _parse_byte_range(
+    byte_range: Optional[str], input_path: Optional[Path], stream: bool
+) -> "ByteRange":
+    """
+    Parse and validate the byte range option.
+
+    Parameters:
+        byte_range (Optional[str]): The byte range option, if any.
+        input_path (Optional[Path]): The input file option, if any.
+        stream (bool): Whether streaming mode is enabled.
+
+    Returns:
+        ByteRange: The selected byte range, or the whole input if not set.
+
+    Raises:
+        typer.BadParameter: The byte range is invalid or not supported.
+    """
+
+    from .sharding import ByteRange
+
+    if byte_range is None:
+        return ByteRange(0, None)
+
+    if input_path is None:
+        raise typer.BadParameter(
+            "A byte range requires an input file.", param_hint="'--byte-range'"
+        )
+
+    if stream:
+        raise typer.BadParameter(
+            "Streaming mode does not support byte ranges.",
+            param_hint="'--byte-range'",
+        )
+
+    if not input_path.is_file():
+        raise typer.BadParameter(
+            "Byte ranges require a regular input file.", param_hint="'--byte-range'"
+        )
+
+    try:
+        return ByteRange.parse(byte_range)
+    except ValueError as error:
+        raise typer.BadParameter(str(error), param_hint="'--byte-range'") from error
+
+
+def _check_data_formats(
+    input_format: DataFormat,
+    output_format: Optional[DataFormat],
+    unsupported_options: List[str],
+) -> DataFormat:
+    """
+    Validate the data format options.
+
+    Parameters:
+        input_format (DataFormat): The input format option.
+        output_format (Optional[DataFormat]): The output format option, if any.
+        unsupported_options (List[str]): The enabled options only supported by
+            jsonl input.
+
+    Returns:
+        DataFormat: The output format, defaulting to the input format.
+
+    Raises:
+        typer.BadParameter: The data formats are invalid or not supported.
+    """
+
+    if output_format is None:
+        output_format = input_format
+
+    if input_format == DataFormat.JSONL:
+        if output_format != DataFormat.JSONL:
+            raise typer.BadParameter(
+                f"The {output_format.value} output format does not support "
+                "jsonl input.",
+                param_hint="'--output-format'",
+            )
+    elif unsupported_options:
+        raise typer.BadParameter(
+            f"The {input_format.value} input format does not support "
+            f"{', '.join(unsupported_options)}.",
+            param_hint="'--input-format'",
+        )
+
+    return output_format
+
+
+def _process_lines(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    processor: "LineProcessor",
+    lines: Iterable[bytes],
+    workers: int,
+    chunk_size: int,
+    line_buffered: bool,
+    cache: Optional["ResultCache"] = None,
+    accounts: Optional["AccountStore"] = None,
+    output_stream: Optional[BinaryIO] = None,
+    checkpointer: Optional["Checkpointer"] = None,
+    checkpoint: Optional["Checkpoint"] = None,
+):
+    """
+    Process lines of input, writing results to the output.
+
+    Parameters:
+        processor (LineProcessor): The line processor.
+        lines (Iterable[bytes]): The lines of input.
+        workers (int): The number of worker processes.
+        chunk_size (int): The number of lines sent to a worker process at a time.
+        line_buffered (bool): Whether to write each result as soon as it is calculated.
+        cache (Optional[ResultCache]): The result cache, if any.
+        accounts (Optional[AccountStore]): The account store, if any.
+        output_stream (Optional[BinaryIO]): The output stream. Defaults to
+            standard output.
+        checkpointer (Optional[Checkpointer]): The checkpointer, if any.
+        checkpoint (Optional[Checkpoint]): The checkpoint resumed from, if any.
+    """
+
+    from .accounts import AccountProcessor
+    from .buffers import OutputBuffer
+    from .cache import process_cached
+    from .checkpoints import Checkpoint, process_checkpointed
+    from .hooks import Stage, timed_call, timed_iterator
+    from .parallel import process_parallel
+
+    hooks = processor.hooks
+
+    # Reading and writing are only timed for hooks observing stages.
+    if hooks is not None and not hooks.observe_stages:
+        hooks = None
+
+    if hooks is not None:
+        lines = timed_iterator(lines, hooks, Stage.READ)
+
+    process_lines: Callable[[Iterable[bytes]], Iterator[bytes]] = (
+        processor.process_lines
+    )
+
+    if accounts is not None:
+        process_lines = AccountProcessor(processor, accounts).process_lines
+
+    if workers > 1:
+        process_lines = partial(
+            process_parallel, processor, workers=workers, chunk_size=chunk_size
+        )
+
+    if cache is not None:
+        # Results depend on whether lines are validated by the models.
+        process_lines = partial(
+            process_cached,
+            process_lines,
+            cache=cache,
+            namespace=b"fast" if processor.fast_decode else b"model",
+        )
+
+    if output_stream is None:
+        output_stream = sys.stdout.buffer
+
+    # Write the results preceding an invalid line before the error is raised.
+    with OutputBuffer(output_stream, line_buffered=line_buffered) as output:
+        write_line: Callable[[bytes], None] = output.write_line
+        json_results = (
+            process_lines(lines)
+            if checkpointer is None
+            else process_checkpointed(
+                process_lines, lines, output, checkpointer, checkpoint or Checkpoint()
+            )
+        )
+
+        if hooks is not None:
+            write_line = timed_call(write_line, hooks, Stage.WRITE)
+
+        for json_result in json_results:
+            write_line(json_result)
+
+
+def _process_stream_input(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    processor: "LineProcessor",
+    input_path: Optional[Path],
+    line_buffered: bool,
+    output_stream: Optional[BinaryIO] = None,
+    checkpointer: Optional["Checkpointer"] = None,
+    checkpoint: Optional["Checkpoint"] = None,
+    input_compression: Optional[Compression] = None,
+):
+    """
+    Process the input in streaming mode, writing results to the output.
+
+    Parameters:
+        processor (LineProcessor): The line processor.
+        input_path (Optional[Path]): The input file, or `None` for standard input.
+        line_buffered (bool): Whether to flush the output after each line.
+        output_stream (Optional[BinaryIO]): The output stream. Defaults to
+            standard output.
+        checkpointer (Optional[Checkpointer]): The checkpointer, if any.
+        checkpoint (Optional[Checkpoint]): The checkpoint resumed from, if any.
+        input_compression (Optional[Compression]): The compression format of
+            the input file, if compressed.
+    """
+
+    from .checkpoints import Checkpoint
+    from .streaming import process_stream
+
+    if output_stream is None:
+        output_stream = sys.stdout.buffer
+
+    if checkpoint is None:
+        checkpoint = Checkpoint()
+
+    try:
+        if input_path is None:
+            process_stream(
+                processor,
+                sys.stdin.buffer,
+                output_stream,
+                line_buffered=line_buffered,
+            )
+        else:
+            with _open_input(input_path, input_compression) as input_file:
+                if checkpoint.input_offset:
+                    input_file.seek(checkpoint.input_offset)
+
+                process_stream(
+                    processor,
+                    input_file,
+                    output_stream,
+                    line_buffered=line_buffered,
+                    checkpointer=checkpointer,
+                    checkpoint=checkpoint,
+                )
+    finally:
+        output_stream.flush()
+
+
+def _process_table_input(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    processor: "LineProcessor",
+    input_path: Optional[Path],
+    input_format: DataFormat,
+    output_format: DataFormat,
+    output_stream: BinaryIO,
+    input_compression: Optional[Compression] = None,
+):
+    """
+    Process tabular or binary input, writing the taxes to the output.
+
+    Parameters:
+        processor (LineProcessor): The line processor.
+        input_path (Optional[Path]): The input file, or `None` for standard input.
+        input_format (DataFormat): The tabular or binary format of the input.
+        output_format (DataFormat): The format of the output.
+        output_stream (BinaryIO): The output stream.
+        input_compression (Optional[Compression]): The compression format of
+            the input file, if compressed.
+    """
+
+    from .tables import process_table
+
+    try:
+        if input_path is None:
+            process_table(
+                processor, sys.stdin.buffer, output_stream, input_format, output_format
+            )
+        else:
+            with _open_input(input_path, input_compression) as input_file:
+                process_table(
+                    processor, input_file, output_stream, input_format, output_format
+                )
+    finally:
+        output_stream.flush()
+
+
 @app.callback(invoke_without_command=True)
-def tax(context: typer.Context):
+def tax(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals,too-many-branches,too-many-statements
+    context: typer.Context,
+    fast_decode: Annotated[
+        bool,
+        typer.Option(
+            "--fast-decode",
+            help="Decode operations into lightweight records, bypassing pydantic models.",
+        ),
+    ] = False,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            min=1,
+            help="Number of worker processes to distribute lines across.",
+        ),
+    ] = 1,
+    chunk_size: Annotated[
+        int,
+        typer.Option(
+            "--chunk-size",
+            min=1,
+            help="Number of lines processed by the columnar engine or sent to a "
+            "worker process at a time.",
+        ),
+    ] = 256,
+    engine: Annotated[
+        Engine,
+        typer.Option(
+            "--engine",
+            help="Tax calculation engine. The numpy engine requires NumPy.",
+        ),
+    ] = Engine.DECIMAL,
+    backend: Annotated[
+        Backend,
+        typer.Option(
+            "--backend",
+            help="Numeric backend representing financial values in the decimal engine.",
+        ),
+    ] = Backend.DECIMAL,
+    codec: Annotated[
+        Codec,
+        typer.Option(
+            "--codec",
+            help="JSON codec decoding operations with --fast-decode. The auto "
+            "codec uses orjson when installed.",
+        ),
+    ] = Codec.AUTO,
+    stream: Annotated[
+        bool,
+        typer.Option(
+            "--stream",
+            help="Decode and encode operations one at a time, with constant memory usage.",
+        ),
+    ] = False,
+    input_path: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--input",
+            exists=True,
+            dir_okay=False,
+            help="Read operations from a memory-mapped file instead of standard input.",
+        ),
+    ] = None,
+    byte_range: Annotated[
+        Optional[str],
+        typer.Option(
+            "--byte-range",
+            metavar="START:END",
+            help="Process only the lines of the input file beginning within the "
+            "byte range, as produced by the shard command.",
+        ),
+    ] = None,
+    line_buffered: Annotated[
+        bool,
+        typer.Option(
+            "--line-buffered",
+            help="Write the results of each line as soon as they are calculated, "
+            "for interactive pipes.",
+        ),
+    ] = False,
+    profile: Annotated[
+        bool,
+        typer.Option(
+            "--profile",
+            help="Print a per-stage time breakdown, operation counts and the "
+            "slowest lines to standard error.",
+        ),
+    ] = False,
+    profile_output: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--profile-output",
+            dir_okay=False,
+            help="Write cProfile statistics of the run to a pstats file.",
+        ),
+    ] = None,
+    metrics_file: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--metrics-file",
+            dir_okay=False,
+            help="Export throughput counters and latency histograms periodically "
+            "to a file in the Prometheus text format.",
+        ),
+    ] = None,
+    metrics_interval: Annotated[
+        float,
+        typer.Option(
+            "--metrics-interval",
+            min=0,
+            help="Number of seconds between exports of the metrics file.",
+        ),
+    ] = 10.0,
+    metrics_summary: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--metrics-summary",
+            dir_okay=False,
+            help="Write a JSON summary of the metrics at the end of the run.",
+        ),
+    ] = None,
+    cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache",
+            help="Reuse the results of repeated lines, skipping their validation "
+            "and calculation.",
+        ),
+    ] = False,
+    cache_size: Annotated[
+        int,
+        typer.Option(
+            "--cache-size",
+            min=0,
+            help="Number of results of distinct lines kept in memory.",
+        ),
+    ] = 65536,
+    cache_path: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--cache-path",
+            dir_okay=False,
+            help="Persist cached results to an SQLite database shared across runs. "
+            "Implies --cache.",
+        ),
+    ] = None,
+    cache_max_bytes: Annotated[
+        int,
+        typer.Option(
+            "--cache-max-bytes",
+            min=0,
+            help="Size of the persistent cache, in bytes, beyond which the least "
+            "recently used results are evicted.",
+        ),
+    ] = 268435456,
+    cache_stats: Annotated[
+        bool,
+        typer.Option(
+            "--cache-stats",
+            help="Print result, prefix and account cache statistics to standard error.",
+        ),
+    ] = False,
+    prefix_cache: Annotated[
+        bool,
+        typer.Option(
+            "--prefix-cache",
+            help="Resume lines extending an earlier line, such as a history with "
+            "new operations appended, from the portfolio state at its end.",
+        ),
+    ] = False,
+    prefix_cache_size: Annotated[
+        int,
+        typer.Option(
+            "--prefix-cache-size",
+            min=0,
+            help="Number of portfolio state snapshots kept in memory.",
+        ),
+    ] = 65536,
+    prefix_cache_bytes: Annotated[
+        int,
+        typer.Option(
+            "--prefix-cache-bytes",
+            min=0,
+            help="Size of the snapshot results kept in memory, in bytes, beyond "
+            "which the least recently used snapshots are evicted.",
+        ),
+    ] = 67108864,
+    accounts: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--accounts",
+            dir_okay=False,
+            help="Apply each line, an object with an account and its operations, "
+            "to the state of the account persisted in an SQLite database.",
+        ),
+    ] = None,
+    input_format: Annotated[
+        DataFormat,
+        typer.Option(
+            "--input-format",
+            help="Format of the input. Tabular formats hold the batch, operation, "
+            "quantity and unit-cost columns, and the Arrow and Parquet formats "
+            "require PyArrow. The binary format holds length-prefixed frames of "
+            "packed operations.",
+        ),
+    ] = DataFormat.JSONL,
+    output_format: Annotated[
+        Optional[DataFormat],
+        typer.Option(
+            "--output-format",
+            help="Format of the output, a tax column aligned to the input rows "
+            "for tabular formats, or a frame of packed taxes per batch for the "
+            "binary format. Defaults to the input format.",
+        ),
+    ] = None,
+    output_path: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--output",
+            dir_okay=False,
+            help="Write the results to a file instead of standard output.",
+        ),
+    ] = None,
+    checkpoint_path: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--checkpoint",
+            dir_okay=False,
+            help="Periodically record the progress of the run in a checkpoint "
+            "file. Requires --input and --output.",
+        ),
+    ] = None,
+    checkpoint_interval: Annotated[
+        float,
+        typer.Option(
+            "--checkpoint-interval",
+            min=0.0,
+            help="Number of seconds between checkpoints.",
+        ),
+    ] = 5.0,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Resume an interrupted run from its checkpoint file, if any.",
+        ),
+    ] = False,
+):
     """
     Process a batch of financial operations from standard input.
 
@@ -31,15 +1039,536 @@ def tax(context: typer.Context):
     if context.invoked_subcommand is not None:
         return
 
-    for json_operations in sys.stdin:
-        # Reset the state and calculator for each line of input.
-        state = PortfolioState()
-        calculator = TaxCalculator(state)
+    from .buffers import read_lines
+    from .hooks import HookGroup
+    from .sharding import ByteRange, read_mapped_lines
+
+    selected_range = _parse_byte_range(byte_range, input_path, stream)
+    input_compression, output_compression = _check_compression(
+        input_path, output_path, byte_range
+    )
+    output_format = _check_data_formats(
+        input_format,
+        output_format,
+        [
+            name
+            for name, enabled in [
+                ("--stream", stream),
+                ("--workers", workers > 1),
+                ("--byte-range", byte_range is not None),
+                ("--cache", cache or cache_path is not None),
+                ("--prefix-cache", prefix_cache),
+                ("--accounts", accounts is not None),
+                ("--checkpoint", checkpoint_path is not None),
+            ]
+            if enabled
+        ],
+    )
+
+    if stream and workers > 1:
+        raise typer.BadParameter(
+            "Streaming mode does not support multiple workers.",
+            param_hint="'--workers'",
+        )
+
+    if stream and engine != Engine.DECIMAL:
+        raise typer.BadParameter(
+            "Streaming mode only supports the decimal engine.",
+            param_hint="'--engine'",
+        )
+
+    single_process = not stream and workers == 1
+    profiler = _create_profiler(
+        profile, single_process, cache or cache_path is not None
+    )
+    metrics = _create_metrics(
+        metrics_file,
+        metrics_interval,
+        metrics_summary,
+        single_process,
+        cache or cache_path is not None,
+    )
+    result_cache = _create_cache(cache, cache_size, cache_path, cache_max_bytes, stream)
+    prefix_index = _create_prefix_index(
+        prefix_cache, prefix_cache_size, prefix_cache_bytes, engine, single_process
+    )
+    account_store = _create_account_store(
+        accounts,
+        engine,
+        single_process,
+        result_cache is not None or prefix_index is not None,
+    )
+    checkpointer, checkpoint = _open_checkpoint(
+        checkpoint_path,
+        checkpoint_interval,
+        resume,
+        input_path,
+        output_path,
+        stream,
+        byte_range is not None
+        or accounts is not None
+        or input_compression is not None
+        or output_compression is not None,
+    )
+    hooks = [hook for hook in [profiler, metrics] if hook is not None]
+    processor = _create_processor(
+        fast_decode,
+        engine,
+        chunk_size,
+        backend,
+        HookGroup(hooks) if len(hooks) > 1 else next(iter(hooks), None),
+        prefix_index,
+        codec,
+    )
+    output_stream = _open_output(
+        output_path, checkpoint.output_offset, output_compression
+    )
+    profile_session: Optional["cProfile.Profile"] = None
+
+    if profile_output is not None:
+        import cProfile
+
+        profile_session = cProfile.Profile()
+        profile_session.enable()
+
+    try:
+        if input_format != DataFormat.JSONL:
+            _process_table_input(
+                processor,
+                input_path,
+                input_format,
+                output_format,
+                output_stream,
+                input_compression,
+            )
+        elif stream:
+            _process_stream_input(
+                processor,
+                input_path,
+                line_buffered,
+                output_stream,
+                checkpointer,
+                checkpoint,
+                input_compression,
+            )
+        else:
+            _process_lines(
+                processor,
+                (
+                    read_lines(sys.stdin.buffer)
+                    if input_path is None
+                    else (
+                        _read_compressed_lines(input_path, input_compression)
+                        if input_compression is not None
+                        else read_mapped_lines(
+                            input_path,
+                            ByteRange(
+                                max(selected_range.start, checkpoint.input_offset),
+                                selected_range.end,
+                            ),
+                        )
+                    )
+                ),
+                workers,
+                chunk_size,
+                line_buffered,
+                result_cache,
+                account_store,
+                output_stream,
+                checkpointer,
+                checkpoint,
+            )
+    finally:
+        if output_path is not None:
+            output_stream.close()
+
+        if profile_session is not None and profile_output is not None:
+            profile_session.disable()
+            profile_session.dump_stats(profile_output)
+
+        if profiler is not None:
+            typer.echo(profiler.report(), err=True)
+
+        if metrics is not None:
+            metrics.export()
+
+            if metrics_summary is not None:
+                metrics.write_summary(str(metrics_summary))
+
+        if result_cache is not None:
+            result_cache.close()
+
+            if cache_stats:
+                typer.echo(result_cache.report(), err=True)
 
-        operations = TypeAdapter(List[OperationModel]).validate_json(json_operations)
-        results = list(calculator.process(operations))
+        if prefix_index is not None and cache_stats:
+            typer.echo(prefix_index.report(), err=True)
 
-        typer.echo(TypeAdapter(List[ResultModel]).dump_json(results))
+        if account_store is not None:
+            account_store.close()
+
+            if cache_stats:
+                typer.echo(account_store.report(), err=True)
+
+
+@app.command()
+def shard(
+    path: Annotated[
+        Path,
+        typer.Argument(exists=True, dir_okay=False, help="Path of the input file."),
+    ],
+    shards: Annotated[
+        int, typer.Option("--shards", min=1, help="Number of byte ranges.")
+    ] = 2,
+):
+    """
+    Split an input file into newline-aligned byte ranges, one per line.
+
+    Each range can be processed with the --byte-range option of the tax
+    command, and the outputs concatenated in order.
+
+    Example: capital-gains shard input.sample.jsonl --shards 4
+    """
+
+    from .sharding import split_file
+
+    for byte_range in split_file(path, shards):
+        typer.echo(str(byte_range))
+
+
+@app.command()
+def bench(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    workloads: Annotated[
+        Optional[List[str]],
+        typer.Option(
+            "--workload",
+            help=f"Workload to run, repeatable. One of: {', '.join(WORKLOAD_NAMES)}. "
+            "Defaults to all workloads.",
+        ),
+    ] = None,
+    scale: Annotated[
+        float,
+        typer.Option("--scale", min=0, help="Scale factor of the workload sizes."),
+    ] = 1.0,
+    seed: Annotated[
+        int, typer.Option("--seed", help="Random seed of the workloads.")
+    ] = 0,
+    json_output: Annotated[
+        bool, typer.Option("--json", help="Report results as JSON.")
+    ] = False,
+    fast_decode: Annotated[
+        bool,
+        typer.Option(
+            "--fast-decode",
+            help="Decode operations into lightweight records, bypassing pydantic models.",
+        ),
+    ] = False,
+    engine: Annotated[
+        Engine, typer.Option("--engine", help="Tax calculation engine.")
+    ] = Engine.DECIMAL,
+    backend: Annotated[
+        Backend,
+        typer.Option(
+            "--backend",
+            help="Numeric backend representing financial values in the decimal engine.",
+        ),
+    ] = Backend.DECIMAL,
+    codec: Annotated[
+        Codec,
+        typer.Option(
+            "--codec",
+            help="JSON codec decoding operations with --fast-decode. The auto "
+            "codec uses orjson when installed.",
+        ),
+    ] = Codec.AUTO,
+):
+    """
+    Measure the throughput and latency of synthetic workloads.
+
+    Example: capital-gains bench --workload tiny-lines --json
+    """
+
+    import json
+
+    from .bench import run_benchmark
+    from .workloads import WORKLOADS, generate_lines
+
+    names = workloads or list(WORKLOADS)
+
+    for name in names:
+        if name not in WORKLOADS:
+            raise typer.BadParameter(
+                f"Unknown workload {name!r}.", param_hint="'--workload'"
+            )
+
+    processor = _create_processor(fast_decode, engine, 256, backend, codec=codec)
+    results = []
+
+    for name in names:
+        shape = WORKLOADS[name].scaled(scale)
+        lines = list(generate_lines(shape, seed))
+        results.append(run_benchmark(processor, name, lines))
+
+    if json_output:
+        typer.echo(json.dumps([result._asdict() for result in results], indent=2))
+        return
+
+    for result in results:
+        typer.echo(
+            f"{result.workload}: {result.lines} lines, {result.operations} operations "
+            f"in {result.seconds:.3f}s ({result.lines_per_second:,.0f} lines/s, "
+            f"{result.operations_per_second:,.0f} ops/s)"
+        )
+
+        if result.latency_p50 is not None and result.latency_p99 is not None:
+            typer.echo(
+                f"  latency p50 {result.latency_p50 * 1e6:,.1f}us, "
+                f"p99 {result.latency_p99 * 1e6:,.1f}us; "
+                f"parse {result.parse_seconds:.3f}s, "
+                f"compute {result.compute_seconds:.3f}s, "
+                f"serialize {result.serialize_seconds:.3f}s"
+            )
+
+        if result.peak_rss is not None:
+            typer.echo(f"  peak RSS {result.peak_rss / 1048576:,.1f} MiB")
+
+
+@app.command()
+def generate(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    lines: Annotated[
+        int, typer.Option("--lines", min=0, help="Number of lines.")
+    ] = 1000,
+    operations_per_line: Annotated[
+        int,
+        typer.Option(
+            "--operations-per-line", min=0, help="Number of operations in each line."
+        ),
+    ] = 10,
+    sell_ratio: Annotated[
+        float,
+        typer.Option(
+            "--sell-ratio",
+            min=0,
+            max=1,
+            help="Probability of selling held shares instead of buying.",
+        ),
+    ] = 0.5,
+    volatility: Annotated[
+        float,
+        typer.Option(
+            "--volatility",
+            min=0,
+            help="Standard deviation of the relative price change between operations.",
+        ),
+    ] = 0.05,
+    loss_frequency: Annotated[
+        float,
+        typer.Option(
+            "--loss-frequency",
+            min=0,
+            max=1,
+            help="Probability of selling below the average cost.",
+        ),
+    ] = 0.2,
+    seed: Annotated[int, typer.Option("--seed", help="Random seed.")] = 0,
+    output_path: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--output",
+            dir_okay=False,
+            help="Write operations to a file instead of standard output.",
+        ),
+    ] = None,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            min=1,
+            help="Number of worker processes generating lines. The output does "
+            "not depend on the number of workers.",
+        ),
+    ] = 1,
+):
+    """
+    Generate synthetic batches of financial operations.
+
+    Example: capital-gains generate --lines 1000000 --output input.jsonl
+    """
+
+    from .workloads import WorkloadShape, generate_blocks
+
+    shape = WorkloadShape(
+        lines, operations_per_line, sell_ratio, volatility, loss_frequency
+    )
+    blocks = generate_blocks(shape, seed, workers)
+
+    if output_path is None:
+        sys.stdout.buffer.writelines(blocks)
+        sys.stdout.buffer.flush()
+    else:
+        with open(output_path, "wb") as output_file:
+            output_file.writelines(blocks)
+
+
+@app.command()
+def serve(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    socket_path: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--socket",
+            dir_okay=False,
+            help="Listen on a Unix socket instead of a TCP port.",
+        ),
+    ] = None,
+    host: Annotated[str, typer.Option("--host", help="Host of the TCP port.")] = (
+        "127.0.0.1"
+    ),
+    port: Annotated[
+        int, typer.Option("--port", min=0, max=65535, help="TCP port.")
+    ] = DEFAULT_PORT,
+    max_connections: Annotated[
+        int,
+        typer.Option(
+            "--max-connections",
+            min=1,
+            help="Number of connections served at a time. Further connections "
+            "wait for a free slot.",
+        ),
+    ] = 64,
+    drain_timeout: Annotated[
+        float,
+        typer.Option(
+            "--drain-timeout",
+            min=0,
+            help="Number of seconds to wait for results to be written on shutdown.",
+        ),
+    ] = 10.0,
+    fast_decode: Annotated[
+        bool,
+        typer.Option(
+            "--fast-decode",
+            help="Decode operations into lightweight records, bypassing pydantic models.",
+        ),
+    ] = False,
+    backend: Annotated[
+        Backend,
+        typer.Option(
+            "--backend",
+            help="Numeric backend representing financial values in the decimal engine.",
+        ),
+    ] = Backend.DECIMAL,
+):
+    """
+    Serve batches of financial operations over a Unix socket or a TCP port.
+
+    Each line of operations sent by a client is answered with a line of
+    results. The server drains connections on interrupt or termination.
+
+    Example: capital-gains serve --socket /tmp/capital-gains.sock
+    """
+
+    import asyncio
+
+    from .server import TaxServer
+
+    processor = _create_processor(fast_decode, Engine.DECIMAL, 256, backend)
+    server = TaxServer(
+        processor, max_connections=max_connections, drain_timeout=drain_timeout
+    )
+
+    asyncio.run(
+        server.serve(None if socket_path is None else str(socket_path), host, port)
+    )
+
+
+@app.command()
+def client(
+    socket_path: Annotated[
+        Optional[Path],
+        typer.Option(
+            "--socket",
+            dir_okay=False,
+            help="Connect to a Unix socket instead of a TCP port.",
+        ),
+    ] = None,
+    host: Annotated[str, typer.Option("--host", help="Host of the TCP port.")] = (
+        "127.0.0.1"
+    ),
+    port: Annotated[
+        int, typer.Option("--port", min=0, max=65535, help="TCP port.")
+    ] = DEFAULT_PORT,
+):
+    """
+    Process a batch of financial operations from standard input with a server.
+
+    Example: capital-gains client --socket /tmp/capital-gains.sock < input.sample.jsonl
+    """
+
+    from .client import connect, run_client
+
+    try:
+        connection = connect(
+            None if socket_path is None else str(socket_path), host, port
+        )
+    except OSError as error:
+        raise typer.BadParameter(
+            f"Cannot connect to the server: {error}.",
+            param_hint="'--socket'" if socket_path is not None else "'--port'",
+        ) from error
+
+    try:
+        run_client(connection, sys.stdin.buffer, sys.stdout.buffer)
+    finally:
+        sys.stdout.buffer.flush()
+
+
+@app.command()
+def recompute(
+    interval: Annotated[
+        int,
+        typer.Option(
+            "--snapshot-interval",
+            min=1,
+            help="Number of operations between the portfolio state snapshots "
+            "kept for each history.",
+        ),
+    ] = 64,
+    fast_decode: Annotated[
+        bool,
+        typer.Option(
+            "--fast-decode",
+            help="Decode histories into lightweight records, bypassing the "
+            "validation models.",
+        ),
+    ] = False,
+    backend: Annotated[
+        Backend,
+        typer.Option(
+            "--backend",
+            help="Numeric backend representing financial values in the decimal engine.",
+        ),
+    ] = Backend.DECIMAL,
+):
+    """
+    Recalculate the taxes of a history after corrections of its operations.
+
+    Each line holding an array of operations starts a new history and
+    writes its results. Each following line holding corrections, such as
+    {"edits": [{"index": 3, "operation": {...}}]}, writes only the changed
+    results with their index.
+    """
+
+    from .buffers import OutputBuffer, read_lines
+    from .history import process_edits
+
+    processor = _create_processor(fast_decode, Engine.DECIMAL, 256, backend)
+
+    # Write each result as soon as it is calculated, for interactive sessions.
+    with OutputBuffer(sys.stdout.buffer, line_buffered=True) as output:
+        for json_result in process_edits(
+            processor, read_lines(sys.stdin.buffer), interval
+        ):
+            output.write_line(json_result)
 
 
 @app.command()
@@ -48,6 +1577,8 @@ def version():
     Show the version of the application and exit.
     """
 
+    from . import __version__  # pylint: disable=no-name-in-module
+
     typer.echo(__version__)
 
 
@@ -0,0 +1,163 @@
+"""
+Client module.
+
+This module provides the client of the tax server. Lines of input are
+sent to the server while results are received, so that the server
+processes a pipelined stream of lines without waiting for the client.
+The client only depends on the standard library, keeping its startup
+cost low.
+"""
+
+import json
+import socket
+import threading
+from contextlib import suppress
+from typing import BinaryIO, List, Optional
+
+from .options import DEFAULT_PORT
+
+#: The number of bytes read or sent at a time.
+_BLOCK_SIZE = 1048576
+
+
+def connect(
+    socket_path: Optional[str] = None, host: str = "127.0.0.1", port: int = DEFAULT_PORT
+) -> socket.socket:
+    """
+    Connect to a tax server.
+
+    Parameters:
+        socket_path (Optional[str]): The path of the Unix socket of the server.
+            Defaults to none, connecting to a TCP port.
+        host (str): The host of the TCP port. Defaults to the local host.
+        port (int): The TCP port. Defaults to `DEFAULT_PORT`.
+
+    Returns:
+        socket.socket: The connected socket.
+
+    Raises:
+        OSError: The server is not reachable.
+    """
+
+    if socket_path is not None:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(socket_path)
+
+        return connection
+
+    return socket.create_connection((host, port))
+
+
+class _Sender(threading.Thread):
+    """
+    Thread sending the input to the server, then shutting down the sending side.
+    """
+
+    def __init__(self, connection: socket.socket, input_stream: BinaryIO):
+        """
+        Initialize the sender.
+
+        Parameters:
+            connection (socket.socket): The connected socket.
+            input_stream (BinaryIO): The binary input stream.
+        """
+
+        super().__init__(daemon=True)
+
+        #: The connected socket.
+        self.connection = connection
+
+        #: The binary input stream.
+        self.input_stream = input_stream
+
+        #: The number of lines sent.
+        self.lines = 0
+
+        #: Whether the whole input was sent.
+        self.complete = False
+
+    def run(self):
+        """
+        Send the input to the server.
+        """
+
+        read = getattr(self.input_stream, "read1", self.input_stream.read)
+        last_data = b"\n"
+
+        try:
+            while data := read(_BLOCK_SIZE):
+                self.connection.sendall(data)
+                self.lines += data.count(b"\n")
+                last_data = data
+
+            # Count the last line, if not terminated by a line break.
+            if not last_data.endswith(b"\n"):
+                self.lines += 1
+
+            self.complete = True
+            self.connection.shutdown(socket.SHUT_WR)
+        except OSError:
+            # The server closed the connection, which is reported by the receiver.
+            pass
+
+
+def run_client(
+    connection: socket.socket, input_stream: BinaryIO, output_stream: BinaryIO
+):
+    """
+    Send lines of input to the server and write the results to the output.
+
+    Results are written as they are received. If a line is invalid, the
+    results of the preceding lines are written before the error is raised.
+
+    Parameters:
+        connection (socket.socket): The connected socket.
+        input_stream (BinaryIO): The binary input stream.
+        output_stream (BinaryIO): The binary output stream.
+
+    Raises:
+        ValueError: A line is invalid.
+        ConnectionError: The server closed the connection before answering
+            all lines.
+    """
+
+    sender = _Sender(connection, input_stream)
+    sender.start()
+
+    pending: List[bytes] = []
+    received = 0
+
+    try:
+        while data := connection.recv(_BLOCK_SIZE):
+            if b"\n" not in data:
+                pending.append(data)
+                continue
+
+            lines = data.split(b"\n")
+
+            # Join the line spanning the previous data.
+            if pending:
+                pending.append(lines[0])
+                lines[0] = b"".join(pending)
+
+            pending = [lines.pop()]
+
+            for index, line in enumerate(lines):
+                if line.startswith(b'{"error"'):
+                    output_stream.write(
+                        b"".join(result + b"\n" for result in lines[:index])
+                    )
+                    raise ValueError(json.loads(line)["error"])
+
+            lines.append(b"")
+            output_stream.write(b"\n".join(lines))
+            received += len(lines) - 1
+    finally:
+        # Unblock the sender if the server stopped reading.
+        with suppress(OSError):
+            connection.shutdown(socket.SHUT_RDWR)
+
+        connection.close()
+
+    if not sender.complete or any(pending) or received != sender.lines:
+        raise ConnectionError("The server closed the connection.")
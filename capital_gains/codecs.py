@@ -0,0 +1,162 @@
+"""
+Codecs module.
+
+This module provides the JSON codecs decoding lines of operations into
+Python values and encoding the taxes of operations as JSON results. The
+standard library codec is always available, and faster codecs are used
+when their libraries are installed. Results are written by the
+formatters of the `formatters` module, byte-identical to the
+serialization of `ResultModel` values, since they are faster than the
+encoders of the JSON libraries for results of mostly untaxed operations.
+"""
+
+import json
+from typing import Any, Iterable, Union
+
+from .formatters import encode_result, encode_results
+from .options import Codec
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def _reject_constant(constant: str) -> Any:
+    """
+    Reject non-standard JSON constants such as `NaN` and `Infinity`.
+
+    Parameters:
+        constant (str): The constant found in the JSON document.
+
+    Raises:
+        ValueError: Always, since these constants are not valid JSON.
+    """
+
+    raise ValueError(f"invalid JSON constant: {constant}")
+
+
+#: Reusable JSON decoder rejecting non-standard constants.
+_json_decoder = json.JSONDecoder(parse_constant=_reject_constant)
+
+
+class JsonCodec:
+    """
+    JSON codec of the standard library.
+    """
+
+    #: The codec option implemented.
+    codec = Codec.JSON
+
+    def loads(self, json_value: Union[str, bytes]) -> Any:
+        """
+        Decode a JSON document into Python values.
+
+        Parameters:
+            json_value (Union[str, bytes]): The JSON document.
+
+        Returns:
+            Any: The decoded value.
+
+        Raises:
+            ValueError: The document is not valid JSON.
+            RecursionError: The document is too deeply nested.
+        """
+
+        return _json_decoder.decode(
+            json_value if isinstance(json_value, str) else json_value.decode()
+        )
+
+    def encode_result(self, tax: int) -> bytes:
+        """
+        Encode a tax in cents as a JSON result.
+
+        Parameters:
+            tax (int): The tax of an operation, in cents.
+
+        Returns:
+            bytes: The JSON encoded result.
+        """
+
+        return encode_result(tax)
+
+    def encode_results(self, taxes: Iterable[int]) -> bytes:
+        """
+        Encode taxes in cents as JSON results.
+
+        Parameters:
+            taxes (Iterable[int]): The taxes of each operation, in cents.
+
+        Returns:
+            bytes: The JSON encoded results.
+        """
+
+        return encode_results(taxes)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    JSON codec decoding with the orjson library.
+    """
+
+    codec = Codec.ORJSON
+
+    def __init__(self):
+        """
+        Initialize the orjson codec.
+
+        Raises:
+            ImportError: The orjson library is not installed.
+        """
+
+        if orjson is None:
+            raise ImportError("The orjson codec requires orjson to be installed.")
+
+    def loads(self, json_value: Union[str, bytes]) -> Any:
+        """
+        Decode a JSON document into Python values.
+
+        Parameters:
+            json_value (Union[str, bytes]): The JSON document.
+
+        Returns:
+            Any: The decoded value.
+
+        Raises:
+            ValueError: The document is not valid JSON, or holds integers
+                beyond 64 bits.
+        """
+
+        return orjson.loads(json_value)
+
+
+#: Shared codec of the standard library.
+JSON_CODEC = JsonCodec()
+
+
+def create_codec(codec: Codec) -> JsonCodec:
+    """
+    Create the JSON codec instance for a codec option.
+
+    Parameters:
+        codec (Codec): The codec option.
+
+    Returns:
+        JsonCodec: The JSON codec instance.
+
+    Raises:
+        ImportError: The codec library is not installed.
+    """
+
+    if codec == Codec.JSON:
+        return JSON_CODEC
+
+    try:
+        return OrjsonCodec()
+    except ImportError as error:
+        if codec == Codec.AUTO:
+            return JSON_CODEC
+
+        raise ImportError(
+            "The orjson codec requires orjson to be installed."
+        ) from error
@@ -0,0 +1,749 @@
+"""
+Compression module.
+
+This module reads and writes gzip and zstandard compressed files, so that
+archived inputs are processed without external decompressors. Compressed
+inputs are detected by their magic bytes and decompressed by background
+threads, overlapping with the validation and calculation of the lines
+already decompressed, since the compression libraries release the global
+interpreter lock. Gzip files with several members, such as the ones written
+by block compressors or concatenated archives, are split at member headers
+and their segments decompressed in parallel. Compressed outputs are
+selected by their file extension and compressed by a background thread.
+
+The zstandard format requires the zstandard library.
+"""
+
+import io
+import mmap
+import os
+import queue
+import threading
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+)
+
+from .options import Compression
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+#: Magic bytes starting compressed files.
+MAGIC_BYTES = {
+    Compression.GZIP: b"\x1f\x8b",
+    Compression.ZSTD: b"\x28\xb5\x2f\xfd",
+}
+
+#: Compression formats of output files, indexed by their extension.
+OUTPUT_SUFFIXES = {
+    ".gz": Compression.GZIP,
+    ".zst": Compression.ZSTD,
+}
+
+#: The default number of threads decompressing gzip members.
+DEFAULT_THREADS = min(4, os.cpu_count() or 1)
+
+#: The default number of compressed bytes of the segments decompressed in parallel.
+DEFAULT_SEGMENT_SIZE = 1048576
+
+#: Header of gzip members with the deflate method.
+_GZIP_HEADER = b"\x1f\x8b\x08"
+
+#: Window bits of zlib streams with a gzip header.
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+#: Number of bytes of compressed input and decompressed output handled at a time.
+_CHUNK_SIZE = 1048576
+
+#: Number of chunks buffered by each background thread.
+_QUEUE_SIZE = 8
+
+#: Compression ratio up to which the decompressed data of a gzip segment is
+#: buffered ahead of its consumption, so that segments do not wait for the
+#: ones preceding them.
+_SEGMENT_RATIO = 16
+
+#: Number of compressed bytes decompressed to validate a gzip member header.
+_PROBE_SIZE = 4096
+
+#: Number of seconds between checks for the cancellation of a background thread.
+_POLL_INTERVAL = 0.1
+
+
+class _Cancelled(Exception):
+    """
+    Cancellation of a background thread by its consumer.
+    """
+
+
+class _Producer:  # pylint: disable=too-many-instance-attributes
+    """
+    Background thread producing chunks of data into a bounded queue.
+
+    The thread runs a function emitting chunks, and blocks while the queue
+    is full, so that at most a fixed number of chunks are held in memory.
+    Small chunks are joined before being queued, so that each queued chunk
+    holds about the same amount of data.
+    """
+
+    #: The position of the input where the thread started.
+    start: int
+
+    #: The value returned by the function, once the chunks are consumed.
+    result: Any
+
+    def __init__(
+        self,
+        function: Callable[[Callable[[bytes], None]], Any],
+        start: int = 0,
+        queue_size: int = _QUEUE_SIZE,
+    ):
+        """
+        Initialize the producer, starting its thread.
+
+        Parameters:
+            function (Callable[[Callable[[bytes], None]], Any]): The function
+                emitting chunks, which returns the result of the producer.
+            start (int): The position of the input where the thread starts.
+                Defaults to zero.
+            queue_size (int): The number of chunks buffered ahead of their
+                consumption. Defaults to eight.
+        """
+
+        self.start = start
+        self.result = None
+
+        self._function = function
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(queue_size)
+        self._cancelled = threading.Event()
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _put(self, chunk: Optional[bytes]):
+        """
+        Put a chunk into the queue, waiting for space.
+
+        Parameters:
+            chunk (Optional[bytes]): The chunk, or `None` at the end of the data.
+
+        Raises:
+            _Cancelled: The producer was cancelled.
+        """
+
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(chunk, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+        raise _Cancelled()
+
+    def _emit(self, chunk: bytes):
+        """
+        Emit a chunk of data.
+
+        Parameters:
+            chunk (bytes): The chunk of data.
+
+        Raises:
+            _Cancelled: The producer was cancelled.
+        """
+
+        if chunk:
+            self._pending.append(chunk)
+            self._pending_size += len(chunk)
+
+            if self._pending_size >= _CHUNK_SIZE:
+                self._flush()
+
+    def _flush(self):
+        """
+        Put the pending chunks into the queue, joined into one.
+
+        Raises:
+            _Cancelled: The producer was cancelled.
+        """
+
+        if self._pending:
+            chunk = b"".join(self._pending)
+            self._pending.clear()
+            self._pending_size = 0
+            self._put(chunk)
+
+    def _run(self):
+        """
+        Run the function, putting its chunks into the queue.
+        """
+
+        try:
+            self.result = self._function(self._emit)
+        except _Cancelled:
+            return
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            self._error = error
+
+        try:
+            self._flush()
+            self._put(None)
+        except _Cancelled:
+            pass
+
+    def chunks(self) -> Iterator[bytes]:
+        """
+        Consume the chunks of data.
+
+        Returns:
+            Iterator[bytes]: The chunks, in order.
+
+        Raises:
+            Exception: The error raised by the function, if any.
+        """
+
+        while (chunk := self._queue.get()) is not None:
+            yield chunk
+
+        self._thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+    def cancel(self):
+        """
+        Cancel the producer, waiting for its thread to stop.
+        """
+
+        self._cancelled.set()
+        self._thread.join()
+
+
+def _is_gzip_member(mapped: mmap.mmap, position: int) -> bool:
+    """
+    Check whether a gzip member starts at a position, by decompressing its beginning.
+
+    Parameters:
+        mapped (mmap.mmap): The compressed file.
+        position (int): The position of a gzip member header.
+
+    Returns:
+        bool: Whether the header and its first compressed bytes are valid.
+    """
+
+    try:
+        zlib.decompressobj(_GZIP_WBITS).decompress(
+            mapped[position : position + _PROBE_SIZE], _PROBE_SIZE
+        )
+    except zlib.error:
+        return False
+
+    return True
+
+
+def _next_gzip_member(mapped: mmap.mmap, position: int) -> int:
+    """
+    Find the next gzip member header at or after a position.
+
+    Compressed data may contain the bytes of a member header, so members
+    found are only likely to start at the returned position.
+
+    Parameters:
+        mapped (mmap.mmap): The compressed file.
+        position (int): The position to search from.
+
+    Returns:
+        int: The position of the header, or the size of the file if none is found.
+    """
+
+    while (position := mapped.find(_GZIP_HEADER, position)) >= 0:
+        if _is_gzip_member(mapped, position):
+            return position
+
+        position += 1
+
+    return len(mapped)
+
+
+def _decompress_gzip(
+    mapped: mmap.mmap, start: int, end: int, emit: Callable[[bytes], None]
+) -> int:
+    """
+    Decompress the gzip members starting from a position until one ends
+    at or after another.
+
+    Parameters:
+        mapped (mmap.mmap): The compressed file.
+        start (int): The position of the first member.
+        end (int): The position after which no member is started.
+        emit (Callable[[bytes], None]): The function receiving the chunks of
+            decompressed data.
+
+    Returns:
+        int: The position after the last member decompressed.
+
+    Raises:
+        ValueError: The file is not valid gzip data.
+    """
+
+    size = len(mapped)
+    position = start
+
+    try:
+        while position < end:
+            decompressor = zlib.decompressobj(_GZIP_WBITS)
+
+            while not decompressor.eof:
+                if position >= size:
+                    raise ValueError("The compressed input is truncated.")
+
+                block = mapped[position : position + _CHUNK_SIZE]
+                position += len(block)
+                chunk = decompressor.decompress(block, _CHUNK_SIZE)
+
+                while True:
+                    emit(chunk)
+
+                    if decompressor.eof or (
+                        not decompressor.unconsumed_tail and len(chunk) < _CHUNK_SIZE
+                    ):
+                        break
+
+                    chunk = decompressor.decompress(
+                        decompressor.unconsumed_tail, _CHUNK_SIZE
+                    )
+
+            position -= len(decompressor.unused_data)
+
+            # Members may be padded with zeros.
+            while position < size and not mapped[position]:
+                position += 1
+    except zlib.error as error:
+        raise ValueError(f"The compressed input is invalid: {error}") from error
+
+    return position
+
+
+def _read_gzip(
+    path: Path, threads: int, segment_size: int
+) -> Generator[bytes, None, None]:
+    """
+    Decompress a gzip file, decompressing its members in parallel segments.
+
+    The file is split at the first member header found after each segment
+    size. Each segment is decompressed by a background thread until a
+    member ends at or after the start of the next segment, and the next
+    segment is only consumed if it starts where the previous one ended.
+    Otherwise, it started within a member and the segments are split again
+    from the end of the previous one. Each thread buffers the decompressed
+    data of its whole segment, up to a compression ratio of 16, so that
+    segments are decompressed without waiting for the ones preceding them.
+
+    Parameters:
+        path (Path): The path of the compressed file.
+        threads (int): The number of segments decompressed at the same time.
+        segment_size (int): The number of compressed bytes of each segment.
+
+    Returns:
+        Iterator[bytes]: The chunks of decompressed data, in order.
+
+    Raises:
+        ValueError: The file is not valid gzip data.
+    """
+
+    with (
+        open(path, "rb") as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        size = len(mapped)
+        position = 0
+        producers: Deque[_Producer] = deque()
+        queue_size = max(_QUEUE_SIZE, -(-segment_size * _SEGMENT_RATIO // _CHUNK_SIZE))
+
+        def start_producer(start: int) -> int:
+            """
+            Start decompressing the segment beginning at a position.
+
+            Parameters:
+                start (int): The position of the segment.
+
+            Returns:
+                int: The position of the next segment.
+            """
+
+            end = _next_gzip_member(mapped, start + segment_size)
+            producers.append(
+                _Producer(
+                    lambda emit: _decompress_gzip(mapped, start, end, emit),
+                    start,
+                    queue_size,
+                )
+            )
+
+            return end
+
+        try:
+            while position < size:
+                next_start = position
+
+                while producers or next_start < size:
+                    while len(producers) < threads and next_start < size:
+                        next_start = start_producer(next_start)
+
+                    producer = producers[0]
+
+                    # Segments not starting where the previous one ended
+                    # started within a member.
+                    if producer.start != position:
+                        producers.popleft().cancel()
+
+                        if producer.start < position:
+                            continue
+
+                        break
+
+                    yield from producer.chunks()
+
+                    position = producer.result
+                    producers.popleft()
+
+                while producers:
+                    producers.pop().cancel()
+        finally:
+            while producers:
+                producers.pop().cancel()
+
+
+def _read_zstd(path: Path, emit: Callable[[bytes], None]):
+    """
+    Decompress a zstandard file.
+
+    Parameters:
+        path (Path): The path of the compressed file.
+        emit (Callable[[bytes], None]): The function receiving the chunks of
+            decompressed data.
+
+    Raises:
+        ValueError: The file is not valid zstandard data.
+    """
+
+    with open(path, "rb") as file:
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            file, read_size=_CHUNK_SIZE, read_across_frames=True
+        )
+
+        try:
+            while chunk := reader.read(_CHUNK_SIZE):
+                emit(chunk)
+        except zstandard.ZstdError as error:
+            raise ValueError(f"The compressed input is invalid: {error}") from error
+
+
+class _ChunkReader(io.RawIOBase):
+    """
+    Readable stream of chunks of data.
+    """
+
+    def __init__(self, chunks: Iterator[bytes], on_close: Callable[[], None]):
+        """
+        Initialize the reader.
+
+        Parameters:
+            chunks (Iterator[bytes]): The chunks of data.
+            on_close (Callable[[], None]): The function stopping the production
+                of chunks when the reader is closed.
+        """
+
+        super().__init__()
+
+        self._chunks = chunks
+        self._on_close = on_close
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        """
+        Check whether the stream is readable.
+
+        Returns:
+            bool: Always true.
+        """
+
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """
+        Read data into a buffer.
+
+        Parameters:
+            buffer (Any): The writable buffer.
+
+        Returns:
+            int: The number of bytes read, or zero at the end of the data.
+        """
+
+        while not self._pending:
+            chunk = next(self._chunks, None)
+
+            if chunk is None:
+                return 0
+
+            self._pending = memoryview(chunk)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+
+        return size
+
+    def close(self):
+        """
+        Close the stream, stopping the production of chunks.
+        """
+
+        if not self.closed:
+            self._on_close()
+
+        super().close()
+
+
+def detect_compression(path: Path) -> Optional[Compression]:
+    """
+    Detect the compression format of a file by its magic bytes.
+
+    Only regular files are detected, since reading the magic bytes of pipes
+    would consume them.
+
+    Parameters:
+        path (Path): The path of the file.
+
+    Returns:
+        Optional[Compression]: The compression format, or `None` if the file
+            is not compressed or not regular.
+    """
+
+    if not path.is_file():
+        return None
+
+    with open(path, "rb") as file:
+        header = file.read(max(map(len, MAGIC_BYTES.values())))
+
+    for compression, magic in MAGIC_BYTES.items():
+        if header.startswith(magic):
+            return compression
+
+    return None
+
+
+def output_compression(path: Path) -> Optional[Compression]:
+    """
+    Select the compression format of an output file by its extension.
+
+    Parameters:
+        path (Path): The path of the file.
+
+    Returns:
+        Optional[Compression]: The compression format, or `None` if the file
+            is not compressed.
+    """
+
+    return OUTPUT_SUFFIXES.get(path.suffix.lower())
+
+
+def require_compression(compression: Compression):
+    """
+    Check that the library of a compression format is installed.
+
+    Parameters:
+        compression (Compression): The compression format.
+
+    Raises:
+        ImportError: The library of the compression format is not installed.
+    """
+
+    if compression == Compression.ZSTD and zstandard is None:
+        raise ImportError("The zstd compression requires zstandard to be installed.")
+
+
+def open_decompressed(
+    path: Path,
+    compression: Compression,
+    threads: int = DEFAULT_THREADS,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+) -> io.BufferedReader:
+    """
+    Open a compressed file for reading its decompressed data.
+
+    Parameters:
+        path (Path): The path of the compressed file.
+        compression (Compression): The compression format of the file.
+        threads (int): The number of threads decompressing gzip members.
+            Defaults to the number of processors, up to four.
+        segment_size (int): The number of compressed bytes of the gzip
+            segments decompressed in parallel. Defaults to 1 MiB.
+
+    Returns:
+        io.BufferedReader: The stream of decompressed data.
+
+    Raises:
+        ImportError: The library of the compression format is not installed.
+    """
+
+    require_compression(compression)
+
+    if compression == Compression.GZIP:
+        chunks = _read_gzip(path, threads, segment_size)
+        reader = _ChunkReader(chunks, chunks.close)
+    else:
+        producer = _Producer(lambda emit: _read_zstd(path, emit))
+        reader = _ChunkReader(producer.chunks(), producer.cancel)
+
+    return io.BufferedReader(reader, _CHUNK_SIZE)
+
+
+class _CompressedWriter(io.RawIOBase):
+    """
+    Writable stream compressing its data to a file in a background thread.
+    """
+
+    def __init__(self, path: Path, compression: Compression):
+        """
+        Initialize the writer, creating the file and starting its thread.
+
+        Parameters:
+            path (Path): The path of the compressed file.
+            compression (Compression): The compression format of the file.
+        """
+
+        super().__init__()
+
+        # pylint: disable-next=consider-using-with
+        self._file = open(path, "wb")
+        self._compressor: Any = (
+            zlib.compressobj(wbits=_GZIP_WBITS)
+            if compression == Compression.GZIP
+            else zstandard.ZstdCompressor().compressobj()
+        )
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(_QUEUE_SIZE)
+        self._error: Optional[Exception] = None
+        self._position = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """
+        Compress the queued chunks of data into the file.
+        """
+
+        compressor = self._compressor
+
+        try:
+            while (chunk := self._queue.get()) is not None:
+                self._file.write(compressor.compress(chunk))
+
+            self._file.write(compressor.flush())
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            self._error = error
+
+            # Consume the remaining chunks, so that the writer does not block.
+            while self._queue.get() is not None:
+                pass
+
+    def _check_error(self):
+        """
+        Raise the error of the background thread, if any.
+
+        Raises:
+            Exception: The error of the background thread.
+        """
+
+        if self._error is not None:
+            raise self._error
+
+    def writable(self) -> bool:
+        """
+        Check whether the stream is writable.
+
+        Returns:
+            bool: Always true.
+        """
+
+        return True
+
+    def write(self, data: Any) -> int:
+        """
+        Queue data to be compressed.
+
+        Parameters:
+            data (Any): The bytes-like data.
+
+        Returns:
+            int: The number of bytes written.
+        """
+
+        self._check_error()
+
+        chunk = bytes(data)
+        self._queue.put(chunk)
+        self._position += len(chunk)
+
+        return len(chunk)
+
+    def tell(self) -> int:
+        """
+        Get the number of decompressed bytes written.
+
+        Returns:
+            int: The number of bytes written.
+        """
+
+        return self._position
+
+    def close(self):
+        """
+        Compress the remaining data and close the file.
+        """
+
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+            self._file.close()
+            super().close()
+            self._check_error()
+
+
+def open_compressed(path: Path, compression: Compression) -> BinaryIO:
+    """
+    Create a compressed file for writing.
+
+    Compressed data is written to the file when the stream is closed or its
+    buffer fills up, and flushing the stream does not end a compressed block.
+
+    Parameters:
+        path (Path): The path of the compressed file.
+        compression (Compression): The compression format of the file.
+
+    Returns:
+        BinaryIO: The stream of data to compress.
+
+    Raises:
+        ImportError: The library of the compression format is not installed.
+    """
+
+    require_compression(compression)
+
+    return io.BufferedWriter(  # type: ignore
+        _CompressedWriter(path, compression), _CHUNK_SIZE
+    )
@@ -0,0 +1,423 @@
+"""
+Decoders module.
+
+This module provides a fast decoder for batches of financial operations
+that bypasses the pydantic validation machinery for well-formed input.
+Operations are parsed straight into lightweight `OperationRecord` instances
+with the same values produced by `OperationModel`. Any input outside the
+fast path is delegated to the pydantic validator, so malformed batches
+raise exactly the same validation errors.
+"""
+
+import math
+import re
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .codecs import JSON_CODEC, JsonCodec
+from .models import (
+    ACCOUNT_BATCH_ADAPTER,
+    OPERATION_ADAPTER,
+    OPERATIONS_ADAPTER,
+    OperationRecord,
+    OperationType,
+)
+
+#: Operation types indexed by their serialized value.
+_OPERATION_TYPES: Dict[str, OperationType] = {
+    operation_type.value: operation_type for operation_type in OperationType
+}
+
+#: Rounding exponent for financial values.
+_CENTS = Decimal("0.01")
+
+#: Maximum number of memoized unit costs.
+_UNIT_COST_CACHE_SIZE = 4096
+
+#: Memoized unit costs indexed by the type and value of their decoded JSON
+#: value or text, since equal integers and floats share a dictionary key.
+_unit_cost_cache: Dict[Tuple[type, Union[int, float, str]], Decimal] = {}
+
+#: Magnitude from which JSON floats may be integers parsed as floats by some
+#: codecs, such as orjson for integers beyond 64 bits.
+_FLOAT_INTEGER_LIMIT = float(2**63)
+
+#: Pattern of plain decimal texts, such as CSV fields, in the fast path.
+_DECIMAL_TEXT = re.compile(r"-?[0-9]+(?:\.[0-9]+)?")
+
+
+def _decode_unit_cost(value: Any) -> Optional[Decimal]:
+    """
+    Decode a unit cost value following the pydantic decimal semantics.
+
+    JSON floats are converted through their shortest representation,
+    matching how pydantic builds decimals from JSON numbers. Floats of 64-bit
+    integer magnitude are left to the validator, since they may be integers
+    of the JSON text parsed as floats.
+
+    Parameters:
+        value (Any): The decoded JSON value.
+
+    Returns:
+        Optional[Decimal]: The rounded unit cost, or `None` if the value
+            is outside the fast path.
+    """
+
+    value_type = type(value)
+
+    if value_type is not int and value_type is not float:
+        return None
+
+    key = (value_type, value)
+    unit_cost = _unit_cost_cache.get(key)
+
+    # Zero values are not memoized, since negative and positive zeros share a key.
+    if unit_cost is not None and value:
+        return unit_cost
+
+    if value_type is int:
+        unit_cost = Decimal(value)
+    elif math.isfinite(value) and abs(value) < _FLOAT_INTEGER_LIMIT:
+        unit_cost = Decimal(repr(value))
+    else:
+        return None
+
+    unit_cost = unit_cost.quantize(_CENTS, rounding=ROUND_HALF_UP)
+
+    if len(_unit_cost_cache) >= _UNIT_COST_CACHE_SIZE:
+        _unit_cost_cache.clear()
+
+    _unit_cost_cache[key] = unit_cost
+
+    return unit_cost
+
+
+def _decode_column_value(value: Any) -> Optional[Decimal]:
+    """
+    Decode a unit cost value of a column, such as a CSV field or an Arrow value.
+
+    Parameters:
+        value (Any): The column value.
+
+    Returns:
+        Optional[Decimal]: The rounded unit cost, or `None` if the value
+            is outside the fast path.
+    """
+
+    value_type = type(value)
+
+    if value_type is Decimal:
+        if not value.is_finite():
+            return None
+
+        return value.quantize(_CENTS, rounding=ROUND_HALF_UP)
+
+    if value_type is not str:
+        return _decode_unit_cost(value)
+
+    key = (str, value)
+    unit_cost = _unit_cost_cache.get(key)
+
+    if unit_cost is not None:
+        return unit_cost
+
+    if not _DECIMAL_TEXT.fullmatch(value):
+        return None
+
+    unit_cost = Decimal(value).quantize(_CENTS, rounding=ROUND_HALF_UP)
+
+    if len(_unit_cost_cache) >= _UNIT_COST_CACHE_SIZE:
+        _unit_cost_cache.clear()
+
+    _unit_cost_cache[key] = unit_cost
+
+    return unit_cost
+
+
+def _decode_operation(value: Any) -> Optional[OperationRecord]:
+    """
+    Decode a single operation into a lightweight record.
+
+    Parameters:
+        value (Any): The decoded JSON value.
+
+    Returns:
+        Optional[OperationRecord]: The decoded record, or `None` if the value
+            is outside the fast path.
+    """
+
+    if type(value) is not dict:  # pylint: disable=unidiomatic-typecheck
+        return None
+
+    operation = value.get("operation")
+    quantity = value.get("quantity")
+
+    # pylint: disable-next=unidiomatic-typecheck
+    if type(operation) is not str or type(quantity) is not int:
+        return None
+
+    operation_type = _OPERATION_TYPES.get(operation)
+
+    if operation_type is None:
+        return None
+
+    # Either the alias or the attribute name may be used, but not both.
+    if "unit-cost" in value:
+        if "unit_cost" in value:
+            return None
+
+        unit_cost = _decode_unit_cost(value["unit-cost"])
+    else:
+        unit_cost = _decode_unit_cost(value.get("unit_cost"))
+
+    if unit_cost is None:
+        return None
+
+    return OperationRecord(operation_type, quantity, unit_cost)
+
+
+def _decode_records(values: Any) -> Optional[List[OperationRecord]]:
+    """
+    Decode a list of operations into lightweight records.
+
+    Parameters:
+        values (Any): The decoded JSON value.
+
+    Returns:
+        Optional[List[OperationRecord]]: The decoded records, or `None` if
+            any value is outside the fast path.
+    """
+
+    if type(values) is not list:  # pylint: disable=unidiomatic-typecheck
+        return None
+
+    records = []
+
+    for value in values:
+        try:
+            record = _decode_operation(value)
+        except ArithmeticError:
+            record = None
+
+        if record is None:
+            return None
+
+        records.append(record)
+
+    return records
+
+
+def _decode_fallback(json_operations: Union[str, bytes]) -> List[OperationRecord]:
+    """
+    Decode a batch of operations using the pydantic validator.
+
+    Parameters:
+        json_operations (Union[str, bytes]): The JSON encoded batch of operations.
+
+    Returns:
+        List[OperationRecord]: The decoded records.
+
+    Raises:
+        ValidationError: The batch of operations is invalid.
+    """
+
+    return [
+        OperationRecord(operation.operation, operation.quantity, operation.unit_cost)
+        for operation in OPERATIONS_ADAPTER.validate_json(json_operations)
+    ]
+
+
+def decode_operations(
+    json_operations: Union[str, bytes], codec: JsonCodec = JSON_CODEC
+) -> List[OperationRecord]:
+    """
+    Decode a JSON encoded batch of operations into lightweight records.
+
+    The produced values are identical to the ones validated by
+    `OperationModel`, and invalid batches raise the same errors.
+
+    Parameters:
+        json_operations (Union[str, bytes]): The JSON encoded batch of operations.
+        codec (JsonCodec): The JSON codec decoding the batch. Defaults to the
+            standard library codec.
+
+    Returns:
+        List[OperationRecord]: The decoded records.
+
+    Raises:
+        ValidationError: The batch of operations is invalid.
+    """
+
+    try:
+        values = codec.loads(json_operations)
+    except (ValueError, RecursionError):
+        return _decode_fallback(json_operations)
+
+    records = _decode_records(values)
+
+    if records is None:
+        return _decode_fallback(json_operations)
+
+    return records
+
+
+def decode_values(values: Any) -> List[OperationRecord]:
+    """
+    Decode an already parsed batch of operations into lightweight records.
+
+    The produced values are identical to the ones validated by
+    `OperationModel` from the same Python values, and invalid batches
+    raise the same errors.
+
+    Parameters:
+        values (Any): The parsed batch of operations, such as a list of
+            dictionaries decoded from JSON.
+
+    Returns:
+        List[OperationRecord]: The decoded records.
+
+    Raises:
+        ValidationError: The batch of operations is invalid.
+    """
+
+    records = _decode_records(values)
+
+    if records is None:
+        return [
+            OperationRecord(
+                operation.operation, operation.quantity, operation.unit_cost
+            )
+            for operation in OPERATIONS_ADAPTER.validate_python(values)
+        ]
+
+    return records
+
+
+def decode_rows(
+    operations: Sequence[Any], quantities: Sequence[Any], unit_costs: Sequence[Any]
+) -> List[OperationRecord]:
+    """
+    Decode columns of operations into lightweight records.
+
+    Values may be typed, as read from Arrow columns, or text, as read from
+    CSV fields. The produced values are identical to the ones validated by
+    `OperationModel` from the values of each row, and invalid rows raise the
+    same errors.
+
+    Parameters:
+        operations (Sequence[Any]): The operation types of each row.
+        quantities (Sequence[Any]): The quantities of each row.
+        unit_costs (Sequence[Any]): The unit costs of each row.
+
+    Returns:
+        List[OperationRecord]: The decoded records.
+
+    Raises:
+        ValidationError: A row is invalid.
+    """
+
+    records = []
+
+    for operation, quantity, unit_cost in zip(operations, quantities, unit_costs):
+        operation_type = _OPERATION_TYPES.get(operation)
+        quantity_type = type(quantity)
+
+        if quantity_type is str and quantity.isascii() and quantity.isdigit():
+            quantity = int(quantity)
+        elif quantity_type is not int:
+            operation_type = None
+
+        decimal_unit_cost = _decode_column_value(unit_cost)
+
+        if operation_type is None or decimal_unit_cost is None:
+            model = OPERATION_ADAPTER.validate_python(
+                {"operation": operation, "quantity": quantity, "unit-cost": unit_cost}
+            )
+            records.append(
+                OperationRecord(model.operation, model.quantity, model.unit_cost)
+            )
+        else:
+            records.append(OperationRecord(operation_type, quantity, decimal_unit_cost))
+
+    return records
+
+
+def decode_account_batch(
+    json_batch: Union[str, bytes], codec: JsonCodec = JSON_CODEC
+) -> Tuple[str, List[OperationRecord]]:
+    """
+    Decode a JSON encoded batch of operations of an account into lightweight records.
+
+    The produced values are identical to the ones validated by
+    `AccountBatchModel`, and invalid batches raise the same errors.
+
+    Parameters:
+        json_batch (Union[str, bytes]): The JSON encoded batch of operations
+            of an account.
+        codec (JsonCodec): The JSON codec decoding the batch. Defaults to the
+            standard library codec.
+
+    Returns:
+        Tuple[str, List[OperationRecord]]: The account and the decoded records.
+
+    Raises:
+        ValidationError: The batch of operations is invalid.
+    """
+
+    try:
+        value = codec.loads(json_batch)
+    except (ValueError, RecursionError):
+        value = None
+
+    if type(value) is dict:  # pylint: disable=unidiomatic-typecheck
+        account = value.get("account")
+
+        # pylint: disable-next=unidiomatic-typecheck
+        if type(account) is str and account:
+            records = _decode_records(value.get("operations"))
+
+            if records is not None:
+                return account, records
+
+    batch = ACCOUNT_BATCH_ADAPTER.validate_json(json_batch)
+
+    return batch.account, [
+        OperationRecord(operation.operation, operation.quantity, operation.unit_cost)
+        for operation in batch.operations
+    ]
+
+
+def decode_operation(
+    json_operation: Union[str, bytes], codec: JsonCodec = JSON_CODEC
+) -> OperationRecord:
+    """
+    Decode a single JSON encoded operation into a lightweight record.
+
+    The produced values are identical to the ones validated by
+    `OperationModel`, and invalid operations raise the same errors.
+
+    Parameters:
+        json_operation (Union[str, bytes]): The JSON encoded operation.
+        codec (JsonCodec): The JSON codec decoding the operation. Defaults to
+            the standard library codec.
+
+    Returns:
+        OperationRecord: The decoded record.
+
+    Raises:
+        ValidationError: The operation is invalid.
+    """
+
+    try:
+        value = codec.loads(json_operation)
+        record = _decode_operation(value)
+    except (ValueError, RecursionError, ArithmeticError):
+        record = None
+
+    if record is None:
+        operation = OPERATION_ADAPTER.validate_json(json_operation)
+        record = OperationRecord(
+            operation.operation, operation.quantity, operation.unit_cost
+        )
+
+    return record
@@ -0,0 +1,106 @@
+"""
+Formatters module.
+
+This module writes financial values straight to JSON number text in the
+format of the `ResultModel` serialization: the shortest representation
+of the value, rounded to two decimal places, as a float. Values in cents
+below 1e15 have at most fifteen significant digits, so their shortest
+representation is their decimal digits without trailing fractional
+zeros, written without converting them to floats. Larger values are
+written through their float representation, which may use exponent
+notation.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable, List
+
+#: JSON encoded result of operations without tax.
+ZERO_JSON_RESULT = b'{"tax":0.0}'
+
+#: Exclusive bound of the values in cents written from their decimal digits.
+_MAX_EXACT_CENTS = 10**15
+
+#: Rounding exponent for financial values.
+_CENTS = Decimal("0.01")
+
+#: JSON fraction digits of each number of cents, without trailing zeros.
+_FRACTIONS: List[bytes] = [
+    b".%02d" % cents if cents % 10 else b".%d" % (cents // 10) for cents in range(100)
+]
+
+
+def format_cents(cents: int) -> bytes:
+    """
+    Format a value in cents as a JSON number.
+
+    Parameters:
+        cents (int): The value, in cents.
+
+    Returns:
+        bytes: The JSON number, matching the float serialization of the value.
+    """
+
+    if 0 <= cents < _MAX_EXACT_CENTS:
+        return b"%d%s" % (cents // 100, _FRACTIONS[cents % 100])
+
+    if -_MAX_EXACT_CENTS < cents < 0:
+        return b"-" + format_cents(-cents)
+
+    return repr(cents / 100).encode()
+
+
+def format_decimal(value: Decimal) -> bytes:
+    """
+    Format a decimal value as a JSON number, rounded to two decimal places.
+
+    Parameters:
+        value (Decimal): The decimal value.
+
+    Returns:
+        bytes: The JSON number, matching the serialization of `ResultModel` values.
+    """
+
+    value = value.quantize(_CENTS, rounding=ROUND_HALF_UP)
+    cents = int(value.scaleb(2))
+
+    # Negative values rounded to zero are serialized as negative floats.
+    if not cents and value.is_signed():
+        return b"-0.0"
+
+    return format_cents(cents)
+
+
+def encode_result(tax: int) -> bytes:
+    """
+    Encode a tax in cents as a JSON result.
+
+    Parameters:
+        tax (int): The tax of an operation, in cents.
+
+    Returns:
+        bytes: The JSON encoded result.
+    """
+
+    if not tax:
+        return ZERO_JSON_RESULT
+
+    return b'{"tax":%s}' % format_cents(tax)
+
+
+def encode_results(taxes: Iterable[int]) -> bytes:
+    """
+    Encode taxes in cents as JSON results.
+
+    Parameters:
+        taxes (Iterable[int]): The taxes of each operation, in cents.
+
+    Returns:
+        bytes: The JSON encoded results.
+    """
+
+    return b"[%s]" % b",".join(
+        [
+            (ZERO_JSON_RESULT if not tax else b'{"tax":%s}' % format_cents(tax))
+            for tax in taxes
+        ]
+    )
@@ -0,0 +1,216 @@
+"""
+History module.
+
+This module provides the incremental recalculation of the taxes of a
+history of operations after some of its operations are corrected. The
+`History` class keeps the taxes of each operation and sparse snapshots
+of the portfolio state every fixed number of operations. A correction is
+recalculated from the nearest snapshot preceding the first corrected
+operation, and the recalculation stops as soon as the portfolio state
+converges back to a recorded snapshot past the last corrected operation,
+since the following taxes cannot change.
+"""
+
+from typing import Iterable, Iterator, List, Mapping, Tuple, Union
+
+from .backends import Number
+from .calculators.tax import TaxCalculator
+from .formatters import format_cents
+from .models import EDIT_BATCH_ADAPTER, Operation
+from .pipeline import LineProcessor
+
+
+def encode_changes(changes: Iterable[Tuple[int, int]]) -> bytes:
+    """
+    Encode the changed taxes of a history as JSON results.
+
+    Parameters:
+        changes (Iterable[Tuple[int, int]]): The indexes of the changed
+            operations and their new taxes, in cents.
+
+    Returns:
+        bytes: The JSON encoded changes.
+    """
+
+    return b"[%s]" % b",".join(
+        [
+            b'{"index":%d,"tax":%s}' % (index, format_cents(tax))
+            for index, tax in changes
+        ]
+    )
+
+
+class History:
+    """
+    History of operations with incrementally recalculated taxes.
+    """
+
+    #: The operations of the history, in order.
+    operations: List[Operation]
+
+    #: The taxes of each operation, in cents.
+    taxes: List[int]
+
+    #: The number of operations between portfolio state snapshots.
+    interval: int
+
+    #: The number of operations recalculated by corrections.
+    recalculated: int
+
+    def __init__(
+        self,
+        calculator: TaxCalculator,
+        operations: Iterable[Operation],
+        interval: int = 64,
+    ):
+        """
+        Calculate the taxes of a history of operations.
+
+        Parameters:
+            calculator (TaxCalculator): The tax calculator, whose state is
+                reset and then used by the history.
+            operations (Iterable[Operation]): The operations of the history.
+            interval (int): The number of operations between portfolio state
+                snapshots. Defaults to 64.
+
+        Raises:
+            ValueError: The interval is not positive.
+        """
+
+        if interval < 1:
+            raise ValueError("The snapshot interval must be positive.")
+
+        self.operations = list(operations)
+        self.taxes = []
+        self.interval = interval
+        self.recalculated = 0
+
+        self._calculator = calculator
+        calculator.state.reset()
+
+        # The portfolio state before each multiple of the interval.
+        self._snapshots: List[Tuple[int, Number, Number]] = [
+            calculator.state.snapshot()
+        ]
+
+        for tax in self._calculate(0):
+            self.taxes.append(tax)
+
+            if len(self.taxes) % interval == 0:
+                self._snapshots.append(calculator.state.snapshot())
+
+    def _calculate(self, start: int) -> Iterator[int]:
+        """
+        Calculate the taxes of the operations following a snapshot.
+
+        Parameters:
+            start (int): The index of the first operation, a multiple of the interval.
+
+        Returns:
+            Iterator[int]: The taxes of each operation from the start, in cents.
+        """
+
+        calculator = self._calculator
+        calculator.state.restore(self._snapshots[start // self.interval])
+
+        return calculator.calculate(
+            self.operations[index] for index in range(start, len(self.operations))
+        )
+
+    def edit(self, edits: Mapping[int, Operation]) -> List[Tuple[int, int]]:
+        """
+        Correct operations of the history and recalculate the changed taxes.
+
+        Parameters:
+            edits (Mapping[int, Operation]): The corrected operations by index.
+
+        Returns:
+            List[Tuple[int, int]]: The indexes of the operations whose tax
+                changed and their new taxes, in cents, in order.
+
+        Raises:
+            ValueError: A corrected operation is not in the history.
+        """
+
+        if not edits:
+            return []
+
+        for index in edits:
+            if not 0 <= index < len(self.operations):
+                raise ValueError(f"Operation {index} is not in the history.")
+
+        for index, operation in edits.items():
+            self.operations[index] = operation
+
+        interval = self.interval
+        snapshots = self._snapshots
+        last_edit = max(edits)
+        position = min(edits) // interval * interval
+        changes = []
+
+        for tax in self._calculate(position):
+            if tax != self.taxes[position]:
+                self.taxes[position] = tax
+                changes.append((position, tax))
+
+            position += 1
+            self.recalculated += 1
+
+            if position % interval == 0:
+                snapshot = self._calculator.state.snapshot()
+                snapshot_index = position // interval
+
+                # The following taxes are unchanged once the state converges.
+                if position > last_edit and snapshot == snapshots[snapshot_index]:
+                    break
+
+                snapshots[snapshot_index] = snapshot
+
+        return changes
+
+
+def process_edits(
+    processor: LineProcessor, lines: Iterable[Union[str, bytes]], interval: int = 64
+) -> Iterator[bytes]:
+    """
+    Process a session of histories and corrections of their operations.
+
+    Each line holding a JSON array of operations starts a new history, and
+    yields its results. Each line holding a JSON object with a list of
+    `edits`, each with the `index` of an operation and the corrected
+    `operation`, corrects the current history, and yields the changed
+    results with their index.
+
+    Parameters:
+        processor (LineProcessor): The line processor, decoding histories
+            and providing the numeric backend.
+        lines (Iterable[Union[str, bytes]]): The lines of the session.
+        interval (int): The number of operations between portfolio state
+            snapshots. Defaults to 64.
+
+    Returns:
+        Iterator[bytes]: The JSON encoded results or changes for each line, in order.
+
+    Raises:
+        ValidationError: A line is invalid.
+        ValueError: A correction precedes the first history, or a corrected
+            operation is not in the current history.
+    """
+
+    calculator = processor.create_calculator()
+    history = None
+
+    for line in lines:
+        if line.lstrip()[:1] in (b"{", "{"):
+            batch = EDIT_BATCH_ADAPTER.validate_json(line)
+
+            if history is None:
+                raise ValueError("Corrections require a preceding history.")
+
+            yield encode_changes(
+                history.edit({edit.index: edit.operation for edit in batch.edits})
+            )
+        else:
+            history = History(calculator, processor.decode(line), interval)
+
+            yield processor.json_codec.encode_results(history.taxes)
@@ -0,0 +1,225 @@
+"""
+Hooks module.
+
+This module defines the instrumentation hooks called around each stage
+of the processing of lines of input and around each operation dispatch.
+Hooks are optional: when no hooks are installed, processing takes the
+uninstrumented code paths, so disabled hooks cost a single check per
+line.
+"""
+
+import time
+from enum import Enum
+from typing import Callable, Iterable, Iterator, List, Sequence, TypeVar
+
+from .models import OperationType
+
+ItemT = TypeVar("ItemT")
+
+
+class Stage(str, Enum):
+    """
+    Enumeration for stages of the processing of lines of input.
+    """
+
+    #: Reading lines of input.
+    READ = "read"
+
+    #: Decoding and validating operations.
+    PARSE = "parse"
+
+    #: Calculating taxes.
+    COMPUTE = "compute"
+
+    #: Encoding results.
+    SERIALIZE = "serialize"
+
+    #: Writing results to the output.
+    WRITE = "write"
+
+
+class ProcessingHooks:
+    """
+    Base class for instrumentation hooks.
+
+    All hooks do nothing by default, and subclasses override the events
+    they observe. Stage and operation events require reading the clock
+    several times per line or per operation, and are only reported to hooks
+    enabling them.
+    """
+
+    #: Whether the hooks observe the time spent in each stage.
+    observe_stages: bool = True
+
+    #: Whether the hooks observe each operation dispatch.
+    observe_operations: bool = True
+
+    def stage(self, stage: Stage, seconds: float):
+        """
+        Observe the time spent in a stage.
+
+        Parameters:
+            stage (Stage): The processing stage.
+            seconds (float): The time spent in the stage, in seconds.
+        """
+
+    def operation(self, operation_type: OperationType, seconds: float):
+        """
+        Observe the dispatch of an operation to its handler.
+
+        Parameters:
+            operation_type (OperationType): The type of the operation.
+            seconds (float): The time spent processing the operation, in seconds.
+        """
+
+    def line(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, operations: int, input_bytes: int, output_bytes: int, seconds: float
+    ):
+        """
+        Observe the processing of a line of input.
+
+        Parameters:
+            operations (int): The number of operations in the line.
+            input_bytes (int): The size of the line of input.
+            output_bytes (int): The size of the results of the line.
+            seconds (float): The time spent decoding, calculating and encoding
+                the line, in seconds. With the columnar engine, the time of a
+                batch of lines is shared equally among its lines.
+        """
+
+    def error(self, error: Exception):
+        """
+        Observe an invalid line of input.
+
+        Parameters:
+            error (Exception): The error raised by the line.
+        """
+
+
+class HookGroup(ProcessingHooks):
+    """
+    Instrumentation hooks reporting events to several hooks.
+    """
+
+    #: The hooks receiving the events.
+    hooks: List[ProcessingHooks]
+
+    def __init__(self, hooks: Sequence[ProcessingHooks]):
+        """
+        Initialize the group of hooks.
+
+        Parameters:
+            hooks (Sequence[ProcessingHooks]): The hooks receiving the events.
+        """
+
+        self.hooks = list(hooks)
+        self.observe_stages = any(hook.observe_stages for hook in self.hooks)
+        self.observe_operations = any(hook.observe_operations for hook in self.hooks)
+
+    def stage(self, stage: Stage, seconds: float):
+        """
+        Report the time spent in a stage to the hooks.
+
+        Parameters:
+            stage (Stage): The processing stage.
+            seconds (float): The time spent in the stage, in seconds.
+        """
+
+        for hook in self.hooks:
+            hook.stage(stage, seconds)
+
+    def operation(self, operation_type: OperationType, seconds: float):
+        """
+        Report the dispatch of an operation to the hooks.
+
+        Parameters:
+            operation_type (OperationType): The type of the operation.
+            seconds (float): The time spent processing the operation, in seconds.
+        """
+
+        for hook in self.hooks:
+            hook.operation(operation_type, seconds)
+
+    def line(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, operations: int, input_bytes: int, output_bytes: int, seconds: float
+    ):
+        """
+        Report the processing of a line of input to the hooks.
+
+        Parameters:
+            operations (int): The number of operations in the line.
+            input_bytes (int): The size of the line of input.
+            output_bytes (int): The size of the results of the line.
+            seconds (float): The time spent processing the line, in seconds.
+        """
+
+        for hook in self.hooks:
+            hook.line(operations, input_bytes, output_bytes, seconds)
+
+    def error(self, error: Exception):
+        """
+        Report an invalid line of input to the hooks.
+
+        Parameters:
+            error (Exception): The error raised by the line.
+        """
+
+        for hook in self.hooks:
+            hook.error(error)
+
+
+def timed_iterator(
+    iterable: Iterable[ItemT], hooks: ProcessingHooks, stage: Stage
+) -> Iterator[ItemT]:
+    """
+    Iterate over items, reporting the time spent producing each item as a stage.
+
+    Parameters:
+        iterable (Iterable[ItemT]): The items.
+        hooks (ProcessingHooks): The instrumentation hooks.
+        stage (Stage): The stage of the time spent producing items.
+
+    Returns:
+        Iterator[ItemT]: The items, in order.
+    """
+
+    iterator = iter(iterable)
+    clock = time.perf_counter
+
+    while True:
+        start = clock()
+
+        try:
+            item = next(iterator)
+        except StopIteration:
+            hooks.stage(stage, clock() - start)
+            return
+
+        hooks.stage(stage, clock() - start)
+
+        yield item
+
+
+def timed_call(
+    function: Callable[[ItemT], None], hooks: ProcessingHooks, stage: Stage
+) -> Callable[[ItemT], None]:
+    """
+    Wrap a function, reporting the time spent in each call as a stage.
+
+    Parameters:
+        function (Callable[[ItemT], None]): The function.
+        hooks (ProcessingHooks): The instrumentation hooks.
+        stage (Stage): The stage of the time spent in the function.
+
+    Returns:
+        Callable[[ItemT], None]: The wrapped function.
+    """
+
+    clock = time.perf_counter
+
+    def wrapper(item: ItemT):
+        start = clock()
+        function(item)
+        hooks.stage(stage, clock() - start)
+
+    return wrapper
@@ -0,0 +1,457 @@
+"""
+Metrics module.
+
+This module defines the `MetricsCollector` class, instrumentation hooks
+counting the lines, operations and bytes processed and the invalid lines,
+and recording per-line latency histograms split by the number of
+operations per line. Metrics can be exported periodically to a file in
+the Prometheus text format, and summarized as JSON at the end of a run.
+"""
+
+import json
+import math
+import os
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .hooks import ProcessingHooks
+
+#: Upper bounds of the per-line latency histogram buckets, in seconds.
+LATENCY_BOUNDS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    math.inf,
+)
+
+#: Upper bounds of the operations per line buckets.
+OPERATION_BOUNDS = (1, 10, 100, 1000, 10000, math.inf)
+
+#: The number of line events buffered before folding them into the metrics.
+_FOLD_LINES = 256
+
+
+def _format_bound(bound: float) -> str:
+    """
+    Format a bucket bound as a Prometheus label value.
+
+    Parameters:
+        bound (float): The bucket bound.
+
+    Returns:
+        str: The label value.
+    """
+
+    return "+Inf" if bound == math.inf else repr(bound)
+
+
+def _operation_bucket_labels() -> List[str]:
+    """
+    Build the labels of the operations per line buckets.
+
+    Returns:
+        List[str]: The label of each bucket, as an inclusive range.
+    """
+
+    labels = []
+    lower = 0
+
+    for bound in OPERATION_BOUNDS:
+        if bound == math.inf:
+            labels.append(f"{lower}+")
+        else:
+            labels.append(f"{lower}-{bound}")
+            lower = int(bound) + 1
+
+    return labels
+
+
+#: Labels of the operations per line buckets.
+OPERATION_BUCKET_LABELS = _operation_bucket_labels()
+
+
+class Histogram:
+    """
+    Histogram of observed values with fixed bucket bounds.
+    """
+
+    #: The upper bounds of the buckets, in ascending order.
+    bounds: Sequence[float]
+
+    #: The number of observations in each bucket.
+    counts: List[int]
+
+    #: The sum of the observed values.
+    total: float
+
+    def __init__(self, bounds: Sequence[float]):
+        """
+        Initialize an empty histogram.
+
+        Parameters:
+            bounds (Sequence[float]): The upper bounds of the buckets, in
+                ascending order, ending with infinity.
+        """
+
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.total = 0.0
+
+    @property
+    def count(self) -> int:
+        """
+        The number of observations.
+
+        Returns:
+            int: The number of observations.
+        """
+
+        return sum(self.counts)
+
+    def observe(self, value: float):
+        """
+        Count an observed value in its bucket.
+
+        Parameters:
+            value (float): The observed value.
+        """
+
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def cumulative_counts(self) -> List[int]:
+        """
+        Count the observations less than or equal to each bound.
+
+        Returns:
+            List[int]: The cumulative count of each bucket.
+        """
+
+        cumulative_counts = []
+        count = 0
+
+        for bucket_count in self.counts:
+            count += bucket_count
+            cumulative_counts.append(count)
+
+        return cumulative_counts
+
+
+class MetricsCollector(ProcessingHooks):  # pylint: disable=too-many-instance-attributes
+    """
+    Instrumentation hooks collecting throughput counters and latency histograms.
+
+    Line events are buffered and folded into the counters and histograms in
+    batches, keeping the cost of each event to a list append.
+    """
+
+    observe_stages = False
+    observe_operations = False
+
+    #: The path of the Prometheus text file exported periodically, if any.
+    export_path: Optional[str]
+
+    #: The number of seconds between periodic exports.
+    export_interval: float
+
+    def __init__(
+        self, export_path: Optional[str] = None, export_interval: float = 10.0
+    ):
+        """
+        Initialize the metrics collector.
+
+        Parameters:
+            export_path (Optional[str]): The path of the Prometheus text file
+                exported periodically. Defaults to none.
+            export_interval (float): The number of seconds between periodic
+                exports. Defaults to 10 seconds.
+        """
+
+        self.export_path = export_path
+        self.export_interval = export_interval
+
+        self._lines = 0
+        self._operations = 0
+        self._input_bytes = 0
+        self._output_bytes = 0
+        self._validation_failures = 0
+        self._latencies = {
+            label: Histogram(LATENCY_BOUNDS) for label in OPERATION_BUCKET_LABELS
+        }
+        self._histograms = [self._latencies[label] for label in OPERATION_BUCKET_LABELS]
+        self._pending: List[Tuple[int, int, int, float]] = []
+        self._unchecked_seconds = 0.0
+        self._start = time.monotonic()
+        self._last_export = self._start
+
+    def _fold(self):
+        """
+        Fold the buffered line events into the counters and histograms.
+        """
+
+        pending = self._pending
+
+        if not pending:
+            return
+
+        operations, input_bytes, output_bytes, seconds = zip(*pending)
+        histograms = self._histograms
+
+        self._lines += len(pending)
+        self._operations += sum(operations)
+        self._input_bytes += sum(input_bytes)
+        self._output_bytes += sum(output_bytes)
+
+        for line_operations, line_seconds in zip(operations, seconds):
+            histogram = histograms[bisect_left(OPERATION_BOUNDS, line_operations)]
+            histogram.counts[bisect_left(LATENCY_BOUNDS, line_seconds)] += 1
+            histogram.total += line_seconds
+
+        pending.clear()
+
+    @property
+    def lines(self) -> int:
+        """
+        The number of lines processed.
+
+        Returns:
+            int: The number of lines processed.
+        """
+
+        self._fold()
+
+        return self._lines
+
+    @property
+    def operations(self) -> int:
+        """
+        The number of operations processed.
+
+        Returns:
+            int: The number of operations processed.
+        """
+
+        self._fold()
+
+        return self._operations
+
+    @property
+    def input_bytes(self) -> int:
+        """
+        The number of bytes of input processed, excluding line breaks.
+
+        Returns:
+            int: The number of bytes of input processed.
+        """
+
+        self._fold()
+
+        return self._input_bytes
+
+    @property
+    def output_bytes(self) -> int:
+        """
+        The number of bytes of results produced, excluding line breaks.
+
+        Returns:
+            int: The number of bytes of results produced.
+        """
+
+        self._fold()
+
+        return self._output_bytes
+
+    @property
+    def validation_failures(self) -> int:
+        """
+        The number of invalid lines.
+
+        Returns:
+            int: The number of invalid lines.
+        """
+
+        return self._validation_failures
+
+    @property
+    def latencies(self) -> Dict[str, Histogram]:
+        """
+        The per-line latency histograms, by operations per line bucket.
+
+        Returns:
+            Dict[str, Histogram]: The latency histogram of each bucket.
+        """
+
+        self._fold()
+
+        return self._latencies
+
+    def line(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, operations: int, input_bytes: int, output_bytes: int, seconds: float
+    ):
+        """
+        Count a line of input and record its latency.
+
+        Parameters:
+            operations (int): The number of operations in the line.
+            input_bytes (int): The size of the line of input.
+            output_bytes (int): The size of the results of the line.
+            seconds (float): The time spent processing the line, in seconds.
+        """
+
+        pending = self._pending
+        pending.append((operations, input_bytes, output_bytes, seconds))
+        self._unchecked_seconds += seconds
+
+        # Read the clock only once per batch of lines, or once the lines
+        # since the last check took at least the export interval.
+        if len(pending) >= _FOLD_LINES:
+            self._fold()
+            self._check_export()
+        elif self._unchecked_seconds >= self.export_interval:
+            self._check_export()
+
+    def _check_export(self):
+        """
+        Export the metrics if the export interval elapsed since the last export.
+        """
+
+        self._unchecked_seconds = 0.0
+
+        if (
+            self.export_path is not None
+            and time.monotonic() - self._last_export >= self.export_interval
+        ):
+            self.export()
+
+    def error(self, error: Exception):
+        """
+        Count an invalid line of input.
+
+        Parameters:
+            error (Exception): The error raised by the line.
+        """
+
+        self._validation_failures += 1
+
+    def to_prometheus(self) -> str:
+        """
+        Format the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics in the Prometheus text format.
+        """
+
+        rows = []
+
+        for name, description, value in [
+            ("lines", "Lines of input processed.", self.lines),
+            ("operations", "Operations processed.", self.operations),
+            ("input_bytes", "Bytes of input processed.", self.input_bytes),
+            ("output_bytes", "Bytes of results produced.", self.output_bytes),
+            (
+                "validation_failures",
+                "Invalid lines of input.",
+                self.validation_failures,
+            ),
+        ]:
+            rows.append(f"# HELP capital_gains_{name}_total {description}")
+            rows.append(f"# TYPE capital_gains_{name}_total counter")
+            rows.append(f"capital_gains_{name}_total {value}")
+
+        metric = "capital_gains_line_latency_seconds"
+        rows.append(f"# HELP {metric} Processing time of a line of input.")
+        rows.append(f"# TYPE {metric} histogram")
+
+        for label, histogram in self.latencies.items():
+            for bound, count in zip(histogram.bounds, histogram.cumulative_counts()):
+                rows.append(
+                    f'{metric}_bucket{{operations="{label}",'
+                    f'le="{_format_bound(bound)}"}} {count}'
+                )
+
+            rows.append(f'{metric}_sum{{operations="{label}"}} {histogram.total!r}')
+            rows.append(f'{metric}_count{{operations="{label}"}} {histogram.count}')
+
+        return "\n".join(rows) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the metrics of the run.
+
+        Returns:
+            Dict[str, Any]: The counters, throughput and latency histograms.
+        """
+
+        seconds = time.monotonic() - self._start
+
+        return {
+            "seconds": seconds,
+            "lines": self.lines,
+            "operations": self.operations,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            "validation_failures": self.validation_failures,
+            "lines_per_second": self.lines / seconds if seconds else 0.0,
+            "operations_per_second": self.operations / seconds if seconds else 0.0,
+            "latency_seconds": {
+                label: {
+                    "count": histogram.count,
+                    "sum": histogram.total,
+                    "buckets": {
+                        _format_bound(bound): count
+                        for bound, count in zip(
+                            histogram.bounds, histogram.cumulative_counts()
+                        )
+                    },
+                }
+                for label, histogram in self.latencies.items()
+                if histogram.count
+            },
+        }
+
+    def export(self):
+        """
+        Write the metrics to the export file in the Prometheus text format.
+
+        The file is replaced atomically, so readers never see a partial export.
+        """
+
+        if self.export_path is None:
+            return
+
+        temporary_path = f"{self.export_path}.tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as export_file:
+            export_file.write(self.to_prometheus())
+
+        os.replace(temporary_path, self.export_path)
+        self._last_export = time.monotonic()
+
+    def write_summary(self, path: str):
+        """
+        Write the summary of the metrics to a JSON file.
+
+        Parameters:
+            path (str): The path of the JSON file.
+        """
+
+        with open(path, "w", encoding="utf-8") as summary_file:
+            json.dump(self.summary(), summary_file, indent=2)
+            summary_file.write("\n")
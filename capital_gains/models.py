@@ -9,8 +9,9 @@ foundation for handling structured data within the system.
 
 from decimal import ROUND_HALF_UP, Decimal
 from enum import Enum
+from typing import List, NamedTuple, Union
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
 
 
 class OperationType(str, Enum):
@@ -77,6 +78,39 @@ class OperationModel(BaseDecimalModel):
     unit_cost: Decimal = Field(..., alias="unit-cost")
 
 
+class AccountBatchModel(BaseModel):
+    """
+    Model representing a batch of financial operations of an account.
+    """
+
+    #: The identifier of the account.
+    account: str = Field(..., min_length=1)
+
+    #: The operations applied to the account, in order.
+    operations: List[OperationModel]
+
+
+class EditModel(BaseModel):
+    """
+    Model representing the correction of an operation of a history.
+    """
+
+    #: The index of the corrected operation in the history.
+    index: int = Field(..., ge=0)
+
+    #: The corrected operation.
+    operation: OperationModel
+
+
+class EditBatchModel(BaseModel):
+    """
+    Model representing a batch of corrections applied to a history at once.
+    """
+
+    #: The corrections of the batch.
+    edits: List[EditModel]
+
+
 class ResultModel(BaseDecimalModel):
     """
     Model representing a calculation result.
@@ -84,3 +118,50 @@ class ResultModel(BaseDecimalModel):
 
     #: Results of a tax calculation.
     tax: Decimal
+
+
+#: Rounded tax of operations without tax.
+ZERO_TAX = Decimal("0.00")
+
+#: Compiled validator for single operations.
+OPERATION_ADAPTER: TypeAdapter[OperationModel] = TypeAdapter(OperationModel)
+
+#: Compiled serializer for single results.
+RESULT_ADAPTER: TypeAdapter[ResultModel] = TypeAdapter(ResultModel)
+
+#: Compiled validator for batches of operations.
+OPERATIONS_ADAPTER: TypeAdapter[List[OperationModel]] = TypeAdapter(
+    List[OperationModel]
+)
+
+#: Compiled validator for batches of operations of an account.
+ACCOUNT_BATCH_ADAPTER: TypeAdapter[AccountBatchModel] = TypeAdapter(AccountBatchModel)
+
+#: Compiled validator for batches of corrections of a history.
+EDIT_BATCH_ADAPTER: TypeAdapter[EditBatchModel] = TypeAdapter(EditBatchModel)
+
+#: Compiled serializer for batches of results.
+RESULTS_ADAPTER: TypeAdapter[List[ResultModel]] = TypeAdapter(List[ResultModel])
+
+
+class OperationRecord(NamedTuple):
+    """
+    Lightweight record representing a validated financial operation.
+
+    This record mirrors the attributes of `OperationModel` without the
+    validation and serialization machinery, and can be processed by
+    calculators in place of the model.
+    """
+
+    #: The type of operation.
+    operation: OperationType
+
+    #: The quantity of shares traded in the operation.
+    quantity: int
+
+    #: The unit price of the stock, rounded to two decimal places.
+    unit_cost: Decimal
+
+
+#: Any representation of a financial operation accepted by calculators.
+Operation = Union[OperationModel, OperationRecord]
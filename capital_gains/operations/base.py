@@ -10,7 +10,8 @@ processed uniformly.
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar
 
-from ..models import OperationModel, ResultModel
+from ..backends import Number
+from ..models import Operation, ResultModel
 
 StateTypeT = TypeVar("StateTypeT")
 
@@ -26,7 +27,24 @@ class BaseOperation(ABC, Generic[StateTypeT]):
     """
 
     @abstractmethod
-    def process(self, operation: OperationModel, state: StateTypeT) -> ResultModel:
+    def calculate(self, operation: Operation, state: StateTypeT) -> Number:
+        """
+        Calculate the tax of a financial operation.
+
+        This method must be implemented by subclasses to define how to
+        execute a specific operation type and update the given state,
+        without building a result model.
+
+        Parameters:
+            operation (Operation): The operation details.
+            state (StateTypeT): The current state of the calculation.
+
+        Returns:
+            Number: The unrounded tax, in the numeric representation of the state.
+        """
+
+    @abstractmethod
+    def process(self, operation: Operation, state: StateTypeT) -> ResultModel:
         """
         Process a financial operation.
 
@@ -34,7 +52,7 @@ class BaseOperation(ABC, Generic[StateTypeT]):
         execute a specific operation type and update the given state.
 
         Parameters:
-            operation (OperationModel): The operation details.
+            operation (Operation): The operation details.
             state (StateTypeT): The current state of the calculation.
 
         Returns:
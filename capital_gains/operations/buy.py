@@ -7,9 +7,8 @@ the `BaseOperation` class and implements the logic required to
 process buy transactions while updating the portfolio state.
 """
 
-from decimal import Decimal
-
-from ..models import OperationModel, ResultModel
+from ..backends import Number
+from ..models import ZERO_TAX, Operation, ResultModel
 from ..states import PortfolioState
 from .base import BaseOperation
 
@@ -23,30 +22,51 @@ class BuyOperation(BaseOperation[PortfolioState]):
     the provided operation details.
     """
 
-    def process(self, operation: OperationModel, state: PortfolioState) -> ResultModel:
+    def calculate(self, operation: Operation, state: PortfolioState) -> Number:
         """
-        Process a buy operation.
+        Calculate the tax of a buy operation.
 
         This method updates the portfolio state with the new total shares
-        and average cost, and returns the tax result of the operation.
+        and average cost, and returns the tax of the operation.
 
         Parameters:
-            operation (OperationModel): The operation details.
+            operation (Operation): The operation details.
             state (PortfolioState): The current state of the portfolio.
 
         Returns:
-            ResultModel: The result of processing the operation.
+            Number: The tax of the operation, which is always zero.
         """
 
+        backend = state.backend
+
         total_cost = (state.total_shares * state.average_cost) + (
-            operation.quantity * operation.unit_cost
+            operation.quantity * backend.from_decimal(operation.unit_cost)
         )
 
         # Increase the total shares in the portfolio by the quantity bought.
         state.total_shares += operation.quantity
 
         # Calculate the average cost per share.
-        state.average_cost = total_cost / state.total_shares
+        state.average_cost = backend.divide(total_cost, state.total_shares)
 
         # No tax for buy operations.
-        return ResultModel(tax=Decimal("0"))
+        return backend.zero
+
+    def process(self, operation: Operation, state: PortfolioState) -> ResultModel:
+        """
+        Process a buy operation.
+
+        This method updates the portfolio state with the new total shares
+        and average cost, and returns the tax result of the operation.
+
+        Parameters:
+            operation (Operation): The operation details.
+            state (PortfolioState): The current state of the portfolio.
+
+        Returns:
+            ResultModel: The result of processing the operation.
+        """
+
+        self.calculate(operation, state)
+
+        return ResultModel.model_construct(tax=ZERO_TAX)
@@ -9,7 +9,8 @@ process sell transactions while updating the portfolio state.
 
 from decimal import Decimal
 
-from ..models import OperationModel, ResultModel
+from ..backends import Number
+from ..models import ZERO_TAX, Operation, ResultModel
 from ..states import PortfolioState
 from .base import BaseOperation
 
@@ -29,26 +30,28 @@ class SellOperation(BaseOperation[PortfolioState]):
     #: The percentage rate at which tax is applied to profits.
     tax_percentage: Decimal = Decimal(0.2)
 
-    def process(self, operation: OperationModel, state: PortfolioState) -> ResultModel:
+    def calculate(self, operation: Operation, state: PortfolioState) -> Number:
         """
-        Process a sell operation.
+        Calculate the tax of a sell operation.
 
         This method updates the portfolio based on the sale of shares,
         calculates profit or loss, and determines the tax owed, if any.
 
         Parameters:
-            operation (OperationModel): The operation details.
+            operation (Operation): The operation details.
             state (PortfolioState): The current state of the portfolio.
 
         Returns:
-            ResultModel: The result of processing the operation.
+            Number: The unrounded tax, in the numeric representation of the state.
         """
 
+        backend = state.backend
+
         # Decrease the total shares in the portfolio by the quantity sold.
         state.total_shares -= operation.quantity
 
         # Calculate the sale value based on operation details.
-        sale_value = operation.quantity * operation.unit_cost
+        sale_value = operation.quantity * backend.from_decimal(operation.unit_cost)
 
         # Calculate the cost value based on average cost to verify profit or loss.
         cost_value = operation.quantity * state.average_cost
@@ -57,25 +60,47 @@ class SellOperation(BaseOperation[PortfolioState]):
         profit = sale_value - cost_value
 
         # If there is no profit or a loss, apply the loss to total loss and return no tax.
-        if profit <= Decimal("0"):
+        if profit <= backend.zero:
             # This loss will be reduced from subsequent profits.
             state.total_loss -= profit
 
-            return ResultModel(tax=Decimal("0"))
+            return backend.zero
 
         # If the total sale value is less than or equal to the exempt threshold, return no tax.
-        if sale_value <= self.exempt_tax_sale_threshold:
-            return ResultModel(tax=Decimal("0"))
+        if sale_value <= backend.from_decimal(self.exempt_tax_sale_threshold):
+            return backend.zero
 
         # Calculate taxable profit after accounting for previous losses, and
         # update total loss, reducing it by the profit realized from this sale.
-        taxable_profit = max(Decimal("0"), profit - state.total_loss)
-        state.total_loss = max(Decimal("0"), state.total_loss - profit)
+        taxable_profit = max(backend.zero, profit - state.total_loss)
+        state.total_loss = max(backend.zero, state.total_loss - profit)
 
         # If there is taxable profit, calculate the tax owed using
         # tax percentage rate and return it.
-        if taxable_profit > Decimal("0"):
-            return ResultModel(tax=taxable_profit * self.tax_percentage)
+        if taxable_profit > backend.zero:
+            return backend.scale(taxable_profit, self.tax_percentage)
 
         # Otherwise return no tax.
-        return ResultModel(tax=Decimal("0"))
+        return backend.zero
+
+    def process(self, operation: Operation, state: PortfolioState) -> ResultModel:
+        """
+        Process a sell operation.
+
+        This method updates the portfolio based on the sale of shares,
+        calculates profit or loss, and returns the tax result of the operation.
+
+        Parameters:
+            operation (Operation): The operation details.
+            state (PortfolioState): The current state of the portfolio.
+
+        Returns:
+            ResultModel: The result of processing the operation.
+        """
+
+        tax = self.calculate(operation, state)
+
+        if tax == state.backend.zero:
+            return ResultModel.model_construct(tax=ZERO_TAX)
+
+        return ResultModel(tax=state.backend.to_decimal(tax))
@@ -0,0 +1,88 @@
+"""
+Options module.
+
+This module defines the enumerations and defaults of the processing
+options. It only depends on the standard library, so the command-line
+interface can declare its options without importing the processing
+pipeline and its dependencies.
+"""
+
+from enum import Enum
+
+#: The default TCP port of the server.
+DEFAULT_PORT = 8765
+
+#: The names of the standard workloads, in the order of their definitions.
+WORKLOAD_NAMES = ("tiny-lines", "huge-line", "sell-heavy", "loss-carry")
+
+
+class Engine(str, Enum):
+    """
+    Enumeration for tax calculation engines.
+    """
+
+    #: Calculate taxes one operation at a time with decimals.
+    DECIMAL = "decimal"
+
+    #: Calculate taxes of whole batches of lines with NumPy column arrays.
+    NUMPY = "numpy"
+
+
+class Backend(str, Enum):
+    """
+    Enumeration for numeric backends of the decimal engine.
+    """
+
+    #: Represent financial values with decimals.
+    DECIMAL = "decimal"
+
+    #: Represent financial values with scaled integers.
+    FIXED = "fixed"
+
+
+class Codec(str, Enum):
+    """
+    Enumeration for JSON codecs decoding operations and encoding results.
+    """
+
+    #: Use the fastest installed codec, falling back to the standard library.
+    AUTO = "auto"
+
+    #: Decode and encode with the standard library.
+    JSON = "json"
+
+    #: Decode and encode with orjson.
+    ORJSON = "orjson"
+
+
+class DataFormat(str, Enum):
+    """
+    Enumeration for input and output data formats.
+    """
+
+    #: One JSON array of operations, or of results, per line.
+    JSONL = "jsonl"
+
+    #: Comma-separated values with a header row.
+    CSV = "csv"
+
+    #: Arrow IPC stream or file. Requires PyArrow.
+    ARROW = "arrow"
+
+    #: Parquet file. Requires PyArrow.
+    PARQUET = "parquet"
+
+    #: Length-prefixed frames of packed operation and result records.
+    BINARY = "binary"
+
+
+class Compression(str, Enum):
+    """
+    Enumeration for compression formats of input and output files.
+    """
+
+    #: Gzip, with any number of members.
+    GZIP = "gzip"
+
+    #: Zstandard, with any number of frames. Requires zstandard.
+    ZSTD = "zstd"
@@ -0,0 +1,131 @@
+"""
+Parallel processing module.
+
+This module distributes lines of input across a pool of worker processes.
+Lines are grouped into chunks, and a bounded window of in-flight chunks
+keeps memory usage constant regardless of the input size. Results are
+yielded in the original input order. The line processor is sent once to
+each worker process when it starts, rather than with every chunk.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .pipeline import LineProcessor
+
+#: The line processor of the worker process, set when the worker starts.
+_worker_processor: Optional[LineProcessor] = None  # pylint: disable=invalid-name
+
+
+def _initialize_worker(processor: LineProcessor):
+    """
+    Set the line processor of a worker process.
+
+    Parameters:
+        processor (LineProcessor): The line processor.
+    """
+
+    global _worker_processor  # pylint: disable=global-statement
+
+    _worker_processor = processor
+
+
+def _process_chunk(
+    lines: List[Union[str, bytes]],
+) -> Tuple[List[bytes], Optional[Exception]]:
+    """
+    Process a chunk of lines with the line processor of a worker process.
+
+    Processing stops at the first invalid line, and the error is returned
+    along with the results of the preceding lines.
+
+    Parameters:
+        lines (List[Union[str, bytes]]): The chunk of lines.
+
+    Returns:
+        Tuple[List[bytes], Optional[Exception]]: The JSON encoded results for
+            each processed line, in order, and the error raised, if any.
+    """
+
+    assert _worker_processor is not None
+
+    results: List[bytes] = []
+
+    try:
+        results.extend(_worker_processor.process_lines(lines))
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        return results, error
+
+    return results, None
+
+
+def process_parallel(
+    processor: LineProcessor,
+    lines: Iterable[Union[str, bytes]],
+    workers: int,
+    chunk_size: int = 256,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Process lines of input across a pool of worker processes.
+
+    Lines are read lazily from the input, and at most `max_in_flight`
+    chunks are submitted to the pool at any time. If a line fails, the
+    results of all preceding lines are yielded before the error is raised.
+
+    Parameters:
+        processor (LineProcessor): The line processor.
+        lines (Iterable[Union[str, bytes]]): The JSON encoded batches of operations.
+        workers (int): The number of worker processes.
+        chunk_size (int): The number of lines per chunk. Defaults to 256.
+        max_in_flight (Optional[int]): The maximum number of pending chunks.
+            Defaults to twice the number of workers.
+
+    Returns:
+        Iterator[bytes]: The JSON encoded results for each line, in input order.
+
+    Raises:
+        ValueError: The number of workers, chunk size or in-flight window is not positive.
+        ValidationError: A batch of operations is invalid.
+    """
+
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+
+    if workers < 1 or chunk_size < 1 or max_in_flight < 1:
+        raise ValueError(
+            "The number of workers, chunk size and in-flight window must be positive."
+        )
+
+    line_iterator = iter(lines)
+    pending: Deque[Future] = deque()
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_initialize_worker, initargs=(processor,)
+    ) as executor:
+        try:
+            while True:
+                # Fill the window of in-flight chunks.
+                while len(pending) < max_in_flight:
+                    chunk = list(islice(line_iterator, chunk_size))
+
+                    if not chunk:
+                        break
+
+                    pending.append(executor.submit(_process_chunk, chunk))
+
+                if not pending:
+                    break
+
+                # Wait for the oldest chunk to preserve the input order.
+                results, error = pending.popleft().result()
+
+                yield from results
+
+                if error is not None:
+                    raise error
+        finally:
+            for future in pending:
+                future.cancel()
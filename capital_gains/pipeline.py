@@ -0,0 +1,583 @@
+"""
+Pipeline module.
+
+This module defines the `LineProcessor` class, which implements the
+processing of lines of input: decoding a batch of operations,
+calculating the taxes from an empty portfolio state, and encoding the
+results. Processors reuse a single calculator, resetting its state for
+each line, so they can be sent to worker processes but must not be
+shared across threads.
+"""
+
+import time
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .backends import DECIMAL_BACKEND, BaseBackend, FixedPointBackend
+from .calculators.tax import TaxCalculator
+from .codecs import JSON_CODEC, JsonCodec, create_codec
+from .decoders import decode_operation, decode_operations
+from .hooks import ProcessingHooks, Stage
+from .models import (
+    OPERATION_ADAPTER,
+    OPERATIONS_ADAPTER,
+    Operation,
+)
+from .options import Backend, Codec, Engine
+from .prefixes import PrefixIndex, PrefixSnapshot
+from .states import PortfolioState
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .calculators.columnar import ColumnarTaxCalculator
+
+
+def _create_backend(backend: Backend) -> BaseBackend:
+    """
+    Create the numeric backend instance for a backend option.
+
+    Parameters:
+        backend (Backend): The numeric backend option.
+
+    Returns:
+        BaseBackend: The numeric backend instance.
+    """
+
+    if backend == Backend.FIXED:
+        return FixedPointBackend()
+
+    return DECIMAL_BACKEND
+
+
+def encode_result(tax: int) -> bytes:
+    """
+    Encode a tax in cents as a JSON result.
+
+    The encoding matches the serialization of `ResultModel` values.
+
+    Parameters:
+        tax (int): The tax of an operation, in cents.
+
+    Returns:
+        bytes: The JSON encoded result.
+    """
+
+    return JSON_CODEC.encode_result(tax)
+
+
+def encode_results(taxes: Iterable[int]) -> bytes:
+    """
+    Encode taxes in cents as JSON results.
+
+    The encoding matches the serialization of `ResultModel` values.
+
+    Parameters:
+        taxes (Iterable[int]): The taxes of each operation, in cents.
+
+    Returns:
+        bytes: The JSON encoded results.
+    """
+
+    return JSON_CODEC.encode_results(taxes)
+
+
+def _report_batches(
+    hooks: ProcessingHooks,
+    lines: Sequence[Union[str, bytes]],
+    batches: Sequence[Sequence[Operation]],
+    json_results: Sequence[bytes],
+    stage_seconds: Tuple[float, float, float],
+):
+    """
+    Report the processing of lines by the columnar engine to the hooks.
+
+    The time of the batch is shared equally among its lines.
+
+    Parameters:
+        hooks (ProcessingHooks): The instrumentation hooks.
+        lines (Sequence[Union[str, bytes]]): The lines, starting with the processed lines.
+        batches (Sequence[Sequence[Operation]]): The decoded operations of each line.
+        json_results (Sequence[bytes]): The JSON encoded results of each line.
+        stage_seconds (Tuple[float, float, float]): The time spent in the parse,
+            compute and serialize stages, in seconds.
+    """
+
+    if hooks.observe_stages:
+        for stage, seconds in zip(
+            [Stage.PARSE, Stage.COMPUTE, Stage.SERIALIZE], stage_seconds
+        ):
+            hooks.stage(stage, seconds)
+
+    if json_results:
+        line_seconds = sum(stage_seconds) / len(json_results)
+
+        for line, batch, json_result in zip(lines, batches, json_results):
+            hooks.line(len(batch), len(line), len(json_result), line_seconds)
+
+
+class LineProcessor:  # pylint: disable=too-many-instance-attributes
+    """
+    Processor of JSON encoded batches of operations.
+
+    Each line is processed independently, starting from an empty
+    portfolio state, or from the snapshot of the longest indexed prefix
+    of its operations when a prefix index is set.
+    """
+
+    #: Whether to decode operations into lightweight records.
+    fast_decode: bool
+
+    #: The tax calculation engine.
+    engine: Engine
+
+    #: The number of lines processed at a time by the columnar engine.
+    batch_size: int
+
+    #: The numeric backend of the decimal engine.
+    backend: Backend
+
+    #: The instrumentation hooks, if any.
+    hooks: Optional[ProcessingHooks]
+
+    #: The index of portfolio state snapshots by prefix of operations, if any.
+    prefix_index: Optional[PrefixIndex]
+
+    #: The JSON codec decoding operations and encoding results.
+    json_codec: JsonCodec
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        fast_decode: bool = False,
+        engine: Engine = Engine.DECIMAL,
+        batch_size: int = 256,
+        backend: Backend = Backend.DECIMAL,
+        hooks: Optional[ProcessingHooks] = None,
+        prefix_index: Optional[PrefixIndex] = None,
+        codec: Codec = Codec.AUTO,
+    ):
+        """
+        Initialize the line processor.
+
+        Parameters:
+            fast_decode (bool): Whether to decode operations into lightweight
+                records, bypassing the validation models. Defaults to false.
+            engine (Engine): The tax calculation engine. Defaults to decimal.
+            batch_size (int): The number of lines processed at a time by the
+                columnar engine. Defaults to 256.
+            backend (Backend): The numeric backend of the decimal engine, also
+                used by the columnar engine to recalculate lines. Defaults to
+                decimal.
+            hooks (Optional[ProcessingHooks]): The instrumentation hooks observing
+                the processing stages and operation dispatches. Defaults to none.
+            prefix_index (Optional[PrefixIndex]): The index of portfolio state
+                snapshots by prefix of operations, resuming lines extending
+                earlier lines. Only supported by the decimal engine, and only
+                line events are reported to the hooks. Defaults to none.
+            codec (Codec): The JSON codec decoding operations with fast decoding
+                and encoding results. Defaults to the fastest installed codec.
+
+        Raises:
+            ImportError: The engine or codec dependencies are not installed.
+            ValueError: The engine does not support prefix indexes.
+        """
+
+        if prefix_index is not None and engine != Engine.DECIMAL:
+            raise ValueError("Prefix indexes are only supported by the decimal engine.")
+
+        self.fast_decode = fast_decode
+        self.engine = engine
+        self.batch_size = batch_size
+        self.backend = backend
+        self.hooks = hooks
+        self.prefix_index = prefix_index
+        self.json_codec = create_codec(codec)
+
+        self._numeric_backend = _create_backend(backend)
+        self._calculator = self.create_calculator()
+        self._columnar_calculator: Optional["ColumnarTaxCalculator"] = None
+
+        if engine == Engine.NUMPY:
+            # Defer loading NumPy until the columnar engine is selected.
+            from .calculators.columnar import (  # pylint: disable=import-outside-toplevel
+                ColumnarTaxCalculator,
+            )
+
+            self._columnar_calculator = ColumnarTaxCalculator()
+
+    def decode(self, json_operations: Union[str, bytes]) -> Sequence[Operation]:
+        """
+        Decode a JSON encoded batch of operations.
+
+        Parameters:
+            json_operations (Union[str, bytes]): The JSON encoded batch of operations.
+
+        Returns:
+            Sequence[Operation]: The decoded operations.
+
+        Raises:
+            ValidationError: The batch of operations is invalid.
+        """
+
+        if self.fast_decode:
+            return decode_operations(json_operations, self.json_codec)
+
+        return OPERATIONS_ADAPTER.validate_json(json_operations)
+
+    def decode_operation(self, json_operation: Union[str, bytes]) -> Operation:
+        """
+        Decode a single JSON encoded operation.
+
+        Parameters:
+            json_operation (Union[str, bytes]): The JSON encoded operation.
+
+        Returns:
+            Operation: The decoded operation.
+
+        Raises:
+            ValidationError: The operation is invalid.
+        """
+
+        if self.fast_decode:
+            return decode_operation(json_operation, self.json_codec)
+
+        return OPERATION_ADAPTER.validate_json(json_operation)
+
+    def create_calculator(self) -> TaxCalculator:
+        """
+        Create a tax calculator with an empty portfolio state.
+
+        Returns:
+            TaxCalculator: The tax calculator.
+        """
+
+        hooks = self.hooks
+
+        # Operation dispatches are only timed for hooks observing them.
+        if hooks is not None and not hooks.observe_operations:
+            hooks = None
+
+        return TaxCalculator(PortfolioState(backend=self._numeric_backend), hooks=hooks)
+
+    def _process_decimal(self, json_operations: Union[str, bytes]) -> bytes:
+        """
+        Process a JSON encoded batch of operations with the decimal engine.
+
+        Parameters:
+            json_operations (Union[str, bytes]): The JSON encoded batch of operations.
+
+        Returns:
+            bytes: The JSON encoded results, without a trailing line break.
+        """
+
+        # Reset the state for each line of input.
+        calculator = self._calculator
+        calculator.state.reset()
+
+        if self.prefix_index is not None:
+            return self._process_prefixed(
+                calculator, json_operations, self.prefix_index
+            )
+
+        if self.hooks is not None:
+            return self._process_decimal_with_hooks(
+                calculator, json_operations, self.hooks
+            )
+
+        operations = self.decode(json_operations)
+
+        return self.json_codec.encode_results(calculator.calculate(operations))
+
+    def _process_prefixed(
+        self,
+        calculator: TaxCalculator,
+        json_operations: Union[str, bytes],
+        prefix_index: PrefixIndex,
+    ) -> bytes:
+        """
+        Process a JSON encoded batch of operations, resuming from an indexed prefix.
+
+        Only the operations following the longest indexed prefix are decoded
+        and calculated, and the snapshot at the end of the batch is indexed.
+
+        Parameters:
+            calculator (TaxCalculator): The tax calculator, with an empty state.
+            json_operations (Union[str, bytes]): The JSON encoded batch of operations.
+            prefix_index (PrefixIndex): The index of portfolio state snapshots.
+
+        Returns:
+            bytes: The JSON encoded results, without a trailing line break.
+        """
+
+        hooks = self.hooks
+        start = time.perf_counter()
+
+        if isinstance(json_operations, str):
+            json_operations = json_operations.encode()
+
+        snapshot, json_remainder = prefix_index.lookup(json_operations)
+        operations = None
+
+        if snapshot is not None and json_remainder:
+            try:
+                operations = self.decode(json_remainder)
+            except ValueError:
+                operations = None
+
+            if not operations:
+                # Decode the whole batch, reporting errors as without an index.
+                snapshot = None
+
+        if snapshot is None:
+            try:
+                operations = self.decode(json_operations)
+            except ValueError as error:
+                if hooks is not None:
+                    hooks.error(error)
+
+                raise
+
+            json_results = self.json_codec.encode_results(
+                calculator.calculate(operations)
+            )
+            length = len(operations)
+        elif operations is None:
+            json_results = snapshot.json_results
+            length = snapshot.length
+        else:
+            calculator.state.restore(snapshot.state)
+            json_suffix = self.json_codec.encode_results(
+                calculator.calculate(operations)
+            )
+
+            # Join the results of the prefix and of the following operations.
+            json_results = snapshot.json_results[:-1] + b"," + json_suffix[1:]
+            length = snapshot.length + len(operations)
+
+        if operations:
+            prefix_index.store(
+                json_operations,
+                PrefixSnapshot(length, calculator.state.snapshot(), json_results),
+            )
+
+        if hooks is not None:
+            hooks.line(
+                length,
+                len(json_operations),
+                len(json_results),
+                time.perf_counter() - start,
+            )
+
+        return json_results
+
+    def _process_decimal_with_hooks(
+        self,
+        calculator: TaxCalculator,
+        json_operations: Union[str, bytes],
+        hooks: ProcessingHooks,
+    ) -> bytes:
+        """
+        Process a JSON encoded batch of operations, reporting each stage to the hooks.
+
+        Parameters:
+            calculator (TaxCalculator): The tax calculator, with an empty state.
+            json_operations (Union[str, bytes]): The JSON encoded batch of operations.
+            hooks (ProcessingHooks): The instrumentation hooks.
+
+        Returns:
+            bytes: The JSON encoded results, without a trailing line break.
+        """
+
+        clock = time.perf_counter
+        start = clock()
+
+        try:
+            operations = self.decode(json_operations)
+        except ValueError as error:
+            hooks.error(error)
+            raise
+
+        if hooks.observe_stages:
+            parsed = clock()
+            taxes = list(calculator.calculate(operations))
+            computed = clock()
+            json_results = self.json_codec.encode_results(taxes)
+            end = clock()
+
+            hooks.stage(Stage.PARSE, parsed - start)
+            hooks.stage(Stage.COMPUTE, computed - parsed)
+            hooks.stage(Stage.SERIALIZE, end - computed)
+        else:
+            json_results = self.json_codec.encode_results(
+                calculator.calculate(operations)
+            )
+            end = clock()
+
+        hooks.line(
+            len(operations), len(json_operations), len(json_results), end - start
+        )
+
+        return json_results
+
+    def _process_columnar(
+        self, calculator: "ColumnarTaxCalculator", lines: Iterable[Union[str, bytes]]
+    ) -> Iterator[bytes]:
+        """
+        Process JSON encoded batches of operations with the columnar engine.
+
+        Lines are decoded and calculated in batches. If a line is invalid,
+        the results of the preceding lines are yielded before the error is raised.
+
+        Parameters:
+            calculator (ColumnarTaxCalculator): The columnar tax calculator.
+            lines (Iterable[Union[str, bytes]]): The JSON encoded batches of operations.
+
+        Returns:
+            Iterator[bytes]: The JSON encoded results for each line, in order.
+        """
+
+        line_iterator = iter(lines)
+        clock = time.perf_counter
+
+        while chunk := list(islice(line_iterator, self.batch_size)):
+            batches = []
+            error: Optional[Exception] = None
+            start = clock()
+
+            for line in chunk:
+                try:
+                    batches.append(self.decode(line))
+                except ValueError as decoding_error:
+                    error = decoding_error
+                    break
+
+            parsed = clock()
+
+            try:
+                taxes = calculator.process_batches(batches)
+            except ArithmeticError:
+                # Surface calculation errors at the line raising them.
+                yield from map(self._process_decimal, chunk[: len(batches)])
+            else:
+                computed = clock()
+                json_results = list(map(self.json_codec.encode_results, taxes))
+
+                if self.hooks is not None:
+                    _report_batches(
+                        self.hooks,
+                        chunk,
+                        batches,
+                        json_results,
+                        (parsed - start, computed - parsed, clock() - computed),
+                    )
+
+                yield from json_results
+
+            if error is not None:
+                if self.hooks is not None:
+                    self.hooks.error(error)
+
+                raise error
+
+    def process(self, json_operations: Union[str, bytes]) -> bytes:
+        """
+        Process a JSON encoded batch of operations.
+
+        Parameters:
+            json_operations (Union[str, bytes]): The JSON encoded batch of operations.
+
+        Returns:
+            bytes: The JSON encoded results, without a trailing line break.
+
+        Raises:
+            ValidationError: The batch of operations is invalid.
+        """
+
+        if self._columnar_calculator is not None:
+            return next(
+                self._process_columnar(self._columnar_calculator, [json_operations])
+            )
+
+        return self._process_decimal(json_operations)
+
+    def process_lines(self, lines: Iterable[Union[str, bytes]]) -> Iterator[bytes]:
+        """
+        Process multiple JSON encoded batches of operations.
+
+        Parameters:
+            lines (Iterable[Union[str, bytes]]): The JSON encoded batches of operations.
+
+        Returns:
+            Iterator[bytes]: The JSON encoded results for each line, in order.
+
+        Raises:
+            ValidationError: A batch of operations is invalid.
+        """
+
+        if self._columnar_calculator is not None:
+            return self._process_columnar(self._columnar_calculator, lines)
+
+        return map(self._process_decimal, lines)
+
+    def calculate_batches(
+        self, batches: Iterable[Sequence[Operation]]
+    ) -> Iterator[List[int]]:
+        """
+        Calculate the taxes of decoded batches of operations.
+
+        Each batch is calculated independently, starting from an empty
+        portfolio state, with the calculator of the engine. The columnar
+        engine calculates batches in chunks, and if the batches iterable
+        raises a validation error, the taxes of the preceding batches are
+        yielded before the error is raised. Only operation dispatches are
+        reported to the hooks, and the prefix index is not used.
+
+        Parameters:
+            batches (Iterable[Sequence[Operation]]): The decoded batches of operations.
+
+        Returns:
+            Iterator[List[int]]: The taxes of each operation of each batch,
+                in cents, in order.
+
+        Raises:
+            ValidationError: A batch of operations is invalid.
+        """
+
+        columnar_calculator = self._columnar_calculator
+
+        if columnar_calculator is None:
+            calculator = self._calculator
+
+            for batch in batches:
+                calculator.state.reset()
+
+                yield list(calculator.calculate(batch))
+
+            return
+
+        batch_iterator = iter(batches)
+
+        while True:
+            chunk: List[Sequence[Operation]] = []
+            error: Optional[Exception] = None
+
+            try:
+                chunk.extend(islice(batch_iterator, self.batch_size))
+            except ValueError as decoding_error:
+                error = decoding_error
+
+            if chunk:
+                yield from columnar_calculator.process_batches(chunk)
+
+            if error is not None:
+                raise error
+
+            if len(chunk) < self.batch_size:
+                return
@@ -0,0 +1,202 @@
+"""
+Prefixes module.
+
+This module defines the `PrefixIndex` class, a bounded index from lines
+of operations to the portfolio state and results at their end. Lines
+extending an earlier line, such as the same client history with new
+operations appended, resume from the snapshot of the longest indexed
+prefix, so that only the new operations are decoded and calculated.
+
+Prefixes are keyed by a hash of the raw bytes of the earlier line up to
+its last operation, computed incrementally over each line, and looked up
+only at the ends of operations matching the length of an indexed prefix.
+The least recently used snapshots are evicted beyond a maximum number of
+entries or encoded results size.
+"""
+
+import hashlib
+import re
+from collections import Counter, OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+from .backends import Number
+
+#: The approximate memory overhead of an index entry, in bytes.
+_ENTRY_OVERHEAD = 256
+
+#: The separator following a prefix, before more operations or the end of the line.
+_SEPARATOR = re.compile(rb"\s*(?:(,)|\]\s*$)")
+
+
+class PrefixSnapshot(NamedTuple):
+    """
+    Portfolio state and results at the end of a line of operations.
+    """
+
+    #: The number of operations in the line.
+    length: int
+
+    #: The portfolio state snapshot at the end of the line.
+    state: Tuple[int, Number, Number]
+
+    #: The JSON encoded results of the line.
+    json_results: bytes
+
+
+class PrefixIndex:  # pylint: disable=too-many-instance-attributes
+    """
+    Bounded least recently used index of portfolio state snapshots by line prefix.
+    """
+
+    #: The maximum number of snapshots.
+    max_entries: int
+
+    #: The maximum size of the indexed results, in bytes.
+    max_bytes: int
+
+    #: The number of lines resumed from an indexed prefix.
+    hits: int
+
+    #: The number of lines calculated from an empty portfolio.
+    misses: int
+
+    #: The number of operations not recalculated thanks to indexed prefixes.
+    reused_operations: int
+
+    #: The number of snapshots evicted.
+    evictions: int
+
+    def __init__(self, max_entries: int = 65536, max_bytes: int = 67108864):
+        """
+        Initialize an empty prefix index.
+
+        Parameters:
+            max_entries (int): The maximum number of snapshots. Defaults to 65536.
+            max_bytes (int): The maximum size of the indexed results, including
+                an estimate of the entry overhead, in bytes. Defaults to 64 MiB.
+        """
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.reused_operations = 0
+        self.evictions = 0
+
+        # The snapshots and prefix lengths by prefix key.
+        self._entries: "OrderedDict[bytes, Tuple[PrefixSnapshot, int]]" = OrderedDict()
+        self._lengths: Counter = Counter()
+        self._size = 0
+
+    def lookup(self, json_operations: bytes) -> Tuple[Optional[PrefixSnapshot], bytes]:
+        """
+        Find the snapshot of the longest indexed prefix of a line of operations.
+
+        Parameters:
+            json_operations (bytes): The JSON encoded line of operations.
+
+        Returns:
+            Tuple[Optional[PrefixSnapshot], bytes]: The snapshot of the longest
+                indexed prefix, if any, and the JSON encoded operations
+                following it, empty if the prefix spans the whole line.
+        """
+
+        entries = self._entries
+        lengths = self._lengths
+        hasher = hashlib.blake2b(digest_size=16)
+        hashed = 0
+        snapshot_key = None
+        remainder = b""
+
+        # Only hash the prefixes ending an operation with the length of a prefix.
+        position = json_operations.find(b"}")
+
+        while position >= 0:
+            length = position + 1
+
+            if length in lengths:
+                hasher.update(json_operations[hashed:length])
+                hashed = length
+                prefix_key = hasher.digest()
+
+                if prefix_key in entries:
+                    separator = _SEPARATOR.match(json_operations, length)
+
+                    if separator is not None:
+                        snapshot_key = prefix_key
+                        remainder = (
+                            b"[" + json_operations[separator.end() :]
+                            if separator.group(1)
+                            else b""
+                        )
+
+            position = json_operations.find(b"}", length)
+
+        if snapshot_key is None:
+            self.misses += 1
+
+            return None, b""
+
+        entries.move_to_end(snapshot_key)
+        snapshot, _ = entries[snapshot_key]
+        self.hits += 1
+        self.reused_operations += snapshot.length
+
+        return snapshot, remainder
+
+    def store(self, json_operations: bytes, snapshot: PrefixSnapshot):
+        """
+        Index the snapshot at the end of a line of operations.
+
+        Parameters:
+            json_operations (bytes): The JSON encoded line of operations.
+            snapshot (PrefixSnapshot): The snapshot at the end of the line.
+        """
+
+        # Strip the closing bracket, keeping the prefix up to the last operation.
+        prefix = json_operations.rstrip()[:-1].rstrip()
+
+        if not prefix.endswith(b"}"):
+            return
+
+        prefix_key = hashlib.blake2b(prefix, digest_size=16).digest()
+
+        if prefix_key in self._entries:
+            return
+
+        self._entries[prefix_key] = (snapshot, len(prefix))
+        self._lengths[len(prefix)] += 1
+        self._size += len(snapshot.json_results) + _ENTRY_OVERHEAD
+
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            _, (evicted, length) = self._entries.popitem(last=False)
+            self._size -= len(evicted.json_results) + _ENTRY_OVERHEAD
+            self._lengths[length] -= 1
+
+            if not self._lengths[length]:
+                del self._lengths[length]
+
+            self.evictions += 1
+
+    def report(self) -> str:
+        """
+        Format the hit and miss statistics of the index.
+
+        Returns:
+            str: The statistics report.
+        """
+
+        lookups = self.hits + self.misses
+        hit_ratio = self.hits / lookups if lookups else 0.0
+
+        return "\n".join(
+            [
+                f"Prefix lookups: {lookups}",
+                f"  hits: {self.hits}",
+                f"  misses: {self.misses}",
+                f"  hit ratio: {hit_ratio:.1%}",
+                f"  reused operations: {self.reused_operations}",
+                f"  snapshots: {len(self._entries)} of {self.max_entries}",
+                f"  evictions: {self.evictions}",
+            ]
+        )
@@ -0,0 +1,171 @@
+"""
+Profiling module.
+
+This module defines the `Profiler` class, instrumentation hooks that
+accumulate the time spent in each processing stage and operation
+dispatch, and keep the slowest lines of input, to report where the time
+of a run goes.
+"""
+
+import heapq
+from typing import Dict, List, Tuple
+
+from .hooks import ProcessingHooks, Stage
+from .models import OperationType
+
+
+class Profiler(ProcessingHooks):  # pylint: disable=too-many-instance-attributes
+    """
+    Instrumentation hooks accumulating a per-stage time breakdown.
+    """
+
+    #: The number of slowest lines kept for the report.
+    slowest_count: int
+
+    #: The time spent in each stage, in seconds.
+    stage_seconds: Dict[Stage, float]
+
+    #: The number of times each stage was observed.
+    stage_counts: Dict[Stage, int]
+
+    #: The time spent processing each type of operation, in seconds.
+    operation_seconds: Dict[OperationType, float]
+
+    #: The number of operations of each type.
+    operation_counts: Dict[OperationType, int]
+
+    #: The number of lines processed.
+    lines: int
+
+    #: The number of invalid lines.
+    errors: int
+
+    def __init__(self, slowest_count: int = 10):
+        """
+        Initialize the profiler.
+
+        Parameters:
+            slowest_count (int): The number of slowest lines kept for the report.
+                Defaults to 10.
+        """
+
+        self.slowest_count = slowest_count
+        self.stage_seconds = dict.fromkeys(Stage, 0.0)
+        self.stage_counts = dict.fromkeys(Stage, 0)
+        self.operation_seconds = dict.fromkeys(OperationType, 0.0)
+        self.operation_counts = dict.fromkeys(OperationType, 0)
+        self.lines = 0
+        self.errors = 0
+
+        # Min-heap of the slowest lines, by time, line number and operations.
+        self._slowest: List[Tuple[float, int, int]] = []
+
+    def stage(self, stage: Stage, seconds: float):
+        """
+        Accumulate the time spent in a stage.
+
+        Parameters:
+            stage (Stage): The processing stage.
+            seconds (float): The time spent in the stage, in seconds.
+        """
+
+        self.stage_seconds[stage] += seconds
+        self.stage_counts[stage] += 1
+
+    def operation(self, operation_type: OperationType, seconds: float):
+        """
+        Accumulate the time spent processing an operation.
+
+        Parameters:
+            operation_type (OperationType): The type of the operation.
+            seconds (float): The time spent processing the operation, in seconds.
+        """
+
+        self.operation_seconds[operation_type] += seconds
+        self.operation_counts[operation_type] += 1
+
+    def line(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, operations: int, input_bytes: int, output_bytes: int, seconds: float
+    ):
+        """
+        Count a line of input, keeping it if it is among the slowest.
+
+        Parameters:
+            operations (int): The number of operations in the line.
+            input_bytes (int): The size of the line of input.
+            output_bytes (int): The size of the results of the line.
+            seconds (float): The time spent decoding, calculating and encoding
+                the line, in seconds.
+        """
+
+        self.lines += 1
+        entry = (seconds, self.lines, operations)
+
+        if len(self._slowest) < self.slowest_count:
+            heapq.heappush(self._slowest, entry)
+        elif self._slowest and entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def error(self, error: Exception):
+        """
+        Count an invalid line of input.
+
+        Parameters:
+            error (Exception): The error raised by the line.
+        """
+
+        self.errors += 1
+
+    @property
+    def slowest_lines(self) -> List[Tuple[int, float, int]]:
+        """
+        The slowest lines, from the slowest.
+
+        Returns:
+            List[Tuple[int, float, int]]: The line number, the time in seconds
+                and the number of operations of each line.
+        """
+
+        return [
+            (line, seconds, operations)
+            for seconds, line, operations in sorted(self._slowest, reverse=True)
+        ]
+
+    def report(self) -> str:
+        """
+        Format the time breakdown as a human readable report.
+
+        Returns:
+            str: The report.
+        """
+
+        total_seconds = sum(self.stage_seconds.values()) or 1.0
+        rows = ["Stage         Seconds    Share     Count"]
+
+        for stage in Stage:
+            seconds = self.stage_seconds[stage]
+            rows.append(
+                f"{stage.value:<10} {seconds:>10.4f} {seconds / total_seconds:>8.1%} "
+                f"{self.stage_counts[stage]:>9}"
+            )
+
+        rows.append("")
+        rows.append("Operation     Seconds    Count")
+
+        for operation_type in OperationType:
+            rows.append(
+                f"{operation_type.value:<10} "
+                f"{self.operation_seconds[operation_type]:>10.4f} "
+                f"{self.operation_counts[operation_type]:>8}"
+            )
+
+        rows.append("")
+        rows.append(f"Lines: {self.lines}, invalid lines: {self.errors}")
+
+        if self._slowest:
+            rows.append("Slowest lines:")
+
+            for line, seconds, operations in self.slowest_lines:
+                rows.append(f"  line {line}: {seconds:.6f}s, {operations} operations")
+
+        return "\n".join(rows)
@@ -0,0 +1,403 @@
+"""
+Server module.
+
+This module provides a long-running server processing lines of input
+sent over a Unix socket or a local TCP connection, so that clients do not
+pay the interpreter startup and import costs on each invocation. The
+protocol is the newline-delimited JSON of the command-line interface: each
+line of operations is answered with a line of results, in order, and
+clients may pipeline any number of lines without waiting for results.
+An invalid line is answered with a JSON object holding an `error` message.
+
+Lines are processed synchronously as they arrive, with a single warm line
+processor shared by all connections. The number of connections served at
+a time is limited, and further connections wait for a free slot. On
+shutdown, the server stops accepting connections, finishes the lines
+already received and flushes their results before closing.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import threading
+from collections import deque
+from contextlib import suppress
+from typing import Any, Deque, List, Optional, Set
+
+from .options import DEFAULT_PORT
+from .pipeline import LineProcessor
+
+
+def encode_error(error: Exception) -> bytes:
+    """
+    Encode the error of an invalid line of input as a JSON object.
+
+    Parameters:
+        error (Exception): The error raised by the line.
+
+    Returns:
+        bytes: The JSON encoded error.
+    """
+
+    return json.dumps({"error": str(error)}).encode()
+
+
+class _Connection(asyncio.Protocol):
+    """
+    Protocol processing the lines of input of a client connection.
+    """
+
+    def __init__(self, server: "TaxServer"):
+        """
+        Initialize the connection.
+
+        Parameters:
+            server (TaxServer): The server accepting the connection.
+        """
+
+        self.server = server
+        self.transport: Optional[asyncio.Transport] = None
+
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._waiting = False
+        self._writing_paused = False
+        self._closing = False
+
+    def connection_made(self, transport: asyncio.BaseTransport):
+        """
+        Register the connection, waiting for a free slot if needed.
+
+        Parameters:
+            transport (asyncio.BaseTransport): The transport of the connection.
+        """
+
+        assert isinstance(transport, asyncio.Transport)
+
+        self.transport = transport
+        self.server.register(self)
+
+    def connection_lost(self, exc: Optional[Exception]):
+        """
+        Unregister the connection, releasing its slot.
+
+        Parameters:
+            exc (Optional[Exception]): The error closing the connection, if any.
+        """
+
+        self.server.unregister(self)
+
+    def wait(self):
+        """
+        Stop reading input until a slot is released.
+        """
+
+        self._waiting = True
+        self._update_reading()
+
+    def start(self):
+        """
+        Start reading input in a free slot.
+        """
+
+        self._waiting = False
+        self._update_reading()
+
+    def drain(self):
+        """
+        Stop reading input and close once the results are written.
+        """
+
+        self._closing = True
+        self._update_reading()
+
+        if not self._writing_paused and self.transport is not None:
+            self.transport.close()
+
+    def _update_reading(self):
+        """
+        Pause or resume reading input according to the connection state.
+        """
+
+        if self.transport is None or self.transport.is_closing():
+            return
+
+        if self._waiting or self._writing_paused or self._closing:
+            self.transport.pause_reading()
+        else:
+            self.transport.resume_reading()
+
+    def pause_writing(self):
+        """
+        Stop reading input while the client is not reading results.
+        """
+
+        self._writing_paused = True
+        self._update_reading()
+
+    def resume_writing(self):
+        """
+        Resume reading input once the client has read the results.
+        """
+
+        self._writing_paused = False
+
+        if self._closing and self.transport is not None:
+            self.transport.close()
+        else:
+            self._update_reading()
+
+    def data_received(self, data: bytes):
+        """
+        Process the complete lines of input received and write their results.
+
+        Parameters:
+            data (bytes): The data received.
+        """
+
+        assert self.transport is not None
+
+        if b"\n" in data:
+            lines = data.split(b"\n")
+
+            # Join the line spanning the previous data.
+            if self._pending:
+                self._pending.append(lines[0])
+                lines[0] = b"".join(self._pending)
+
+            self._pending = [lines.pop()]
+            self._pending_size = len(self._pending[0])
+            self.transport.write(self.server.process_lines(lines))
+        else:
+            self._pending.append(data)
+            self._pending_size += len(data)
+
+        if self._pending_size > self.server.max_line_size:
+            self.transport.write(encode_error(ValueError("Line too long")) + b"\n")
+            self._pending = []
+            self._pending_size = 0
+            self.drain()
+
+    def eof_received(self) -> bool:
+        """
+        Process the last line of input, if not terminated by a line break.
+
+        Returns:
+            bool: Whether to keep the transport open, which is false.
+        """
+
+        assert self.transport is not None
+
+        line = b"".join(self._pending)
+
+        if line:
+            self.transport.write(self.server.process_lines([line]))
+            self._pending = []
+            self._pending_size = 0
+
+        return False
+
+
+class TaxServer:  # pylint: disable=too-many-instance-attributes
+    """
+    Server processing lines of input sent over Unix sockets or TCP connections.
+    """
+
+    #: The line processor shared by all connections.
+    processor: LineProcessor
+
+    #: The maximum number of connections served at a time.
+    max_connections: int
+
+    #: The maximum size of a line of input, in bytes.
+    max_line_size: int
+
+    #: The number of seconds to wait for results to be written on shutdown.
+    drain_timeout: float
+
+    #: Set once the server is accepting connections.
+    listening: threading.Event
+
+    #: The socket addresses the server is listening on.
+    addresses: List[Any]
+
+    def __init__(
+        self,
+        processor: LineProcessor,
+        max_connections: int = 64,
+        max_line_size: int = 67108864,
+        drain_timeout: float = 10.0,
+    ):
+        """
+        Initialize the server.
+
+        Parameters:
+            processor (LineProcessor): The line processor shared by all connections.
+            max_connections (int): The maximum number of connections served at
+                a time. Defaults to 64.
+            max_line_size (int): The maximum size of a line of input, in bytes.
+                Defaults to 64 MiB.
+            drain_timeout (float): The number of seconds to wait for results to
+                be written on shutdown. Defaults to 10 seconds.
+        """
+
+        self.processor = processor
+        self.max_connections = max_connections
+        self.max_line_size = max_line_size
+        self.drain_timeout = drain_timeout
+        self.listening = threading.Event()
+        self.addresses = []
+
+        self._active: Set[_Connection] = set()
+        self._waiting: Deque[_Connection] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._closed: Optional[asyncio.Event] = None
+
+    def process_lines(self, lines: List[bytes]) -> bytes:
+        """
+        Process lines of input, answering invalid lines with an error.
+
+        Parameters:
+            lines (List[bytes]): The lines of input.
+
+        Returns:
+            bytes: The results of each line, terminated by line breaks.
+        """
+
+        results = []
+
+        for line in lines:
+            try:
+                results.append(self.processor.process(line))
+            except (ValueError, ArithmeticError) as error:
+                results.append(encode_error(error))
+
+        results.append(b"")
+
+        return b"\n".join(results)
+
+    def register(self, connection: _Connection):
+        """
+        Register a new connection, serving it if a slot is free.
+
+        Parameters:
+            connection (_Connection): The connection.
+        """
+
+        assert self._stop is not None
+        assert self._closed is not None
+
+        if self._stop.is_set():
+            connection.drain()
+            return
+
+        self._closed.clear()
+
+        if len(self._active) < self.max_connections:
+            self._active.add(connection)
+        else:
+            connection.wait()
+            self._waiting.append(connection)
+
+    def unregister(self, connection: _Connection):
+        """
+        Unregister a closed connection, serving a waiting connection in its slot.
+
+        Parameters:
+            connection (_Connection): The connection.
+        """
+
+        assert self._closed is not None
+
+        if connection in self._active:
+            self._active.remove(connection)
+
+            if self._waiting:
+                waiting_connection = self._waiting.popleft()
+                self._active.add(waiting_connection)
+                waiting_connection.start()
+        else:
+            with suppress(ValueError):
+                self._waiting.remove(connection)
+
+        if not self._active and not self._waiting:
+            self._closed.set()
+
+    def close(self):
+        """
+        Request a graceful shutdown of the server, from any thread.
+        """
+
+        loop = self._loop
+
+        if loop is not None and self._stop is not None:
+            # The loop may have stopped since, if the server already shut down.
+            with suppress(RuntimeError):
+                loop.call_soon_threadsafe(self._stop.set)
+
+    async def serve(
+        self,
+        socket_path: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+    ):
+        """
+        Serve connections until a shutdown is requested.
+
+        A shutdown is requested by `close`, or by the interrupt and
+        termination signals when running in the main thread.
+
+        Parameters:
+            socket_path (Optional[str]): The path of the Unix socket to listen
+                on. Defaults to none, listening on a TCP port.
+            host (str): The host of the TCP port. Defaults to the local host.
+            port (int): The TCP port. Defaults to `DEFAULT_PORT`.
+        """
+
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._closed.set()
+
+        if threading.current_thread() is threading.main_thread():
+            for signal_number in [signal.SIGINT, signal.SIGTERM]:
+                with suppress(NotImplementedError):
+                    self._loop.add_signal_handler(signal_number, self._stop.set)
+
+        if socket_path is not None:
+            server = await self._loop.create_unix_server(
+                lambda: _Connection(self), socket_path
+            )
+        else:
+            server = await self._loop.create_server(
+                lambda: _Connection(self), host, port
+            )
+
+        self.addresses = [socket.getsockname() for socket in server.sockets]
+        self.listening.set()
+
+        try:
+            await self._stop.wait()
+        finally:
+            server.close()
+
+            for connection in [*self._active, *self._waiting]:
+                connection.drain()
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._closed.wait(), self.drain_timeout)
+
+            # Abort the connections of clients not reading their results.
+            for connection in [*self._active, *self._waiting]:
+                if connection.transport is not None:
+                    connection.transport.abort()
+
+            await server.wait_closed()
+            self.listening.clear()
+            self._loop = None
+
+            if socket_path is not None:
+                with suppress(FileNotFoundError):
+                    os.remove(socket_path)
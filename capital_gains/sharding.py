@@ -0,0 +1,191 @@
+"""
+Sharding module.
+
+This module provides memory-mapped reading of input files and the
+splitting of files into byte ranges, so that a large file can be
+processed by several processes or machines sharing a filesystem. Each
+line belongs to the byte range holding its first byte, so the outputs of
+contiguous byte ranges can be concatenated in order.
+"""
+
+import mmap
+import os
+import stat
+from typing import Iterator, List, NamedTuple, Optional, Union
+
+from .buffers import read_lines
+
+#: Any representation of a file system path.
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+class ByteRange(NamedTuple):
+    """
+    Range of bytes of a file, from an inclusive start to an exclusive end.
+    """
+
+    #: The offset of the first byte.
+    start: int
+
+    #: The offset after the last byte, or `None` for the end of the file.
+    end: Optional[int]
+
+    @classmethod
+    def parse(cls, text: str) -> "ByteRange":
+        """
+        Parse a byte range from the `START:END` notation.
+
+        The end may be omitted to select the bytes up to the end of the file.
+
+        Parameters:
+            text (str): The byte range notation.
+
+        Returns:
+            ByteRange: The byte range.
+
+        Raises:
+            ValueError: The byte range notation is invalid.
+        """
+
+        start_text, separator, end_text = text.partition(":")
+
+        if not separator:
+            raise ValueError("The byte range must be in the START:END notation.")
+
+        start = int(start_text) if start_text else 0
+        end = int(end_text) if end_text else None
+
+        if start < 0 or (end is not None and end < start):
+            raise ValueError("The byte range must be non-negative and ordered.")
+
+        return cls(start, end)
+
+    def __str__(self) -> str:
+        """
+        Format the byte range in the `START:END` notation.
+
+        Returns:
+            str: The byte range notation.
+        """
+
+        return f"{self.start}:{'' if self.end is None else self.end}"
+
+
+def _line_start(mapped: mmap.mmap, offset: int) -> int:
+    """
+    Find the start of the first line beginning at or after an offset.
+
+    Parameters:
+        mapped (mmap.mmap): The memory-mapped file.
+        offset (int): The offset.
+
+    Returns:
+        int: The offset of the line start, or the file size if there is none.
+    """
+
+    size = len(mapped)
+
+    if offset <= 0:
+        return 0
+
+    if offset >= size:
+        return size
+
+    if mapped[offset - 1] == ord("\n"):
+        return offset
+
+    line_end = mapped.find(b"\n", offset)
+
+    return size if line_end < 0 else line_end + 1
+
+
+def read_mapped_lines(
+    path: PathLike, byte_range: ByteRange = ByteRange(0, None)
+) -> Iterator[bytes]:
+    """
+    Read the lines of a file beginning within a byte range, with a memory map.
+
+    Lines are yielded without the trailing line break. A line beginning
+    within the range is read entirely, even if it ends after the range.
+    Files that cannot be memory-mapped, such as pipes and devices, are read
+    as streams.
+
+    Parameters:
+        path (PathLike): The path of the input file.
+        byte_range (ByteRange): The byte range of the lines. Defaults to the
+            whole file.
+
+    Returns:
+        Iterator[bytes]: The lines of input, in order.
+
+    Raises:
+        ValueError: A byte range is selected in a file that is not regular.
+    """
+
+    with open(path, "rb") as file:
+        status = os.fstat(file.fileno())
+
+        if not stat.S_ISREG(status.st_mode):
+            if byte_range != ByteRange(0, None):
+                raise ValueError("Byte ranges require a regular input file.")
+
+            yield from read_lines(file)
+            return
+
+        # Empty files cannot be memory-mapped.
+        if status.st_size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            end = size if byte_range.end is None else min(byte_range.end, size)
+            position = _line_start(mapped, byte_range.start)
+
+            while position < end:
+                line_end = mapped.find(b"\n", position)
+
+                if line_end < 0:
+                    line_end = size
+
+                yield mapped[position:line_end]
+
+                position = line_end + 1
+
+
+def split_file(path: PathLike, shards: int) -> List[ByteRange]:
+    """
+    Split a file into newline-aligned byte ranges of similar size.
+
+    Parameters:
+        path (PathLike): The path of the input file.
+        shards (int): The number of byte ranges.
+
+    Returns:
+        List[ByteRange]: The contiguous byte ranges covering the file, in order.
+            Ranges may be empty when lines are longer than a range.
+
+    Raises:
+        ValueError: The number of shards is not positive.
+    """
+
+    if shards < 1:
+        raise ValueError("The number of shards must be positive.")
+
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+
+        if size == 0:
+            return [ByteRange(0, 0)] * shards
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            boundaries = [0]
+
+            for shard in range(1, shards):
+                boundary = _line_start(mapped, size * shard // shards)
+                boundaries.append(max(boundary, boundaries[-1]))
+
+            boundaries.append(size)
+
+    return [
+        ByteRange(start, end) for start, end in zip(boundaries[:-1], boundaries[1:])
+    ]
@@ -7,7 +7,9 @@ for specific state management related to investment holdings and performance.
 """
 
 from decimal import Decimal
+from typing import Optional, Tuple
 
+from ..backends import DECIMAL_BACKEND, BaseBackend, Number
 from .base import BaseState
 
 
@@ -23,14 +25,21 @@ class PortfolioState(BaseState):
     #: The total number of shares.
     total_shares: int
 
-    #: The average cost per share.
-    average_cost: Decimal
+    #: The average cost per share, in the backend representation.
+    average_cost: Number
 
-    #: The total loss incurred over time.
-    total_loss: Decimal
+    #: The total loss incurred over time, in the backend representation.
+    total_loss: Number
+
+    #: The numeric backend representing financial values.
+    backend: BaseBackend
 
     def __init__(
-        self, total_shares=0, average_cost=Decimal("0"), total_loss=Decimal("0")
+        self,
+        total_shares=0,
+        average_cost=Decimal("0"),
+        total_loss=Decimal("0"),
+        backend: Optional[BaseBackend] = None,
     ):
         """
         Initialize a new instance of the portfolio state class.
@@ -43,8 +52,46 @@ class PortfolioState(BaseState):
             total_shares (int): The total number of shares. Defaults to zero.
             average_cost (Decimal): The average cost per share. Defaults to zero.
             total_loss (Decimal): The total loss incurred over time. Defaults to zero.
+            backend (Optional[BaseBackend]): The numeric backend representing
+                financial values. Defaults to the decimal backend.
         """
 
+        self.backend = DECIMAL_BACKEND if backend is None else backend
+
         self.total_shares = total_shares
-        self.average_cost = average_cost
-        self.total_loss = total_loss
+        self.average_cost = self.backend.from_decimal(average_cost)
+        self.total_loss = self.backend.from_decimal(total_loss)
+
+    def reset(self):
+        """
+        Reset the portfolio to an empty state.
+
+        This allows reusing the state for independent batches of operations
+        instead of allocating a new instance for each batch.
+        """
+
+        self.total_shares = 0
+        self.average_cost = self.backend.zero
+        self.total_loss = self.backend.zero
+
+    def snapshot(self) -> Tuple[int, Number, Number]:
+        """
+        Capture the values of the portfolio.
+
+        Returns:
+            Tuple[int, Number, Number]: The total shares, average cost and
+                total loss, in the backend representation.
+        """
+
+        return self.total_shares, self.average_cost, self.total_loss
+
+    def restore(self, snapshot: Tuple[int, Number, Number]):
+        """
+        Restore the values of the portfolio from a snapshot.
+
+        Parameters:
+            snapshot (Tuple[int, Number, Number]): The total shares, average
+                cost and total loss, in the backend representation.
+        """
+
+        self.total_shares, self.average_cost, self.total_loss = snapshot
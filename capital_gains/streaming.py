@@ -0,0 +1,355 @@
+"""
+Streaming module.
+
+This module provides incremental decoding of lines of input holding
+arbitrarily large JSON arrays of operations. Input is read in fixed-size
+blocks and array elements are yielded one at a time, so that operations
+can be fed lazily to a calculator and results written element by element.
+Peak memory usage is bounded by the block size and the size of a single
+operation, regardless of the length of a line. Runs over input files may
+be checkpointed within lines and resumed.
+"""
+
+import codecs
+import json
+from typing import BinaryIO, Iterator, Optional
+
+from .checkpoints import Checkpoint, Checkpointer
+from .pipeline import LineProcessor
+
+#: Whitespace allowed around array elements within a line.
+_WHITESPACE = " \t\r"
+
+
+class ArrayStreamReader:  # pylint: disable=too-many-instance-attributes
+    """
+    Incremental reader of newline-delimited JSON arrays.
+
+    The reader yields one element iterator per line of input. Each element
+    iterator yields the JSON text of the array elements in order, and must
+    be exhausted before the next line is read.
+    """
+
+    #: The binary input stream.
+    stream: BinaryIO
+
+    #: The number of bytes read from the stream at a time.
+    block_size: int
+
+    def __init__(self, stream: BinaryIO, block_size: int = 65536):
+        """
+        Initialize the array stream reader.
+
+        Parameters:
+            stream (BinaryIO): The binary input stream.
+            block_size (int): The number of bytes read from the stream at a time.
+                Defaults to 64 KiB.
+        """
+
+        self.stream = stream
+        self.block_size = block_size
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+        self._read_size = 0
+
+    @property
+    def offset(self) -> int:
+        """
+        The number of bytes consumed from the stream.
+
+        Returns:
+            int: The offset of the next byte to parse, relative to the
+                position of the stream when the reader was created.
+        """
+
+        pending, _ = self._decoder.getstate()
+        unparsed = self._buffer[self._position :].encode()
+
+        return self._read_size - len(pending) - len(unparsed)
+
+    def _fill(self) -> bool:
+        """
+        Read the next block from the stream into the buffer.
+
+        Returns:
+            bool: Whether more data was read.
+        """
+
+        if self._eof:
+            return False
+
+        read = getattr(self.stream, "read1", self.stream.read)
+        data = read(self.block_size)
+
+        if not data:
+            self._eof = True
+
+        self._read_size += len(data)
+
+        text = self._decoder.decode(data, final=self._eof)
+
+        if not text:
+            return not self._eof
+
+        # Discard the consumed part of the buffer.
+        self._buffer = self._buffer[self._position :] + text
+        self._position = 0
+
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        """
+        Build a decoding error at the current buffer position.
+
+        Parameters:
+            message (str): The error message.
+
+        Returns:
+            json.JSONDecodeError: The decoding error.
+        """
+
+        return json.JSONDecodeError(message, self._buffer, self._position)
+
+    def _peek(self) -> Optional[str]:
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        Returns:
+            Optional[str]: The next character, or `None` at the end of the stream.
+        """
+
+        while True:
+            while (
+                self._position < len(self._buffer)
+                and self._buffer[self._position] in _WHITESPACE
+            ):
+                self._position += 1
+
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+
+            if not self._fill() and self._position >= len(self._buffer):
+                return None
+
+    def _expect(self, characters: str) -> str:
+        """
+        Consume the next character, which must be one of the given characters.
+
+        Parameters:
+            characters (str): The accepted characters.
+
+        Returns:
+            str: The consumed character.
+
+        Raises:
+            json.JSONDecodeError: The next character is not accepted.
+        """
+
+        character = self._peek()
+
+        if character is None or character not in characters:
+            expected = " or ".join(repr(character) for character in characters)
+            raise self._error(f"Expecting {expected}")
+
+        self._position += 1
+
+        return character
+
+    def _read_element(self) -> str:
+        """
+        Read the JSON text of the next array element.
+
+        Returns:
+            str: The JSON text of the element.
+
+        Raises:
+            json.JSONDecodeError: The element is not valid JSON.
+        """
+
+        while True:
+            try:
+                _, end = self._json_decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as error:
+                # The element may be truncated at the end of the buffer.
+                if "\n" in self._buffer[self._position :] or not self._fill():
+                    raise error
+            else:
+                # Make sure a trailing number is not truncated at the end of the buffer.
+                if end < len(self._buffer) or not self._fill():
+                    break
+
+        element = self._buffer[self._position : end]
+
+        if "\n" in element:
+            raise self._error("Unterminated line")
+
+        self._position = end
+
+        return element
+
+    def _elements(self, inside: bool = False) -> Iterator[str]:
+        """
+        Yield the JSON text of the elements of the current array.
+
+        Parameters:
+            inside (bool): Whether the reader is within the array, after an
+                element. Defaults to false.
+
+        Returns:
+            Iterator[str]: The JSON text of each element.
+
+        Raises:
+            json.JSONDecodeError: The array is not valid JSON.
+        """
+
+        if inside:
+            closed = self._expect(",]") == "]"
+        else:
+            self._expect("[")
+            closed = self._peek() == "]"
+
+            if closed:
+                self._position += 1
+
+        if not closed:
+            while True:
+                self._peek()
+
+                yield self._read_element()
+
+                if self._expect(",]") == "]":
+                    break
+
+        # Each array must be followed by a line break or the end of the stream.
+        if self._peek() is not None:
+            self._expect("\n")
+
+    def arrays(self, inside: bool = False) -> Iterator[Iterator[str]]:
+        """
+        Yield an element iterator for each line of input.
+
+        Parameters:
+            inside (bool): Whether the stream starts within the array of a
+                line, after an element. Defaults to false.
+
+        Returns:
+            Iterator[Iterator[str]]: The element iterators of each line.
+
+        Raises:
+            json.JSONDecodeError: A line is not a valid JSON array.
+        """
+
+        if inside:
+            elements = self._elements(inside=True)
+
+            yield elements
+
+            for _ in elements:
+                pass
+
+        while self._peek() is not None:
+            elements = self._elements()
+
+            yield elements
+
+            # Skip the elements not consumed by the caller.
+            for _ in elements:
+                pass
+
+
+def process_stream(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    processor: LineProcessor,
+    input_stream: BinaryIO,
+    output_stream: BinaryIO,
+    block_size: int = 65536,
+    line_buffered: bool = False,
+    checkpointer: Optional[Checkpointer] = None,
+    checkpoint: Checkpoint = Checkpoint(),
+):
+    """
+    Process lines of input, decoding and encoding array elements one at a time.
+
+    Results are written to the output as they are calculated. If an
+    operation is invalid, the results of the preceding operations of the
+    same line are written before the error is raised.
+
+    Parameters:
+        processor (LineProcessor): The line processor.
+        input_stream (BinaryIO): The binary input stream.
+        output_stream (BinaryIO): The binary output stream.
+        block_size (int): The number of bytes read from the input at a time.
+            Defaults to 64 KiB.
+        line_buffered (bool): Whether to flush the output after each line.
+            Defaults to false.
+        checkpointer (Optional[Checkpointer]): The checkpointer, writing
+            checkpoints when due after each operation and at the end of the
+            input. The output stream must be a file. Defaults to none.
+        checkpoint (Checkpoint): The checkpoint resumed from, with the input
+            stream positioned at its input offset and the output stream at
+            its output offset. Defaults to the start of the input.
+
+    Raises:
+        json.JSONDecodeError: A line is not a valid JSON array.
+        ValidationError: An operation is invalid.
+    """
+
+    reader = ArrayStreamReader(input_stream, block_size)
+    calculator = processor.create_calculator()
+    encode_result = processor.json_codec.encode_result
+    state = calculator.state
+    input_offset, output_offset, line_state = checkpoint
+
+    for elements in reader.arrays(inside=line_state is not None):
+        if line_state is not None:
+            # Resume the line in progress after its last processed operation.
+            checkpoint.restore(state)
+            separator = b","
+            line_state = None
+        else:
+            # Reset the state for each line of input.
+            state.reset()
+            separator = b"["
+
+        operations = map(processor.decode_operation, elements)
+
+        for tax in calculator.calculate(operations):
+            json_result = encode_result(tax)
+            output_stream.write(separator)
+            output_stream.write(json_result)
+
+            if checkpointer is not None:
+                output_offset += len(separator) + len(json_result)
+
+                if checkpointer.due():
+                    checkpointer.save(
+                        Checkpoint.capture(
+                            input_offset + reader.offset, output_offset, state
+                        ),
+                        output_stream,
+                    )
+
+            separator = b","
+
+        line_end = b"[]\n" if separator == b"[" else b"]\n"
+        output_stream.write(line_end)
+
+        if line_buffered:
+            output_stream.flush()
+
+        if checkpointer is not None:
+            output_offset += len(line_end)
+
+            if checkpointer.due():
+                checkpointer.save(
+                    Checkpoint(input_offset + reader.offset, output_offset),
+                    output_stream,
+                )
+
+    if checkpointer is not None:
+        checkpointer.save(
+            Checkpoint(input_offset + reader.offset, output_offset), output_stream
+        )
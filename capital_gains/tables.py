@@ -0,0 +1,510 @@
+"""
+Tables module.
+
+This module reads operations stored as columns from CSV, Arrow IPC and
+Parquet inputs, and writes the tax of each operation as a column aligned
+to the input rows. Inputs hold the `batch`, `operation`, `quantity` and
+`unit-cost` columns, and consecutive rows with the same batch identifier
+form a batch of operations, calculated from an empty portfolio state as a
+line of JSON input. Inputs are read in chunks of rows, and each chunk is
+decoded straight into lightweight records, without validation models,
+then calculated by the engine of the line processor.
+
+Batches of operations encoded as binary frames by the `wire` module are
+processed in the same way, and their taxes may be written in any output
+format. The Arrow IPC and Parquet formats require PyArrow, which is only
+imported when one of them is used.
+"""
+
+import csv
+import io
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Union,
+)
+
+from .buffers import OutputBuffer
+from .decoders import decode_rows
+from .formatters import format_cents
+from .models import OperationRecord
+from .options import DataFormat
+from .pipeline import LineProcessor
+from .wire import decode_operation_frame, encode_result_frame, read_frames
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pyarrow
+
+#: The columns of operations read from tables.
+INPUT_COLUMNS = ("batch", "operation", "quantity", "unit-cost")
+
+#: The column of taxes written to tables.
+TAX_COLUMN = "tax"
+
+#: The default number of rows of the chunks read from and written to tables.
+DEFAULT_CHUNK_ROWS = 65536
+
+#: Magic bytes starting Arrow IPC files, as opposed to Arrow IPC streams.
+_ARROW_FILE_MAGIC = b"ARROW1"
+
+#: Columns of a chunk of operations, indexed by name.
+Columns = Dict[str, List[Any]]
+
+
+def _import_pyarrow(data_format: DataFormat) -> Any:
+    """
+    Import PyArrow for a data format.
+
+    Parameters:
+        data_format (DataFormat): The data format requiring PyArrow.
+
+    Returns:
+        Any: The PyArrow module, with its IPC and Parquet modules loaded.
+
+    Raises:
+        ImportError: PyArrow is not installed.
+    """
+
+    try:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError(
+            f"The {data_format.value} format requires PyArrow to be installed."
+        ) from error
+
+    return pyarrow
+
+
+def _missing_columns(names: Iterable[str]) -> ValueError:
+    """
+    Create the error of an input without some of the operation columns.
+
+    Parameters:
+        names (Iterable[str]): The column names of the input.
+
+    Returns:
+        ValueError: The error, naming the missing columns.
+    """
+
+    missing = [name for name in INPUT_COLUMNS if name not in set(names)]
+
+    return ValueError(f"The input is missing the columns: {', '.join(missing)}.")
+
+
+def read_csv_columns(input_stream: BinaryIO, chunk_rows: int) -> Iterator[Columns]:
+    """
+    Read chunks of operation columns from CSV input with a header row.
+
+    Parameters:
+        input_stream (BinaryIO): The UTF-8 encoded input stream.
+        chunk_rows (int): The number of rows of each chunk.
+
+    Returns:
+        Iterator[Columns]: The columns of each chunk, as text.
+
+    Raises:
+        ValueError: The input is missing a column, or a row is missing fields.
+    """
+
+    text_stream = io.TextIOWrapper(input_stream, encoding="utf-8", newline="")
+
+    try:
+        reader = csv.reader(text_stream)
+        header = next(reader, [])
+
+        if not set(INPUT_COLUMNS).issubset(header):
+            raise _missing_columns(header)
+
+        indexes = [header.index(name) for name in INPUT_COLUMNS]
+
+        while rows := list(islice(reader, chunk_rows)):
+            try:
+                yield {
+                    name: [row[index] for row in rows]
+                    for name, index in zip(INPUT_COLUMNS, indexes)
+                }
+            except IndexError as error:
+                raise ValueError("A row of the input is missing fields.") from error
+    finally:
+        # Leave the input stream open for the caller.
+        text_stream.detach()
+
+
+def _record_batch_columns(record_batch: "pyarrow.RecordBatch") -> Columns:
+    """
+    Convert the operation columns of an Arrow record batch to Python values.
+
+    Parameters:
+        record_batch (pyarrow.RecordBatch): The record batch.
+
+    Returns:
+        Columns: The columns of the record batch.
+
+    Raises:
+        ValueError: The record batch is missing a column.
+    """
+
+    names = record_batch.schema.names
+
+    if not set(INPUT_COLUMNS).issubset(names):
+        raise _missing_columns(names)
+
+    return {name: record_batch.column(name).to_pylist() for name in INPUT_COLUMNS}
+
+
+def read_arrow_columns(input_stream: BinaryIO) -> Iterator[Columns]:
+    """
+    Read chunks of operation columns from an Arrow IPC stream or file.
+
+    Each record batch is read as a chunk. Arrow IPC files are only
+    recognized in seekable input.
+
+    Parameters:
+        input_stream (BinaryIO): The input stream.
+
+    Returns:
+        Iterator[Columns]: The columns of each record batch.
+
+    Raises:
+        ImportError: PyArrow is not installed.
+        ValueError: The input is missing a column.
+    """
+
+    pyarrow = _import_pyarrow(DataFormat.ARROW)
+
+    if input_stream.seekable():
+        position = input_stream.tell()
+        magic = input_stream.read(len(_ARROW_FILE_MAGIC))
+        input_stream.seek(position)
+
+        if magic == _ARROW_FILE_MAGIC:
+            reader = pyarrow.ipc.open_file(input_stream)
+
+            for index in range(reader.num_record_batches):
+                yield _record_batch_columns(reader.get_batch(index))
+
+            return
+
+    for record_batch in pyarrow.ipc.open_stream(input_stream):
+        yield _record_batch_columns(record_batch)
+
+
+def read_parquet_columns(input_stream: BinaryIO, chunk_rows: int) -> Iterator[Columns]:
+    """
+    Read chunks of operation columns from a Parquet file.
+
+    Non-seekable input is read into memory, since Parquet metadata is
+    stored at the end of the file.
+
+    Parameters:
+        input_stream (BinaryIO): The input stream.
+        chunk_rows (int): The maximum number of rows of each chunk.
+
+    Returns:
+        Iterator[Columns]: The columns of each chunk.
+
+    Raises:
+        ImportError: PyArrow is not installed.
+        ValueError: The input is missing a column.
+    """
+
+    pyarrow = _import_pyarrow(DataFormat.PARQUET)
+    source = (
+        input_stream
+        if input_stream.seekable()
+        else pyarrow.BufferReader(input_stream.read())
+    )
+    parquet_file = pyarrow.parquet.ParquetFile(source)
+    names = parquet_file.schema_arrow.names
+
+    if not set(INPUT_COLUMNS).issubset(names):
+        raise _missing_columns(names)
+
+    for record_batch in parquet_file.iter_batches(
+        batch_size=chunk_rows, columns=list(INPUT_COLUMNS)
+    ):
+        yield _record_batch_columns(record_batch)
+
+
+def read_columns(
+    input_stream: BinaryIO, data_format: DataFormat, chunk_rows: int
+) -> Iterator[Columns]:
+    """
+    Read chunks of operation columns from a table.
+
+    Parameters:
+        input_stream (BinaryIO): The input stream.
+        data_format (DataFormat): The format of the table.
+        chunk_rows (int): The number of rows of each chunk, for formats
+            that are not stored in record batches.
+
+    Returns:
+        Iterator[Columns]: The columns of each chunk.
+
+    Raises:
+        ImportError: PyArrow is not installed.
+        ValueError: The format is not tabular, or the input is missing a column.
+    """
+
+    if data_format == DataFormat.CSV:
+        return read_csv_columns(input_stream, chunk_rows)
+
+    if data_format == DataFormat.ARROW:
+        return read_arrow_columns(input_stream)
+
+    if data_format == DataFormat.PARQUET:
+        return read_parquet_columns(input_stream, chunk_rows)
+
+    raise ValueError(f"The {data_format.value} format is not tabular.")
+
+
+def split_batches(chunks: Iterable[Columns]) -> Iterator[List[OperationRecord]]:
+    """
+    Decode chunks of operation columns into batches of consecutive rows.
+
+    Batches spanning several chunks are yielded once they are complete.
+
+    Parameters:
+        chunks (Iterable[Columns]): The columns of each chunk.
+
+    Returns:
+        Iterator[List[OperationRecord]]: The operations of each batch, in order.
+
+    Raises:
+        ValidationError: A row is invalid.
+    """
+
+    batch: List[OperationRecord] = []
+    batch_id: Any = None
+
+    for columns in chunks:
+        records = decode_rows(
+            columns["operation"], columns["quantity"], columns["unit-cost"]
+        )
+        start = 0
+
+        for index, row_id in enumerate(columns["batch"]):
+            if row_id != batch_id:
+                batch.extend(records[start:index])
+
+                if batch:
+                    yield batch
+
+                batch = []
+                batch_id = row_id
+                start = index
+
+        batch.extend(records[start:])
+
+    if batch:
+        yield batch
+
+
+class CsvTaxWriter:
+    """
+    Writer of the tax column of a table, as comma-separated values.
+    """
+
+    #: The output stream.
+    output_stream: BinaryIO
+
+    def __init__(self, output_stream: BinaryIO):
+        """
+        Initialize the writer, writing the header row.
+
+        Parameters:
+            output_stream (BinaryIO): The output stream.
+        """
+
+        self.output_stream = output_stream
+
+        output_stream.write(TAX_COLUMN.encode() + b"\n")
+
+    def write(self, taxes: Sequence[int]):
+        """
+        Write the taxes of consecutive rows.
+
+        Parameters:
+            taxes (Sequence[int]): The taxes of each row, in cents.
+        """
+
+        if taxes:
+            self.output_stream.write(b"\n".join(map(format_cents, taxes)) + b"\n")
+
+    def close(self):
+        """
+        Finish writing the table.
+        """
+
+        self.output_stream.flush()
+
+
+class ArrowTaxWriter:
+    """
+    Writer of the tax column of a table, as an Arrow IPC stream or Parquet file.
+
+    Taxes are written as 64-bit floats, the values of the JSON results, in
+    record batches of a fixed number of rows.
+    """
+
+    #: The output stream.
+    output_stream: BinaryIO
+
+    #: The number of rows of each record batch.
+    chunk_rows: int
+
+    def __init__(
+        self, output_stream: BinaryIO, data_format: DataFormat, chunk_rows: int
+    ):
+        """
+        Initialize the writer.
+
+        Parameters:
+            output_stream (BinaryIO): The output stream.
+            data_format (DataFormat): The Arrow or Parquet format.
+            chunk_rows (int): The number of rows of each record batch.
+
+        Raises:
+            ImportError: PyArrow is not installed.
+        """
+
+        pyarrow = _import_pyarrow(data_format)
+        schema = pyarrow.schema([(TAX_COLUMN, pyarrow.float64())])
+
+        self.output_stream = output_stream
+        self.chunk_rows = chunk_rows
+
+        self._pyarrow = pyarrow
+        self._schema = schema
+        self._taxes: List[int] = []
+        self._writer = (
+            pyarrow.parquet.ParquetWriter(output_stream, schema)
+            if data_format == DataFormat.PARQUET
+            else pyarrow.ipc.new_stream(output_stream, schema)
+        )
+
+    def _write_batch(self, taxes: Sequence[int]):
+        """
+        Write a record batch of taxes.
+
+        Parameters:
+            taxes (Sequence[int]): The taxes of each row, in cents.
+        """
+
+        column = self._pyarrow.array(
+            [tax / 100 for tax in taxes], self._pyarrow.float64()
+        )
+        self._writer.write_batch(
+            self._pyarrow.record_batch([column], schema=self._schema)
+        )
+
+    def write(self, taxes: Sequence[int]):
+        """
+        Write the taxes of consecutive rows.
+
+        Parameters:
+            taxes (Sequence[int]): The taxes of each row, in cents.
+        """
+
+        pending = self._taxes
+        pending.extend(taxes)
+
+        if len(pending) >= self.chunk_rows:
+            chunk_rows = self.chunk_rows
+            end = len(pending) - len(pending) % chunk_rows
+
+            for start in range(0, end, chunk_rows):
+                self._write_batch(pending[start : start + chunk_rows])
+
+            del pending[:end]
+
+    def close(self):
+        """
+        Write the pending taxes and finish writing the table.
+        """
+
+        if self._taxes:
+            self._write_batch(self._taxes)
+            self._taxes = []
+
+        self._writer.close()
+        self.output_stream.flush()
+
+
+def process_table(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    processor: LineProcessor,
+    input_stream: BinaryIO,
+    output_stream: BinaryIO,
+    input_format: DataFormat,
+    output_format: DataFormat,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+):
+    """
+    Calculate the taxes of the operations of a table or of binary frames.
+
+    Taxes are written as a column aligned to the input rows, as one line of
+    JSON results per batch with the JSONL output format, or as one frame of
+    results per batch with the binary output format. If a row is invalid,
+    the taxes of the preceding batches are written before the error is raised.
+
+    Parameters:
+        processor (LineProcessor): The line processor, whose engine calculates
+            the batches.
+        input_stream (BinaryIO): The input stream.
+        output_stream (BinaryIO): The output stream.
+        input_format (DataFormat): The tabular or binary format of the input.
+        output_format (DataFormat): The format of the output.
+        chunk_rows (int): The number of rows of the chunks read and written.
+            Defaults to 65536.
+
+    Raises:
+        ImportError: PyArrow is not installed.
+        ValueError: The input format is not tabular or binary, the input is
+            missing a column, or a frame is invalid.
+        ValidationError: A row is invalid.
+    """
+
+    batches: Iterable[List[OperationRecord]] = (
+        map(decode_operation_frame, read_frames(input_stream))
+        if input_format == DataFormat.BINARY
+        else split_batches(read_columns(input_stream, input_format, chunk_rows))
+    )
+
+    if output_format == DataFormat.JSONL:
+        with OutputBuffer(output_stream) as output:
+            for taxes in processor.calculate_batches(batches):
+                output.write_line(processor.json_codec.encode_results(taxes))
+
+        return
+
+    if output_format == DataFormat.BINARY:
+        try:
+            for taxes in processor.calculate_batches(batches):
+                output_stream.write(encode_result_frame(taxes))
+        finally:
+            output_stream.flush()
+
+        return
+
+    writer: Union[CsvTaxWriter, ArrowTaxWriter] = (
+        CsvTaxWriter(output_stream)
+        if output_format == DataFormat.CSV
+        else ArrowTaxWriter(output_stream, output_format, chunk_rows)
+    )
+
+    # Write the taxes preceding an invalid row, and the footer of the output.
+    try:
+        for taxes in processor.calculate_batches(batches):
+            writer.write(taxes)
+    finally:
+        writer.close()
@@ -0,0 +1,259 @@
+"""
+Wire module.
+
+This module provides a compact binary encoding of operations and results
+for service-to-service use. Each batch is a frame holding its length in
+bytes, as a little-endian unsigned 32-bit integer, followed by its packed
+records. Operation records hold the operation type byte, the quantity and
+the unit cost in cents, and result records hold the tax in cents, all as
+little-endian signed 64-bit integers. Frames are decoded from memory views
+of the input without copying it or parsing text.
+"""
+
+import struct
+from decimal import ROUND_HALF_UP, Decimal
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Union
+
+from .models import OperationModel, OperationRecord, OperationType
+
+#: Length prefix of frames, in bytes.
+FRAME_HEADER = struct.Struct("<I")
+
+#: Packed operation record: type byte, quantity and unit cost in cents.
+OPERATION_RECORD = struct.Struct("<Bqq")
+
+#: Packed result record: tax in cents.
+RESULT_RECORD = struct.Struct("<q")
+
+#: Operation types indexed by their type byte.
+OPERATION_TYPES = (OperationType.BUY, OperationType.SELL)
+
+#: Type bytes indexed by their operation type.
+_TYPE_BYTES: Dict[OperationType, int] = {
+    operation_type: type_byte
+    for type_byte, operation_type in enumerate(OPERATION_TYPES)
+}
+
+#: Rounding exponent for financial values.
+_CENTS = Decimal("0.01")
+
+#: Maximum number of memoized unit costs.
+_UNIT_COST_CACHE_SIZE = 4096
+
+#: Memoized unit costs indexed by their value in cents.
+_unit_cost_cache: Dict[int, Decimal] = {}
+
+
+def _encode_frame(payload: bytes) -> bytes:
+    """
+    Prefix a frame payload with its length.
+
+    Parameters:
+        payload (bytes): The packed records of the frame.
+
+    Returns:
+        bytes: The encoded frame.
+
+    Raises:
+        ValueError: The payload does not fit in a frame.
+    """
+
+    try:
+        return FRAME_HEADER.pack(len(payload)) + payload
+    except struct.error as error:
+        raise ValueError("The batch does not fit in a frame.") from error
+
+
+def encode_operation_frame(
+    operations: Iterable[Union[OperationModel, OperationRecord]],
+) -> bytes:
+    """
+    Encode a batch of operations as a frame.
+
+    Unit costs are rounded to cents, as validated by `OperationModel`.
+
+    Parameters:
+        operations (Iterable[Union[OperationModel, OperationRecord]]): The
+            operations of the batch.
+
+    Returns:
+        bytes: The encoded frame.
+
+    Raises:
+        ValueError: A quantity or unit cost exceeds 64 bits.
+    """
+
+    try:
+        payload = b"".join(
+            [
+                OPERATION_RECORD.pack(
+                    _TYPE_BYTES[operation.operation],
+                    operation.quantity,
+                    int(operation.unit_cost.quantize(_CENTS, ROUND_HALF_UP).scaleb(2)),
+                )
+                for operation in operations
+            ]
+        )
+    except struct.error as error:
+        raise ValueError(f"The operation does not fit in a record: {error}") from error
+
+    return _encode_frame(payload)
+
+
+def _decode_unit_cost(cents: int) -> Decimal:
+    """
+    Decode a unit cost in cents into its decimal value.
+
+    Parameters:
+        cents (int): The unit cost, in cents.
+
+    Returns:
+        Decimal: The unit cost, with two decimal places.
+    """
+
+    unit_cost = _unit_cost_cache.get(cents)
+
+    if unit_cost is None:
+        unit_cost = Decimal(cents).scaleb(-2)
+
+        if len(_unit_cost_cache) >= _UNIT_COST_CACHE_SIZE:
+            _unit_cost_cache.clear()
+
+        _unit_cost_cache[cents] = unit_cost
+
+    return unit_cost
+
+
+def decode_operation_frame(payload: memoryview) -> List[OperationRecord]:
+    """
+    Decode the payload of an operation frame into lightweight records.
+
+    Parameters:
+        payload (memoryview): The packed operation records.
+
+    Returns:
+        List[OperationRecord]: The decoded records.
+
+    Raises:
+        ValueError: The payload holds a partial record or an unknown type byte.
+    """
+
+    if len(payload) % OPERATION_RECORD.size:
+        raise ValueError("The frame holds a partial operation record.")
+
+    unit_costs = _unit_cost_cache
+
+    try:
+        return [
+            OperationRecord(
+                OPERATION_TYPES[type_byte],
+                quantity,
+                unit_costs.get(cents) or _decode_unit_cost(cents),
+            )
+            for type_byte, quantity, cents in OPERATION_RECORD.iter_unpack(payload)
+        ]
+    except IndexError as error:
+        raise ValueError("The frame holds an unknown operation type.") from error
+
+
+def encode_result_frame(taxes: Iterable[int]) -> bytes:
+    """
+    Encode the taxes of a batch as a frame.
+
+    Parameters:
+        taxes (Iterable[int]): The taxes of each operation, in cents.
+
+    Returns:
+        bytes: The encoded frame.
+
+    Raises:
+        ValueError: A tax exceeds 64 bits.
+    """
+
+    taxes = list(taxes)
+
+    try:
+        payload = struct.pack(f"<{len(taxes)}q", *taxes)
+    except struct.error as error:
+        raise ValueError(f"The tax does not fit in a record: {error}") from error
+
+    return _encode_frame(payload)
+
+
+def decode_result_frame(payload: memoryview) -> List[int]:
+    """
+    Decode the payload of a result frame into taxes.
+
+    Parameters:
+        payload (memoryview): The packed result records.
+
+    Returns:
+        List[int]: The taxes of each operation, in cents.
+
+    Raises:
+        ValueError: The payload holds a partial record.
+    """
+
+    if len(payload) % RESULT_RECORD.size:
+        raise ValueError("The frame holds a partial result record.")
+
+    return list(struct.unpack(f"<{len(payload) // RESULT_RECORD.size}q", payload))
+
+
+def iter_frames(buffer: Union[bytes, bytearray, memoryview]) -> Iterator[memoryview]:
+    """
+    Iterate over the frames of a buffer.
+
+    Parameters:
+        buffer (Union[bytes, bytearray, memoryview]): The encoded frames.
+
+    Returns:
+        Iterator[memoryview]: The payload of each frame, as a view of the buffer.
+
+    Raises:
+        ValueError: The buffer ends within a frame.
+    """
+
+    view = memoryview(buffer).cast("B")
+    offset = 0
+
+    while offset < len(view):
+        end = offset + FRAME_HEADER.size
+
+        if end > len(view):
+            raise ValueError("The input ends within a frame header.")
+
+        (length,) = FRAME_HEADER.unpack_from(view, offset)
+        offset = end + length
+
+        if offset > len(view):
+            raise ValueError("The input ends within a frame.")
+
+        yield view[end:offset]
+
+
+def read_frames(input_stream: BinaryIO) -> Iterator[memoryview]:
+    """
+    Read the frames of a stream, one at a time.
+
+    Parameters:
+        input_stream (BinaryIO): The input stream.
+
+    Returns:
+        Iterator[memoryview]: The payload of each frame.
+
+    Raises:
+        ValueError: The input ends within a frame.
+    """
+
+    while header := input_stream.read(FRAME_HEADER.size):
+        if len(header) < FRAME_HEADER.size:
+            raise ValueError("The input ends within a frame header.")
+
+        (length,) = FRAME_HEADER.unpack(header)
+        payload = input_stream.read(length)
+
+        if len(payload) < length:
+            raise ValueError("The input ends within a frame.")
+
+        yield memoryview(payload)
@@ -0,0 +1,266 @@
+"""
+Workloads module.
+
+This module generates deterministic synthetic batches of operations and
+defines the standard workloads used to measure the throughput of the
+application. Lines are generated lazily, in blocks seeded from the
+workload seed, so the same parameters always produce the same input and
+blocks can be generated in parallel.
+"""
+
+import math
+import random
+from collections import deque
+from concurrent.futures import Future
+from itertools import islice
+from typing import Deque, Iterator, NamedTuple
+
+#: The number of lines generated from each derived random seed.
+BLOCK_LINES = 1024
+
+
+class WorkloadShape(NamedTuple):
+    """
+    Parameters of a synthetic stream of operation batches.
+    """
+
+    #: The number of lines.
+    lines: int
+
+    #: The number of operations in each line.
+    operations_per_line: int
+
+    #: The probability of selling held shares instead of buying.
+    sell_ratio: float = 0.5
+
+    #: The standard deviation of the relative price change between operations.
+    volatility: float = 0.05
+
+    #: The probability of selling below the average cost, carrying a loss.
+    loss_frequency: float = 0.2
+
+
+#: JSON templates of buy and sell operations.
+_BUY_TEMPLATE = '{"operation":"buy","unit-cost":%.2f,"quantity":%d}'
+_SELL_TEMPLATE = '{"operation":"sell","unit-cost":%.2f,"quantity":%d}'
+
+#: Multipliers of bought quantities.
+_QUANTITY_MULTIPLIERS = (1, 10, 100)
+
+
+def generate_line(generator: random.Random, shape: WorkloadShape) -> bytes:
+    """
+    Generate a JSON encoded batch of operations that never sells more than held.
+
+    Prices follow a random walk from a random initial price, and losing
+    sales are priced below the average cost of the held shares.
+
+    Parameters:
+        generator (random.Random): The random generator.
+        shape (WorkloadShape): The parameters of the workload.
+
+    Returns:
+        bytes: The JSON encoded batch of operations, without a trailing line break.
+    """
+
+    # Bind the random functions locally, as this loop generates every operation.
+    uniform = generator.random
+    gauss = generator.gauss
+    sell_ratio = shape.sell_ratio
+    volatility = shape.volatility
+    loss_frequency = shape.loss_frequency
+
+    price = 5 + 95 * uniform()
+    shares = 0
+    total_cost = 0.0
+    operations = []
+
+    for _ in range(shape.operations_per_line):
+        price = max(0.01, price * math.exp(gauss(0, volatility)))
+
+        if shares == 0 or uniform() >= sell_ratio:
+            quantity = (
+                int(1000 * uniform() + 1) * _QUANTITY_MULTIPLIERS[int(3 * uniform())]
+            )
+            total_cost += quantity * price
+            shares += quantity
+            operations.append(_BUY_TEMPLATE % (price, quantity))
+        else:
+            average_cost = total_cost / shares
+            quantity = int(shares * uniform()) + 1
+            total_cost -= quantity * average_cost
+            shares -= quantity
+
+            if uniform() < loss_frequency:
+                unit_cost = average_cost * (0.5 + 0.49 * uniform())
+            else:
+                unit_cost = price
+
+            operations.append(_SELL_TEMPLATE % (unit_cost, quantity))
+
+    return f"[{','.join(operations)}]".encode()
+
+
+def generate_block(shape: WorkloadShape, seed: int, block: int) -> bytes:
+    """
+    Generate a block of JSON encoded batches of operations.
+
+    Each block is generated from its own random seed, derived from the
+    workload seed, so blocks can be generated independently.
+
+    Parameters:
+        shape (WorkloadShape): The parameters of the workload.
+        seed (int): The random seed of the workload.
+        block (int): The index of the block.
+
+    Returns:
+        bytes: The lines of the block, each followed by a line break.
+    """
+
+    generator = random.Random(f"{seed}:{block}")
+    count = min(BLOCK_LINES, shape.lines - block * BLOCK_LINES)
+
+    return b"".join(generate_line(generator, shape) + b"\n" for _ in range(count))
+
+
+def generate_lines(shape: WorkloadShape, seed: int = 0) -> Iterator[bytes]:
+    """
+    Generate JSON encoded batches of operations lazily.
+
+    Parameters:
+        shape (WorkloadShape): The parameters of the workload.
+        seed (int): The random seed. Defaults to zero.
+
+    Returns:
+        Iterator[bytes]: The JSON encoded batches of operations, without
+            trailing line breaks.
+    """
+
+    for block in range(-(-shape.lines // BLOCK_LINES)):
+        generator = random.Random(f"{seed}:{block}")
+        count = min(BLOCK_LINES, shape.lines - block * BLOCK_LINES)
+
+        for _ in range(count):
+            yield generate_line(generator, shape)
+
+
+def generate_blocks(
+    shape: WorkloadShape, seed: int = 0, workers: int = 1
+) -> Iterator[bytes]:
+    """
+    Generate blocks of JSON encoded batches of operations lazily, in order.
+
+    With multiple workers, blocks are generated across a pool of worker
+    processes, with at most twice as many pending blocks as workers. The
+    output does not depend on the number of workers.
+
+    Parameters:
+        shape (WorkloadShape): The parameters of the workload.
+        seed (int): The random seed. Defaults to zero.
+        workers (int): The number of worker processes. Defaults to one.
+
+    Returns:
+        Iterator[bytes]: The blocks of lines, each line followed by a line break.
+    """
+
+    blocks = range(-(-shape.lines // BLOCK_LINES))
+
+    if workers <= 1:
+        for block in blocks:
+            yield generate_block(shape, seed, block)
+
+        return
+
+    # Defer loading multiprocessing until worker processes are needed.
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+    )
+
+    pending: Deque[Future] = deque()
+    block_iterator = iter(blocks)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            while True:
+                # Fill the window of in-flight blocks.
+                for block in islice(block_iterator, 2 * workers - len(pending)):
+                    pending.append(executor.submit(generate_block, shape, seed, block))
+
+                if not pending:
+                    break
+
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class Workload(NamedTuple):
+    """
+    Standard workload used to measure the throughput of the application.
+    """
+
+    #: The name of the workload.
+    name: str
+
+    #: The description of the workload.
+    description: str
+
+    #: The parameters of the workload at unit scale.
+    shape: WorkloadShape
+
+    #: The minimum expected throughput, in operations per second, used to
+    #: detect performance regressions.
+    min_operations_per_second: float
+
+    def scaled(self, scale: float) -> WorkloadShape:
+        """
+        Scale the size of the workload.
+
+        The number of lines is scaled, or the number of operations when
+        the workload has a single line.
+
+        Parameters:
+            scale (float): The scale factor.
+
+        Returns:
+            WorkloadShape: The parameters of the scaled workload.
+        """
+
+        if self.shape.lines == 1:
+            operations_per_line = max(1, round(self.shape.operations_per_line * scale))
+            return self.shape._replace(operations_per_line=operations_per_line)
+
+        return self.shape._replace(lines=max(1, round(self.shape.lines * scale)))
+
+
+#: The standard workloads, by name.
+WORKLOADS = {
+    workload.name: workload
+    for workload in [
+        Workload(
+            "tiny-lines",
+            "Many lines of two operations.",
+            WorkloadShape(lines=20000, operations_per_line=2),
+            min_operations_per_second=2000,
+        ),
+        Workload(
+            "huge-line",
+            "A single line of many operations.",
+            WorkloadShape(lines=1, operations_per_line=100000),
+            min_operations_per_second=2000,
+        ),
+        Workload(
+            "sell-heavy",
+            "Lines where most operations sell shares.",
+            WorkloadShape(lines=1000, operations_per_line=50, sell_ratio=0.8),
+            min_operations_per_second=2000,
+        ),
+        Workload(
+            "loss-carry",
+            "Lines where most sales carry losses to later profits.",
+            WorkloadShape(lines=1000, operations_per_line=50, loss_frequency=0.6),
+            min_operations_per_second=2000,
+        ),
+    ]
+}
@@ -0,0 +1,155 @@
+"""
+Test accounts module.
+"""
+
+import json
+import os
+from decimal import Decimal
+from typing import List
+
+import pytest
+
+from capital_gains.accounts import AccountProcessor, AccountStore
+from capital_gains.metrics import MetricsCollector
+from capital_gains.pipeline import Backend, Engine, LineProcessor
+from capital_gains.workloads import WorkloadShape, generate_lines
+
+
+def account_line(account: str, operations: list) -> bytes:
+    """
+    Encode a batch of operations of an account.
+
+    Parameters:
+        account (str): The identifier of the account.
+        operations (list): The decoded operations.
+
+    Returns:
+        bytes: The JSON encoded batch of operations of the account.
+    """
+
+    return json.dumps({"account": account, "operations": operations}).encode()
+
+
+def test_account_store(tmp_path):
+    """
+    Test saving, committing and loading the states of accounts.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: The states or the statistics do not match.
+    """
+
+    path = os.path.join(tmp_path, "accounts.sqlite")
+    store = AccountStore(path, commit_interval=2, max_cached=1)
+
+    assert store.load("a") is None
+
+    store.save("a", (10, Decimal("1.5"), Decimal("0")))
+    store.save("b", (20, Decimal("2.5"), Decimal("100")))
+
+    # Dropping the updated state of the first account from memory commits it.
+    assert store.writes == 1
+
+    store.save("c", (30, Decimal("3.5"), Decimal("0.000000000000000001")))
+
+    assert store.load("a") == (10, Decimal("1.5"), Decimal("0"))
+    assert store.writes == 3
+
+    store.close()
+    store = AccountStore(path)
+
+    assert store.load("c") == (30, Decimal("3.5"), Decimal("0.000000000000000001"))
+    assert store.load("c") is not None
+    assert (store.hits, store.misses) == (1, 1)
+    assert "hit ratio: 50.0%" in store.report()
+
+    store.close()
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"fast_decode": True}, {"backend": Backend.FIXED}],
+)
+def test_account_processing(tmp_path, options: dict):
+    """
+    Test that processing histories in daily deltas matches processing them whole.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+        options (dict): The keyword arguments of the line processor.
+
+    Raises:
+        AssertionError: The results differ from processing whole histories.
+    """
+
+    histories = [
+        json.loads(line) for line in generate_lines(WorkloadShape(5, 30), seed=3)
+    ]
+    path = os.path.join(tmp_path, "accounts.sqlite")
+    results: List[list] = [[] for _ in histories]
+
+    for day in range(3):
+        store = AccountStore(path, commit_interval=4, max_cached=2)
+        processor = AccountProcessor(LineProcessor(**options), store)
+
+        for account, history in enumerate(histories):
+            json_results = processor.process(
+                account_line(str(account), history[day * 10 : (day + 1) * 10])
+            )
+            results[account].extend(json.loads(json_results))
+
+        store.close()
+
+    line_processor = LineProcessor(**options)
+
+    assert results == [
+        json.loads(line_processor.process(json.dumps(history))) for history in histories
+    ]
+
+
+def test_account_processing_error(tmp_path):
+    """
+    Test that invalid batches do not update the state of the account.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: The state is updated or the failure is not reported.
+    """
+
+    metrics = MetricsCollector()
+    store = AccountStore(os.path.join(tmp_path, "accounts.sqlite"))
+    processor = AccountProcessor(LineProcessor(hooks=metrics), store)
+    buy = {"operation": "buy", "unit-cost": 10, "quantity": 100}
+
+    processor.process(account_line("a", [buy]))
+
+    with pytest.raises(ValueError):
+        processor.process(account_line("a", [buy, {"operation": "hold"}]))
+
+    assert store.load("a") == (100, Decimal("10.00"), Decimal("0"))
+    assert (metrics.lines, metrics.validation_failures) == (1, 1)
+
+    store.close()
+
+
+def test_account_engine(tmp_path):
+    """
+    Test that only the decimal engine supports accounts.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: The error is not raised.
+    """
+
+    store = AccountStore(os.path.join(tmp_path, "accounts.sqlite"))
+
+    with pytest.raises(ValueError, match="decimal engine"):
+        AccountProcessor(LineProcessor(engine=Engine.NUMPY), store)
+
+    store.close()
@@ -0,0 +1,158 @@
+"""
+Test API module.
+"""
+
+import json
+import os
+from decimal import Decimal
+from typing import Iterator, List
+
+import pytest
+from pydantic import ValidationError
+
+import capital_gains
+from capital_gains.api import calculate_taxes, process_lines
+from capital_gains.models import (
+    RESULTS_ADAPTER,
+    OperationModel,
+    OperationRecord,
+    OperationType,
+)
+from capital_gains.options import Backend, Engine
+
+
+def read_data(data_path: str, name: str) -> List[bytes]:
+    """
+    Read the lines of a test data file.
+
+    Parameters:
+        data_path (str): The path to the test data directory.
+        name (str): The name of the test data file.
+
+    Returns:
+        List[bytes]: The lines of the file, without line breaks.
+    """
+
+    with open(os.path.join(data_path, name), "rb") as data_file:
+        return data_file.read().splitlines()
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"fast_decode": True},
+        {"backend": Backend.FIXED},
+        {"engine": Engine.NUMPY, "batch_size": 2},
+    ],
+)
+@pytest.mark.parametrize("scenario", range(10))
+def test_api_scenarios(data_path: str, scenario: int, options: dict):
+    """
+    Test that the library entry points match the command-line results.
+
+    Parameters:
+        data_path (str): The path to the test data directory.
+        scenario (int): The number of the test scenario.
+        options (dict): The keyword arguments of the entry points.
+
+    Raises:
+        AssertionError: The results do not match the expected output.
+    """
+
+    lines = read_data(data_path, f"input.{scenario}.jsonl")
+    expected_lines = read_data(data_path, f"output.{scenario}.jsonl")
+    expected_taxes = [
+        [result.tax for result in RESULTS_ADAPTER.validate_json(line)]
+        for line in expected_lines
+    ]
+
+    assert list(process_lines(lines, **options)) == expected_lines
+    assert list(calculate_taxes(lines, **options)) == expected_taxes
+    assert list(calculate_taxes(map(json.loads, lines), **options)) == expected_taxes
+
+
+def test_calculate_operations():
+    """
+    Test calculating batches of decoded operations and of mixed values.
+
+    Raises:
+        AssertionError: The taxes do not match.
+    """
+
+    batches = [
+        [
+            OperationRecord(OperationType.BUY, 10000, Decimal("10.00")),
+            OperationRecord(OperationType.SELL, 5000, Decimal("20.00")),
+        ],
+        (
+            operation
+            for operation in [
+                OperationModel(
+                    operation=OperationType.BUY, quantity=10000, unit_cost=10
+                ),
+                {"operation": "sell", "unit-cost": "20.004", "quantity": 5000},
+            ]
+        ),
+        [],
+    ]
+
+    assert list(calculate_taxes(batches)) == [
+        [Decimal("0"), Decimal("10000")],
+        [Decimal("0"), Decimal("10000")],
+        [],
+    ]
+
+
+@pytest.mark.parametrize("engine", list(Engine))
+@pytest.mark.parametrize("fast_decode", [False, True])
+def test_calculate_lazily(engine: Engine, fast_decode: bool):
+    """
+    Test that batches are consumed lazily and errors follow the preceding results.
+
+    Parameters:
+        engine (Engine): The tax calculation engine.
+        fast_decode (bool): Whether to decode operations into lightweight records.
+
+    Raises:
+        AssertionError: The input is consumed ahead of the results, or the
+            results preceding the invalid batch are not yielded.
+    """
+
+    consumed = []
+
+    def batches() -> Iterator[list]:
+        for index in range(5):
+            consumed.append(index)
+
+            yield [{"operation": "buy", "unit-cost": 1, "quantity": 1}]
+
+        yield [{"operation": "hold"}]
+
+    taxes = calculate_taxes(
+        batches(), engine=engine, fast_decode=fast_decode, batch_size=2
+    )
+
+    assert next(taxes) == [Decimal("0")]
+    assert len(consumed) <= 2
+    assert len(list(zip(range(4), taxes))) == 4
+
+    with pytest.raises(ValidationError):
+        next(taxes)
+
+
+def test_package_exports():
+    """
+    Test that the library entry points are exported by the package.
+
+    Raises:
+        AssertionError: The exports do not match the entry points.
+    """
+
+    assert capital_gains.process_lines is process_lines
+    assert capital_gains.calculate_taxes is calculate_taxes
+    assert capital_gains.Engine is Engine
+    assert capital_gains.Backend is Backend
+
+    with pytest.raises(AttributeError):
+        getattr(capital_gains, "unknown")
@@ -0,0 +1,68 @@
+"""
+Test the decimal backend.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from capital_gains.backends import DecimalBackend
+
+
+@pytest.mark.parametrize("value", [Decimal("0"), Decimal("10.25"), Decimal("-3")])
+def test_conversion(value: Decimal):
+    """
+    Test that decimal values are represented as is.
+
+    Parameters:
+        value (Decimal): The decimal value.
+
+    Raises:
+        AssertionError: The value is changed by the conversions.
+    """
+
+    backend = DecimalBackend()
+
+    assert backend.from_decimal(value) is value
+    assert backend.to_decimal(value) is value
+
+
+@pytest.mark.parametrize(
+    "value, cents",
+    [
+        (Decimal("0"), 0),
+        (Decimal("12.344"), 1234),
+        (Decimal("12.345"), 1235),
+        (Decimal("-12.345"), -1235),
+    ],
+)
+def test_to_cents(value: Decimal, cents: int):
+    """
+    Test that decimal values are rounded to cents with ties away from zero.
+
+    Parameters:
+        value (Decimal): The decimal value.
+        cents (int): The expected value in cents.
+
+    Raises:
+        AssertionError: The value in cents does not match the expected value.
+    """
+
+    assert DecimalBackend().to_cents(value) == cents
+
+
+def test_arithmetic():
+    """
+    Test the division and scaling of decimal values.
+
+    Raises:
+        AssertionError: The results do not match the decimal arithmetic.
+    """
+
+    backend = DecimalBackend()
+
+    assert backend.divide(Decimal("10"), 4) == Decimal("2.5")
+    assert backend.scale(Decimal("10"), Decimal(0.2)) == Decimal("10") * Decimal(0.2)
+
+    with pytest.raises(ArithmeticError):
+        backend.divide(Decimal("10"), 0)
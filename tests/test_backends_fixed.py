@@ -0,0 +1,217 @@
+"""
+Test the fixed-point backend.
+"""
+
+import json
+import random
+from decimal import Decimal
+from fractions import Fraction
+from typing import List
+
+import pytest
+from typer import Typer
+from typer.testing import CliRunner
+
+from capital_gains.backends import FixedPointBackend
+
+
+@pytest.mark.parametrize(
+    "value, scaled_value",
+    [
+        (Decimal("0"), 0),
+        (Decimal("10.25"), 1025),
+        (Decimal("-3"), -300),
+        (Decimal("0.005"), 0),
+        (Decimal("0.015"), 2),
+        (Decimal("-0.025"), -2),
+    ],
+)
+def test_from_decimal(value: Decimal, scaled_value: int):
+    """
+    Test the conversion of decimal values to scaled integers.
+
+    Parameters:
+        value (Decimal): The decimal value.
+        scaled_value (int): The expected scaled integer, with two decimal places.
+
+    Raises:
+        AssertionError: The scaled integer does not match the expected value.
+    """
+
+    backend = FixedPointBackend(places=2)
+
+    assert backend.from_decimal(value) == scaled_value
+    assert backend.from_decimal(value) == scaled_value
+
+
+@pytest.mark.parametrize("scaled_value", [0, 1, -1, 1025, 10**40 + 7])
+def test_to_decimal(scaled_value: int):
+    """
+    Test that scaled integers are converted to decimals exactly.
+
+    Parameters:
+        scaled_value (int): The scaled integer.
+
+    Raises:
+        AssertionError: The decimal value does not match the scaled integer.
+    """
+
+    backend = FixedPointBackend()
+    value = backend.to_decimal(scaled_value)
+
+    assert Fraction(value) == Fraction(scaled_value, backend.unit)
+    assert backend.from_decimal(value) == scaled_value
+
+
+@pytest.mark.parametrize(
+    "value, cents",
+    [
+        (Decimal("0"), 0),
+        (Decimal("12.344"), 1234),
+        (Decimal("12.345"), 1235),
+        (Decimal("-12.345"), -1235),
+        (Decimal("-12.3449"), -1234),
+    ],
+)
+def test_to_cents(value: Decimal, cents: int):
+    """
+    Test that scaled integers are rounded to cents with ties away from zero.
+
+    Parameters:
+        value (Decimal): The decimal value.
+        cents (int): The expected value in cents.
+
+    Raises:
+        AssertionError: The value in cents does not match the expected value.
+    """
+
+    backend = FixedPointBackend()
+
+    assert backend.to_cents(backend.from_decimal(value)) == cents
+
+
+@pytest.mark.parametrize(
+    "value, quantity, quotient",
+    [
+        (10, 4, 2),
+        (10, 3, 3),
+        (5, 2, 2),
+        (7, 2, 4),
+        (-5, 2, -2),
+        (-7, 2, -4),
+        (5, -2, -2),
+        (0, 7, 0),
+    ],
+)
+def test_divide(value: int, quantity: int, quotient: int):
+    """
+    Test that divisions round to the nearest integer with ties to even.
+
+    Parameters:
+        value (int): The scaled integer.
+        quantity (int): The quantity to divide by.
+        quotient (int): The expected quotient.
+
+    Raises:
+        AssertionError: The quotient does not match the expected value.
+    """
+
+    assert FixedPointBackend().divide(value, quantity) == quotient
+
+
+def test_divide_by_zero():
+    """
+    Test that dividing by zero raises an arithmetic error.
+
+    Raises:
+        AssertionError: No arithmetic error is raised.
+    """
+
+    with pytest.raises(ArithmeticError):
+        FixedPointBackend().divide(10, 0)
+
+
+@pytest.mark.parametrize(
+    "value, factor, product",
+    [
+        (10, Decimal("0.5"), 5),
+        (25, Decimal("0.1"), 2),
+        (35, Decimal("0.1"), 4),
+        (100, Decimal(0.2), 20),
+    ],
+)
+def test_scale(value: int, factor: Decimal, product: int):
+    """
+    Test that scaling applies the exact factor and rounds with ties to even.
+
+    Parameters:
+        value (int): The scaled integer.
+        factor (Decimal): The factor to multiply by.
+        product (int): The expected product.
+
+    Raises:
+        AssertionError: The product does not match the expected value.
+    """
+
+    assert FixedPointBackend().scale(value, factor) == product
+
+
+def random_line(generator: random.Random, count: int) -> str:
+    """
+    Generate a random line of input that never sells more than held.
+
+    Parameters:
+        generator (random.Random): The random generator.
+        count (int): The number of operations.
+
+    Returns:
+        str: The JSON encoded batch of operations.
+    """
+
+    operations: List[dict] = []
+    shares = 0
+
+    for _ in range(count):
+        unit_cost = generator.randint(1, 5000000) / 100
+
+        if shares == 0 or generator.random() < 0.5:
+            quantity = generator.choice([1, 3, 7, 1000, generator.randint(1, 100000)])
+            operation = "buy"
+            shares += quantity
+        else:
+            quantity = generator.choice([shares, generator.randint(1, shares)])
+            operation = "sell"
+            shares -= quantity
+
+        operations.append(
+            {"operation": operation, "unit-cost": unit_cost, "quantity": quantity}
+        )
+
+    return json.dumps(operations)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_workloads(seed: int, cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test that the fixed-point output is byte-identical to the decimal output.
+
+    Parameters:
+        seed (int): The random seed.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The outputs of the backends differ.
+    """
+
+    generator = random.Random(seed)
+    input_data = "".join(
+        random_line(generator, generator.choice([1, 2, 10, 100, 1000])) + "\n"
+        for _ in range(100)
+    )
+
+    decimal_result = cli_runner.invoke(cli_app, [], input=input_data)
+    fixed_result = cli_runner.invoke(cli_app, ["--backend", "fixed"], input=input_data)
+
+    assert fixed_result.exit_code == 0
+    assert fixed_result.stdout_bytes == decimal_result.stdout_bytes
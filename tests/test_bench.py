@@ -0,0 +1,94 @@
+"""
+Test benchmark module.
+"""
+
+import json
+
+import pytest
+from typer import Typer
+from typer.testing import CliRunner
+
+from capital_gains.bench import run_benchmark
+from capital_gains.pipeline import Engine, LineProcessor
+from capital_gains.workloads import WORKLOADS, generate_lines
+
+
+@pytest.mark.parametrize("engine", list(Engine))
+def test_run_benchmark(engine: Engine):
+    """
+    Test measuring the processing of a workload.
+
+    Parameters:
+        engine (Engine): The tax calculation engine.
+
+    Raises:
+        AssertionError: The measurements are inconsistent with the workload.
+    """
+
+    lines = list(generate_lines(WORKLOADS["sell-heavy"].scaled(0.01)))
+    result = run_benchmark(LineProcessor(engine=engine), "sell-heavy", lines)
+
+    assert result.workload == "sell-heavy"
+    assert result.lines == len(lines)
+    assert result.operations == sum(len(json.loads(line)) for line in lines)
+    assert result.seconds > 0
+    assert result.operations_per_second == pytest.approx(
+        result.operations / result.seconds
+    )
+
+    if engine == Engine.DECIMAL:
+        assert result.latency_p50 is not None and result.latency_p99 is not None
+        assert 0 < result.latency_p50 <= result.latency_p99 <= result.seconds
+    else:
+        assert result.latency_p50 is None
+
+
+@pytest.mark.parametrize(
+    "options, expected_workloads",
+    [
+        ([], list(WORKLOADS)),
+        (
+            ["--workload", "huge-line", "--workload", "tiny-lines"],
+            ["huge-line", "tiny-lines"],
+        ),
+    ],
+)
+def test_bench_command(
+    options: list, expected_workloads: list, cli_app: Typer, cli_runner: CliRunner
+):
+    """
+    Test reporting benchmark results as JSON from the CLI application.
+
+    Parameters:
+        options (list): The command-line options to invoke the command with.
+        expected_workloads (list): The expected names of the reported workloads.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The reported workloads do not match the expected workloads.
+    """
+
+    result = cli_runner.invoke(
+        cli_app, ["bench", "--scale", "0.001", "--json", *options]
+    )
+    results = json.loads(result.stdout)
+
+    assert [result["workload"] for result in results] == expected_workloads
+
+
+def test_bench_unknown_workload(cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test rejecting unknown workloads from the CLI application.
+
+    Parameters:
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The unknown workload is accepted.
+    """
+
+    result = cli_runner.invoke(cli_app, ["bench", "--workload", "unknown"])
+
+    assert result.exit_code == 2
@@ -0,0 +1,155 @@
+"""
+Test buffered input and output module.
+"""
+
+import io
+from typing import List
+
+import pytest
+
+from capital_gains.buffers import OutputBuffer, read_lines
+
+
+class RecordingStream(io.BytesIO):
+    """
+    Binary stream recording the number of writes and flushes.
+    """
+
+    def __init__(self):
+        """
+        Initialize the recording stream.
+        """
+
+        super().__init__()
+
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, data) -> int:
+        """
+        Write data to the stream and record the write.
+
+        Parameters:
+            data: The data to write.
+
+        Returns:
+            int: The number of bytes written.
+        """
+
+        self.writes += 1
+
+        return super().write(data)
+
+    def flush(self):
+        """
+        Flush the stream and record the flush.
+        """
+
+        self.flushes += 1
+
+        super().flush()
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 7, 1048576])
+@pytest.mark.parametrize(
+    "data, expected_lines",
+    [
+        (b"", []),
+        (b"\n", [b""]),
+        (b"[]", [b"[]"]),
+        (b"[]\n", [b"[]"]),
+        (b"[]\n[1, 2]\n", [b"[]", b"[1, 2]"]),
+        (b"[]\n\n[1, 2]", [b"[]", b"", b"[1, 2]"]),
+        (b"[1]\r\n[2]\r\n", [b"[1]\r", b"[2]\r"]),
+    ],
+)
+def test_read_lines(data: bytes, expected_lines: List[bytes], block_size: int):
+    """
+    Test reading lines of bytes in blocks.
+
+    Parameters:
+        data (bytes): The input data.
+        expected_lines (List[bytes]): The expected lines.
+        block_size (int): The number of bytes read at a time.
+
+    Raises:
+        AssertionError: The lines do not match the expected lines.
+    """
+
+    assert list(read_lines(io.BytesIO(data), block_size)) == expected_lines
+
+
+def test_output_buffer_size():
+    """
+    Test that buffered lines are written when the size threshold is reached.
+
+    Raises:
+        AssertionError: The lines are not written in bulk.
+    """
+
+    stream = RecordingStream()
+
+    with OutputBuffer(stream, flush_size=8, flush_interval=3600) as output:
+        output.write_line(b"[1]")
+        assert stream.writes == 0
+
+        output.write_line(b"[2]")
+        assert stream.writes == 1
+
+        output.write_line(b"[3]")
+        assert stream.writes == 1
+
+    assert stream.writes == 2
+    assert stream.getvalue() == b"[1]\n[2]\n[3]\n"
+
+
+def test_output_buffer_interval():
+    """
+    Test that buffered lines are written when the time threshold is reached.
+
+    Raises:
+        AssertionError: The lines are not written after the interval.
+    """
+
+    stream = RecordingStream()
+    output = OutputBuffer(stream, flush_interval=0)
+    output.write_line(b"[1]")
+
+    assert stream.getvalue() == b"[1]\n"
+
+
+def test_output_buffer_line_buffered():
+    """
+    Test that each line is written and flushed when line buffered.
+
+    Raises:
+        AssertionError: A line is not written and flushed immediately.
+    """
+
+    stream = RecordingStream()
+    output = OutputBuffer(stream, flush_interval=3600, line_buffered=True)
+
+    for line in [b"[1]", b"[2]"]:
+        output.write_line(line)
+
+    assert stream.writes == 2
+    assert stream.flushes == 2
+    assert stream.getvalue() == b"[1]\n[2]\n"
+
+
+def test_output_buffer_error():
+    """
+    Test that buffered lines are written when an error is raised.
+
+    Raises:
+        AssertionError: The buffered lines are discarded.
+    """
+
+    stream = RecordingStream()
+
+    with pytest.raises(ValueError):
+        with OutputBuffer(stream, flush_interval=3600) as output:
+            output.write_line(b"[1]")
+            raise ValueError()
+
+    assert stream.getvalue() == b"[1]\n"
@@ -0,0 +1,201 @@
+"""
+Test cache module.
+"""
+
+import os
+from typing import Iterable, Iterator, List
+
+import pytest
+
+from capital_gains.cache import (
+    ResultCache,
+    ResultStore,
+    line_key,
+    process_cached,
+)
+from capital_gains.parallel import process_parallel
+from capital_gains.pipeline import Engine, LineProcessor
+
+#: Lines of input and their results.
+LINES = [
+    b'[{"operation": "buy", "unit-cost": 10.00, "quantity": 10000}]',
+    b'[{"operation": "buy", "unit-cost": 10.00, "quantity": 10000}, '
+    b'{"operation": "sell", "unit-cost": 20.00, "quantity": 5000}]',
+    b"[]",
+]
+RESULTS = [b'[{"tax":0.0}]', b'[{"tax":0.0},{"tax":10000.0}]', b"[]"]
+
+
+def test_line_key():
+    """
+    Test hashing lines of input.
+
+    Raises:
+        AssertionError: The keys do not depend on the line bytes and namespace only.
+    """
+
+    assert line_key(LINES[0]) == line_key(LINES[0].decode())
+    assert line_key(LINES[0]) != line_key(LINES[1])
+    assert line_key(LINES[0], b"fast") != line_key(LINES[0], b"model")
+    assert len(line_key(LINES[0])) == 16
+
+
+def test_result_cache():
+    """
+    Test looking up, caching and evicting results in memory.
+
+    Raises:
+        AssertionError: The results or the statistics do not match.
+    """
+
+    cache = ResultCache(max_entries=2)
+
+    assert cache.get(b"a") is None
+
+    cache.put(b"a", b"1")
+    cache.put(b"b", b"2")
+
+    assert cache.get(b"a") == b"1"
+
+    cache.put(b"c", b"3")
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == b"1"
+    assert cache.get(b"c") == b"3"
+    assert (cache.hits, cache.misses, cache.evictions) == (3, 2, 1)
+    assert "hit ratio: 60.0%" in cache.report()
+
+
+def test_result_store(tmp_path):
+    """
+    Test persisting results across runs, evicting the least recently used.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: The results are not persisted or evicted.
+    """
+
+    path = os.path.join(tmp_path, "cache.sqlite")
+    store = ResultStore(path, max_bytes=1000, commit_interval=2)
+
+    for index in range(10):
+        store.put(bytes([index]) * 16, b"x" * 84)
+
+    store.close()
+
+    store = ResultStore(path, max_bytes=1000)
+
+    assert store.get(bytes([9]) * 16) == b"x" * 84
+
+    store.put(bytes([10]) * 16, b"x" * 84)
+    store.close()
+
+    store = ResultStore(path, max_bytes=1000)
+
+    assert store.get(bytes([0]) * 16) is None
+    assert store.get(bytes([9]) * 16) == b"x" * 84
+    assert store.get(bytes([10]) * 16) == b"x" * 84
+
+    store.close()
+
+
+def test_result_cache_store(tmp_path):
+    """
+    Test looking up results in the persistent tier.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: The results are not found in the persistent tier.
+    """
+
+    path = os.path.join(tmp_path, "cache.sqlite")
+    cache = ResultCache(store=ResultStore(path))
+    cache.put(b"a", b"1")
+    cache.close()
+
+    cache = ResultCache(store=ResultStore(path))
+
+    assert cache.get(b"a") == b"1"
+    assert cache.get(b"a") == b"1"
+    assert (cache.hits, cache.store_hits, cache.misses) == (1, 1, 0)
+
+    cache.close()
+
+
+@pytest.mark.parametrize("engine", list(Engine))
+def test_process_cached(engine: Engine):
+    """
+    Test processing lines of input with cached results, in order.
+
+    Parameters:
+        engine (Engine): The tax calculation engine.
+
+    Raises:
+        AssertionError: The results or the statistics do not match.
+    """
+
+    processor = LineProcessor(engine=engine)
+    cache = ResultCache()
+    lines = LINES + LINES[::-1] + LINES
+
+    assert list(process_cached(processor.process_lines, lines, cache)) == (
+        RESULTS + RESULTS[::-1] + RESULTS
+    )
+
+    # The columnar engine reads the repeated lines ahead of their first result.
+    read_ahead = engine == Engine.NUMPY
+
+    assert (cache.hits, cache.misses) == ((0, 9) if read_ahead else (6, 3))
+    assert list(process_cached(processor.process_lines, LINES, cache)) == RESULTS
+    assert (cache.hits, cache.misses) == ((3, 9) if read_ahead else (9, 3))
+
+
+def test_process_cached_parallel():
+    """
+    Test processing lines of input with cached results across worker processes.
+
+    Raises:
+        AssertionError: The results do not match.
+    """
+
+    processor = LineProcessor()
+    cache = ResultCache()
+    lines = LINES * 20
+
+    def process_lines(lines: Iterable[bytes]) -> Iterator[bytes]:
+        return process_parallel(processor, lines, workers=2, chunk_size=2)
+
+    assert list(process_cached(process_lines, lines, cache)) == RESULTS * 20
+
+
+@pytest.mark.parametrize("cached_lines", [[], [0], [0, 1]])
+def test_process_cached_error(cached_lines: List[int]):
+    """
+    Test that results preceding an invalid line are yielded before the error.
+
+    Parameters:
+        cached_lines (List[int]): The indexes of the lines cached beforehand.
+
+    Raises:
+        AssertionError: The results are not yielded or the error is not raised.
+    """
+
+    processor = LineProcessor()
+    cache = ResultCache()
+
+    for index in cached_lines:
+        cache.put(line_key(LINES[index]), RESULTS[index])
+
+    results = []
+
+    with pytest.raises(ValueError):
+        for result in process_cached(
+            processor.process_lines, [*LINES[:2], b"[{}]", LINES[2]], cache
+        ):
+            results.append(result)
+
+    assert results == RESULTS[:2]
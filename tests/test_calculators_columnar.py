@@ -0,0 +1,210 @@
+"""
+Test the columnar tax calculator module.
+"""
+
+import random
+from decimal import Decimal
+from typing import List
+
+import pytest
+
+from capital_gains.calculators.columnar import ColumnarTaxCalculator, build_columns
+from capital_gains.calculators.tax import TaxCalculator
+from capital_gains.models import Operation, OperationRecord, OperationType
+from capital_gains.states.portfolio import PortfolioState
+
+pytest.importorskip("numpy")
+
+
+def buy(quantity: int, unit_cost: str) -> OperationRecord:
+    """
+    Build a buy operation.
+
+    Parameters:
+        quantity (int): The quantity of shares.
+        unit_cost (str): The unit cost.
+
+    Returns:
+        OperationRecord: The buy operation.
+    """
+
+    return OperationRecord(OperationType.BUY, quantity, Decimal(unit_cost))
+
+
+def sell(quantity: int, unit_cost: str) -> OperationRecord:
+    """
+    Build a sell operation.
+
+    Parameters:
+        quantity (int): The quantity of shares.
+        unit_cost (str): The unit cost.
+
+    Returns:
+        OperationRecord: The sell operation.
+    """
+
+    return OperationRecord(OperationType.SELL, quantity, Decimal(unit_cost))
+
+
+def expected_taxes(operations: List[Operation]) -> List[int]:
+    """
+    Calculate the taxes of a batch of operations with the decimal calculator.
+
+    Parameters:
+        operations (List[Operation]): The batch of operations.
+
+    Returns:
+        List[int]: The taxes of each operation, in cents.
+    """
+
+    calculator = TaxCalculator(PortfolioState())
+
+    return [int(result.tax.scaleb(2)) for result in calculator.process(operations)]
+
+
+def random_operations(generator: random.Random, count: int) -> List[Operation]:
+    """
+    Generate a random batch of operations that never sells more than held.
+
+    Parameters:
+        generator (random.Random): The random generator.
+        count (int): The number of operations.
+
+    Returns:
+        List[Operation]: The batch of operations.
+    """
+
+    operations: List[Operation] = []
+    shares = 0
+
+    for _ in range(count):
+        unit_cost = str(Decimal(generator.randint(0, 5000000)).scaleb(-2))
+
+        if shares == 0 or generator.random() < 0.5:
+            quantity = generator.choice([1, 10, 1000, generator.randint(1, 100000)])
+            operations.append(buy(quantity, unit_cost))
+            shares += quantity
+        else:
+            quantity = generator.choice([shares, generator.randint(1, shares)])
+            operations.append(sell(quantity, unit_cost))
+            shares -= quantity
+
+    return operations
+
+
+@pytest.mark.parametrize(
+    "batches",
+    [
+        [],
+        [[]],
+        [[], [buy(10, "10.00")], []],
+        [
+            [buy(10000, "10.00"), sell(5000, "20.00")],
+            [buy(10000, "20.00"), sell(5000, "10.00")],
+        ],
+        [
+            [
+                buy(10000, "10.00"),
+                sell(5000, "20.00"),
+                sell(5000, "5.00"),
+                buy(10000, "20.00"),
+                sell(5000, "10.00"),
+                buy(5000, "25.00"),
+                sell(10000, "30.00"),
+            ]
+        ],
+        # Operations whose taxes are exactly rounding ties.
+        [[buy(10, "25.09"), buy(10, "20.00"), sell(1, "51146.02")]],
+        # Operations outside the range of the scans.
+        [[sell(10, "100.00"), buy(5, "10.00")], [sell(0, "10.00"), buy(1, "10.00")]],
+        [[buy(2**40, "10.00"), sell(2**40, "20.00")]],
+        [[buy(10, "12345678901234.56"), sell(10, "12345678901234.57")]],
+        [[buy(10, "-10.00"), sell(10, "10.00")]],
+    ],
+)
+def test_process_batches(batches: List[List[Operation]]):
+    """
+    Test that the columnar taxes match the decimal taxes.
+
+    Parameters:
+        batches (List[List[Operation]]): The batches of operations.
+
+    Raises:
+        AssertionError: The columnar taxes do not match the decimal taxes.
+    """
+
+    calculator = ColumnarTaxCalculator()
+
+    assert calculator.process_batches(batches) == [
+        expected_taxes(batch) for batch in batches
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_process_random_batches(seed: int):
+    """
+    Test that the columnar taxes match the decimal taxes for random workloads.
+
+    Parameters:
+        seed (int): The random seed.
+
+    Raises:
+        AssertionError: The columnar taxes do not match the decimal taxes.
+    """
+
+    generator = random.Random(seed)
+    batches = [
+        random_operations(generator, generator.choice([1, 2, 10, 100, 2000]))
+        for _ in range(50)
+    ]
+
+    calculator = ColumnarTaxCalculator()
+
+    assert calculator.process_batches(batches) == [
+        expected_taxes(batch) for batch in batches
+    ]
+
+
+def test_process_invalid_batches():
+    """
+    Test that calculation errors of the decimal calculator are raised.
+
+    Raises:
+        AssertionError: The calculation error is not raised.
+    """
+
+    calculator = ColumnarTaxCalculator()
+
+    with pytest.raises(ArithmeticError):
+        calculator.process_batches([[buy(10, "10.00")], [buy(0, "10.00")]])
+
+
+def test_build_columns():
+    """
+    Test building column arrays from batches of operations.
+
+    Raises:
+        AssertionError: The column arrays do not match the operations.
+    """
+
+    columns = build_columns([[buy(10, "10.01"), sell(5, "0.07")], [], [buy(1, "3")]])
+
+    assert columns.operation_types.tolist() == [0, 1, 0]
+    assert columns.quantities.tolist() == [10, 5, 1]
+    assert columns.unit_costs.tolist() == [1001, 7, 300]
+    assert columns.offsets.tolist() == [0, 2, 2, 3]
+
+
+def test_build_columns_overflow():
+    """
+    Test that values not fitting the column arrays are rejected.
+
+    Raises:
+        AssertionError: The values are not rejected.
+    """
+
+    with pytest.raises(OverflowError):
+        build_columns([[buy(2**64, "10.00")]])
+
+    with pytest.raises(OverflowError):
+        build_columns([[buy(1, "1e20")]])
@@ -61,3 +61,64 @@ def test_process_operations(
     tax_results = [result.tax for result in calculator.process(operations)]
 
     assert tax_results == expected_tax_results
+
+
+@pytest.mark.parametrize(
+    "operation_types, expected_taxes",
+    [
+        ([], []),
+        ([OperationType.BUY], [0]),
+        ([OperationType.BUY, OperationType.SELL], [0, 1235]),
+        ([OperationType.SELL, OperationType.BUY], [1235, 0]),
+    ],
+)
+def test_calculate_operations(
+    operation_types: List[OperationType], expected_taxes: List[int]
+):
+    """
+    Test calculating the taxes of a batch of operations in cents.
+
+    Parameters:
+        operation_types (list[OperationType]): A batch of operation types to process.
+        expected_taxes (list[int]): The expected taxes, in cents.
+
+    Raises:
+        AssertionError: The taxes do not match the expected taxes.
+    """
+
+    calculator = TaxCalculator(PortfolioState())
+    calculator.operation_register[OperationType.BUY].calculate = MagicMock(  # type: ignore
+        return_value=Decimal("0")
+    )
+    calculator.operation_register[OperationType.SELL].calculate = MagicMock(  # type: ignore
+        return_value=Decimal("12.345")
+    )
+
+    operations = [
+        OperationModel(operation=operation_type, quantity=10, unit_cost=Decimal("10"))
+        for operation_type in operation_types
+    ]
+
+    assert list(calculator.calculate(operations)) == expected_taxes
+
+
+def test_process_independent_results():
+    """
+    Test that modifying a result does not change the results of other calculators.
+
+    Raises:
+        AssertionError: The results of untaxed operations are shared.
+    """
+
+    operations = [
+        OperationModel(
+            operation=OperationType.BUY, quantity=10, unit_cost=Decimal("10")
+        )
+    ]
+
+    results = list(TaxCalculator(PortfolioState()).process(operations))
+    results[0].tax = Decimal("5")
+
+    assert [
+        result.tax for result in TaxCalculator(PortfolioState()).process(operations)
+    ] == [Decimal("0.00")]
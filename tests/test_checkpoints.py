@@ -0,0 +1,239 @@
+"""
+Test checkpoints module.
+"""
+
+import os
+import shutil
+from decimal import Decimal
+from typing import BinaryIO, List
+
+import pytest
+
+from capital_gains.backends import BaseBackend, DecimalBackend, FixedPointBackend
+from capital_gains.buffers import OutputBuffer
+from capital_gains.checkpoints import Checkpoint, Checkpointer, process_checkpointed
+from capital_gains.pipeline import LineProcessor
+from capital_gains.sharding import ByteRange, read_mapped_lines
+from capital_gains.states import PortfolioState
+from capital_gains.streaming import process_stream
+from capital_gains.workloads import WorkloadShape, generate_lines
+
+
+class RecordingCheckpointer(Checkpointer):
+    """
+    Checkpointer recording every checkpoint written.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the recording checkpointer, writing a checkpoint whenever possible.
+
+        Parameters:
+            path (str): The path of the checkpoint file.
+        """
+
+        super().__init__(path, interval=0.0)
+
+        self.checkpoints: List[Checkpoint] = []
+
+    def save(self, checkpoint: Checkpoint, output_stream: BinaryIO):
+        """
+        Write and record a checkpoint.
+
+        Parameters:
+            checkpoint (Checkpoint): The checkpoint.
+            output_stream (BinaryIO): The output file stream.
+        """
+
+        super().save(checkpoint, output_stream)
+
+        self.checkpoints.append(checkpoint)
+
+
+@pytest.fixture(name="input_path")
+def input_path_fixture(tmp_path) -> str:
+    """
+    Provides an input file of random lines, the last one without a line break.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Returns:
+        str: The path of the input file.
+    """
+
+    path = os.path.join(tmp_path, "input.jsonl")
+
+    with open(path, "wb") as input_file:
+        input_file.write(b"\n".join(generate_lines(WorkloadShape(20, 5), seed=9)))
+        input_file.write(b"\n[]\n[ ]")
+
+    return path
+
+
+def resume_lines(input_path: str, output_path: str, checkpoint: Checkpoint):
+    """
+    Process the lines of an input file from a checkpoint.
+
+    Parameters:
+        input_path (str): The path of the input file.
+        output_path (str): The path of the output file.
+        checkpoint (Checkpoint): The checkpoint resumed from.
+    """
+
+    checkpointer = Checkpointer(f"{output_path}.checkpoint")
+
+    with open(output_path, "r+b") as output_file:
+        output_file.truncate(checkpoint.output_offset)
+        output_file.seek(checkpoint.output_offset)
+
+        with OutputBuffer(output_file) as output:
+            lines = read_mapped_lines(
+                input_path, ByteRange(checkpoint.input_offset, None)
+            )
+
+            for json_result in process_checkpointed(
+                LineProcessor().process_lines, lines, output, checkpointer, checkpoint
+            ):
+                output.write_line(json_result)
+
+
+def resume_stream(input_path: str, output_path: str, checkpoint: Checkpoint):
+    """
+    Process an input file in streaming mode from a checkpoint.
+
+    Parameters:
+        input_path (str): The path of the input file.
+        output_path (str): The path of the output file.
+        checkpoint (Checkpoint): The checkpoint resumed from.
+    """
+
+    checkpointer = Checkpointer(f"{output_path}.checkpoint")
+
+    with open(input_path, "rb") as input_file, open(output_path, "r+b") as output_file:
+        output_file.truncate(checkpoint.output_offset)
+        output_file.seek(checkpoint.output_offset)
+        input_file.seek(checkpoint.input_offset)
+
+        process_stream(
+            LineProcessor(),
+            input_file,
+            output_file,
+            block_size=16,
+            checkpointer=checkpointer,
+            checkpoint=checkpoint,
+        )
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_resume(tmp_path, input_path: str, stream: bool):
+    """
+    Test that resuming from any checkpoint produces the uninterrupted output.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+        input_path (str): The path of the input file.
+        stream (bool): Whether to process the input in streaming mode.
+
+    Raises:
+        AssertionError: The resumed output differs from the uninterrupted output.
+    """
+
+    resume = resume_stream if stream else resume_lines
+    output_path = os.path.join(tmp_path, "output.jsonl")
+    checkpointer = RecordingCheckpointer(os.path.join(tmp_path, "checkpoint.json"))
+
+    # Record the checkpoints of an uninterrupted run.
+    if stream:
+        with open(input_path, "rb") as input_file, open(output_path, "wb") as output:
+            process_stream(
+                LineProcessor(),
+                input_file,
+                output,
+                block_size=16,
+                checkpointer=checkpointer,
+            )
+    else:
+        with open(output_path, "wb") as output_file:
+            with OutputBuffer(output_file) as output:
+                for json_result in process_checkpointed(
+                    LineProcessor().process_lines,
+                    read_mapped_lines(input_path),
+                    output,
+                    checkpointer,
+                ):
+                    output.write_line(json_result)
+
+    checkpoints = checkpointer.checkpoints
+
+    with open(output_path, "rb") as output_file:
+        expected_output_data = output_file.read()
+
+    assert len(checkpoints) > 20
+    assert any(checkpoint.state is not None for checkpoint in checkpoints) == stream
+    assert checkpoints[-1].output_offset == len(expected_output_data)
+
+    for checkpoint in checkpoints:
+        interrupted_path = os.path.join(tmp_path, "interrupted.jsonl")
+        shutil.copyfile(output_path, interrupted_path)
+
+        # Results written after the checkpoint are discarded.
+        with open(interrupted_path, "ab") as interrupted_file:
+            interrupted_file.write(b"[{")
+
+        resume(input_path, interrupted_path, checkpoint)
+
+        with open(interrupted_path, "rb") as interrupted_file:
+            assert interrupted_file.read() == expected_output_data
+
+
+def test_checkpointer(tmp_path):
+    """
+    Test writing and reading checkpoints.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: The checkpoints do not match.
+    """
+
+    path = os.path.join(tmp_path, "checkpoint.json")
+    checkpointer = Checkpointer(path, interval=3600.0)
+
+    assert checkpointer.load() is None
+    assert not checkpointer.due()
+
+    with open(os.path.join(tmp_path, "output.jsonl"), "wb") as output_file:
+        checkpointer.save(Checkpoint(10, 20, (1, "2.5", "0")), output_file)
+
+    assert checkpointer.load() == Checkpoint(10, 20, (1, "2.5", "0"))
+    assert checkpointer.saves == 1
+
+    with open(path, "w", encoding="utf-8") as checkpoint_file:
+        checkpoint_file.write('{"input_offset": 10}')
+
+    with pytest.raises(ValueError, match="Invalid checkpoint"):
+        checkpointer.load()
+
+
+@pytest.mark.parametrize("backend", [DecimalBackend(), FixedPointBackend()])
+def test_checkpoint_state(backend: BaseBackend):
+    """
+    Test capturing and restoring the portfolio state of a line in progress.
+
+    Parameters:
+        backend (BaseBackend): The numeric backend of the portfolio.
+
+    Raises:
+        AssertionError: The restored state does not match the captured state.
+    """
+
+    state = PortfolioState(
+        7, Decimal("10") / Decimal("3"), Decimal("12.5"), backend=backend
+    )
+    checkpoint = Checkpoint.capture(1, 2, state)
+    restored_state = PortfolioState(backend=backend)
+    checkpoint.restore(restored_state)
+
+    assert restored_state.snapshot() == state.snapshot()
@@ -0,0 +1,87 @@
+"""
+Test codecs module.
+"""
+
+import pickle
+import random
+from decimal import Decimal
+
+import pytest
+
+from capital_gains.codecs import JSON_CODEC, JsonCodec, OrjsonCodec, create_codec
+from capital_gains.models import RESULTS_ADAPTER, ResultModel
+from capital_gains.options import Codec
+
+#: Taxes in cents covering fractions, rounding and exponent notation.
+TAXES = [
+    0,
+    1,
+    10,
+    150,
+    1000000,
+    123456789012345678,
+    10**18 - 1,
+    10**18,
+    10**25,
+    *random.Random(5).sample(range(10**12), 100),
+]
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+@pytest.mark.parametrize("codec", [JsonCodec(), OrjsonCodec()])
+def test_encode_results(codec: JsonCodec):
+    """
+    Test that encoded results match the serialization of result models.
+
+    Parameters:
+        codec (JsonCodec): The JSON codec.
+
+    Raises:
+        AssertionError: The encoded results do not match the result models.
+    """
+
+    for tax in TAXES:
+        result = ResultModel(tax=Decimal(tax).scaleb(-2))
+
+        assert codec.encode_result(tax) == result.model_dump_json().encode()
+        assert codec.encode_results([tax]) == RESULTS_ADAPTER.dump_json([result])
+
+    assert codec.encode_results(iter(TAXES)) == JSON_CODEC.encode_results(TAXES)
+    assert codec.encode_results([]) == b"[]"
+
+
+@pytest.mark.parametrize("codec", [JsonCodec(), OrjsonCodec()])
+@pytest.mark.parametrize(
+    "json_value",
+    ["[", "[NaN]", '{"a": Infinity}', b"[\xff]", "[1] 2"],
+)
+def test_loads_invalid(codec: JsonCodec, json_value: str):
+    """
+    Test that invalid documents raise value errors.
+
+    Parameters:
+        codec (JsonCodec): The JSON codec.
+        json_value (str): The invalid JSON document.
+
+    Raises:
+        AssertionError: The error is not raised.
+    """
+
+    with pytest.raises(ValueError):
+        codec.loads(json_value)
+
+
+def test_create_codec():
+    """
+    Test creating the codecs of each option.
+
+    Raises:
+        AssertionError: The codecs do not match the options.
+    """
+
+    assert create_codec(Codec.JSON) is JSON_CODEC
+    assert create_codec(Codec.AUTO).codec == Codec.ORJSON
+    assert create_codec(Codec.ORJSON).codec == Codec.ORJSON
+
+    # Codecs are sent to worker processes with their line processor.
+    assert pickle.loads(pickle.dumps(create_codec(Codec.ORJSON))).loads(b"[1]") == [1]
@@ -0,0 +1,233 @@
+"""
+Test compression module.
+"""
+
+import gzip
+import os
+import threading
+import zlib
+from pathlib import Path
+
+import pytest
+
+from capital_gains.compression import (
+    detect_compression,
+    open_compressed,
+    open_decompressed,
+    output_compression,
+)
+from capital_gains.options import Compression
+
+#: Lines of data compressed in the tests.
+DATA = b"".join(
+    b'[{"operation": "buy", "unit-cost": %d.00, "quantity": %d}]\n' % (index, index)
+    for index in range(20000)
+)
+
+
+def read_all(path: Path, **options) -> bytes:
+    """
+    Read the decompressed data of a file in blocks.
+
+    Parameters:
+        path (Path): The path of the compressed file.
+        options: The keyword arguments of `open_decompressed`.
+
+    Returns:
+        bytes: The decompressed data.
+    """
+
+    compression = detect_compression(path)
+
+    assert compression is not None
+
+    with open_decompressed(path, compression, **options) as input_stream:
+        return b"".join(iter(lambda: input_stream.read1(65536), b""))
+
+
+@pytest.mark.parametrize("threads", [1, 3])
+@pytest.mark.parametrize("segment_size", [1, 1000, 100000, 8388608])
+@pytest.mark.parametrize("member_size", [1000, 50000, len(DATA)])
+def test_gzip_members(tmp_path, member_size: int, segment_size: int, threads: int):
+    """
+    Test decompressing gzip files with several members in parallel segments.
+
+    Parameters:
+        tmp_path (Path): The temporary directory.
+        member_size (int): The number of decompressed bytes of each member.
+        segment_size (int): The number of compressed bytes of each segment.
+        threads (int): The number of threads decompressing segments.
+
+    Raises:
+        AssertionError: The decompressed data does not match.
+    """
+
+    path = tmp_path / "input.jsonl.gz"
+    path.write_bytes(
+        b"".join(
+            gzip.compress(DATA[start : start + member_size], mtime=0)
+            for start in range(0, len(DATA), member_size)
+        )
+        + bytes(10)
+    )
+
+    assert read_all(path, threads=threads, segment_size=segment_size) == DATA
+
+
+def test_gzip_false_members(tmp_path):
+    """
+    Test that member headers within compressed data do not split the data.
+
+    Parameters:
+        tmp_path (Path): The temporary directory.
+
+    Raises:
+        AssertionError: The decompressed data does not match.
+    """
+
+    # Stored blocks hold the bytes of the inner gzip data verbatim.
+    inner = gzip.compress(DATA[:5000], mtime=0)
+    data = DATA[:2000] + inner + DATA[:2000] + inner + DATA[:3000]
+    path = tmp_path / "input.gz"
+    path.write_bytes(
+        gzip.compress(data, compresslevel=0, mtime=0) + gzip.compress(DATA, mtime=0)
+    )
+
+    for segment_size in [1, 1000, 3000]:
+        assert read_all(path, threads=2, segment_size=segment_size) == data + DATA
+
+
+@pytest.mark.parametrize(
+    "compressed_data",
+    [
+        gzip.compress(DATA)[:-100],
+        gzip.compress(DATA) + b"garbage",
+        b"\x1f\x8b\x08" + bytes(20),
+    ],
+)
+def test_invalid_gzip(tmp_path, compressed_data: bytes):
+    """
+    Test that truncated and invalid gzip files raise value errors.
+
+    Parameters:
+        tmp_path (Path): The temporary directory.
+        compressed_data (bytes): The invalid gzip data.
+
+    Raises:
+        AssertionError: The error is not raised.
+    """
+
+    path = tmp_path / "input.gz"
+    path.write_bytes(compressed_data)
+
+    with pytest.raises(ValueError):
+        read_all(path, segment_size=1000)
+
+
+@pytest.mark.parametrize("compression", list(Compression))
+def test_compressed_output(tmp_path, compression: Compression):
+    """
+    Test writing compressed files and reading them back.
+
+    Parameters:
+        tmp_path (Path): The temporary directory.
+        compression (Compression): The compression format.
+
+    Raises:
+        AssertionError: The decompressed data does not match.
+    """
+
+    if compression == Compression.ZSTD:
+        pytest.importorskip("zstandard")
+
+    suffix = {Compression.GZIP: ".gz", Compression.ZSTD: ".zst"}[compression]
+    path = tmp_path / f"output.jsonl{suffix}"
+
+    assert output_compression(path) == compression
+
+    output_stream = open_compressed(path, compression)
+
+    for start in range(0, len(DATA), 7000):
+        output_stream.write(DATA[start : start + 7000])
+        output_stream.flush()
+
+    output_stream.close()
+
+    assert detect_compression(path) == compression
+    assert read_all(path) == DATA
+
+    if compression == Compression.GZIP:
+        assert gzip.decompress(path.read_bytes()) == DATA
+
+
+def test_zstd_frames(tmp_path):
+    """
+    Test decompressing zstandard files with several frames.
+
+    Parameters:
+        tmp_path (Path): The temporary directory.
+
+    Raises:
+        AssertionError: The decompressed data does not match.
+    """
+
+    zstandard = pytest.importorskip("zstandard")
+
+    path = tmp_path / "input.zst"
+    path.write_bytes(
+        zstandard.ZstdCompressor().compress(DATA[:1000])
+        + zstandard.ZstdCompressor().compress(DATA[1000:])
+    )
+
+    assert read_all(path) == DATA
+
+
+def test_uncompressed_files(tmp_path):
+    """
+    Test that uncompressed files are not detected as compressed.
+
+    Parameters:
+        tmp_path (Path): The temporary directory.
+
+    Raises:
+        AssertionError: The files are detected as compressed.
+    """
+
+    path = tmp_path / "input.jsonl"
+
+    for data in [b"", b"\x1f", DATA]:
+        path.write_bytes(data)
+
+        assert detect_compression(path) is None
+
+    assert output_compression(path) is None
+
+    pipe_path = tmp_path / "input.jsonl.gz"
+    os.mkfifo(pipe_path)
+
+    assert detect_compression(pipe_path) is None
+
+
+def test_close_early(tmp_path):
+    """
+    Test that closing a partially read file stops its background threads.
+
+    Parameters:
+        tmp_path (Path): The temporary directory.
+
+    Raises:
+        AssertionError: The background threads do not stop.
+    """
+
+    path = tmp_path / "input.gz"
+    path.write_bytes(
+        b"".join(zlib.compress(DATA, wbits=16 + zlib.MAX_WBITS) for _ in range(20))
+    )
+    active_threads = threading.active_count()
+
+    with open_decompressed(
+        path, Compression.GZIP, threads=4, segment_size=1000
+    ) as input_stream:
+        assert input_stream.read(100) == DATA[:100]
+
+    assert threading.active_count() == active_threads
@@ -0,0 +1,297 @@
+"""
+Test decoders module.
+"""
+
+import json
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+
+from capital_gains.codecs import JsonCodec, OrjsonCodec
+from capital_gains.decoders import (
+    decode_account_batch,
+    decode_operations,
+    decode_rows,
+    decode_values,
+)
+from capital_gains.models import (
+    ACCOUNT_BATCH_ADAPTER,
+    OPERATION_ADAPTER,
+    OPERATIONS_ADAPTER,
+    OperationRecord,
+)
+
+
+@pytest.mark.parametrize("codec", [JsonCodec(), OrjsonCodec()])
+@pytest.mark.parametrize(
+    "json_operations",
+    [
+        "[]",
+        '[{"operation": "buy", "unit-cost": 10.00, "quantity": 100}]',
+        '[{"operation": "sell", "unit-cost": 0.115, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": 1.005, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": 1e2, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": -0.0, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": 12345678901234567890.125, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": 1, "quantity": 123456789012345678901}]',
+        '[{"operation": "buy", "unit-cost": 99999999999999991611392, "quantity": 1}]',
+        '[{"operation": "buy", "unit_cost": 10, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": "10.005", "quantity": "5"}]',
+        '[{"operation": "buy", "unit-cost": 10, "quantity": 5.0, "extra": null}]',
+        '[{"operation": "buy", "unit-cost": 10, "quantity": true}]',
+    ],
+)
+def test_decode_operations(json_operations: str, codec: JsonCodec):
+    """
+    Test that decoded records match the values validated by the operation model.
+
+    Parameters:
+        json_operations (str): The JSON encoded batch of operations.
+        codec (JsonCodec): The JSON codec.
+
+    Raises:
+        AssertionError: The decoded records do not match the validated models.
+    """
+
+    expected_records = [
+        OperationRecord(operation.operation, operation.quantity, operation.unit_cost)
+        for operation in OPERATIONS_ADAPTER.validate_json(json_operations)
+    ]
+
+    records = decode_operations(json_operations, codec)
+
+    assert records == expected_records
+    assert [str(record.unit_cost) for record in records] == [
+        str(record.unit_cost) for record in expected_records
+    ]
+
+
+@pytest.mark.parametrize("codec", [JsonCodec(), OrjsonCodec()])
+def test_decode_equal_numbers(codec: JsonCodec):
+    """
+    Test that memoized unit costs of equal integers and floats do not collide.
+
+    Parameters:
+        codec (JsonCodec): The JSON codec.
+
+    Raises:
+        AssertionError: The decoded unit costs do not match the operation model.
+    """
+
+    unit_costs = ["99999999999999991611392", "1e23", "3", "3.0", "3.004"]
+
+    for unit_cost in unit_costs + unit_costs[::-1]:
+        json_operations = (
+            f'[{{"operation": "buy", "unit-cost": {unit_cost}, "quantity": 1}}]'
+        )
+        expected_unit_cost = OPERATIONS_ADAPTER.validate_json(json_operations)[
+            0
+        ].unit_cost
+
+        assert str(decode_operations(json_operations, codec)[0].unit_cost) == str(
+            expected_unit_cost
+        )
+
+    for value in [99999999999999991611392, 1e23, "1e23", 3, "3"]:
+        expected_unit_cost = OPERATION_ADAPTER.validate_python(
+            {"operation": "buy", "quantity": 1, "unit-cost": value}
+        ).unit_cost
+
+        assert str(decode_rows(["buy"], [1], [value])[0].unit_cost) == str(
+            expected_unit_cost
+        )
+
+
+@pytest.mark.parametrize("codec", [JsonCodec(), OrjsonCodec()])
+@pytest.mark.parametrize(
+    "json_operations",
+    [
+        "",
+        "{}",
+        "[1]",
+        '[{"operation": "BUY", "unit-cost": 10, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": 10, "quantity": 1.5}]',
+        '[{"operation": "buy", "unit-cost": 10, "quantity": null}]',
+        '[{"operation": "buy", "unit-cost": null, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": NaN, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": 1e400, "quantity": 1}]',
+        '[{"operation": "buy", "quantity": 1}]',
+    ],
+)
+def test_decode_invalid_operations(json_operations: str, codec: JsonCodec):
+    """
+    Test that invalid batches raise the same errors as the operation model.
+
+    Parameters:
+        json_operations (str): The JSON encoded batch of operations.
+        codec (JsonCodec): The JSON codec.
+
+    Raises:
+        AssertionError: The decoding errors do not match the validation errors.
+    """
+
+    with pytest.raises(ValidationError) as expected_error:
+        OPERATIONS_ADAPTER.validate_json(json_operations)
+
+    with pytest.raises(ValidationError) as error:
+        decode_operations(json_operations, codec)
+
+    assert str(error.value) == str(expected_error.value)
+
+
+@pytest.mark.parametrize(
+    "json_batch",
+    [
+        '{"account": "a", "operations": []}',
+        '{"account": "a", "operations": [{"operation": "buy", "unit-cost": 1.005, '
+        '"quantity": 1}], "extra": null}',
+        '{"account": "a", "operations": [{"operation": "buy", "unit-cost": "10", '
+        '"quantity": "5"}]}',
+        "",
+        "[]",
+        '{"account": "", "operations": []}',
+        '{"account": 1, "operations": []}',
+        '{"account": "a"}',
+        '{"account": "a", "operations": [{"operation": "hold"}]}',
+    ],
+)
+def test_decode_account_batch(json_batch: str):
+    """
+    Test that decoded account batches match the account batch model.
+
+    Parameters:
+        json_batch (str): The JSON encoded batch of operations of an account.
+
+    Raises:
+        AssertionError: The decoded records or errors do not match the model.
+    """
+
+    try:
+        batch = ACCOUNT_BATCH_ADAPTER.validate_json(json_batch)
+    except ValidationError as expected_error:
+        with pytest.raises(ValidationError) as error:
+            decode_account_batch(json_batch)
+
+        assert str(error.value) == str(expected_error)
+    else:
+        assert decode_account_batch(json_batch) == (
+            batch.account,
+            [
+                OperationRecord(
+                    operation.operation, operation.quantity, operation.unit_cost
+                )
+                for operation in batch.operations
+            ],
+        )
+
+
+@pytest.mark.parametrize(
+    "json_operations",
+    [
+        '[{"operation": "buy", "unit-cost": 10.00, "quantity": 100}]',
+        '[{"operation": "sell", "unit-cost": 0.115, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": -0.0, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": 12345678901234567890.125, "quantity": 1}]',
+        '[{"operation": "buy", "unit-cost": "10.005", "quantity": "5"}]',
+        '[{"operation": "buy", "unit-cost": 10, "quantity": true}]',
+        '[{"operation": "buy", "unit-cost": 10, "quantity": 1.5}]',
+        '[{"operation": "buy", "quantity": 1}]',
+        "{}",
+    ],
+)
+def test_decode_values(json_operations: str):
+    """
+    Test that decoded parsed batches match the operation model.
+
+    Parameters:
+        json_operations (str): The JSON encoded batch of operations, parsed
+            before decoding.
+
+    Raises:
+        AssertionError: The decoded records or errors do not match the model.
+    """
+
+    values = json.loads(json_operations)
+
+    try:
+        operations = OPERATIONS_ADAPTER.validate_python(values)
+    except ValidationError as expected_error:
+        with pytest.raises(ValidationError) as error:
+            decode_values(values)
+
+        assert str(error.value) == str(expected_error)
+    else:
+        records = decode_values(values)
+
+        assert records == [
+            OperationRecord(
+                operation.operation, operation.quantity, operation.unit_cost
+            )
+            for operation in operations
+        ]
+        assert [str(record.unit_cost) for record in records] == [
+            str(operation.unit_cost) for operation in operations
+        ]
+
+
+@pytest.mark.parametrize(
+    "row",
+    [
+        ("buy", 100, 10.0),
+        ("sell", 1, 0.115),
+        ("buy", 1, Decimal("1.005")),
+        ("buy", 1, Decimal("-0.0")),
+        ("buy", 1, 10),
+        ("buy", "100", "10.00"),
+        ("sell", "1", "0.115"),
+        ("buy", "1", "-0.00"),
+        ("buy", "1", "1e2"),
+        ("buy", "1", "12345678901234567890.125"),
+        ("buy", " 1", "10"),
+        ("buy", "1.5", "10"),
+        ("buy", True, 10),
+        ("buy", 1, "ten"),
+        ("buy", 1, Decimal("NaN")),
+        ("buy", 1, None),
+        ("hold", 1, 10),
+        (None, 1, 10),
+    ],
+)
+def test_decode_rows(row: tuple):
+    """
+    Test that decoded rows of columns match the operation model.
+
+    Parameters:
+        row (tuple): The operation, quantity and unit cost of the row.
+
+    Raises:
+        AssertionError: The decoded records or errors do not match the model.
+    """
+
+    operation_type, quantity, unit_cost = row
+
+    try:
+        operation = OPERATION_ADAPTER.validate_python(
+            {"operation": operation_type, "quantity": quantity, "unit-cost": unit_cost}
+        )
+    except ValidationError as expected_error:
+        with pytest.raises(ValidationError) as error:
+            decode_rows([operation_type], [quantity], [unit_cost])
+
+        assert str(error.value) == str(expected_error)
+    else:
+        records = decode_rows([operation_type] * 2, [quantity] * 2, [unit_cost] * 2)
+
+        assert (
+            records
+            == [
+                OperationRecord(
+                    operation.operation, operation.quantity, operation.unit_cost
+                )
+            ]
+            * 2
+        )
+        assert [str(record.unit_cost) for record in records] == [
+            str(operation.unit_cost)
+        ] * 2
@@ -0,0 +1,107 @@
+"""
+Test formatters module.
+"""
+
+import json
+import random
+from decimal import Decimal
+
+import pytest
+
+from capital_gains.formatters import (
+    ZERO_JSON_RESULT,
+    encode_result,
+    encode_results,
+    format_cents,
+    format_decimal,
+)
+from capital_gains.models import ResultModel
+
+#: Values in cents covering fractions, trailing zeros, the bound of the
+#: exact representation and exponent notation.
+CENTS = [
+    0,
+    1,
+    10,
+    99,
+    100,
+    150,
+    12345,
+    10**15 - 1,
+    10**15,
+    123456789012345678,
+    10**18 - 1,
+    10**18,
+    10**25,
+    *random.Random(6).sample(range(10**15), 200),
+]
+
+
+@pytest.mark.parametrize(
+    "value, expected_value",
+    [
+        (Decimal("123"), 123.0),
+        (Decimal("123.4"), 123.4),
+        (Decimal("123.45"), 123.45),
+        (Decimal("123.451"), 123.45),
+        (Decimal("123.456"), 123.46),
+        (Decimal("0"), 0.0),
+        (Decimal("-0.001"), -0.0),
+        (Decimal("-123.456"), -123.46),
+    ],
+)
+def test_format_decimal(value: Decimal, expected_value: float):
+    """
+    Test that formatted decimal values match the serialization of result models.
+
+    Parameters:
+        value (Decimal): The decimal value to test.
+        expected_value (float): The expected float value.
+
+    Raises:
+        AssertionError: The formatted values do not match the result models.
+    """
+
+    json_value = format_decimal(value)
+
+    assert json_value == repr(expected_value).encode()
+    assert ResultModel(tax=value).model_dump_json().encode() == (
+        b'{"tax":%s}' % json_value
+    )
+
+
+def test_format_cents():
+    """
+    Test that formatted values in cents match their float representation.
+
+    Raises:
+        AssertionError: The formatted values do not match the float representation.
+    """
+
+    for cents in CENTS + [-cents for cents in CENTS]:
+        assert format_cents(cents) == json.dumps(cents / 100).encode()
+
+
+def test_encode_results():
+    """
+    Test that encoded results match the JSON serialization of their floats.
+
+    Raises:
+        AssertionError: The encoded results do not match.
+    """
+
+    assert encode_result(0) is ZERO_JSON_RESULT
+    assert encode_results([]) == b"[]"
+
+    for tax in CENTS:
+        assert (
+            encode_result(tax)
+            == json.dumps({"tax": tax / 100}, separators=(",", ":")).encode()
+        )
+
+    assert (
+        encode_results(iter(CENTS))
+        == json.dumps(
+            [{"tax": tax / 100} for tax in CENTS], separators=(",", ":")
+        ).encode()
+    )
@@ -0,0 +1,168 @@
+"""
+Test history module.
+"""
+
+import json
+import random
+from decimal import Decimal
+
+import pytest
+
+from capital_gains.history import History, encode_changes, process_edits
+from capital_gains.models import OperationRecord, OperationType
+from capital_gains.pipeline import Backend, LineProcessor
+from capital_gains.workloads import WorkloadShape, generate_lines
+
+
+def round_trip(length: int) -> list:
+    """
+    Create a history buying and selling all shares at the same price, repeatedly.
+
+    Parameters:
+        length (int): The number of round trips.
+
+    Returns:
+        list: The operations of the history.
+    """
+
+    return [
+        OperationRecord(operation_type, 100, Decimal("10.00"))
+        for _ in range(length)
+        for operation_type in [OperationType.BUY, OperationType.SELL]
+    ]
+
+
+@pytest.mark.parametrize(
+    "interval, backend",
+    [(1, Backend.DECIMAL), (7, Backend.DECIMAL), (64, Backend.FIXED)],
+)
+def test_history_edits(interval: int, backend: Backend):
+    """
+    Test that corrected histories match recalculating them entirely.
+
+    Parameters:
+        interval (int): The number of operations between snapshots.
+        backend (Backend): The numeric backend.
+
+    Raises:
+        AssertionError: The taxes or changes differ from a full recalculation.
+    """
+
+    processor = LineProcessor(fast_decode=True, backend=backend)
+    generator = random.Random(4)
+    lines = list(generate_lines(WorkloadShape(20, 100), seed=4))
+    history = History(
+        processor.create_calculator(), processor.decode(lines[0]), interval
+    )
+
+    for line in lines[1:]:
+        replacements = processor.decode(line)
+        indexes = generator.sample(range(100), generator.randint(1, 3))
+        taxes = list(history.taxes)
+        changes = history.edit({index: replacements[index] for index in indexes})
+        expected_taxes = list(
+            processor.create_calculator().calculate(history.operations)
+        )
+
+        assert history.taxes == expected_taxes
+        assert changes == [
+            (index, tax)
+            for index, (tax, previous_tax) in enumerate(zip(expected_taxes, taxes))
+            if tax != previous_tax
+        ]
+
+
+def test_history_convergence():
+    """
+    Test that recalculations stop once the portfolio state converges.
+
+    Raises:
+        AssertionError: Operations are recalculated past the convergence.
+    """
+
+    processor = LineProcessor()
+    history = History(processor.create_calculator(), round_trip(1000), 4)
+    changes = history.edit(
+        {1001: OperationRecord(OperationType.SELL, 100, Decimal("12.00"))}
+    )
+
+    assert not changes
+    assert history.recalculated == 4
+
+    # A loss is deducted from later profits, so the state never converges.
+    changes = history.edit(
+        {1001: OperationRecord(OperationType.SELL, 100, Decimal("5.00"))}
+    )
+
+    assert not changes
+    assert history.recalculated == 4 + 1000
+
+
+def test_history_edit_range():
+    """
+    Test that corrections outside the history are rejected.
+
+    Raises:
+        AssertionError: The error is not raised.
+    """
+
+    history = History(LineProcessor().create_calculator(), round_trip(1))
+
+    with pytest.raises(ValueError, match="not in the history"):
+        history.edit({2: OperationRecord(OperationType.BUY, 1, Decimal("1.00"))})
+
+    with pytest.raises(ValueError, match="positive"):
+        History(LineProcessor().create_calculator(), [], 0)
+
+
+def test_process_edits():
+    """
+    Test processing a session of histories and corrections.
+
+    Raises:
+        AssertionError: The results or changes do not match.
+    """
+
+    history = json.dumps(
+        [
+            {"operation": "buy", "unit-cost": 10.00, "quantity": 10000},
+            {"operation": "sell", "unit-cost": 20.00, "quantity": 5000},
+            {"operation": "sell", "unit-cost": 5.00, "quantity": 5000},
+        ]
+    )
+    edit = json.dumps(
+        {
+            "edits": [
+                {
+                    "index": 1,
+                    "operation": {
+                        "operation": "sell",
+                        "unit-cost": 30,
+                        "quantity": 5000,
+                    },
+                }
+            ]
+        }
+    )
+
+    assert list(process_edits(LineProcessor(), [history, edit, '{"edits": []}'])) == [
+        b'[{"tax":0.0},{"tax":10000.0},{"tax":0.0}]',
+        b'[{"index":1,"tax":20000.0}]',
+        b"[]",
+    ]
+
+    with pytest.raises(ValueError, match="preceding history"):
+        list(process_edits(LineProcessor(), [edit]))
+
+
+def test_encode_changes():
+    """
+    Test encoding the changed taxes of a history.
+
+    Raises:
+        AssertionError: The encoded changes do not match.
+    """
+
+    assert encode_changes([(3, 150), (7, 0)]) == (
+        b'[{"index":3,"tax":1.5},{"index":7,"tax":0.0}]'
+    )
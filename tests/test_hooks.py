@@ -0,0 +1,116 @@
+"""
+Test hooks module.
+"""
+
+from typing import List, Tuple
+
+from capital_gains.hooks import (
+    HookGroup,
+    ProcessingHooks,
+    Stage,
+    timed_call,
+    timed_iterator,
+)
+from capital_gains.metrics import MetricsCollector
+from capital_gains.models import OperationType
+
+
+class RecordingHooks(ProcessingHooks):
+    """
+    Instrumentation hooks recording the observed stages.
+    """
+
+    def __init__(self):
+        """
+        Initialize the recording hooks.
+        """
+
+        self.stages: List[Tuple[Stage, float]] = []
+
+    def stage(self, stage: Stage, seconds: float):
+        """
+        Record the time spent in a stage.
+
+        Parameters:
+            stage (Stage): The processing stage.
+            seconds (float): The time spent in the stage, in seconds.
+        """
+
+        self.stages.append((stage, seconds))
+
+
+def test_default_hooks():
+    """
+    Test that the default hooks accept all events.
+
+    Raises:
+        AssertionError: An event is not accepted.
+    """
+
+    hooks = ProcessingHooks()
+
+    hooks.stage(Stage.PARSE, 1.0)
+    hooks.operation(OperationType.BUY, 1.0)
+    hooks.line(1, 10, 10, 1.0)
+    hooks.error(ValueError())
+
+
+def test_timed_iterator():
+    """
+    Test reporting the time spent producing each item, and the end of iteration.
+
+    Raises:
+        AssertionError: The items or the observed stages are not reported.
+    """
+
+    hooks = RecordingHooks()
+
+    assert list(timed_iterator([1, 2, 3], hooks, Stage.READ)) == [1, 2, 3]
+    assert [stage for stage, _ in hooks.stages] == [Stage.READ] * 4
+    assert all(seconds >= 0 for _, seconds in hooks.stages)
+
+
+def test_timed_call():
+    """
+    Test reporting the time spent in each call of a function.
+
+    Raises:
+        AssertionError: The calls or the observed stages are not reported.
+    """
+
+    hooks = RecordingHooks()
+    items: List[int] = []
+    append = timed_call(items.append, hooks, Stage.WRITE)
+
+    append(1)
+    append(2)
+
+    assert items == [1, 2]
+    assert [stage for stage, _ in hooks.stages] == [Stage.WRITE] * 2
+
+
+def test_hook_group():
+    """
+    Test reporting events to a group of hooks.
+
+    Raises:
+        AssertionError: The events or the observed flags are not reported.
+    """
+
+    first = RecordingHooks()
+    second = RecordingHooks()
+    group = HookGroup([first, second])
+
+    group.stage(Stage.PARSE, 1.0)
+    group.operation(OperationType.BUY, 1.0)
+    group.line(1, 10, 10, 1.0)
+    group.error(ValueError())
+
+    assert first.stages == second.stages == [(Stage.PARSE, 1.0)]
+    assert group.observe_stages
+    assert group.observe_operations
+
+    group = HookGroup([MetricsCollector()])
+
+    assert not group.observe_stages
+    assert not group.observe_operations
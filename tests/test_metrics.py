@@ -0,0 +1,207 @@
+"""
+Test metrics module.
+"""
+
+import json
+import math
+import os
+import time
+
+import pytest
+
+from capital_gains.metrics import (
+    LATENCY_BOUNDS,
+    OPERATION_BUCKET_LABELS,
+    Histogram,
+    MetricsCollector,
+)
+from capital_gains.pipeline import Engine, LineProcessor
+
+
+def test_histogram():
+    """
+    Test counting observed values in their buckets.
+
+    Raises:
+        AssertionError: The counts or the sum do not match the observations.
+    """
+
+    histogram = Histogram((1.0, 2.0, math.inf))
+
+    for value in [0.5, 1.0, 1.5, 3.0]:
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.cumulative_counts() == [2, 3, 4]
+    assert histogram.count == 4
+    assert histogram.total == 6.0
+
+
+def test_operation_bucket_labels():
+    """
+    Test the labels of the operations per line buckets.
+
+    Raises:
+        AssertionError: The labels do not match the bucket ranges.
+    """
+
+    assert OPERATION_BUCKET_LABELS == [
+        "0-1",
+        "2-10",
+        "11-100",
+        "101-1000",
+        "1001-10000",
+        "10001+",
+    ]
+
+
+@pytest.mark.parametrize("lines", [1, 255, 256, 1000])
+def test_collector_counters(lines: int):
+    """
+    Test counting lines, operations and bytes, including buffered events.
+
+    Parameters:
+        lines (int): The number of line events.
+
+    Raises:
+        AssertionError: The counters do not match the line events.
+    """
+
+    metrics = MetricsCollector()
+
+    for _ in range(lines):
+        metrics.line(2, 100, 20, 0.00002)
+
+    metrics.line(500, 5000, 1000, 0.002)
+    metrics.error(ValueError())
+
+    assert metrics.lines == lines + 1
+    assert metrics.operations == 2 * lines + 500
+    assert metrics.input_bytes == 100 * lines + 5000
+    assert metrics.output_bytes == 20 * lines + 1000
+    assert metrics.validation_failures == 1
+    assert metrics.latencies["2-10"].count == lines
+    assert metrics.latencies["101-1000"].counts[LATENCY_BOUNDS.index(0.0025)] == 1
+
+
+def test_collector_prometheus():
+    """
+    Test formatting the metrics in the Prometheus text format.
+
+    Raises:
+        AssertionError: The counters or the histogram samples are missing.
+    """
+
+    metrics = MetricsCollector()
+    metrics.line(2, 100, 20, 0.00002)
+
+    rows = metrics.to_prometheus().splitlines()
+
+    assert "capital_gains_lines_total 1" in rows
+    assert "capital_gains_operations_total 2" in rows
+    assert "capital_gains_validation_failures_total 0" in rows
+    assert (
+        'capital_gains_line_latency_seconds_bucket{operations="2-10",le="1e-05"} 0'
+        in rows
+    )
+    assert (
+        'capital_gains_line_latency_seconds_bucket{operations="2-10",le="2.5e-05"} 1'
+        in rows
+    )
+    assert 'capital_gains_line_latency_seconds_count{operations="2-10"} 1' in rows
+
+
+def test_collector_export(tmp_path):
+    """
+    Test exporting the metrics and writing the summary.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: The export or the summary do not match the metrics.
+    """
+
+    export_path = os.path.join(tmp_path, "metrics.prom")
+    summary_path = os.path.join(tmp_path, "summary.json")
+
+    metrics = MetricsCollector(export_path, export_interval=0.0)
+
+    for _ in range(256):
+        metrics.line(1, 10, 10, 0.001)
+
+    with open(export_path, "r", encoding="utf-8") as export_file:
+        assert "capital_gains_lines_total 256\n" in export_file.read()
+
+    metrics.write_summary(summary_path)
+
+    with open(summary_path, "r", encoding="utf-8") as summary_file:
+        summary = json.load(summary_file)
+
+    assert summary["lines"] == 256
+    assert summary["operations"] == 256
+    assert list(summary["latency_seconds"]) == ["0-1"]
+    assert summary["latency_seconds"]["0-1"]["buckets"]["+Inf"] == 256
+    assert not os.path.exists(f"{export_path}.tmp")
+
+
+def test_collector_export_slow_lines(tmp_path):
+    """
+    Test exporting the metrics periodically while processing a few slow lines.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: The export is not written before the end of the run.
+    """
+
+    export_path = os.path.join(tmp_path, "metrics.prom")
+
+    metrics = MetricsCollector(export_path, export_interval=0.05)
+    metrics.line(1, 10, 10, 0.01)
+
+    assert not os.path.exists(export_path)
+
+    time.sleep(0.05)
+    metrics.line(1, 10, 10, 0.05)
+
+    with open(export_path, "r", encoding="utf-8") as export_file:
+        assert "capital_gains_lines_total 2\n" in export_file.read()
+
+    metrics.line(1, 10, 10, 0.05)
+
+    with open(export_path, "r", encoding="utf-8") as export_file:
+        assert "capital_gains_lines_total 2\n" in export_file.read()
+
+
+@pytest.mark.parametrize("engine", list(Engine))
+def test_processor_metrics(engine: Engine):
+    """
+    Test collecting the metrics of a line processor.
+
+    Parameters:
+        engine (Engine): The tax calculation engine.
+
+    Raises:
+        AssertionError: The metrics do not match the processed lines.
+    """
+
+    line = (
+        '[{"operation": "buy", "unit-cost": 10.00, "quantity": 10000}, '
+        '{"operation": "sell", "unit-cost": 20.00, "quantity": 5000}]'
+    )
+
+    metrics = MetricsCollector()
+    processor = LineProcessor(engine=engine, hooks=metrics)
+
+    results = list(processor.process_lines([line] * 3))
+
+    with pytest.raises(ValueError):
+        processor.process('[{"operation": "hold"}]')
+
+    assert metrics.lines == 3
+    assert metrics.operations == 6
+    assert metrics.input_bytes == 3 * len(line)
+    assert metrics.output_bytes == sum(len(result) for result in results)
+    assert metrics.validation_failures == 1
@@ -6,6 +6,7 @@ from decimal import Decimal
 
 import pytest
 
+from capital_gains.formatters import format_decimal
 from capital_gains.models import OperationModel, OperationType, ResultModel
 
 
@@ -81,3 +82,4 @@ def test_decimal_serialization(value: Decimal, expected_value: float):
     json_result = result.model_dump_json()
 
     assert json_result == f'{{"tax":{expected_value}}}'
+    assert json_result.encode() == b'{"tax":%s}' % format_decimal(value)
@@ -97,3 +97,43 @@ def test_process_operation(
     assert state.total_loss == expected_state.total_loss
 
     assert result.tax == expected_result.tax
+
+
+def test_calculate_operation():
+    """
+    Test that calculating a sell operation returns the unrounded tax.
+
+    Raises:
+        AssertionError: The tax is rounded or does not match the expected tax.
+    """
+
+    operation = OperationModel(
+        operation=OperationType.SELL, quantity=3, unit_cost=Decimal("10000.01")
+    )
+    state = PortfolioState(total_shares=3, average_cost=Decimal("1"))
+
+    tax = SellOperation().calculate(operation, state)
+
+    assert tax == Decimal("29997.03") * SellOperation.tax_percentage
+    assert state.total_shares == 0
+
+
+def test_process_untaxed_operation():
+    """
+    Test that sell operations without tax return independent zero results.
+
+    Raises:
+        AssertionError: The zero results are shared or not rounded.
+    """
+
+    operation = OperationModel(
+        operation=OperationType.SELL, quantity=10, unit_cost=Decimal("5")
+    )
+    result = SellOperation().process(
+        operation, PortfolioState(total_shares=10, average_cost=Decimal("10"))
+    )
+    result.tax = Decimal("5")
+
+    assert SellOperation().process(
+        operation, PortfolioState(total_shares=10, average_cost=Decimal("10"))
+    ) == ResultModel(tax=Decimal("0.00"))
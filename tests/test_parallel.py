@@ -0,0 +1,104 @@
+"""
+Test parallel processing module.
+"""
+
+from typing import Optional
+
+import pytest
+from pydantic import ValidationError
+
+from capital_gains.parallel import process_parallel
+from capital_gains.pipeline import LineProcessor
+
+
+def make_line(unit_cost: int) -> str:
+    """
+    Build a line of input whose tax depends on the unit cost.
+
+    Parameters:
+        unit_cost (int): The unit cost of the sell operation.
+
+    Returns:
+        str: The JSON encoded batch of operations.
+    """
+
+    return (
+        '[{"operation": "buy", "unit-cost": 10.00, "quantity": 10000}, '
+        f'{{"operation": "sell", "unit-cost": {unit_cost}, "quantity": 10000}}]\n'
+    )
+
+
+@pytest.mark.parametrize(
+    "workers, chunk_size, max_in_flight",
+    [(1, 1, 1), (2, 1, None), (2, 3, 1), (3, 7, 2)],
+)
+def test_process_parallel_order(
+    workers: int, chunk_size: int, max_in_flight: Optional[int]
+):
+    """
+    Test that parallel results are yielded in the input order.
+
+    Parameters:
+        workers (int): The number of worker processes.
+        chunk_size (int): The number of lines per chunk.
+        max_in_flight (Optional[int]): The maximum number of pending chunks.
+
+    Raises:
+        AssertionError: The results do not match the serial results.
+    """
+
+    processor = LineProcessor()
+    lines = [make_line(unit_cost) for unit_cost in range(10, 60)]
+
+    results = list(
+        process_parallel(processor, lines, workers, chunk_size, max_in_flight)
+    )
+
+    assert results == list(processor.process_lines(lines))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4])
+def test_process_parallel_error(chunk_size: int):
+    """
+    Test that results preceding an invalid line are yielded before the error.
+
+    Parameters:
+        chunk_size (int): The number of lines per chunk.
+
+    Raises:
+        AssertionError: The preceding results are not yielded or the error is not raised.
+    """
+
+    processor = LineProcessor()
+    lines = [make_line(20), make_line(30), "[{}]\n", make_line(40)]
+    results = []
+
+    with pytest.raises(ValidationError):
+        for result in process_parallel(
+            processor, lines, workers=2, chunk_size=chunk_size
+        ):
+            results.append(result)
+
+    assert results == list(processor.process_lines(lines[:2]))
+
+
+@pytest.mark.parametrize(
+    "workers, chunk_size, max_in_flight", [(0, 1, None), (1, 0, None), (1, 1, 0)]
+)
+def test_process_parallel_invalid_arguments(
+    workers: int, chunk_size: int, max_in_flight: Optional[int]
+):
+    """
+    Test that non-positive arguments are rejected.
+
+    Parameters:
+        workers (int): The number of worker processes.
+        chunk_size (int): The number of lines per chunk.
+        max_in_flight (Optional[int]): The maximum number of pending chunks.
+
+    Raises:
+        AssertionError: The invalid arguments are not rejected.
+    """
+
+    with pytest.raises(ValueError):
+        list(process_parallel(LineProcessor(), [], workers, chunk_size, max_in_flight))
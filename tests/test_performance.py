@@ -0,0 +1,35 @@
+"""
+Test performance of the standard workloads.
+
+These tests detect throughput regressions against the minimum expected
+throughput of each workload, and can be deselected with
+`pytest -m "not performance"`.
+"""
+
+import pytest
+
+from capital_gains.bench import run_benchmark
+from capital_gains.pipeline import LineProcessor
+from capital_gains.workloads import WORKLOADS, generate_lines
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("fast_decode", [False, True])
+@pytest.mark.parametrize("name", list(WORKLOADS))
+def test_workload_throughput(name: str, fast_decode: bool):
+    """
+    Test that the throughput of a workload meets its minimum.
+
+    Parameters:
+        name (str): The name of the workload.
+        fast_decode (bool): Whether to decode operations into lightweight records.
+
+    Raises:
+        AssertionError: The throughput is below the minimum of the workload.
+    """
+
+    workload = WORKLOADS[name]
+    lines = list(generate_lines(workload.scaled(0.05)))
+    result = run_benchmark(LineProcessor(fast_decode=fast_decode), name, lines)
+
+    assert result.operations_per_second >= workload.min_operations_per_second
@@ -0,0 +1,101 @@
+"""
+Test pipeline module.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from capital_gains.pipeline import Engine, LineProcessor
+
+
+@pytest.mark.parametrize("engine", list(Engine))
+@pytest.mark.parametrize("fast_decode", [False, True])
+@pytest.mark.parametrize(
+    "json_operations, expected_json_results",
+    [
+        ("[]", b"[]"),
+        (
+            '[{"operation": "buy", "unit-cost": 10.00, "quantity": 10000}, '
+            '{"operation": "sell", "unit-cost": 20.00, "quantity": 5000}]\n',
+            b'[{"tax":0.0},{"tax":10000.0}]',
+        ),
+        (
+            b'[{"operation": "buy", "unit-cost": 20.00, "quantity": 10000}, '
+            b'{"operation": "sell", "unit-cost": 10.00, "quantity": 5000}]\n',
+            b'[{"tax":0.0},{"tax":0.0}]',
+        ),
+    ],
+)
+def test_process_line(
+    json_operations: str,
+    expected_json_results: bytes,
+    fast_decode: bool,
+    engine: Engine,
+):
+    """
+    Test processing a line of input.
+
+    Parameters:
+        json_operations (str): The JSON encoded batch of operations.
+        expected_json_results (bytes): The expected JSON encoded results.
+        fast_decode (bool): Whether to decode operations into lightweight records.
+        engine (Engine): The tax calculation engine.
+
+    Raises:
+        AssertionError: The JSON encoded results do not match the expected results.
+    """
+
+    processor = LineProcessor(fast_decode=fast_decode, engine=engine)
+
+    assert processor.process(json_operations) == expected_json_results
+    assert (
+        list(processor.process_lines([json_operations] * 2))
+        == [expected_json_results] * 2
+    )
+
+
+@pytest.mark.parametrize("engine", list(Engine))
+@pytest.mark.parametrize("fast_decode", [False, True])
+def test_process_invalid_line(fast_decode: bool, engine: Engine):
+    """
+    Test processing an invalid line of input.
+
+    Parameters:
+        fast_decode (bool): Whether to decode operations into lightweight records.
+        engine (Engine): The tax calculation engine.
+
+    Raises:
+        AssertionError: The invalid line does not raise a validation error.
+    """
+
+    processor = LineProcessor(fast_decode=fast_decode, engine=engine)
+
+    with pytest.raises(ValidationError):
+        processor.process('[{"operation": "hold"}]')
+
+
+@pytest.mark.parametrize("engine", list(Engine))
+def test_process_lines_error(engine: Engine):
+    """
+    Test that results preceding a failing line are yielded before the error.
+
+    Parameters:
+        engine (Engine): The tax calculation engine.
+
+    Raises:
+        AssertionError: The preceding results are not yielded or the error is not raised.
+    """
+
+    processor = LineProcessor(engine=engine)
+    lines = [
+        '[{"operation": "buy", "unit-cost": 10.00, "quantity": 100}]',
+        '[{"operation": "buy", "unit-cost": 10.00, "quantity": 0}]',
+        "[]",
+    ]
+    results = []
+
+    with pytest.raises(ArithmeticError):
+        for result in processor.process_lines(lines):
+            results.append(result)
+
+    assert results == [b'[{"tax":0.0}]']
@@ -0,0 +1,211 @@
+"""
+Test prefixes module.
+"""
+
+import json
+from typing import List
+
+import pytest
+
+from capital_gains.backends import DecimalBackend
+from capital_gains.metrics import MetricsCollector
+from capital_gains.pipeline import Backend, Engine, LineProcessor
+from capital_gains.prefixes import PrefixIndex, PrefixSnapshot
+from capital_gains.workloads import WorkloadShape, generate_lines
+
+#: Lines of growing prefixes of a history of operations.
+LINES = [
+    b'[{"operation": "buy", "unit-cost": 10.00, "quantity": 100}]',
+    b'[{"operation": "buy", "unit-cost": 10.00, "quantity": 100}, '
+    b'{"operation": "sell", "unit-cost": 20.00, "quantity": 50}]',
+    b'[{"operation": "buy", "unit-cost": 10.00, "quantity": 100}, '
+    b'{"operation": "sell", "unit-cost": 20.00, "quantity": 50}, '
+    b'{"operation": "sell", "unit-cost": 5.00, "quantity": 50}]',
+]
+
+
+def growing_histories(count: int, lengths: List[int]) -> List[bytes]:
+    """
+    Generate lines of growing prefixes of random histories of operations.
+
+    Parameters:
+        count (int): The number of histories.
+        lengths (List[int]): The lengths of the prefixes of each history, in order.
+
+    Returns:
+        List[bytes]: The lines of input.
+    """
+
+    lines: List[bytes] = []
+
+    for line in generate_lines(WorkloadShape(count, max(lengths)), seed=7):
+        operations = json.loads(line)
+
+        lines.extend(json.dumps(operations[:length]).encode() for length in lengths)
+
+    return lines
+
+
+def snapshot(length: int) -> PrefixSnapshot:
+    """
+    Create a snapshot of an empty portfolio.
+
+    Parameters:
+        length (int): The number of operations in the line.
+
+    Returns:
+        PrefixSnapshot: The snapshot.
+    """
+
+    zero = DecimalBackend().zero
+
+    return PrefixSnapshot(length, (0, zero, zero), b"[" + b"{}," * length + b"]")
+
+
+def test_prefix_lookup():
+    """
+    Test finding the longest indexed prefix of a line of operations.
+
+    Raises:
+        AssertionError: The snapshots, remainders or statistics do not match.
+    """
+
+    index = PrefixIndex()
+
+    assert index.lookup(LINES[0]) == (None, b"")
+
+    index.store(LINES[0], snapshot(1))
+    index.store(LINES[1] + b" \n", snapshot(2))
+
+    found, remainder = index.lookup(LINES[2])
+    assert found == snapshot(2)
+    assert remainder == b'[ {"operation": "sell", "unit-cost": 5.00, "quantity": 50}]'
+
+    assert index.lookup(LINES[1]) == (snapshot(2), b"")
+    assert index.lookup(LINES[2].replace(b"}, ", b"},\n"))[0] == snapshot(1)
+    assert index.lookup(b"[" + LINES[2][1:].replace(b"100", b"10")) == (None, b"")
+    assert index.lookup(LINES[0][:-1] + b"x]") == (None, b"")
+
+    assert (index.hits, index.misses) == (3, 3)
+    assert index.reused_operations == 2 + 2 + 1
+    assert "hit ratio: 50.0%" in index.report()
+
+
+@pytest.mark.parametrize(
+    "max_entries, max_bytes",
+    [(2, 65536), (8, 2 * 256 + 20)],
+)
+def test_prefix_eviction(max_entries: int, max_bytes: int):
+    """
+    Test evicting the least recently used snapshots.
+
+    Parameters:
+        max_entries (int): The maximum number of snapshots.
+        max_bytes (int): The maximum size of the indexed results, in bytes.
+
+    Raises:
+        AssertionError: The snapshots found do not match.
+    """
+
+    index = PrefixIndex(max_entries, max_bytes)
+
+    for length, line in enumerate(LINES, 1):
+        index.store(line, snapshot(length))
+
+    assert index.evictions == 1
+    assert [index.lookup(line)[0] for line in LINES] == [
+        None,
+        snapshot(2),
+        snapshot(3),
+    ]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"fast_decode": True}, {"backend": Backend.FIXED}],
+)
+def test_prefix_processing(options: dict):
+    """
+    Test that resuming lines from indexed prefixes does not change the results.
+
+    Parameters:
+        options (dict): The keyword arguments of the line processor.
+
+    Raises:
+        AssertionError: The results differ from processing from an empty portfolio.
+    """
+
+    lines = growing_histories(20, [5, 10, 10, 40, 20, 0])
+    index = PrefixIndex(max_entries=16)
+    processor = LineProcessor(prefix_index=index, **options)
+
+    assert [processor.process(line) for line in lines] == [
+        LineProcessor(**options).process(line) for line in lines
+    ]
+    assert index.hits == 80
+    assert index.reused_operations == 20 * (5 + 10 + 10 + 10)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        LINES[1][:-1] + b', {"operation": "hold"}]',
+        LINES[1][:-1] + b", ]",
+        LINES[1][:-1] + b", {}",
+    ],
+)
+def test_prefix_processing_error(line: bytes):
+    """
+    Test that invalid operations following a prefix raise the same errors.
+
+    Parameters:
+        line (bytes): The invalid line of operations.
+
+    Raises:
+        AssertionError: The errors differ from processing without an index.
+    """
+
+    processor = LineProcessor(prefix_index=PrefixIndex())
+    processor.process(LINES[1])
+
+    with pytest.raises(ValueError) as expected_error:
+        LineProcessor().process(line)
+
+    with pytest.raises(ValueError) as error:
+        processor.process(line)
+
+    assert str(error.value) == str(expected_error.value)
+    assert processor.prefix_index and processor.prefix_index.hits == 1
+
+
+def test_prefix_processing_hooks():
+    """
+    Test reporting lines and validation failures with a prefix index.
+
+    Raises:
+        AssertionError: The counters do not match.
+    """
+
+    metrics = MetricsCollector()
+    processor = LineProcessor(prefix_index=PrefixIndex(), hooks=metrics)
+
+    for line in growing_histories(2, [3, 6]):
+        processor.process(line)
+
+    with pytest.raises(ValueError):
+        processor.process(b'[{"operation": "hold"}]')
+
+    assert (metrics.lines, metrics.operations) == (4, 18)
+    assert metrics.validation_failures == 1
+
+
+def test_prefix_engine():
+    """
+    Test that only the decimal engine supports prefix indexes.
+
+    Raises:
+        AssertionError: The error is not raised.
+    """
+
+    with pytest.raises(ValueError, match="decimal engine"):
+        LineProcessor(engine=Engine.NUMPY, prefix_index=PrefixIndex())
@@ -0,0 +1,84 @@
+"""
+Test profiling module.
+"""
+
+import pytest
+
+from capital_gains.hooks import Stage
+from capital_gains.models import OperationType
+from capital_gains.pipeline import Engine, LineProcessor
+from capital_gains.profiling import Profiler
+
+
+def test_profiler():
+    """
+    Test accumulating stages, operations and the slowest lines.
+
+    Raises:
+        AssertionError: The accumulated measurements do not match the events.
+    """
+
+    profiler = Profiler(slowest_count=2)
+
+    profiler.stage(Stage.PARSE, 1.0)
+    profiler.stage(Stage.PARSE, 0.5)
+    profiler.operation(OperationType.SELL, 0.25)
+
+    for seconds in [0.3, 0.1, 0.7, 0.2]:
+        profiler.line(5, 100, 20, seconds)
+
+    profiler.error(ValueError())
+
+    assert profiler.stage_seconds[Stage.PARSE] == 1.5
+    assert profiler.stage_counts[Stage.PARSE] == 2
+    assert profiler.operation_seconds[OperationType.SELL] == 0.25
+    assert profiler.operation_counts[OperationType.SELL] == 1
+    assert profiler.operation_counts[OperationType.BUY] == 0
+    assert profiler.lines == 4
+    assert profiler.errors == 1
+    assert profiler.slowest_lines == [(3, 0.7, 5), (1, 0.3, 5)]
+
+    report = profiler.report()
+
+    assert "parse" in report
+    assert "line 3: 0.700000s, 5 operations" in report
+
+
+@pytest.mark.parametrize("engine", list(Engine))
+@pytest.mark.parametrize("fast_decode", [False, True])
+def test_processor_hooks(fast_decode: bool, engine: Engine):
+    """
+    Test that line processors report their stages and lines to the hooks.
+
+    Parameters:
+        fast_decode (bool): Whether to decode operations into lightweight records.
+        engine (Engine): The tax calculation engine.
+
+    Raises:
+        AssertionError: The profiler does not observe the processed lines.
+    """
+
+    profiler = Profiler()
+    processor = LineProcessor(fast_decode=fast_decode, engine=engine, hooks=profiler)
+    lines = [
+        '[{"operation": "buy", "unit-cost": 10.00, "quantity": 10000}, '
+        '{"operation": "sell", "unit-cost": 20.00, "quantity": 5000}]',
+        "[]",
+        '[{"operation": "hold"}]',
+    ]
+    results = []
+
+    with pytest.raises(ValueError):
+        for result in processor.process_lines(lines):
+            results.append(result)
+
+    assert results == [b'[{"tax":0.0},{"tax":10000.0}]', b"[]"]
+    assert profiler.lines == 2
+    assert profiler.errors == 1
+    assert profiler.stage_counts[Stage.PARSE] > 0
+    assert profiler.stage_counts[Stage.COMPUTE] > 0
+    assert profiler.stage_counts[Stage.SERIALIZE] > 0
+
+    if engine == Engine.DECIMAL:
+        assert profiler.operation_counts[OperationType.BUY] == 1
+        assert profiler.operation_counts[OperationType.SELL] == 1
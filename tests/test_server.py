@@ -0,0 +1,309 @@
+"""
+Test server and client modules.
+"""
+
+import asyncio
+import io
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Tuple
+
+import pytest
+from typer import Typer
+from typer.testing import CliRunner
+
+from capital_gains.client import connect, run_client
+from capital_gains.pipeline import LineProcessor
+from capital_gains.server import TaxServer, encode_error
+
+from .test_use_cases import SCENARIOS
+
+#: A line of operations and its results.
+LINE = (
+    b'[{"operation": "buy", "unit-cost": 10.00, "quantity": 10000}, '
+    b'{"operation": "sell", "unit-cost": 20.00, "quantity": 5000}]'
+)
+RESULTS = b'[{"tax":0.0},{"tax":10000.0}]'
+
+
+@contextmanager
+def running(tax_server: TaxServer, **kwargs: Any) -> Iterator[threading.Thread]:
+    """
+    Run a tax server in a background thread, shutting it down on exit.
+
+    Parameters:
+        tax_server (TaxServer): The server.
+        **kwargs (Any): The keyword arguments of the `serve` method.
+
+    Returns:
+        Iterator[threading.Thread]: The thread running the server.
+    """
+
+    thread = threading.Thread(target=asyncio.run, args=(tax_server.serve(**kwargs),))
+    thread.start()
+
+    try:
+        assert tax_server.listening.wait(10)
+
+        yield thread
+    finally:
+        tax_server.close()
+        thread.join(10)
+
+
+@pytest.fixture(name="server")
+def server_fixture(tmp_path) -> Iterator[Tuple[TaxServer, str]]:
+    """
+    Provides a tax server listening on a Unix socket in a background thread.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Returns:
+        Iterator[Tuple[TaxServer, str]]: The server and the path of its socket.
+    """
+
+    socket_path = os.path.join(tmp_path, "server.sock")
+    tax_server = TaxServer(LineProcessor(), max_connections=2, drain_timeout=1.0)
+
+    with running(tax_server, socket_path=socket_path) as thread:
+        yield tax_server, socket_path
+
+    assert not thread.is_alive()
+
+
+@pytest.mark.parametrize(
+    "input_data, expected_output_data",
+    [
+        (b"", b""),
+        (LINE + b"\n", RESULTS + b"\n"),
+        (LINE, RESULTS + b"\n"),
+        ((LINE + b"\n") * 1000, (RESULTS + b"\n") * 1000),
+        (b"[]\n" + LINE + b"\n[]", b"[]\n" + RESULTS + b"\n[]\n"),
+    ],
+)
+def test_client(
+    server: Tuple[TaxServer, str], input_data: bytes, expected_output_data: bytes
+):
+    """
+    Test processing pipelined lines with the server.
+
+    Parameters:
+        server (Tuple[TaxServer, str]): The server and the path of its socket.
+        input_data (bytes): The lines of input.
+        expected_output_data (bytes): The expected results.
+
+    Raises:
+        AssertionError: The results do not match the expected results.
+    """
+
+    _, socket_path = server
+    output_stream = io.BytesIO()
+
+    run_client(connect(socket_path), io.BytesIO(input_data), output_stream)
+
+    assert output_stream.getvalue() == expected_output_data
+
+
+def test_client_error(server: Tuple[TaxServer, str]):
+    """
+    Test that results preceding an invalid line are written before the error.
+
+    Parameters:
+        server (Tuple[TaxServer, str]): The server and the path of its socket.
+
+    Raises:
+        AssertionError: The results are not written or the error is not raised.
+    """
+
+    _, socket_path = server
+    output_stream = io.BytesIO()
+    input_stream = io.BytesIO(LINE + b'\n[{"operation": "hold"}]\n' + LINE + b"\n")
+
+    with pytest.raises(ValueError, match="validation error"):
+        run_client(connect(socket_path), input_stream, output_stream)
+
+    assert output_stream.getvalue() == RESULTS + b"\n"
+
+
+def test_server_connections(server: Tuple[TaxServer, str]):
+    """
+    Test that connections beyond the limit wait for a free slot.
+
+    Parameters:
+        server (Tuple[TaxServer, str]): The server and the path of its socket.
+
+    Raises:
+        AssertionError: A waiting connection is served before a slot is free.
+    """
+
+    _, socket_path = server
+    connections = [connect(socket_path) for _ in range(3)]
+
+    for connection in connections:
+        connection.sendall(LINE + b"\n")
+
+    connections[0].settimeout(10)
+    assert connections[0].recv(1024) == RESULTS + b"\n"
+
+    connections[2].settimeout(0.2)
+
+    with pytest.raises(socket.timeout):
+        connections[2].recv(1024)
+
+    connections[0].close()
+    connections[2].settimeout(10)
+    assert connections[2].recv(1024) == RESULTS + b"\n"
+
+    for connection in connections[1:]:
+        connection.close()
+
+
+def test_server_drain(tmp_path):
+    """
+    Test that lines received before shutdown are answered before closing.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: The results are not written or the connection is not closed.
+    """
+
+    socket_path = os.path.join(tmp_path, "server.sock")
+    tax_server = TaxServer(LineProcessor(), drain_timeout=1.0)
+
+    with running(tax_server, socket_path=socket_path) as thread:
+        connection = connect(socket_path)
+        connection.settimeout(10)
+        connection.sendall(LINE + b"\n")
+
+        assert connection.recv(1024) == RESULTS + b"\n"
+
+        tax_server.close()
+        thread.join(10)
+
+        assert not thread.is_alive()
+        assert connection.recv(1024) == b""
+        assert not os.path.exists(socket_path)
+
+        connection.close()
+
+
+def test_server_line_size(tmp_path):
+    """
+    Test that lines beyond the maximum size are rejected.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: The line is not rejected.
+    """
+
+    socket_path = os.path.join(tmp_path, "server.sock")
+    tax_server = TaxServer(LineProcessor(), max_line_size=16)
+
+    with running(tax_server, socket_path=socket_path):
+        connection = connect(socket_path)
+        connection.settimeout(10)
+        connection.sendall(LINE)
+
+        assert connection.recv(1024) == b'{"error": "Line too long"}\n'
+        assert connection.recv(1024) == b""
+
+        connection.close()
+
+
+def test_server_tcp():
+    """
+    Test processing lines with the server listening on a TCP port.
+
+    Raises:
+        AssertionError: The results do not match the expected results.
+    """
+
+    tax_server = TaxServer(LineProcessor())
+    output_stream = io.BytesIO()
+
+    with running(tax_server, port=0):
+        host, port = tax_server.addresses[0][:2]
+        connection = connect(host=host, port=port)
+
+        run_client(connection, io.BytesIO(LINE + b"\n"), output_stream)
+
+    assert output_stream.getvalue() == RESULTS + b"\n"
+
+
+def test_encode_error():
+    """
+    Test encoding the error of an invalid line.
+
+    Raises:
+        AssertionError: The encoded error does not match the expected error.
+    """
+
+    assert encode_error(ValueError('Invalid "line"')) == (
+        b'{"error": "Invalid \\"line\\""}'
+    )
+
+
+@pytest.mark.parametrize("input_filename, output_filename", SCENARIOS)
+def test_client_command(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    server: Tuple[TaxServer, str],
+    input_filename: str,
+    output_filename: str,
+    data_path: str,
+    cli_app: Typer,
+    cli_runner: CliRunner,
+):
+    """
+    Test the client command processing the use case scenarios with the server.
+
+    Parameters:
+        server (Tuple[TaxServer, str]): The server and the path of its socket.
+        input_filename (str): The filename of the input data.
+        output_filename (str): The filename of the expected output data.
+        data_path (str): The path to the directory containing the input files.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The output does not match the expected output.
+    """
+
+    _, socket_path = server
+
+    with open(os.path.join(data_path, input_filename), "rb") as input_file:
+        input_data = input_file.read()
+
+    with open(os.path.join(data_path, output_filename), "rb") as output_file:
+        expected_output_data = output_file.read()
+
+    result = cli_runner.invoke(
+        cli_app, ["client", "--socket", socket_path], input=input_data
+    )
+
+    assert result.stdout_bytes == expected_output_data
+
+
+def test_client_command_unreachable(tmp_path, cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test the client command failing to connect to a server.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The command does not fail.
+    """
+
+    socket_path = os.path.join(tmp_path, "missing.sock")
+    result = cli_runner.invoke(cli_app, ["client", "--socket", socket_path])
+
+    assert result.exit_code == 2
+    assert "Cannot connect to the server" in result.stderr
@@ -0,0 +1,189 @@
+"""
+Test sharding module.
+"""
+
+import os
+import threading
+from typing import List, Optional
+
+import pytest
+
+from capital_gains.sharding import ByteRange, read_mapped_lines, split_file
+
+#: Lines of the sample input file.
+LINES = [b"[1]", b"[22]", b"", b"[333]", b"[4444]"]
+
+
+@pytest.fixture(
+    name="input_path", params=[b"\n".join(LINES), b"\n".join(LINES) + b"\n"]
+)
+def fixture_input_path(request: pytest.FixtureRequest, tmp_path) -> str:
+    """
+    Provides the path to a sample input file, with and without a trailing line break.
+
+    Parameters:
+        request (pytest.FixtureRequest): The fixture request.
+        tmp_path: The temporary directory path.
+
+    Returns:
+        str: The path to the input file.
+    """
+
+    path = os.path.join(tmp_path, "input.jsonl")
+
+    with open(path, "wb") as input_file:
+        input_file.write(request.param)
+
+    return path
+
+
+@pytest.mark.parametrize(
+    "text, expected_byte_range",
+    [
+        ("0:10", ByteRange(0, 10)),
+        ("5:", ByteRange(5, None)),
+        (":7", ByteRange(0, 7)),
+        ("3:3", ByteRange(3, 3)),
+    ],
+)
+def test_parse_byte_range(text: str, expected_byte_range: ByteRange):
+    """
+    Test parsing byte ranges.
+
+    Parameters:
+        text (str): The byte range notation.
+        expected_byte_range (ByteRange): The expected byte range.
+
+    Raises:
+        AssertionError: The byte range does not match the expected byte range.
+    """
+
+    assert ByteRange.parse(text) == expected_byte_range
+    assert ByteRange.parse(str(expected_byte_range)) == expected_byte_range
+
+
+@pytest.mark.parametrize("text", ["10", "a:b", "-1:5", "5:3"])
+def test_parse_invalid_byte_range(text: str):
+    """
+    Test parsing invalid byte ranges.
+
+    Parameters:
+        text (str): The byte range notation.
+
+    Raises:
+        AssertionError: The invalid byte range does not raise a value error.
+    """
+
+    with pytest.raises(ValueError):
+        ByteRange.parse(text)
+
+
+def test_read_mapped_lines(input_path: str):
+    """
+    Test reading all lines of a memory-mapped file.
+
+    Parameters:
+        input_path (str): The path to the input file.
+
+    Raises:
+        AssertionError: The lines do not match the lines of the file.
+    """
+
+    assert list(read_mapped_lines(input_path)) == LINES
+
+
+@pytest.mark.parametrize("end", [None, 100])
+def test_read_mapped_lines_partition(input_path: str, end: Optional[int]):
+    """
+    Test that any two contiguous byte ranges read each line exactly once.
+
+    Parameters:
+        input_path (str): The path to the input file.
+        end (Optional[int]): The end of the second byte range.
+
+    Raises:
+        AssertionError: A line is missing or read twice.
+    """
+
+    for offset in range(os.path.getsize(input_path) + 2):
+        lines: List[bytes] = list(read_mapped_lines(input_path, ByteRange(0, offset)))
+        lines.extend(read_mapped_lines(input_path, ByteRange(offset, end)))
+
+        assert lines == LINES
+
+
+@pytest.mark.parametrize("shards", [1, 2, 3, 5, 30])
+def test_split_file(input_path: str, shards: int):
+    """
+    Test splitting a file into contiguous newline-aligned byte ranges.
+
+    Parameters:
+        input_path (str): The path to the input file.
+        shards (int): The number of byte ranges.
+
+    Raises:
+        AssertionError: The byte ranges do not cover the lines of the file.
+    """
+
+    byte_ranges = split_file(input_path, shards)
+    lines: List[bytes] = []
+
+    for byte_range in byte_ranges:
+        lines.extend(read_mapped_lines(input_path, byte_range))
+
+    assert len(byte_ranges) == shards
+    assert byte_ranges[0].start == 0
+    assert byte_ranges[-1].end == os.path.getsize(input_path)
+    assert lines == LINES
+
+
+def test_empty_file(tmp_path):
+    """
+    Test reading and splitting an empty file.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: Lines are read from the empty file.
+    """
+
+    path = os.path.join(tmp_path, "input.jsonl")
+    open(path, "wb").close()  # pylint: disable=consider-using-with
+
+    assert not list(read_mapped_lines(path))
+    assert split_file(path, 2) == [ByteRange(0, 0), ByteRange(0, 0)]
+
+    with pytest.raises(ValueError):
+        split_file(path, 0)
+
+
+def test_read_pipe(tmp_path):
+    """
+    Test reading the lines of a named pipe, which cannot be memory-mapped.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+
+    Raises:
+        AssertionError: The lines do not match the written lines.
+    """
+
+    path = os.path.join(tmp_path, "input.jsonl")
+    os.mkfifo(path)
+
+    def write_lines():
+        """
+        Write the sample lines to the named pipe.
+        """
+
+        with open(path, "wb") as pipe:
+            pipe.write(b"\n".join(LINES))
+
+    writer = threading.Thread(target=write_lines)
+    writer.start()
+
+    try:
+        assert list(read_mapped_lines(path)) == LINES
+    finally:
+        writer.join()
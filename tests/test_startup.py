@@ -0,0 +1,138 @@
+"""
+Test startup time of the command-line application.
+
+These tests run the application in a fresh interpreter with
+`-X importtime`, checking which modules short invocations import and
+enforcing a budget on the import time of the command-line interface.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+import pytest
+
+#: The maximum import time of the command-line interface, in seconds.
+STARTUP_BUDGET = 0.1
+
+
+def import_times(arguments: List[str], input_data: bytes = b"") -> Dict[str, float]:
+    """
+    Run a Python interpreter and report the cumulative import time of each module.
+
+    Parameters:
+        arguments (List[str]): The arguments of the interpreter.
+        input_data (bytes): The standard input data. Defaults to empty.
+
+    Returns:
+        Dict[str, float]: The cumulative import time of each module, in seconds.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments],
+        input=input_data,
+        capture_output=True,
+        check=True,
+    )
+    times = {}
+
+    for line in result.stderr.decode().splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative) / 1e6
+
+    return times
+
+
+@pytest.mark.performance
+def test_import_budget():
+    """
+    Test that the command-line interface imports within the startup budget.
+
+    Raises:
+        AssertionError: The import time exceeds the budget.
+    """
+
+    times = import_times(["-c", "import capital_gains.cli"])
+
+    assert times["capital_gains.cli"] <= STARTUP_BUDGET
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        ["--help"],
+        ["version"],
+        ["client", "--help"],
+        ["serve", "--help"],
+        ["bench", "--help"],
+    ],
+)
+def test_lazy_imports(arguments: List[str]):
+    """
+    Test that short invocations do not import the processing pipeline.
+
+    Parameters:
+        arguments (List[str]): The arguments of the application.
+
+    Raises:
+        AssertionError: The processing pipeline or its dependencies are imported.
+    """
+
+    times = import_times(["-m", "capital_gains", *arguments])
+
+    assert "capital_gains.cli" in times
+    assert "capital_gains.pipeline" not in times
+    assert "capital_gains.workloads" not in times
+    assert "pydantic" not in times
+    assert "numpy" not in times
+
+
+def test_fast_entry_path(data_path: str):
+    """
+    Test that the default invocation bypasses the command-line interface.
+
+    Parameters:
+        data_path (str): The path to the directory containing the input files.
+
+    Raises:
+        AssertionError: The command-line interface or NumPy are imported.
+    """
+
+    with open(os.path.join(data_path, "input.0.jsonl"), "rb") as input_file:
+        times = import_times(["-m", "capital_gains"], input_file.read())
+
+    assert "capital_gains.pipeline" in times
+    assert "capital_gains.cli" not in times
+    assert "typer" not in times
+    assert "numpy" not in times
+
+
+def test_fast_entry_output(data_path: str):
+    """
+    Test that the default invocation writes the expected results.
+
+    Parameters:
+        data_path (str): The path to the directory containing the input files.
+
+    Raises:
+        AssertionError: The output does not match the expected output.
+    """
+
+    with open(os.path.join(data_path, "input.1.jsonl"), "rb") as input_file:
+        input_data = input_file.read()
+
+    with open(os.path.join(data_path, "output.1.jsonl"), "rb") as output_file:
+        expected_output_data = output_file.read()
+
+    result = subprocess.run(
+        [sys.executable, "-m", "capital_gains"],
+        input=input_data,
+        capture_output=True,
+        check=True,
+    )
+
+    assert result.stdout == expected_output_data
@@ -7,6 +7,7 @@ from typing import Tuple
 
 import pytest
 
+from capital_gains.backends import BaseBackend, DecimalBackend, FixedPointBackend
 from capital_gains.states.portfolio import PortfolioState
 
 
@@ -50,3 +51,46 @@ def test_state_initialization(args: Tuple[int, Decimal, Decimal]):
     assert portfolio.total_shares == args[0]
     assert portfolio.average_cost == args[1]
     assert portfolio.total_loss == args[2]
+
+
+@pytest.mark.parametrize("backend", [DecimalBackend(), FixedPointBackend()])
+def test_state_reset(backend: BaseBackend):
+    """
+    Test resetting the portfolio state.
+
+    Parameters:
+        backend (BaseBackend): The numeric backend of the portfolio.
+
+    Raises:
+        AssertionError: The reset state of the portfolio is not empty.
+    """
+
+    portfolio = PortfolioState(100, Decimal("10"), Decimal("1000"), backend=backend)
+    portfolio.reset()
+
+    assert portfolio.total_shares == 0
+    assert portfolio.average_cost == backend.zero
+    assert portfolio.total_loss == backend.zero
+    assert portfolio.backend is backend
+
+
+@pytest.mark.parametrize("backend", [DecimalBackend(), FixedPointBackend()])
+def test_state_snapshot(backend: BaseBackend):
+    """
+    Test restoring the portfolio state from a snapshot.
+
+    Parameters:
+        backend (BaseBackend): The numeric backend of the portfolio.
+
+    Raises:
+        AssertionError: The restored state of the portfolio does not match.
+    """
+
+    portfolio = PortfolioState(100, Decimal("10"), Decimal("1000"), backend=backend)
+    snapshot = portfolio.snapshot()
+    portfolio.reset()
+    portfolio.restore(snapshot)
+
+    assert portfolio.total_shares == 100
+    assert portfolio.average_cost == backend.from_decimal(Decimal("10"))
+    assert portfolio.total_loss == backend.from_decimal(Decimal("1000"))
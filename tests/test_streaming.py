@@ -0,0 +1,202 @@
+"""
+Test streaming module.
+"""
+
+import io
+import itertools
+import json
+import tracemalloc
+from typing import List
+
+import pytest
+
+from capital_gains.pipeline import LineProcessor
+from capital_gains.streaming import ArrayStreamReader, process_stream
+
+
+class GeneratedLineStream(io.RawIOBase):
+    """
+    Binary stream generating a single line with a large array of operations.
+    """
+
+    def __init__(self, count: int):
+        """
+        Initialize the generated line stream.
+
+        Parameters:
+            count (int): The number of buy and sell pairs in the line.
+        """
+
+        self._chunks = itertools.chain(
+            [b"["],
+            (
+                b'{"operation": "buy", "unit-cost": 10.00, "quantity": 100}, '
+                b'{"operation": "sell", "unit-cost": 15.00, "quantity": 100}'
+                + (b", " if index < count - 1 else b"]\n")
+                for index in range(count)
+            ),
+        )
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore
+        while not self._pending:
+            self._pending = next(self._chunks, b"")
+
+            if not self._pending:
+                return 0
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+
+        return size
+
+
+class DiscardingStream(io.RawIOBase):
+    """
+    Binary stream discarding all written data.
+    """
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore
+        return len(data)
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 7, 65536])
+@pytest.mark.parametrize(
+    "lines",
+    [
+        [],
+        ["[]"],
+        ["[ ]", "  []  "],
+        ['[{"operation": "buy", "unit-cost": 10, "quantity": 100}]'],
+        [
+            '[{"operation": "buy", "unit-cost": 10.00, "quantity": 10000}, '
+            '{"operation": "sell", "unit-cost": 20.00, "quantity": 5000}]',
+            '[{"operation": "buy", "unit-cost": 20.00, "quantity": 10000},'
+            '{"operation": "sell", "unit-cost": 10.00, "quantity": 5000}]',
+            "[]",
+            '[{"operation":"buy","unit-cost":1234567.891,"quantity":12345678}]',
+        ],
+    ],
+)
+def test_read_arrays(lines: List[str], block_size: int):
+    """
+    Test reading arrays element by element.
+
+    Parameters:
+        lines (List[str]): The lines of input.
+        block_size (int): The number of bytes read at a time.
+
+    Raises:
+        AssertionError: The elements do not match the array elements.
+    """
+
+    stream = io.BytesIO("".join(f"{line}\n" for line in lines).encode())
+    reader = ArrayStreamReader(stream, block_size)
+
+    arrays = [
+        [json.loads(element) for element in elements] for elements in reader.arrays()
+    ]
+
+    assert arrays == [json.loads(line) for line in lines]
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 65536])
+def test_skip_unconsumed_elements(block_size: int):
+    """
+    Test that elements not consumed by the caller are skipped.
+
+    Parameters:
+        block_size (int): The number of bytes read at a time.
+
+    Raises:
+        AssertionError: The arrays are not read in order.
+    """
+
+    stream = io.BytesIO(b"[1, 2, 3]\n[4]\n[5, 6]")
+    reader = ArrayStreamReader(stream, block_size)
+
+    first_elements = [next(elements) for elements in reader.arrays()]
+
+    assert first_elements == ["1", "4", "5"]
+
+
+@pytest.mark.parametrize("block_size", [1, 65536])
+@pytest.mark.parametrize(
+    "data", [b"\n", b"{}\n", b"[1, 2\n", b"[1,]\n", b"[1] 2\n", b"[1 2]\n", b"[tru]"]
+)
+def test_read_invalid_arrays(data: bytes, block_size: int):
+    """
+    Test that invalid arrays raise decoding errors.
+
+    Parameters:
+        data (bytes): The invalid input.
+        block_size (int): The number of bytes read at a time.
+
+    Raises:
+        AssertionError: The invalid input does not raise a decoding error.
+    """
+
+    reader = ArrayStreamReader(io.BytesIO(data), block_size)
+
+    with pytest.raises(json.JSONDecodeError):
+        for elements in reader.arrays():
+            list(elements)
+
+
+@pytest.mark.parametrize("fast_decode", [False, True])
+@pytest.mark.parametrize("block_size", [5, 65536])
+def test_process_stream(data_path: str, block_size: int, fast_decode: bool):
+    """
+    Test that streaming results match the line processing results.
+
+    Parameters:
+        data_path (str): The path to the directory containing test data.
+        block_size (int): The number of bytes read at a time.
+        fast_decode (bool): Whether to decode operations into lightweight records.
+
+    Raises:
+        AssertionError: The streaming results do not match the line results.
+    """
+
+    processor = LineProcessor(fast_decode=fast_decode)
+
+    with open(f"{data_path}/input.7.jsonl", "rb") as input_file:
+        lines = input_file.readlines()
+
+    output_stream = io.BytesIO()
+    process_stream(processor, io.BytesIO(b"".join(lines)), output_stream, block_size)
+
+    expected_output = b"".join(
+        json_results + b"\n" for json_results in processor.process_lines(lines)
+    )
+
+    assert output_stream.getvalue() == expected_output
+
+
+def test_process_stream_memory():
+    """
+    Test that the memory usage of streaming does not grow with the line length.
+
+    Raises:
+        AssertionError: The peak memory usage grows with the line length.
+    """
+
+    processor = LineProcessor(fast_decode=True)
+    peaks = []
+
+    for count in [1000, 20000]:
+        tracemalloc.start()
+        process_stream(processor, GeneratedLineStream(count), DiscardingStream())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        peaks.append(peak)
+
+    assert peaks[1] < 2 * peaks[0]
@@ -0,0 +1,333 @@
+"""
+Test tables module.
+"""
+
+import csv
+import io
+import json
+import os
+from typing import List, Tuple
+
+import pytest
+from pydantic import ValidationError
+
+from capital_gains.options import Backend, DataFormat, Engine
+from capital_gains.pipeline import LineProcessor
+from capital_gains.tables import INPUT_COLUMNS, process_table, split_batches
+
+
+def read_scenario(data_path: str, scenario: int) -> Tuple[List[tuple], List[bytes]]:
+    """
+    Read the rows and the expected output lines of a test scenario.
+
+    Parameters:
+        data_path (str): The path to the test data directory.
+        scenario (int): The number of the test scenario.
+
+    Returns:
+        Tuple[List[tuple], List[bytes]]: The rows of the batch, operation,
+            quantity and unit-cost columns, and the expected output lines.
+    """
+
+    with open(os.path.join(data_path, f"input.{scenario}.jsonl"), "rb") as input_file:
+        rows = [
+            (batch, value["operation"], value["quantity"], value["unit-cost"])
+            for batch, line in enumerate(input_file.read().splitlines())
+            for value in json.loads(line)
+        ]
+
+    with open(os.path.join(data_path, f"output.{scenario}.jsonl"), "rb") as output_file:
+        return rows, output_file.read().splitlines()
+
+
+def write_csv(rows: List[tuple]) -> io.BytesIO:
+    """
+    Write rows to CSV input with a header row.
+
+    Parameters:
+        rows (List[tuple]): The rows of the input columns.
+
+    Returns:
+        io.BytesIO: The CSV input.
+    """
+
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator="\n")
+    writer.writerow(INPUT_COLUMNS)
+    writer.writerows(rows)
+
+    return io.BytesIO(text.getvalue().encode())
+
+
+def expected_taxes(lines: List[bytes]) -> List[float]:
+    """
+    Flatten the taxes of expected output lines.
+
+    Parameters:
+        lines (List[bytes]): The expected output lines.
+
+    Returns:
+        List[float]: The tax of each operation, in order.
+    """
+
+    return [result["tax"] for line in lines for result in json.loads(line)]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"backend": Backend.FIXED},
+        {"engine": Engine.NUMPY, "batch_size": 2},
+    ],
+)
+@pytest.mark.parametrize("chunk_rows", [1, 3, 65536])
+@pytest.mark.parametrize("scenario", range(10))
+def test_csv_scenarios(data_path: str, scenario: int, chunk_rows: int, options: dict):
+    """
+    Test that taxes of CSV input match the expected output in every format.
+
+    Parameters:
+        data_path (str): The path to the test data directory.
+        scenario (int): The number of the test scenario.
+        chunk_rows (int): The number of rows of each chunk.
+        options (dict): The keyword arguments of the line processor.
+
+    Raises:
+        AssertionError: The taxes do not match the expected output.
+    """
+
+    rows, lines = read_scenario(data_path, scenario)
+    processor = LineProcessor(**options)
+
+    output = io.BytesIO()
+    process_table(
+        processor, write_csv(rows), output, DataFormat.CSV, DataFormat.CSV, chunk_rows
+    )
+
+    assert output.getvalue().splitlines()[0] == b"tax"
+    assert list(map(float, output.getvalue().splitlines()[1:])) == expected_taxes(lines)
+
+    output = io.BytesIO()
+    process_table(
+        processor, write_csv(rows), output, DataFormat.CSV, DataFormat.JSONL, chunk_rows
+    )
+
+    assert output.getvalue().splitlines() == lines
+
+
+@pytest.mark.parametrize("output_format", [DataFormat.ARROW, DataFormat.PARQUET])
+@pytest.mark.parametrize("input_format", [DataFormat.ARROW, DataFormat.PARQUET])
+@pytest.mark.parametrize("scenario", range(10))
+def test_arrow_scenarios(
+    data_path: str,
+    scenario: int,
+    input_format: DataFormat,
+    output_format: DataFormat,
+):
+    """
+    Test that taxes of Arrow and Parquet input match the expected output.
+
+    Parameters:
+        data_path (str): The path to the test data directory.
+        scenario (int): The number of the test scenario.
+        input_format (DataFormat): The format of the input.
+        output_format (DataFormat): The format of the output.
+
+    Raises:
+        AssertionError: The taxes do not match the expected output.
+    """
+
+    pyarrow = pytest.importorskip("pyarrow")
+    pytest.importorskip("pyarrow.parquet")
+
+    rows, lines = read_scenario(data_path, scenario)
+    table = pyarrow.table(
+        {name: [row[index] for row in rows] for index, name in enumerate(INPUT_COLUMNS)}
+    )
+    input_stream = pyarrow.BufferOutputStream()
+
+    if input_format == DataFormat.PARQUET:
+        pyarrow.parquet.write_table(table, input_stream, row_group_size=2)
+    else:
+        with pyarrow.ipc.new_stream(input_stream, table.schema) as writer:
+            writer.write_table(table, max_chunksize=2)
+
+    output = io.BytesIO()
+    process_table(
+        LineProcessor(),
+        io.BytesIO(input_stream.getvalue().to_pybytes()),
+        output,
+        input_format,
+        output_format,
+        chunk_rows=3,
+    )
+    output.seek(0)
+
+    if output_format == DataFormat.PARQUET:
+        taxes = pyarrow.parquet.read_table(output)
+    else:
+        taxes = pyarrow.ipc.open_stream(output).read_all()
+
+    assert taxes.column_names == ["tax"]
+    assert taxes.column("tax").to_pylist() == expected_taxes(lines)
+
+
+def test_arrow_file(data_path: str):
+    """
+    Test reading operations from an Arrow IPC file.
+
+    Parameters:
+        data_path (str): The path to the test data directory.
+
+    Raises:
+        AssertionError: The taxes do not match the expected output.
+    """
+
+    pyarrow = pytest.importorskip("pyarrow")
+
+    rows, lines = read_scenario(data_path, 7)
+    table = pyarrow.table(
+        {name: [row[index] for row in rows] for index, name in enumerate(INPUT_COLUMNS)}
+    )
+    input_stream = pyarrow.BufferOutputStream()
+
+    with pyarrow.ipc.new_file(input_stream, table.schema) as writer:
+        writer.write_table(table, max_chunksize=2)
+
+    output = io.BytesIO()
+    process_table(
+        LineProcessor(),
+        io.BytesIO(input_stream.getvalue().to_pybytes()),
+        output,
+        DataFormat.ARROW,
+        DataFormat.JSONL,
+    )
+
+    assert output.getvalue().splitlines() == lines
+
+
+def test_split_batches():
+    """
+    Test splitting consecutive rows into batches across chunks.
+
+    Raises:
+        AssertionError: The batches do not match the batch identifiers.
+    """
+
+    def chunk(batches: List[str]) -> dict:
+        """
+        Create a chunk of buy operations with increasing quantities.
+
+        Parameters:
+            batches (List[str]): The batch identifier of each row.
+
+        Returns:
+            dict: The columns of the chunk.
+        """
+
+        return {
+            "batch": batches,
+            "operation": ["buy"] * len(batches),
+            "quantity": list(range(1, len(batches) + 1)),
+            "unit-cost": ["10"] * len(batches),
+        }
+
+    batches = split_batches(
+        [chunk(["a", "a"]), chunk(["a", "b"]), chunk([]), chunk(["b"]), chunk(["a"])]
+    )
+
+    assert [[operation.quantity for operation in batch] for batch in batches] == [
+        [1, 2, 1],
+        [2, 1],
+        [1],
+    ]
+    assert not list(split_batches([chunk([])]))
+
+
+@pytest.mark.parametrize(
+    "csv_input",
+    [
+        b"batch,operation,quantity\n1,buy,1\n",
+        b"",
+        b"batch,operation,quantity,unit-cost\n1,buy,1\n",
+    ],
+)
+def test_invalid_csv(csv_input: bytes):
+    """
+    Test that CSV input without every column raises value errors.
+
+    Parameters:
+        csv_input (bytes): The invalid CSV input.
+
+    Raises:
+        AssertionError: The error is not raised.
+    """
+
+    with pytest.raises(ValueError):
+        process_table(
+            LineProcessor(),
+            io.BytesIO(csv_input),
+            io.BytesIO(),
+            DataFormat.CSV,
+            DataFormat.CSV,
+        )
+
+
+def test_invalid_row():
+    """
+    Test that invalid rows raise validation errors.
+
+    Raises:
+        AssertionError: The error is not raised.
+    """
+
+    with pytest.raises(ValidationError):
+        process_table(
+            LineProcessor(),
+            write_csv([(1, "buy", 1, "10"), (1, "hold", 1, "10")]),
+            io.BytesIO(),
+            DataFormat.CSV,
+            DataFormat.CSV,
+        )
+
+
+@pytest.mark.parametrize(
+    "output_format", [DataFormat.CSV, DataFormat.ARROW, DataFormat.PARQUET]
+)
+def test_invalid_row_output(output_format: DataFormat):
+    """
+    Test that the taxes of the batches preceding an invalid row are written.
+
+    Parameters:
+        output_format (DataFormat): The tabular output format.
+
+    Raises:
+        AssertionError: The taxes of the preceding batches are not written.
+    """
+
+    output = io.BytesIO()
+
+    with pytest.raises(ValidationError):
+        process_table(
+            LineProcessor(),
+            write_csv([(1, "buy", 1, "10"), (2, "buy", 1, "10"), (2, "hold", 1, "10")]),
+            output,
+            DataFormat.CSV,
+            output_format,
+            chunk_rows=2,
+        )
+
+    if output_format == DataFormat.CSV:
+        assert output.getvalue().splitlines() == [b"tax", b"0.0"]
+        return
+
+    pyarrow = pytest.importorskip("pyarrow")
+
+    if output_format == DataFormat.PARQUET:
+        parquet = pytest.importorskip("pyarrow.parquet")
+        table = parquet.read_table(pyarrow.BufferReader(output.getvalue()))
+    else:
+        table = pyarrow.ipc.open_stream(output.getvalue()).read_all()
+
+    assert table.column("tax").to_pylist() == [0.0]
@@ -2,31 +2,66 @@
 Test use case scenarios for CLI application.
 """
 
+import gzip
+import json
 import os
+import pstats
+import threading
+from decimal import Decimal
+from typing import List
 
 import pytest
 from typer import Typer
 from typer.testing import CliRunner
 
+from capital_gains.models import OperationRecord, OperationType
+from capital_gains.wire import encode_operation_frame, encode_result_frame
 
+#: The input and expected output files of each scenario.
+SCENARIOS = [
+    ("input.0.jsonl", "output.0.jsonl"),
+    ("input.1.jsonl", "output.1.jsonl"),
+    ("input.2.jsonl", "output.2.jsonl"),
+    ("input.3.jsonl", "output.3.jsonl"),
+    ("input.4.jsonl", "output.4.jsonl"),
+    ("input.5.jsonl", "output.5.jsonl"),
+    ("input.6.jsonl", "output.6.jsonl"),
+    ("input.7.jsonl", "output.7.jsonl"),
+    ("input.8.jsonl", "output.8.jsonl"),
+    ("input.9.jsonl", "output.9.jsonl"),
+]
+
+
+@pytest.mark.parametrize("input_filename, output_filename", SCENARIOS)
 @pytest.mark.parametrize(
-    "input_filename, output_filename",
+    "options",
     [
-        ("input.0.jsonl", "output.0.jsonl"),
-        ("input.1.jsonl", "output.1.jsonl"),
-        ("input.2.jsonl", "output.2.jsonl"),
-        ("input.3.jsonl", "output.3.jsonl"),
-        ("input.4.jsonl", "output.4.jsonl"),
-        ("input.5.jsonl", "output.5.jsonl"),
-        ("input.6.jsonl", "output.6.jsonl"),
-        ("input.7.jsonl", "output.7.jsonl"),
-        ("input.8.jsonl", "output.8.jsonl"),
-        ("input.9.jsonl", "output.9.jsonl"),
+        [],
+        ["--fast-decode"],
+        ["--workers", "2", "--chunk-size", "1"],
+        ["--stream"],
+        ["--stream", "--fast-decode"],
+        ["--backend", "fixed"],
+        ["--backend", "fixed", "--stream"],
+        ["--line-buffered"],
+        ["--stream", "--line-buffered"],
+        ["--profile"],
+        ["--engine", "numpy"],
+        ["--engine", "numpy", "--fast-decode", "--chunk-size", "3"],
+        ["--engine", "numpy", "--workers", "2"],
+        ["--cache"],
+        ["--cache", "--cache-size", "1", "--workers", "2", "--chunk-size", "1"],
+        ["--cache", "--engine", "numpy", "--fast-decode"],
+        ["--prefix-cache"],
+        ["--prefix-cache", "--fast-decode", "--cache"],
+        ["--codec", "json", "--fast-decode"],
+        ["--codec", "orjson", "--fast-decode", "--stream"],
     ],
 )
-def test_scenarios(
+def test_scenarios(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     input_filename: str,
     output_filename: str,
+    options: List[str],
     data_path: str,
     cli_app: Typer,
     cli_runner: CliRunner,
@@ -40,6 +75,7 @@ def test_scenarios(
     Parameters:
         input_filename (str): The name of the input JSONL file to test.
         output_filename (str): The name of the expected output JSONL file.
+        options (List[str]): The command-line options to invoke the application with.
         data_path (str): The path to the directory containing the input and output files.
         cli_app (Typer): The CLI application instance used for testing.
         cli_runner (CliRunner): The CLI testing runner for invoking commands.
@@ -58,7 +94,634 @@ def test_scenarios(
     with open(output_filepath, "r", encoding="utf-8") as output_file:
         expected_output_data = output_file.read()
 
-    result = cli_runner.invoke(cli_app, input=input_data)
+    result = cli_runner.invoke(cli_app, options, input=input_data)
     output_data = result.stdout
 
     assert output_data == expected_output_data
+
+
+@pytest.mark.parametrize("input_filename, output_filename", SCENARIOS)
+@pytest.mark.parametrize("shards", [1, 3])
+def test_sharded_scenarios(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    input_filename: str,
+    output_filename: str,
+    shards: int,
+    data_path: str,
+    cli_app: Typer,
+    cli_runner: CliRunner,
+):
+    """
+    Test CLI application processing byte ranges of input files.
+
+    The input file is split into byte ranges with the shard command, each
+    range is processed separately, and the outputs are concatenated in order.
+
+    Parameters:
+        input_filename (str): The name of the input JSONL file to test.
+        output_filename (str): The name of the expected output JSONL file.
+        shards (int): The number of byte ranges.
+        data_path (str): The path to the directory containing the input and output files.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError:
+            The concatenated output does not match the expected output.
+    """
+
+    input_filepath = os.path.join(data_path, input_filename)
+    output_filepath = os.path.join(data_path, output_filename)
+
+    with open(output_filepath, "r", encoding="utf-8") as output_file:
+        expected_output_data = output_file.read()
+
+    shard_result = cli_runner.invoke(
+        cli_app, ["shard", input_filepath, "--shards", str(shards)]
+    )
+    byte_ranges = shard_result.stdout.split()
+
+    output_data = "".join(
+        cli_runner.invoke(
+            cli_app, ["--input", input_filepath, "--byte-range", byte_range]
+        ).stdout
+        for byte_range in byte_ranges
+    )
+
+    assert len(byte_ranges) == shards
+    assert output_data == expected_output_data
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        ["--byte-range", "0:10"],
+        ["--input", "input.0.jsonl", "--byte-range", "10"],
+        ["--input", "input.0.jsonl", "--byte-range", "0:10", "--stream"],
+    ],
+)
+def test_invalid_byte_range(
+    options: List[str], data_path: str, cli_app: Typer, cli_runner: CliRunner
+):
+    """
+    Test CLI application rejecting invalid byte range options.
+
+    Parameters:
+        options (List[str]): The command-line options to invoke the application with.
+        data_path (str): The path to the directory containing the input files.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The invalid options are accepted.
+    """
+
+    options = [
+        os.path.join(data_path, option) if option.endswith(".jsonl") else option
+        for option in options
+    ]
+
+    result = cli_runner.invoke(cli_app, options, input="[]\n")
+
+    assert result.exit_code == 2
+
+
+def test_pipe_byte_range(tmp_path, cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test CLI application rejecting byte ranges of named pipes.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The byte range is accepted.
+    """
+
+    input_filepath = os.path.join(tmp_path, "input.jsonl")
+    os.mkfifo(input_filepath)
+
+    result = cli_runner.invoke(
+        cli_app, ["--input", input_filepath, "--byte-range", "0:10"]
+    )
+
+    assert result.exit_code == 2
+    assert "regular input file" in result.stderr
+
+
+@pytest.mark.parametrize("options", [[], ["--stream"]])
+def test_pipe_input(
+    options: List[str], tmp_path, data_path: str, cli_app: Typer, cli_runner: CliRunner
+):
+    """
+    Test CLI application reading the input from a named pipe.
+
+    Parameters:
+        options (List[str]): The command-line options to invoke the application with.
+        tmp_path: The temporary directory path.
+        data_path (str): The path to the directory containing the input and output files.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The output does not match the expected output.
+    """
+
+    input_filepath = os.path.join(tmp_path, "input.jsonl")
+    os.mkfifo(input_filepath)
+
+    with open(os.path.join(data_path, "input.2.jsonl"), "rb") as input_file:
+        input_data = input_file.read()
+
+    with open(os.path.join(data_path, "output.2.jsonl"), "r", encoding="utf-8") as file:
+        expected_output_data = file.read()
+
+    def write_input():
+        """
+        Write the input data to the named pipe.
+        """
+
+        with open(input_filepath, "wb") as pipe:
+            pipe.write(input_data)
+
+    writer = threading.Thread(target=write_input)
+    writer.start()
+
+    try:
+        result = cli_runner.invoke(cli_app, ["--input", input_filepath, *options])
+    finally:
+        writer.join()
+
+    assert result.exit_code == 0
+    assert result.stdout == expected_output_data
+
+
+@pytest.mark.parametrize("input_filename, output_filename", SCENARIOS)
+@pytest.mark.parametrize("options", [[], ["--stream"]])
+def test_input_file(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    input_filename: str,
+    output_filename: str,
+    options: List[str],
+    data_path: str,
+    cli_app: Typer,
+    cli_runner: CliRunner,
+):
+    """
+    Test CLI application reading operations from an input file.
+
+    Parameters:
+        input_filename (str): The name of the input JSONL file to test.
+        output_filename (str): The name of the expected output JSONL file.
+        options (List[str]): The command-line options to invoke the application with.
+        data_path (str): The path to the directory containing the input and output files.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError:
+            The output produced by the CLI application does not match the expected output.
+    """
+
+    input_filepath = os.path.join(data_path, input_filename)
+    output_filepath = os.path.join(data_path, output_filename)
+
+    with open(output_filepath, "r", encoding="utf-8") as output_file:
+        expected_output_data = output_file.read()
+
+    result = cli_runner.invoke(cli_app, ["--input", input_filepath, *options])
+
+    assert result.stdout == expected_output_data
+
+
+def test_profile_output(
+    tmp_path, data_path: str, cli_app: Typer, cli_runner: CliRunner
+):
+    """
+    Test CLI application writing a profile report and cProfile statistics.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+        data_path (str): The path to the directory containing the input files.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The report or the statistics are not written.
+    """
+
+    input_filepath = os.path.join(data_path, "input.0.jsonl")
+    profile_filepath = os.path.join(tmp_path, "profile.pstats")
+
+    result = cli_runner.invoke(
+        cli_app,
+        ["--input", input_filepath, "--profile", "--profile-output", profile_filepath],
+    )
+
+    assert "Slowest lines:" in result.stderr
+    assert pstats.Stats(profile_filepath).get_stats_profile().func_profiles
+
+
+def test_profile_cache(data_path: str, cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test CLI application rejecting the profile report with result caches.
+
+    Parameters:
+        data_path (str): The path to the directory containing the input files.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The options are accepted.
+    """
+
+    result = cli_runner.invoke(
+        cli_app,
+        ["--input", os.path.join(data_path, "input.0.jsonl"), "--cache", "--profile"],
+    )
+
+    assert result.exit_code == 2
+    assert "result caches" in result.stderr
+
+
+def test_metrics_output(
+    tmp_path, data_path: str, cli_app: Typer, cli_runner: CliRunner
+):
+    """
+    Test CLI application exporting metrics and writing a metrics summary.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+        data_path (str): The path to the directory containing the input files.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The metrics or the summary are not written.
+    """
+
+    input_filepath = os.path.join(data_path, "input.0.jsonl")
+    metrics_filepath = os.path.join(tmp_path, "metrics.prom")
+    summary_filepath = os.path.join(tmp_path, "summary.json")
+
+    result = cli_runner.invoke(
+        cli_app,
+        [
+            "--input",
+            input_filepath,
+            "--metrics-file",
+            metrics_filepath,
+            "--metrics-summary",
+            summary_filepath,
+        ],
+    )
+
+    with open(input_filepath, "r", encoding="utf-8") as input_file:
+        lines = len(input_file.read().splitlines())
+
+    with open(metrics_filepath, "r", encoding="utf-8") as metrics_file:
+        assert f"capital_gains_lines_total {lines}\n" in metrics_file.read()
+
+    with open(summary_filepath, "r", encoding="utf-8") as summary_file:
+        assert json.load(summary_file)["lines"] == lines
+
+    assert result.exit_code == 0
+
+
+def test_metrics_cache(data_path: str, cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test CLI application rejecting metrics with result caches.
+
+    Parameters:
+        data_path (str): The path to the directory containing the input files.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The options are accepted.
+    """
+
+    result = cli_runner.invoke(
+        cli_app,
+        [
+            "--input",
+            os.path.join(data_path, "input.0.jsonl"),
+            "--cache",
+            "--metrics-summary",
+            "summary.json",
+        ],
+    )
+
+    assert result.exit_code == 2
+    assert "result caches" in result.stderr
+
+
+def test_cache_path(tmp_path, data_path: str, cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test CLI application reusing results persisted by a previous run.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+        data_path (str): The path to the directory containing the input files.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The output does not match or the results are not reused.
+    """
+
+    input_filepath = os.path.join(data_path, "input.9.jsonl")
+    cache_filepath = os.path.join(tmp_path, "cache.sqlite")
+
+    with open(os.path.join(data_path, "output.9.jsonl"), "r", encoding="utf-8") as file:
+        expected_output_data = file.read()
+
+    options = ["--input", input_filepath, "--cache-path", cache_filepath]
+
+    for expected_statistics in ["store hits: 0", "misses: 0"]:
+        result = cli_runner.invoke(cli_app, [*options, "--cache-stats"])
+
+        assert result.stdout == expected_output_data
+        assert expected_statistics in result.stderr
+
+
+def test_accounts(tmp_path, cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test CLI application applying daily operations to persisted accounts.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The output does not match or the states are not persisted.
+    """
+
+    accounts_filepath = os.path.join(tmp_path, "accounts.sqlite")
+    days = [
+        b'{"account": "a", "operations": [{"operation": "buy", "unit-cost": 10.00, '
+        b'"quantity": 10000}]}\n'
+        b'{"account": "b", "operations": [{"operation": "buy", "unit-cost": 20.00, '
+        b'"quantity": 10000}]}\n',
+        b'{"account": "a", "operations": [{"operation": "sell", "unit-cost": 20.00, '
+        b'"quantity": 5000}]}\n'
+        b'{"account": "b", "operations": [{"operation": "sell", "unit-cost": 10.00, '
+        b'"quantity": 5000}]}\n',
+    ]
+    expected_outputs = [
+        '[{"tax":0.0}]\n[{"tax":0.0}]\n',
+        '[{"tax":10000.0}]\n[{"tax":0.0}]\n',
+    ]
+
+    for input_data, expected_output_data in zip(days, expected_outputs):
+        result = cli_runner.invoke(
+            cli_app, ["--accounts", accounts_filepath], input=input_data
+        )
+
+        assert result.stdout == expected_output_data
+
+    result = cli_runner.invoke(
+        cli_app, ["--accounts", accounts_filepath, "--workers", "2"], input=days[0]
+    )
+
+    assert result.exit_code == 2
+
+
+@pytest.mark.parametrize("options", [[], ["--stream"]])
+def test_checkpoint_resume(
+    tmp_path, options: List[str], data_path: str, cli_app: Typer, cli_runner: CliRunner
+):
+    """
+    Test CLI application resuming an interrupted run from its checkpoint.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+        options (List[str]): The command-line options.
+        data_path (str): The path to the directory containing the input files.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The resumed output differs from the expected output.
+    """
+
+    input_filepath = os.path.join(data_path, "input.9.jsonl")
+    output_filepath = os.path.join(tmp_path, "output.jsonl")
+    checkpoint_filepath = os.path.join(tmp_path, "checkpoint.json")
+
+    with open(input_filepath, "rb") as file:
+        first_line = file.readline()
+
+    with open(os.path.join(data_path, "output.9.jsonl"), "rb") as file:
+        first_result = file.readline()
+        expected_output_data = first_result + file.read()
+
+    # Simulate a run interrupted after writing part of the second result.
+    with open(output_filepath, "wb") as file:
+        file.write(expected_output_data[: len(first_result) + 5])
+
+    with open(checkpoint_filepath, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "input_offset": len(first_line),
+                "output_offset": len(first_result),
+                "state": None,
+            },
+            file,
+        )
+
+    arguments = [
+        "--input",
+        input_filepath,
+        "--output",
+        output_filepath,
+        "--checkpoint",
+        checkpoint_filepath,
+        "--resume",
+        *options,
+    ]
+
+    for _ in range(2):
+        result = cli_runner.invoke(cli_app, arguments)
+
+        assert result.exit_code == 0
+
+        with open(output_filepath, "rb") as file:
+            assert file.read() == expected_output_data
+
+    result = cli_runner.invoke(cli_app, ["--checkpoint", checkpoint_filepath])
+
+    assert result.exit_code == 2
+
+
+def test_recompute(cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test CLI application recalculating a history after corrections.
+
+    Parameters:
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The results or changes do not match.
+    """
+
+    input_data = (
+        b'[{"operation": "buy", "unit-cost": 10.00, "quantity": 10000}, '
+        b'{"operation": "sell", "unit-cost": 20.00, "quantity": 5000}, '
+        b'{"operation": "sell", "unit-cost": 5.00, "quantity": 5000}]\n'
+        b'{"edits": [{"index": 1, "operation": {"operation": "sell", '
+        b'"unit-cost": 30.00, "quantity": 5000}}]}\n'
+        b'{"edits": [{"index": 2, "operation": {"operation": "sell", '
+        b'"unit-cost": 6.00, "quantity": 5000}}]}\n'
+    )
+    result = cli_runner.invoke(
+        cli_app, ["recompute", "--snapshot-interval", "2"], input=input_data
+    )
+
+    assert result.stdout == (
+        '[{"tax":0.0},{"tax":10000.0},{"tax":0.0}]\n'
+        '[{"index":1,"tax":20000.0}]\n'
+        "[]\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "options, expected_output",
+    [
+        ([], "tax\n0.0\n10000.0\n0.0\n"),
+        (
+            ["--output-format", "jsonl"],
+            '[{"tax":0.0},{"tax":10000.0}]\n[{"tax":0.0}]\n',
+        ),
+        (["--stream"], None),
+        (["--workers", "2"], None),
+        (["--cache"], None),
+    ],
+)
+def test_table_formats(
+    cli_app: Typer,
+    cli_runner: CliRunner,
+    options: List[str],
+    expected_output: str,
+):
+    """
+    Test CLI application calculating taxes of tabular input.
+
+    Parameters:
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+        options (List[str]): The command-line options.
+        expected_output (str): The expected output, or `None` if the options
+            are not supported.
+
+    Raises:
+        AssertionError: The output does not match.
+    """
+
+    input_data = (
+        "batch,operation,quantity,unit-cost\n"
+        "a,buy,10000,10.00\n"
+        "a,sell,5000,20.00\n"
+        "b,buy,100,10.00\n"
+    )
+    result = cli_runner.invoke(
+        cli_app, ["--input-format", "csv", *options], input=input_data
+    )
+
+    if expected_output is None:
+        assert result.exit_code == 2
+    else:
+        assert result.exit_code == 0
+        assert result.stdout == expected_output
+
+
+def test_table_output_requires_table_input(cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test CLI application rejecting tabular output of lines of JSON input.
+
+    Parameters:
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The options are not rejected.
+    """
+
+    result = cli_runner.invoke(cli_app, ["--output-format", "csv"], input="[]\n")
+
+    assert result.exit_code == 2
+
+
+def test_binary_format(cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test CLI application calculating taxes of binary frames.
+
+    Parameters:
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The output does not match.
+    """
+
+    input_data = encode_operation_frame(
+        [
+            OperationRecord(OperationType.BUY, 10000, Decimal("10.00")),
+            OperationRecord(OperationType.SELL, 5000, Decimal("20.00")),
+        ]
+    )
+    result = cli_runner.invoke(cli_app, ["--input-format", "binary"], input=input_data)
+
+    assert result.exit_code == 0
+    assert result.stdout_bytes == encode_result_frame([0, 1000000])
+
+    result = cli_runner.invoke(
+        cli_app,
+        ["--input-format", "binary", "--output-format", "csv"],
+        input=input_data,
+    )
+
+    assert result.stdout == "tax\n0.0\n10000.0\n"
+
+
+def test_compressed_files(tmp_path, cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test CLI application reading and writing compressed files.
+
+    Parameters:
+        tmp_path (Path): The temporary directory.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The results do not match.
+    """
+
+    input_path = tmp_path / "input.jsonl.gz"
+    output_path = tmp_path / "output.jsonl.gz"
+    input_path.write_bytes(
+        gzip.compress(
+            b'[{"operation": "buy", "unit-cost": 10.00, "quantity": 10000}]\n'
+        )
+        + gzip.compress(
+            b'[{"operation": "buy", "unit-cost": 10.00, "quantity": 10000}, '
+            b'{"operation": "sell", "unit-cost": 20.00, "quantity": 5000}]\n'
+        )
+    )
+    expected_output = b'[{"tax":0.0}]\n[{"tax":0.0},{"tax":10000.0}]\n'
+
+    for options in [[], ["--stream"]]:
+        result = cli_runner.invoke(
+            cli_app,
+            ["--input", str(input_path), "--output", str(output_path), *options],
+        )
+
+        assert result.exit_code == 0
+        assert gzip.decompress(output_path.read_bytes()) == expected_output
+
+    result = cli_runner.invoke(
+        cli_app, ["--input", str(input_path), "--byte-range", "0:10"]
+    )
+
+    assert result.exit_code == 2
@@ -0,0 +1,187 @@
+"""
+Test wire module.
+"""
+
+import io
+import os
+from decimal import Decimal
+
+import pytest
+
+from capital_gains.models import (
+    OPERATIONS_ADAPTER,
+    RESULTS_ADAPTER,
+    OperationRecord,
+    OperationType,
+)
+from capital_gains.options import DataFormat, Engine
+from capital_gains.pipeline import LineProcessor
+from capital_gains.tables import process_table
+from capital_gains.wire import (
+    FRAME_HEADER,
+    decode_operation_frame,
+    decode_result_frame,
+    encode_operation_frame,
+    encode_result_frame,
+    iter_frames,
+    read_frames,
+)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"engine": Engine.NUMPY, "batch_size": 2},
+    ],
+)
+@pytest.mark.parametrize("scenario", range(10))
+def test_binary_scenarios(data_path: str, scenario: int, options: dict):
+    """
+    Test that taxes of binary frames match the expected output.
+
+    Parameters:
+        data_path (str): The path to the test data directory.
+        scenario (int): The number of the test scenario.
+        options (dict): The keyword arguments of the line processor.
+
+    Raises:
+        AssertionError: The taxes do not match the expected output.
+    """
+
+    with open(os.path.join(data_path, f"input.{scenario}.jsonl"), "rb") as input_file:
+        batches = [
+            OPERATIONS_ADAPTER.validate_json(line)
+            for line in input_file.read().splitlines()
+        ]
+
+    with open(os.path.join(data_path, f"output.{scenario}.jsonl"), "rb") as output_file:
+        expected_lines = output_file.read().splitlines()
+
+    input_data = b"".join(map(encode_operation_frame, batches))
+
+    assert [decode_operation_frame(frame) for frame in iter_frames(input_data)] == [
+        [
+            OperationRecord(
+                operation.operation, operation.quantity, operation.unit_cost
+            )
+            for operation in batch
+        ]
+        for batch in batches
+    ]
+
+    output = io.BytesIO()
+    process_table(
+        LineProcessor(**options),
+        io.BytesIO(input_data),
+        output,
+        DataFormat.BINARY,
+        DataFormat.BINARY,
+    )
+
+    assert [
+        decode_result_frame(frame)
+        for frame in read_frames(io.BytesIO(output.getvalue()))
+    ] == [
+        [int(result.tax.scaleb(2)) for result in RESULTS_ADAPTER.validate_json(line)]
+        for line in expected_lines
+    ]
+
+    output = io.BytesIO()
+    process_table(
+        LineProcessor(**options),
+        io.BytesIO(input_data),
+        output,
+        DataFormat.BINARY,
+        DataFormat.JSONL,
+    )
+
+    assert output.getvalue().splitlines() == expected_lines
+
+
+def test_encode_frames():
+    """
+    Test encoding frames of operations and results.
+
+    Raises:
+        AssertionError: The frames do not match their packed records.
+    """
+
+    operations = [
+        OperationRecord(OperationType.BUY, 100, Decimal("10.005")),
+        OperationRecord(OperationType.SELL, 2**63 - 1, Decimal("-0.01")),
+    ]
+    frame = encode_operation_frame(operations)
+
+    assert frame[: FRAME_HEADER.size] == b"\x22\x00\x00\x00"
+    assert decode_operation_frame(memoryview(frame)[FRAME_HEADER.size :]) == [
+        OperationRecord(OperationType.BUY, 100, Decimal("10.01")),
+        OperationRecord(OperationType.SELL, 2**63 - 1, Decimal("-0.01")),
+    ]
+    assert encode_operation_frame([]) == b"\x00\x00\x00\x00"
+
+    taxes = [0, 1, -1, 2**63 - 1]
+
+    assert [
+        decode_result_frame(frame)
+        for frame in iter_frames(
+            b"".join([encode_result_frame(taxes), encode_result_frame(iter([]))])
+        )
+    ] == [taxes, []]
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        OperationRecord(OperationType.BUY, 2**63, Decimal("10")),
+        OperationRecord(OperationType.BUY, 1, Decimal("1e17")),
+    ],
+)
+def test_encode_invalid_operations(operation: OperationRecord):
+    """
+    Test that operations beyond 64-bit records raise value errors.
+
+    Parameters:
+        operation (OperationRecord): The operation beyond 64-bit records.
+
+    Raises:
+        AssertionError: The error is not raised.
+    """
+
+    with pytest.raises(ValueError):
+        encode_operation_frame([operation])
+
+    with pytest.raises(ValueError):
+        encode_result_frame([2**63])
+
+
+@pytest.mark.parametrize(
+    "input_data",
+    [
+        b"\x01\x00",
+        b"\x11\x00\x00\x00\x00",
+        b"\x10\x00\x00\x00" + bytes(16),
+        b"\x11\x00\x00\x00\x02" + bytes(16),
+    ],
+)
+def test_decode_invalid_frames(input_data: bytes):
+    """
+    Test that truncated frames and invalid records raise value errors.
+
+    Parameters:
+        input_data (bytes): The invalid frames.
+
+    Raises:
+        AssertionError: The error is not raised.
+    """
+
+    with pytest.raises(ValueError):
+        for frame in iter_frames(input_data):
+            decode_operation_frame(frame)
+
+    with pytest.raises(ValueError):
+        for frame in read_frames(io.BytesIO(input_data)):
+            decode_operation_frame(frame)
+
+    with pytest.raises(ValueError):
+        decode_result_frame(memoryview(bytes(7)))
@@ -0,0 +1,145 @@
+"""
+Test workloads module.
+"""
+
+import json
+import os
+
+import pytest
+from typer import Typer
+from typer.testing import CliRunner
+
+from capital_gains.options import WORKLOAD_NAMES
+from capital_gains.workloads import (
+    BLOCK_LINES,
+    WORKLOADS,
+    WorkloadShape,
+    generate_blocks,
+    generate_lines,
+)
+
+
+@pytest.mark.parametrize(
+    "shape",
+    [
+        WorkloadShape(lines=0, operations_per_line=2),
+        WorkloadShape(lines=50, operations_per_line=0),
+        WorkloadShape(lines=50, operations_per_line=20),
+        WorkloadShape(lines=50, operations_per_line=20, sell_ratio=1.0),
+        WorkloadShape(lines=50, operations_per_line=20, loss_frequency=1.0),
+    ],
+)
+def test_generate_lines(shape: WorkloadShape):
+    """
+    Test generating valid batches of operations that never sell more than held.
+
+    Parameters:
+        shape (WorkloadShape): The parameters of the workload.
+
+    Raises:
+        AssertionError: The generated lines are invalid or not deterministic.
+    """
+
+    lines = list(generate_lines(shape, seed=1))
+
+    assert lines == list(generate_lines(shape, seed=1))
+    assert len(lines) == shape.lines
+
+    for line in lines:
+        operations = json.loads(line)
+        shares = 0
+
+        assert len(operations) == shape.operations_per_line
+
+        for operation in operations:
+            assert operation["unit-cost"] >= 0
+            assert operation["quantity"] > 0
+
+            if operation["operation"] == "buy":
+                shares += operation["quantity"]
+            else:
+                shares -= operation["quantity"]
+
+            assert shares >= 0
+
+
+@pytest.mark.parametrize("name", list(WORKLOADS))
+@pytest.mark.parametrize("scale", [0.001, 0.5, 2])
+def test_scaled_workloads(name: str, scale: float):
+    """
+    Test scaling the size of the standard workloads.
+
+    Parameters:
+        name (str): The name of the workload.
+        scale (float): The scale factor.
+
+    Raises:
+        AssertionError: The scaled size does not match the scale factor.
+    """
+
+    workload = WORKLOADS[name]
+    shape = workload.scaled(scale)
+    size = shape.lines * shape.operations_per_line
+    expected_size = workload.shape.lines * workload.shape.operations_per_line * scale
+
+    assert shape.lines >= 1 and shape.operations_per_line >= 1
+    assert size == pytest.approx(max(expected_size, size), rel=0.01)
+
+
+def test_workload_names():
+    """
+    Test that the workload names listed by the options match the standard workloads.
+
+    Raises:
+        AssertionError: The names do not match the standard workloads.
+    """
+
+    assert tuple(WORKLOADS) == WORKLOAD_NAMES
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("lines", [0, 1, BLOCK_LINES, 2 * BLOCK_LINES + 3])
+def test_generate_blocks(lines: int, workers: int):
+    """
+    Test that blocks hold the generated lines regardless of the number of workers.
+
+    Parameters:
+        lines (int): The number of lines.
+        workers (int): The number of worker processes.
+
+    Raises:
+        AssertionError: The blocks do not match the generated lines.
+    """
+
+    shape = WorkloadShape(lines=lines, operations_per_line=2)
+    expected_data = b"".join(line + b"\n" for line in generate_lines(shape, seed=3))
+
+    assert b"".join(generate_blocks(shape, seed=3, workers=workers)) == expected_data
+
+
+def test_generate_command(tmp_path, cli_app: Typer, cli_runner: CliRunner):
+    """
+    Test generating operations to standard output and to a file.
+
+    Parameters:
+        tmp_path: The temporary directory path.
+        cli_app (Typer): The CLI application instance used for testing.
+        cli_runner (CliRunner): The CLI testing runner for invoking commands.
+
+    Raises:
+        AssertionError: The generated operations are not reproducible or invalid.
+    """
+
+    options = ["generate", "--lines", "20", "--operations-per-line", "5", "--seed", "7"]
+    output_path = os.path.join(tmp_path, "input.jsonl")
+
+    result = cli_runner.invoke(cli_app, options)
+    cli_runner.invoke(cli_app, [*options, "--output", output_path])
+
+    with open(output_path, "rb") as output_file:
+        assert output_file.read() == result.stdout_bytes
+
+    tax_result = cli_runner.invoke(cli_app, ["--input", output_path])
+
+    assert tax_result.exit_code == 0
+    assert len(tax_result.stdout.splitlines()) == 20